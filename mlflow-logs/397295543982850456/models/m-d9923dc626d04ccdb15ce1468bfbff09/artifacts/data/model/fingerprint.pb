@@ -0,0 +1 @@
+A۹Ჰ ٭(튛m2
\ No newline at end of file
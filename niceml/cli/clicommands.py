@@ -46,6 +46,49 @@ def gendata(
     execute_job(context, "job_data_generation", config_path)
 
 
+@task(
+    help={
+        "config_path": "config_path to your job_train job config",
+        "batch_count": "Number of batches to load in each run",
+        "set_name": "Dataset of the train op to benchmark (train or validation)",
+        "workers": "Number of workers of the parallel run; 0 skips it",
+        "max_queue_size": "Maximum number of prefetched batches of the parallel run",
+        "use_multiprocessing": "Use processes instead of threads as workers",
+    }
+)
+def benchmark_data(  # noqa: PLR0913
+    context,  # pylint: disable=unused-argument
+    config_path,
+    batch_count=100,
+    set_name="train",
+    workers=4,
+    max_queue_size=10,
+    use_multiprocessing=False,
+):
+    """Measures how fast the dataset of a job_train config provides batches
+    without a model, sequentially and with parallel prefetching"""
+    from niceml.scripts.datasetbenchmark import (  # pylint: disable=import-outside-toplevel
+        run_dataset_benchmark,
+    )
+
+    result_df, stage_df = run_dataset_benchmark(
+        config_path,
+        batch_count=batch_count,
+        set_name=set_name,
+        workers=workers,
+        max_queue_size=max_queue_size,
+        use_multiprocessing=use_multiprocessing,
+    )
+    print(result_df.to_string(index=False))
+    if len(stage_df) > 0:
+        print(
+            stage_df[
+                ["workers", "epoch", "stage", "count", "mean_ms", "p50_ms", "p90_ms"]
+                + ["p99_ms", "max_ms", "samples_per_sec"]
+            ].to_string(index=False)
+        )
+
+
 @task
 def execute(context, job_name, config_path):
     """Starts a job with given name"""
@@ -9,13 +9,16 @@ from niceml.dagster.ops.datageneration import data_generation
 from niceml.dagster.ops.dfnormalization import df_normalization
 from niceml.dagster.ops.evalcopyexp import eval_copy_exp
 from niceml.dagster.ops.experiment import experiment
+from niceml.dagster.ops.exportmodel import export_model
 from niceml.dagster.ops.exptests import exptests
 from niceml.dagster.ops.filelockops import clear_locks, acquire_locks, release_locks
 from niceml.dagster.ops.imagetotable import image_to_tabular_data
 from niceml.dagster.ops.localizeexperiment import localize_experiment
 from niceml.dagster.ops.prediction import prediction
+from niceml.dagster.ops.preprocessimages import preprocess_images
 from niceml.dagster.ops.splitdata import split_data
 from niceml.dagster.ops.train import train
+from niceml.dagster.ops.writeshards import write_shards
 from niceml.dagster.resources.locations import locations_resource
 from dagster import job
 
@@ -69,6 +72,13 @@ def job_eval():
     exptests(exp_context)  # pylint: disable=no-value-for-parameter
 
 
+@job(config=hydra_conf_mapping_factory())
+def job_export_model():
+    """Job for exporting the model of an experiment for inference"""
+    exp_context = localize_experiment()  # pylint: disable=no-value-for-parameter
+    export_model(exp_context)  # pylint: disable=no-value-for-parameter
+
+
 @job(
     config=hydra_conf_mapping_factory(),
     resource_defs={
@@ -86,3 +96,23 @@ def job_copy_exp():
 def job_clearlocks():
     """Clear locks from given lock entries"""
     clear_locks()  # pylint: disable=no-value-for-parameter
+
+
+@job(config=hydra_conf_mapping_factory())
+def job_write_shards():
+    """Job for packing the train and validation data into shards"""
+    write_shards.alias("write_shards_train")()  # pylint: disable=no-value-for-parameter
+    write_shards.alias(  # pylint: disable=no-value-for-parameter
+        "write_shards_validation"
+    )()
+
+
+@job(config=hydra_conf_mapping_factory())
+def job_preprocess_images():
+    """Job for resizing and reencoding the train and validation images once"""
+    preprocess_images.alias(  # pylint: disable=no-value-for-parameter
+        "preprocess_images_train"
+    )()
+    preprocess_images.alias(  # pylint: disable=no-value-for-parameter
+        "preprocess_images_validation"
+    )()
@@ -7,13 +7,24 @@ from niceml.dagster.jobs.jobs import (
     job_copy_exp,
     job_data_generation,
     job_eval,
+    job_export_model,
     job_train,
+    job_write_shards,
+    job_preprocess_images,
 )
 
 
 def get_job_list() -> List[JobDefinition]:
     """returns a list of all niceml jobs"""
-    return [job_train, job_eval, job_copy_exp, job_data_generation]
+    return [
+        job_train,
+        job_eval,
+        job_export_model,
+        job_copy_exp,
+        job_data_generation,
+        job_write_shards,
+        job_preprocess_images,
+    ]
 
 
 @repository
@@ -0,0 +1,73 @@
+"""Module for the export model dagster op"""
+import json
+
+from dagster import Field, OpExecutionContext, op
+from hydra.utils import ConvertMode, instantiate
+
+from niceml.config.defaultremoveconfigkeys import DEFAULT_REMOVE_CONFIG_KEYS
+from niceml.config.hydra import HydraInitField
+from niceml.config.writeopconfig import write_op_config
+from niceml.data.datadescriptions.datadescription import DataDescription
+from niceml.experiments.expdatalocalstorageloader import create_expdata_from_expcontext
+from niceml.experiments.experimentcontext import ExperimentContext
+from niceml.experiments.experimentdata import ExperimentData
+from niceml.experiments.expfilenames import ExperimentFilenames, OpNames
+from niceml.mlcomponents.modelexporter.modelexporter import ModelExporter
+from niceml.mlcomponents.modelloader.modelloader import ModelLoader
+from niceml.utilities.fsspec.locationutils import join_fs_path, open_location
+
+
+# pylint: disable=use-dict-literal
+@op(
+    config_schema=dict(
+        model_loader=HydraInitField(ModelLoader),
+        model_exporter=HydraInitField(ModelExporter),
+        export_name=Field(
+            str,
+            default_value="inference_model",
+            description="Name of the exported model in the exported models folder",
+        ),
+        remove_key_list=Field(
+            list,
+            default_value=DEFAULT_REMOVE_CONFIG_KEYS,
+            description="These key are removed from any config recursively before it is saved.",
+        ),
+    ),
+)
+def export_model(
+    context: OpExecutionContext, exp_context: ExperimentContext
+) -> ExperimentContext:
+    """This dagster op exports the latest model of the experiment for inference"""
+    op_config = json.loads(json.dumps(context.op_config))
+    write_op_config(
+        op_config,
+        exp_context,
+        OpNames.OP_EXPORT_MODEL.value,
+        op_config["remove_key_list"],
+    )
+    instantiated_op_config = instantiate(op_config, _convert_=ConvertMode.ALL)
+    data_description: DataDescription = (
+        exp_context.instantiate_datadescription_from_yaml()
+    )
+
+    exp_data: ExperimentData = create_expdata_from_expcontext(exp_context)
+    model_path: str = exp_data.get_model_path(relative_path=True)
+    model_loader: ModelLoader = instantiated_op_config["model_loader"]
+    model_exporter: ModelExporter = instantiated_op_config["model_exporter"]
+    model_exporter.initialize(data_description, exp_context)
+    with open_location(exp_context.fs_config) as (exp_fs, exp_root):
+        model = model_loader(
+            join_fs_path(exp_fs, exp_root, model_path),
+            file_system=exp_fs,
+        )
+        export_path = join_fs_path(
+            exp_fs,
+            exp_root,
+            ExperimentFilenames.EXPORTED_MODELS_FOLDER,
+            op_config["export_name"],
+        )
+        context.log.info(f"Export model {model_path} to {export_path}")
+        model_exporter(model, data_description, export_path, file_system=exp_fs)
+    exp_context.update_last_modified()
+
+    return exp_context
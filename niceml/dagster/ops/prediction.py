@@ -36,6 +36,13 @@ from niceml.utilities.readwritelock import FileLock
             "Otherwise only `prediction_steps` are evaluated.",
         ),
         model_loader=HydraInitField(ModelLoader),
+        exported_model_name=Field(
+            Noneable(str),
+            default_value=None,
+            description="If None the model of the experiment is predicted. "
+            "Otherwise the model with this name in the exported models folder "
+            "(see op `export_model`) is loaded.",
+        ),
         prediction_function=HydraInitField(PredictionFunction),
         remove_key_list=Field(
             list,
@@ -65,7 +72,13 @@ def prediction(
     )
 
     exp_data: ExperimentData = create_expdata_from_expcontext(exp_context)
-    model_path: str = exp_data.get_model_path(relative_path=True)
+    if instantiated_op_config["exported_model_name"] is None:
+        model_path: str = exp_data.get_model_path(relative_path=True)
+    else:
+        model_path = join(
+            ExperimentFilenames.EXPORTED_MODELS_FOLDER,
+            instantiated_op_config["exported_model_name"],
+        )
     model_loader: ModelLoader = instantiated_op_config["model_loader"]
     with open_location(exp_context.fs_config) as (exp_fs, exp_root):
         model = model_loader(
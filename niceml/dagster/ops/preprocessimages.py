@@ -0,0 +1,38 @@
+"""Module for the preprocess_images op"""
+import json
+
+from attrs import asdict
+from hydra.utils import ConvertMode, instantiate
+
+from niceml.config.hydra import HydraInitField
+from niceml.filechecksumprocessors.filechecksumprocessor import FileChecksumProcessor
+from niceml.utilities.fsspec.locationutils import LocationConfig
+from dagster import Field, OpExecutionContext, op
+
+
+@op(
+    config_schema={
+        "processor": HydraInitField(
+            FileChecksumProcessor,
+            description="Processor which resizes and reencodes the images",
+        ),
+        "force": Field(
+            bool,
+            default_value=False,
+            description="Flag if all files are processed, even if they did not change",
+        ),
+    }
+)
+def preprocess_images(context: OpExecutionContext) -> dict:
+    """Resizes and reencodes an image folder once with a checksum based processor
+    (e.g. the ImagePreprocessingProcessor). Reruns only process changed files.
+    Returns the location of the preprocessed files."""
+    op_config = json.loads(json.dumps(context.op_config))
+    instantiated_op_config = instantiate(op_config, _convert_=ConvertMode.ALL)
+    processor: FileChecksumProcessor = instantiated_op_config["processor"]
+    processor.run_process(force=instantiated_op_config["force"])
+
+    output_location = processor.output_location
+    if isinstance(output_location, LocationConfig):
+        output_location = asdict(output_location)
+    return output_location
@@ -0,0 +1,127 @@
+"""Module for the write_shards op"""
+import json
+from typing import List, Union
+
+from attrs import asdict
+from hydra.utils import ConvertMode, instantiate
+from tqdm import tqdm
+
+from niceml.config.hydra import HydraInitField
+from niceml.data.datadescriptions.datadescription import DataDescription
+from niceml.data.datainfolistings.datainfolisting import DataInfoListing
+from niceml.data.datainfos.datainfo import DataInfo
+from niceml.utilities.fsspec.locationutils import (
+    LocationConfig,
+    join_fs_path,
+    join_location_w_path,
+    open_location,
+)
+from niceml.utilities.ioutils import write_json
+from niceml.utilities.shardutils import (
+    SHARD_INDEX_FILENAME,
+    ShardSample,
+    get_shard_name,
+    read_sample_files,
+    write_shard,
+)
+from niceml.utilities.splitutils import clear_folder
+from dagster import Field, OpExecutionContext, op
+
+
+@op(
+    config_schema={
+        "data_description": HydraInitField(DataDescription),
+        "datainfo_listing": HydraInitField(
+            DataInfoListing, description="Lists the samples to write into the shards"
+        ),
+        "output_location": Field(
+            dict, description="Location where the shards and the index are stored"
+        ),
+        "sub_dir": Field(
+            str, default_value="", description="Subdirectory to save the shards"
+        ),
+        "samples_per_shard": Field(
+            int, default_value=1000, description="Number of samples in one shard"
+        ),
+        "clear_folder": Field(
+            bool,
+            default_value=False,
+            description="Flag if the output folder should be cleared before writing",
+        ),
+    }
+)
+def write_shards(context: OpExecutionContext) -> dict:
+    """Packs the samples of a DataInfoListing into tar shards with an index,
+    which can be read with the ShardDataInfoListing and the ShardDataLoader"""
+    op_config = json.loads(json.dumps(context.op_config))
+    instantiated_op_config = instantiate(op_config, _convert_=ConvertMode.ALL)
+
+    output_location: Union[dict, LocationConfig] = instantiated_op_config[
+        "output_location"
+    ]
+    if len(instantiated_op_config["sub_dir"]) > 0:
+        output_location = join_location_w_path(
+            output_location, instantiated_op_config["sub_dir"]
+        )
+    if instantiated_op_config["clear_folder"]:
+        clear_folder(output_location)
+
+    datainfo_listing: DataInfoListing = instantiated_op_config["datainfo_listing"]
+    data_info_list: List[DataInfo] = datainfo_listing.list(
+        instantiated_op_config["data_description"]
+    )
+    shard_index = write_shard_files(
+        data_info_list, output_location, instantiated_op_config["samples_per_shard"]
+    )
+    context.log.info(
+        f"Wrote {len(data_info_list)} samples into {len(shard_index['shards'])} shards"
+    )
+
+    if isinstance(output_location, LocationConfig):
+        output_location = asdict(output_location)
+    return output_location
+
+
+def write_shard_files(
+    data_info_list: List[DataInfo],
+    output_location: Union[dict, LocationConfig],
+    samples_per_shard: int,
+) -> dict:
+    """
+    Writes the samples of the data infos into shards and writes the shard index
+
+    Args:
+        data_info_list: Data infos of the samples to write
+        output_location: Location to write the shards and the index to
+        samples_per_shard: Number of samples in one shard
+
+    Returns:
+        The shard index
+    """
+    shard_dicts: List[dict] = []
+    with open_location(output_location) as (output_fs, output_root):
+        output_fs.makedirs(output_root, exist_ok=True)
+        for shard_idx, start_idx in enumerate(
+            tqdm(range(0, len(data_info_list), samples_per_shard))
+        ):
+            samples: List[ShardSample] = [
+                read_sample_files(data_info, key=f"{sample_idx:09d}")
+                for sample_idx, data_info in enumerate(
+                    data_info_list[start_idx : start_idx + samples_per_shard],
+                    start=start_idx,
+                )
+            ]
+            shard_name = get_shard_name(shard_idx)
+            write_shard(
+                samples, join_fs_path(output_fs, output_root, shard_name), output_fs
+            )
+            shard_dicts.append(
+                dict(name=shard_name, samples=[x.to_dict() for x in samples])
+            )
+        shard_index = dict(shards=shard_dicts)
+        write_json(
+            shard_index,
+            join_fs_path(output_fs, output_root, SHARD_INDEX_FILENAME),
+            file_system=output_fs,
+        )
+    return shard_index
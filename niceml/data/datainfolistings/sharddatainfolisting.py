@@ -0,0 +1,49 @@
+"""Module for ShardDataInfoListing"""
+from typing import List, Union
+
+from niceml.data.datadescriptions.datadescription import DataDescription
+from niceml.data.datainfolistings.datainfolisting import DataInfoListing
+from niceml.data.datainfos.datainfo import DataInfo
+from niceml.utilities.fsspec.locationutils import LocationConfig, join_location_w_path
+from niceml.utilities.shardutils import (
+    data_info_from_dict,
+    get_shard_memory_root,
+    read_shard_index,
+    relocate_data_info,
+)
+
+
+class ShardDataInfoListing(DataInfoListing):  # pylint: disable=too-few-public-methods
+    """Lists the data infos of a sharded dataset (see the op `write_shards`).
+    Only the shard index is read. The data infos are returned in shard order and
+    their locations point to the in memory filesystem, where the ShardDataLoader
+    extracts the shards to."""
+
+    def __init__(self, location: Union[dict, LocationConfig], sub_dir: str = ""):
+        """
+        Init method of the ShardDataInfoListing
+        Args:
+            location: Location of the sharded dataset
+            sub_dir: Subdirectory of the location containing the shards
+        """
+        self.location = location
+        self.sub_dir = sub_dir
+
+    def get_shard_location(self) -> Union[dict, LocationConfig]:
+        """Returns the location of the shards and the shard index"""
+        if len(self.sub_dir) > 0:
+            return join_location_w_path(self.location, self.sub_dir)
+        return self.location
+
+    def list(self, data_description: DataDescription) -> List[DataInfo]:
+        """Lists all data infos of the shard index"""
+        shard_location = self.get_shard_location()
+        memory_root = get_shard_memory_root(shard_location)
+        shard_index = read_shard_index(shard_location)
+        return [
+            relocate_data_info(
+                data_info_from_dict(sample_dict), memory_root, shard_dict["name"]
+            )
+            for shard_dict in shard_index["shards"]
+            for sample_dict in shard_dict["samples"]
+        ]
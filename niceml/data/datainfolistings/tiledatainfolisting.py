@@ -0,0 +1,71 @@
+"""Module for TileDataInfoListing"""
+from typing import List, Optional
+
+from niceml.data.datadescriptions.datadescription import DataDescription
+from niceml.data.datadescriptions.inputdatadescriptions import InputImageDataDescription
+from niceml.data.datainfolistings.datainfolisting import DataInfoListing
+from niceml.data.datainfos.imagedatainfo import ImageDataInfo
+from niceml.data.datainfos.tiledatainfo import TileDataInfo
+from niceml.utilities.commonutils import check_instance
+from niceml.utilities.fsspec.locationutils import open_location
+from niceml.utilities.imageloading import load_image_size
+from niceml.utilities.imagesize import ImageSize
+from niceml.utilities.imagetiling import get_tile_positions
+
+
+class TileDataInfoListing(DataInfoListing):  # pylint: disable=too-few-public-methods
+    """Splits the images of a wrapped listing into overlapping tiles, so large
+    images are predicted at full resolution instead of being resized to the
+    input size. Each tile is listed as own data info (see `TileDataInfo`) and
+    the tiles of an image are listed consecutively. Only the image headers are
+    read to get the image sizes."""
+
+    def __init__(
+        self,
+        datainfo_listing: DataInfoListing,
+        overlap: int = 64,
+        tile_size: Optional[ImageSize] = None,
+    ):
+        """
+        Init method of the TileDataInfoListing
+        Args:
+            datainfo_listing: Listing of the image data infos (e.g. ObjDetDataInfoListing)
+            overlap: Minimum number of pixels which neighbouring tiles share
+            tile_size: Size of the tiles; default = input image size of
+                the data description
+        """
+        self.datainfo_listing = datainfo_listing
+        self.overlap = overlap
+        self.tile_size = tile_size
+
+    def list(self, data_description: DataDescription) -> List[TileDataInfo]:
+        """Lists the tiles of all data infos of the wrapped listing"""
+        tile_size = self.tile_size
+        if tile_size is None:
+            input_dd: InputImageDataDescription = check_instance(
+                data_description, InputImageDataDescription
+            )
+            tile_size = input_dd.get_input_image_size()
+        tile_infos: List[TileDataInfo] = []
+        for data_info in self.datainfo_listing.list(data_description):
+            image_data_info: ImageDataInfo = check_instance(data_info, ImageDataInfo)
+            with open_location(image_data_info.image_location) as (
+                image_fs,
+                image_path,
+            ):
+                image_size = load_image_size(image_path, file_system=image_fs)
+            tile_positions = get_tile_positions(image_size, tile_size, self.overlap)
+            tile_infos += [
+                TileDataInfo(
+                    data_info=image_data_info,
+                    tile_index=tile_idx,
+                    tile_count=len(tile_positions),
+                    x_pos=int(x_pos),
+                    y_pos=int(y_pos),
+                    tile_size=tile_size,
+                    image_size=image_size,
+                    overlap=self.overlap,
+                )
+                for tile_idx, (x_pos, y_pos) in enumerate(tile_positions)
+            ]
+        return tile_infos
@@ -0,0 +1,41 @@
+"""Module for TileDataInfo"""
+from dataclasses import dataclass
+
+from niceml.data.datainfos.datainfo import DataInfo
+from niceml.utilities.imagesize import ImageSize
+
+TILE_IDENTIFIER_SEPARATOR = "#tile_"
+
+
+@dataclass
+class TileDataInfo(DataInfo):
+    """Data info of one tile of an image. The wrapped data info describes the
+    whole image and the tile is the area of `tile_size` at (x_pos, y_pos)."""
+
+    data_info: DataInfo
+    tile_index: int
+    tile_count: int
+    x_pos: int
+    y_pos: int
+    tile_size: ImageSize
+    image_size: ImageSize
+    overlap: int
+
+    def get_identifier(self) -> str:
+        """Returns the identifier of the image with the tile index"""
+        return (
+            f"{self.get_image_identifier()}"
+            f"{TILE_IDENTIFIER_SEPARATOR}{self.tile_index:04d}"
+        )
+
+    def get_image_identifier(self) -> str:
+        """Returns the identifier of the whole image"""
+        return self.data_info.get_identifier()
+
+    def get_info_dict(self) -> dict:
+        """Returns the info dict of the image with the tile position"""
+        info_dict = self.data_info.get_info_dict()
+        info_dict.update(
+            tile_index=self.tile_index, tile_x_pos=self.x_pos, tile_y_pos=self.y_pos
+        )
+        return info_dict
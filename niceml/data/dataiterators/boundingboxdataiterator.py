@@ -1,14 +1,15 @@
 """Module containing BoundingBoxIterator"""
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
-import cattr
 import numpy as np
+import pandas as pd
+from attrs import fields
+from fsspec.implementations.local import LocalFileSystem
+
 from niceml.mlcomponents.resultanalyzers.tensors.tensordataiterators import (
     TensordataIterator,
 )
-from fsspec.implementations.local import LocalFileSystem
-
 from niceml.utilities.boundingboxes.boundingbox import BoundingBox
 from niceml.utilities.ioutils import read_parquet
 
@@ -29,51 +30,88 @@ class ObjDetPredictionContainer:
         return combined_array
 
 
+@dataclass
+class ObjDetPredictionArrays:
+    """Numpy-native container with all predictions of one image"""
+
+    boxes_xywh: np.ndarray
+    class_predictions: np.ndarray
+
+    def __len__(self) -> int:
+        """Returns the number of predictions"""
+        return len(self.boxes_xywh)
+
+    def to_array(self) -> np.ndarray:
+        """Returns the boxes and class predictions as one array"""
+        return np.concatenate([self.boxes_xywh, self.class_predictions], axis=1)
+
+    def to_containers(self) -> List[ObjDetPredictionContainer]:
+        """Creates one ObjDetPredictionContainer per prediction"""
+        return [
+            ObjDetPredictionContainer(
+                bounding_box=BoundingBox(*box_xywh),
+                class_predictions=class_predictions,
+            )
+            for box_xywh, class_predictions in zip(
+                self.boxes_xywh.tolist(), self.class_predictions
+            )
+        ]
+
+
 class BoundingBoxIterator(TensordataIterator):
-    """Iterator for iterating over prediction data"""
+    """Iterator for iterating over prediction data. The predictions are
+    sorted by identifier once when opened, so each lookup only slices
+    precomputed arrays."""
 
     def __init__(self, parq_extension: str = ".parq"):
         self.parq_extension = parq_extension
         self.target_cols_prefix = "pred"
         self.data = None
         self.keys = None
+        self.boxes_xywh: Optional[np.ndarray] = None
+        self.class_predictions: Optional[np.ndarray] = None
+        self.detection_indexes: Optional[np.ndarray] = None
+        self.key_offsets: Optional[Dict[str, Tuple[int, int]]] = None
 
     def open(self, path: str, file_system=None):
         file_system = file_system or LocalFileSystem()
-        self.data = read_parquet(path + self.parq_extension, file_system=file_system)
-        self.keys = list(self.data.iloc[:, 0].unique())
+        data = read_parquet(path + self.parq_extension, file_system=file_system)
+        key_codes, keys = pd.factorize(data.iloc[:, 0])
+        sorted_idxes = np.argsort(key_codes, kind="stable")
+        self.data = data.iloc[sorted_idxes].reset_index(drop=True)
+        self.keys = list(keys)
+
+        key_ends = np.cumsum(np.bincount(key_codes, minlength=len(keys)))
+        key_starts = key_ends - np.bincount(key_codes, minlength=len(keys))
+        self.key_offsets = {
+            key: (int(key_start), int(key_end))
+            for key, key_start, key_end in zip(self.keys, key_starts, key_ends)
+        }
+        box_cols = [box_field.name for box_field in fields(BoundingBox)]
+        class_prediction_cols = [
+            x for x in self.data.columns if x.startswith(self.target_cols_prefix)
+        ]
+        self.boxes_xywh = self.data[box_cols].to_numpy(dtype=np.float64)
+        self.class_predictions = self.data[class_prediction_cols].to_numpy()
+        self.detection_indexes = self.data[DETECTION_INDEX_COLUMN_NAME].to_numpy()
 
     def __iter__(self):
         if self.keys is None:
             raise Exception("Keys is None. open method needs to be called fist.")
         return iter(self.keys)
 
-    def __getitem__(self, data_key: str) -> List[ObjDetPredictionContainer]:
-        if self.data is None:
+    def get_arrays(self, data_key: str) -> ObjDetPredictionArrays:
+        """Returns the predictions of one identifier as arrays without
+        creating BoundingBox objects"""
+        if self.key_offsets is None:
             raise Exception("Data is None. open method needs to be called fist.")
-        prediction_container_list = []
-        filtered_data = self.data[self.data.iloc[:, 0] == data_key]
-
-        if (
-            filtered_data[DETECTION_INDEX_COLUMN_NAME].iloc[0]
-            == NO_PREDICTIONS_DETECTION_VALUE
-        ):
-            return []
-
-        bounding_box_list = [
-            cattr.structure(row, BoundingBox) for _, row in filtered_data.iterrows()
-        ]
-        class_prediction_cols = [
-            x for x in self.data.columns if x.startswith(self.target_cols_prefix)
-        ]
-        class_predictions_array = filtered_data[class_prediction_cols].to_numpy()
+        key_start, key_end = self.key_offsets[data_key]
+        if self.detection_indexes[key_start] == NO_PREDICTIONS_DETECTION_VALUE:
+            key_end = key_start
+        return ObjDetPredictionArrays(
+            boxes_xywh=self.boxes_xywh[key_start:key_end],
+            class_predictions=self.class_predictions[key_start:key_end],
+        )
 
-        for bounding_box, class_predictions in zip(
-            bounding_box_list, class_predictions_array
-        ):
-            prediction_container = ObjDetPredictionContainer(
-                bounding_box=bounding_box,
-                class_predictions=class_predictions,
-            )
-            prediction_container_list.append(prediction_container)
-        return prediction_container_list
+    def __getitem__(self, data_key: str) -> List[ObjDetPredictionContainer]:
+        return self.get_arrays(data_key).to_containers()
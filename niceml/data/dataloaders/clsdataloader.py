@@ -3,6 +3,7 @@ from niceml.data.datadescriptions.inputdatadescriptions import InputImageDataDes
 from niceml.data.datainfos.clsdatainfo import ClsData, ClsDataInfo
 from niceml.data.dataloaders.dataloader import DataLoader
 from niceml.utilities.commonutils import check_instance
+from niceml.utilities.fsspec.locationutils import open_location
 from niceml.utilities.imageloading import load_img_uint8
 
 
@@ -14,10 +15,12 @@ class ClsDataLoader(DataLoader):
         input_data_description: InputImageDataDescription = check_instance(
             self.data_description, InputImageDataDescription
         )
-        image = load_img_uint8(
-            data_info.image_location,
-            target_image_size=input_data_description.get_input_image_size(),
-        )
+        with open_location(data_info.image_location) as (image_fs, image_path):
+            image = load_img_uint8(
+                image_path,
+                file_system=image_fs,
+                target_image_size=input_data_description.get_input_image_size(),
+            )
         return ClsData(
             identifier=data_info.get_identifier(),
             image=image,
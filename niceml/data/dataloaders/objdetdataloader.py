@@ -10,6 +10,16 @@ from niceml.utilities.imageloading import load_img_uint8
 class ObjDetDataLoader(DataLoader):
     """DataLoader for ObjDetDataLoader"""
 
+    def __init__(self, resize_to_input_size: bool = True):
+        """
+        Init method of the ObjDetDataLoader
+        Args:
+            resize_to_input_size: Whether the images are resized to the input
+                image size. Disable it to load the full resolution (e.g. for tiling).
+        """
+        super().__init__()
+        self.resize_to_input_size = resize_to_input_size
+
     def load_data(self, data_info: ObjDetDataInfo) -> ObjDetData:
         """Loads and returns object detection data (ObjDetData)"""
         input_data_description: InputImageDataDescription = check_instance(
@@ -19,7 +29,9 @@ class ObjDetDataLoader(DataLoader):
             image = load_img_uint8(
                 image_path,
                 file_system=image_fs,
-                target_image_size=input_data_description.get_input_image_size(),
+                target_image_size=input_data_description.get_input_image_size()
+                if self.resize_to_input_size
+                else None,
             )
 
         return ObjDetData(image=image, labels=data_info.labels)
@@ -12,6 +12,16 @@ from niceml.utilities.imageloading import load_img_uint8
 class SemSegDataLoader(DataLoader):
     """Implementation of SemSegDataLoader"""
 
+    def __init__(self, resize_to_input_size: bool = True):
+        """
+        Init method of the SemSegDataLoader
+        Args:
+            resize_to_input_size: Whether the images and masks are resized to the
+                input image size. Disable it to load the full resolution (e.g. for tiling).
+        """
+        super().__init__()
+        self.resize_to_input_size = resize_to_input_size
+
     def load_data(self, data_info: SemSegDataInfo) -> SemSegData:
         """
         Takes a SemSegDataInfo object as input, which contains all the information needed to load
@@ -30,17 +40,20 @@ class SemSegDataLoader(DataLoader):
         )
 
         class_lut = semseg_dd.get_class_idx_lut()
+        target_image_size = (
+            semseg_dd.get_input_image_size() if self.resize_to_input_size else None
+        )
         with open_location(data_info.image_location) as (image_fs, image_path):
             image = load_img_uint8(
                 image_path,
                 file_system=image_fs,
-                target_image_size=semseg_dd.get_input_image_size(),
+                target_image_size=target_image_size,
             )
         with open_location(data_info.mask_location) as (mask_fs, mask_path):
             mask_image = load_img_uint8(
                 mask_path,
                 file_system=mask_fs,
-                target_image_size=semseg_dd.get_input_image_size(),
+                target_image_size=target_image_size,
             )
 
         mask_image = transform_mask_image(mask_image, class_lut)
@@ -0,0 +1,152 @@
+"""Module for ShardDataLoader"""
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+from typing import Any, Union
+
+from fsspec.implementations.memory import MemoryFileSystem
+
+from niceml.data.datadescriptions.datadescription import DataDescription
+from niceml.data.datainfos.datainfo import DataInfo
+from niceml.data.dataloaders.dataloader import DataLoader
+from niceml.utilities.fsspec.locationutils import (
+    LocationConfig,
+    join_fs_path,
+    join_location_w_path,
+    open_location,
+)
+from niceml.utilities.shardutils import (
+    ShardFormatError,
+    get_location_field_names,
+    get_shard_memory_root,
+    read_shard,
+    split_shard_memory_uri,
+)
+
+
+class ShardDataLoader(DataLoader):
+    """DataLoader for sharded datasets listed by the ShardDataInfoListing.
+    Each shard is read with one sequential read and extracted to an in memory
+    filesystem, from which the wrapped data loader loads the samples. Only the
+    `cache_size` most recently used shards are kept in memory, a shard is
+    pinned while samples are loaded from it. The lock is only held for the
+    cache access, a shard which is extracted by another thread is awaited by
+    its future, so different shards are extracted in parallel. The dataset
+    should use the ShardShuffler, otherwise almost every sample requires
+    extracting a whole shard."""
+
+    def __init__(
+        self,
+        data_loader: DataLoader,
+        location: Union[dict, LocationConfig],
+        sub_dir: str = "",
+        cache_size: int = 2,
+    ):
+        """
+        Init method of the ShardDataLoader
+        Args:
+            data_loader: Loader of the sample type (e.g. ObjDetDataLoader)
+            location: Location of the sharded dataset
+            sub_dir: Subdirectory of the location containing the shards
+            cache_size: Number of extracted shards kept in memory. Should cover
+                the shards which are accessed concurrently, e.g. by the shuffle
+                buffer. Shards which are currently read are never removed, so
+                the cache can temporarily exceed this size.
+        """
+        super().__init__()
+        self.data_loader = data_loader
+        self.shard_location = (
+            join_location_w_path(location, sub_dir) if len(sub_dir) > 0 else location
+        )
+        self.memory_root = get_shard_memory_root(self.shard_location)
+        self.cache_size = cache_size
+        self._cached_shards: "OrderedDict[str, Future]" = OrderedDict()
+        # number of loads per shard, which are currently reading from it
+        self._shard_users: "Counter[str]" = Counter()
+        self._lock = threading.Lock()
+
+    def initialize(self, data_description: DataDescription):
+        """Initializes the ShardDataLoader and the wrapped data loader"""
+        super().initialize(data_description)
+        self.data_loader.initialize(data_description)
+
+    def load_data(self, data_info: DataInfo) -> Any:
+        """Extracts the shard of the data info if required and loads the data"""
+        location_field = get_location_field_names(data_info)[0]
+        memory_root, shard_name = split_shard_memory_uri(
+            getattr(data_info, location_field)["uri"]
+        )
+        if memory_root != self.memory_root:
+            raise ShardFormatError(
+                f"Data info is not part of the shards in {self.shard_location}"
+            )
+        try:
+            self._acquire_shard(shard_name)
+            return self.data_loader.load_data(data_info)
+        finally:
+            self._release_shard(shard_name)
+
+    def _acquire_shard(self, shard_name: str):
+        """Pins the shard, so it is not removed while its samples are loaded,
+        and extracts it to memory if required. Must be followed by
+        `_release_shard`, also if an exception is raised."""
+        with self._lock:
+            shard_future = self._cached_shards.get(shard_name)
+            is_extracting = shard_future is None
+            if is_extracting:
+                shard_future = Future()
+                self._cached_shards[shard_name] = shard_future
+            else:
+                self._cached_shards.move_to_end(shard_name)
+            self._shard_users[shard_name] += 1
+            self._remove_unused_shards()
+        if not is_extracting:
+            shard_future.result()
+            return
+        try:
+            self._extract_shard(shard_name)
+        except BaseException as error:
+            with self._lock:
+                # the shard is pinned, so the entry is still the one of this thread
+                del self._cached_shards[shard_name]
+                self._remove_shard_files(shard_name)
+            shard_future.set_exception(error)
+            raise
+        shard_future.set_result(None)
+
+    def _release_shard(self, shard_name: str):
+        """Unpins the shard and removes the least recently used shards,
+        which exceed the cache size"""
+        with self._lock:
+            self._shard_users[shard_name] -= 1
+            if self._shard_users[shard_name] == 0:
+                del self._shard_users[shard_name]
+            self._remove_unused_shards()
+
+    def _extract_shard(self, shard_name: str):
+        """Reads the shard and writes its files to the memory filesystem"""
+        with open_location(self.shard_location) as (shard_fs, shard_root):
+            member_dict = read_shard(
+                join_fs_path(shard_fs, shard_root, shard_name), shard_fs
+            )
+        memory_fs = MemoryFileSystem()
+        shard_memory_path = f"{self.memory_root}/{shard_name}"
+        for member_name, content in member_dict.items():
+            memory_fs.pipe_file(f"{shard_memory_path}/{member_name}", content)
+
+    def _remove_unused_shards(self):
+        """Removes the least recently used shards, which are not pinned, until
+        the cache size is reached. Must be called with the lock held."""
+        for shard_name in list(self._cached_shards):
+            if len(self._cached_shards) <= self.cache_size:
+                return
+            if self._shard_users[shard_name] == 0:
+                del self._cached_shards[shard_name]
+                self._remove_shard_files(shard_name)
+
+    def _remove_shard_files(self, shard_name: str):
+        """Removes the extracted files of the shard from the memory filesystem"""
+        memory_fs = MemoryFileSystem()
+        shard_memory_path = f"{self.memory_root}/{shard_name}"
+        if memory_fs.exists(shard_memory_path):
+            memory_fs.rm(shard_memory_path, recursive=True)
@@ -0,0 +1,144 @@
+"""Module for TileDataLoader"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, List
+
+import numpy as np
+from attrs import evolve
+
+from niceml.data.datadescriptions.datadescription import DataDescription
+from niceml.data.datainfos.objdetdatainfo import ObjDetData
+from niceml.data.datainfos.semsegdatainfo import SemSegData
+from niceml.data.datainfos.tiledatainfo import TileDataInfo
+from niceml.data.dataloaders.dataloader import DataLoader
+from niceml.utilities.boundingboxes.bboxlabeling import ObjDetInstanceLabel
+from niceml.utilities.boundingboxes.boxarray import BoxArray
+from niceml.utilities.commonutils import check_instance
+from niceml.utilities.imagesize import ImageSize
+from niceml.utilities.imagetiling import crop_tile
+
+
+class TileDataLoader(DataLoader):
+    """DataLoader for the tiles listed by the TileDataInfoListing. The whole
+    image is loaded once at full resolution with the wrapped data loader and
+    the tiles are cropped from it. The `cache_size` most recently used images
+    are kept in memory, so consecutive tiles of an image are not loaded again."""
+
+    def __init__(self, data_loader: DataLoader, cache_size: int = 2):
+        """
+        Init method of the TileDataLoader
+        Args:
+            data_loader: Loader of the image data type, which must load the
+                full resolution (e.g. ObjDetDataLoader with
+                `resize_to_input_size=False`)
+            cache_size: Number of loaded images kept in memory. Should cover
+                the images whose tiles are loaded concurrently, otherwise
+                images are loaded more than once.
+        """
+        super().__init__()
+        self.data_loader = data_loader
+        self.cache_size = cache_size
+        self._cached_data: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def initialize(self, data_description: DataDescription):
+        """Initializes the TileDataLoader and the wrapped data loader"""
+        super().initialize(data_description)
+        self.data_loader.initialize(data_description)
+
+    def load_data(self, data_info: TileDataInfo) -> Any:
+        """Loads the image of the tile if required and crops the tile"""
+        tile_info: TileDataInfo = check_instance(data_info, TileDataInfo)
+        image_data = self._provide_image_data(tile_info)
+        if isinstance(image_data, ObjDetData):
+            return ObjDetData(
+                image=crop_tile(
+                    image_data.image,
+                    tile_info.x_pos,
+                    tile_info.y_pos,
+                    tile_info.tile_size,
+                ),
+                labels=crop_labels(
+                    image_data.labels,
+                    tile_info.x_pos,
+                    tile_info.y_pos,
+                    tile_info.tile_size,
+                ),
+            )
+        if isinstance(image_data, SemSegData):
+            return SemSegData(
+                file_id=tile_info.get_identifier(),
+                image=crop_tile(
+                    image_data.image,
+                    tile_info.x_pos,
+                    tile_info.y_pos,
+                    tile_info.tile_size,
+                ),
+                mask_image=crop_tile(
+                    image_data.mask_image,
+                    tile_info.x_pos,
+                    tile_info.y_pos,
+                    tile_info.tile_size,
+                ),
+            )
+        raise TypeError(f"Tiling of {type(image_data)} is not supported")
+
+    def _provide_image_data(self, tile_info: TileDataInfo) -> Any:
+        """Returns the cached data of the image or loads it and removes the
+        least recently used images. The lock is only held for the cache access,
+        an image which is loaded by another thread is awaited by its future,
+        so different images are loaded in parallel."""
+        image_identifier = tile_info.get_image_identifier()
+        with self._lock:
+            image_future = self._cached_data.get(image_identifier)
+            is_loading = image_future is None
+            if is_loading:
+                image_future = Future()
+                self._cached_data[image_identifier] = image_future
+                while len(self._cached_data) > self.cache_size:
+                    self._cached_data.popitem(last=False)
+            else:
+                self._cached_data.move_to_end(image_identifier)
+        if not is_loading:
+            return image_future.result()
+        try:
+            image_data = self._load_image_data(tile_info)
+        except BaseException as error:
+            with self._lock:
+                if self._cached_data.get(image_identifier) is image_future:
+                    del self._cached_data[image_identifier]
+            image_future.set_exception(error)
+            raise
+        image_future.set_result(image_data)
+        return image_data
+
+    def _load_image_data(self, tile_info: TileDataInfo) -> Any:
+        """Loads the full resolution data of the image of the tile"""
+        image_data = self.data_loader.load_data(tile_info.data_info)
+        if not tile_info.image_size.np_array_has_same_size(image_data.image):
+            raise ValueError(
+                f"The image {tile_info.get_image_identifier()} was loaded with the "
+                f"shape {image_data.image.shape} instead of the listed size "
+                f"{tile_info.image_size}. The wrapped data loader must not "
+                f"resize the images."
+            )
+        return image_data
+
+
+def crop_labels(
+    labels: List[ObjDetInstanceLabel], x_pos: int, y_pos: int, tile_size: ImageSize
+) -> List[ObjDetInstanceLabel]:
+    """Returns the labels overlapping the tile with boxes in tile coordinates,
+    which are clipped to the tile"""
+    if len(labels) == 0:
+        return []
+    tile_boxes = (
+        BoxArray.from_bounding_boxes([label.bounding_box for label in labels])
+        .shift(-x_pos, -y_pos)
+        .clip(tile_size)
+    )
+    return [
+        evolve(labels[label_idx], bounding_box=tile_boxes[label_idx])
+        for label_idx in np.flatnonzero(tile_boxes.get_absolute_area() > 0)
+    ]
@@ -54,3 +54,6 @@ class Dataset(ABC):
     @abstractmethod
     def get_data_by_key(self, data_key):
         """Returns the data by the key (identifier of the data)"""
+
+    def on_training_end(self):
+        """Is called after the training has finished"""
@@ -1,24 +1,31 @@
 """module for generic dataset implementation"""
 from abc import ABC
+from contextlib import nullcontext
+from os.path import join
 from typing import Dict, List, Optional
 
+import numpy as np
 
 from niceml.data.augmentation.augmentation import AugmentationProcessor
 from niceml.data.datadescriptions.datadescription import DataDescription
 from niceml.data.datainfolistings.datainfolisting import DataInfoListing
 from niceml.data.datainfos.datainfo import DataInfo
 from niceml.data.dataloaders.dataloader import DataLoader
+from niceml.data.dataloaders.sharddataloader import ShardDataLoader
 from niceml.data.datasets.dataset import Dataset
 from niceml.data.datashuffler.datashuffler import DataShuffler
 from niceml.data.datashuffler.defaultshuffler import DefaultDataShuffler
+from niceml.data.datashuffler.shardshuffler import ShardShuffler
 from niceml.data.datastatsgenerator.datastatsgenerator import DataStatsGenerator
 from niceml.data.datastatsgenerator.defaultstatsgenerator import DefaultStatsGenerator
 from niceml.data.netdataloggers.netdatalogger import NetDataLogger
 from niceml.experiments.experimentcontext import ExperimentContext
+from niceml.experiments.expfilenames import ExperimentFilenames
 from niceml.mlcomponents.targettransformer.targettransformer import (
     NetInputTransformer,
     NetTargetTransformer,
 )
+from niceml.utilities.stagetimer import StageTimer
 
 
 class GenericDataset(Dataset, ABC):
@@ -39,6 +46,7 @@ class GenericDataset(Dataset, ABC):
         stats_generator: Optional[DataStatsGenerator] = None,
         augmentator: Optional[AugmentationProcessor] = None,
         net_data_logger: Optional[NetDataLogger] = None,
+        stage_timer: Optional[StageTimer] = None,
     ):
         """
         Constructor of the GenericDataset
@@ -54,6 +62,8 @@ class GenericDataset(Dataset, ABC):
             stats_generator: Write dataset stats
             augmentator: Augment the data on the fly
             net_data_logger: Stores the in the way it is presented to the model
+            stage_timer: Optional timer which measures the latency of the
+                pipeline stages and writes them per epoch to the experiment
         """
         super().__init__()
         self.net_data_logger = net_data_logger
@@ -62,9 +72,12 @@ class GenericDataset(Dataset, ABC):
         self.data_loader: DataLoader = data_loader
         self.shuffle = shuffle
         self.data_shuffler: DataShuffler = data_shuffler or DefaultDataShuffler()
+        check_shard_shuffler(data_loader, self.data_shuffler, shuffle)
         self.target_transformer: NetTargetTransformer = target_transformer
         self.input_transformer: NetInputTransformer = input_transformer
         self.augmentator: Optional[AugmentationProcessor] = augmentator
+        self.stage_timer: Optional[StageTimer] = stage_timer
+        self.exp_context: Optional[ExperimentContext] = None
 
         self.data_stats_generator: DataStatsGenerator = (
             stats_generator or DefaultStatsGenerator()
@@ -75,6 +88,7 @@ class GenericDataset(Dataset, ABC):
     ):
         """Initializes the dataset with the data description and context"""
         self.data_description = data_description
+        self.exp_context = exp_context
 
         self.data_loader.initialize(data_description)
         self.data_shuffler.initialize(data_description)
@@ -83,7 +97,7 @@ class GenericDataset(Dataset, ABC):
         self.data_info_list: List[DataInfo] = self.datainfo_listing.list(
             data_description
         )
-        self.index_list: List[int] = list(range(len(self.data_info_list)))
+        self.index_list: np.ndarray = np.arange(len(self.data_info_list))
         self.data_info_dict: Dict[str, DataInfo] = {
             cur_data_info.get_identifier(): cur_data_info
             for cur_data_info in self.data_info_list
@@ -107,19 +121,48 @@ class GenericDataset(Dataset, ABC):
         """Returns the data of the item at index"""
         real_index = self.index_list[item_index]
         data_info = self.data_info_list[real_index]
-        data_item = self.data_loader.load_data(data_info)
+        with self.measure_stage("load"):
+            data_item = self.data_loader.load_data(data_info)
         if self.augmentator is not None:
-            data_item = self.augmentator(data_item)
-        net_inputs = self.input_transformer.get_net_inputs([data_item])
-        net_targets = self.target_transformer.get_net_targets([data_item])
+            with self.measure_stage("augmentation"):
+                data_item = self.augmentator(data_item)
+        with self.measure_stage("input_transformation"):
+            net_inputs = self.input_transformer.get_net_inputs([data_item])
+        with self.measure_stage("target_transformation"):
+            net_targets = self.target_transformer.get_net_targets([data_item])
         if self.net_data_logger is not None:
-            self.net_data_logger.log_data(
-                net_inputs=net_inputs,
-                net_targets=net_targets,
-                data_info_list=[data_info],
-            )
+            with self.measure_stage("net_data_logging"):
+                self.net_data_logger.log_data(
+                    net_inputs=net_inputs,
+                    net_targets=net_targets,
+                    data_info_list=[data_info],
+                )
+        if self.stage_timer is not None:
+            self.stage_timer.add_samples(1)
         return net_inputs, net_targets
 
+    def measure_stage(self, stage: str):
+        """Returns a context which measures the latency of a pipeline stage,
+        if a stage timer is configured"""
+        if self.stage_timer is None:
+            return nullcontext()
+        return self.stage_timer.measure(stage)
+
+    def write_stage_timings(self):
+        """Aggregates the stage latencies of the finished epoch and writes
+        the timings of all epochs to the experiment"""
+        if self.stage_timer is None or self.exp_context is None:
+            return
+        if len(self.stage_timer.aggregate_epoch()) == 0:
+            return
+        self.exp_context.write_parquet(
+            self.stage_timer.get_records_df(),
+            join(
+                ExperimentFilenames.DATASETS_STATS_FOLDER,
+                ExperimentFilenames.STAGE_TIMINGS.format(subset_name=self.set_name),
+            ),
+        )
+
     def get_set_name(self) -> str:
         """Returns the name of the set e.g. train"""
         return self.set_name
@@ -139,7 +182,30 @@ class GenericDataset(Dataset, ABC):
             self.data_info_list, self.index_list
         )
 
+    def on_training_end(self):
+        """Writes all pending data of the net data logger"""
+        if self.net_data_logger is not None:
+            self.net_data_logger.flush()
+
     def on_epoch_end(self):
-        """Shuffles the data if required"""
+        """Writes the stage timings and shuffles the data if required"""
+        self.write_stage_timings()
         if self.shuffle:
             self.index_list = self.data_shuffler.shuffle(self.data_info_list)
+
+
+def check_shard_shuffler(
+    data_loader: DataLoader, data_shuffler: DataShuffler, shuffle: bool
+):
+    """Raises a ValueError if a sharded dataset is shuffled without the
+    ShardShuffler, because a random order would extract a whole shard for
+    almost every sample"""
+    if (
+        shuffle
+        and isinstance(data_loader, ShardDataLoader)
+        and not isinstance(data_shuffler, ShardShuffler)
+    ):
+        raise ValueError(
+            f"The ShardDataLoader requires the ShardShuffler, but the data is "
+            f"shuffled with {type(data_shuffler).__name__}"
+        )
@@ -2,6 +2,8 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional
 
+import numpy as np
+
 from niceml.data.datadescriptions.datadescription import DataDescription
 from niceml.data.datainfos.datainfo import DataInfo
 
@@ -9,12 +11,26 @@ from niceml.data.datainfos.datainfo import DataInfo
 class DataShuffler(ABC):
     """Abstract class for data shufflers"""
 
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Base constructor of the data shufflers
+        Args:
+            seed: Seed of the random generator. Each shuffler instance (and therefore
+                each dataset) owns its own generator, which makes runs reproducible
+                if a seed is configured. If None, fresh entropy is used.
+        """
+        self.seed = seed
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+
     def initialize(self, data_description: DataDescription):
+        """Initializes the shuffler with the data description and resets the
+        random generator to the configured seed"""
         self.data_description = data_description
+        self.rng = np.random.default_rng(self.seed)
 
     @abstractmethod
     def shuffle(
         self, data_infos: List[DataInfo], batch_size: Optional[int] = None
-    ) -> List[int]:
-        """Returns a list of shuffled indexes"""
+    ) -> np.ndarray:
+        """Returns an int array of shuffled indexes"""
         pass
@@ -1,8 +1,8 @@
 """Module with default data shuffler"""
-
-from random import shuffle
 from typing import List, Optional
 
+import numpy as np
+
 from niceml.data.datainfos.datainfo import DataInfo
 from niceml.data.datashuffler.datashuffler import DataShuffler
 
@@ -12,7 +12,6 @@ class DefaultDataShuffler(DataShuffler):
 
     def shuffle(
         self, data_infos: List[DataInfo], batch_size: Optional[int] = None
-    ) -> List[int]:
-        indexes = list(range(len(data_infos)))
-        shuffle(indexes)
-        return indexes
+    ) -> np.ndarray:
+        """Returns a random permutation of all indexes"""
+        return self.rng.permutation(len(data_infos))
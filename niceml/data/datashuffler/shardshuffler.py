@@ -0,0 +1,57 @@
+"""Module for the ShardShuffler"""
+from typing import List, Optional
+
+import numpy as np
+
+from niceml.data.datainfos.datainfo import DataInfo
+from niceml.data.datashuffler.datashuffler import DataShuffler
+from niceml.utilities.shardutils import (
+    get_location_field_names,
+    split_shard_memory_uri,
+)
+
+
+class ShardShuffler(DataShuffler):
+    """Shuffler for sharded datasets. It shuffles the order of the shards and
+    the samples within a sliding window of `buffer_size` samples, similar to a
+    shuffle buffer. Therefore, the shards are still read sequentially."""
+
+    def __init__(self, buffer_size: int = 1000, seed: Optional[int] = None):
+        """
+        Init method of the ShardShuffler
+        Args:
+            buffer_size: Number of consecutive samples which are shuffled together
+            seed: Seed of the random generator of this shuffler
+        """
+        super().__init__(seed=seed)
+        self.buffer_size = buffer_size
+        self._shard_column: Optional[np.ndarray] = None
+        self._shard_column_source: Optional[List[DataInfo]] = None
+
+    def get_shard_column(self, data_infos: List[DataInfo]) -> np.ndarray:
+        """Returns the shard index of each datainfo as array"""
+        if self._shard_column is None or self._shard_column_source is not data_infos:
+            shard_names = [
+                split_shard_memory_uri(
+                    getattr(data_info, get_location_field_names(data_info)[0])["uri"]
+                )[1]
+                for data_info in data_infos
+            ]
+            self._shard_column = np.unique(shard_names, return_inverse=True)[1].reshape(
+                -1
+            )
+            self._shard_column_source = data_infos
+        return self._shard_column
+
+    def shuffle(
+        self, data_infos: List[DataInfo], batch_size: Optional[int] = None
+    ) -> np.ndarray:
+        """Returns indexes grouped by shuffled shards and shuffled within the buffer"""
+        shard_column = self.get_shard_column(data_infos)
+        if len(shard_column) == 0:
+            return np.empty(0, dtype=np.int64)
+        shard_rank = self.rng.permutation(shard_column.max() + 1)
+        shard_order = np.argsort(shard_rank[shard_column], kind="stable")
+        window_idx = np.arange(len(shard_order)) // self.buffer_size
+        buffer_order = np.lexsort((self.rng.random(len(shard_order)), window_idx))
+        return shard_order[buffer_order]
@@ -1,14 +1,12 @@
 """ Module for the UniformDistributionShuffler and helper methods"""
-from collections import defaultdict
-from random import sample, shuffle
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import numpy as np
 
 from niceml.data.datainfos.datainfo import DataInfo
 from niceml.data.datashuffler.datashuffler import DataShuffler
 
-MODE_DICT = dict(min=min, max=max, avg=np.mean)
+MODE_DICT = dict(min=np.min, max=np.max, avg=np.mean)
 
 
 class ModeNotImplementedError(Exception):
@@ -24,7 +22,7 @@ def check_mode(mode: str):
 
 
 class UniformDistributionShuffler(DataShuffler):
-    def __init__(self, class_attr: str, mode: str = "max"):
+    def __init__(self, class_attr: str, mode: str = "max", seed: Optional[int] = None):
         """
         A shuffler which generates uniform distributed indexes
 
@@ -35,24 +33,86 @@ class UniformDistributionShuffler(DataShuffler):
         mode: str
             How the target amount of each class should be calculated
             such that they are evenly distributed (max, min, avg)
+        seed: Optional[int]
+            Seed of the random generator of this shuffler
         """
+        super().__init__(seed=seed)
         check_mode(mode)
         self.class_attr = class_attr
         self.mode = mode
+        self._class_column: Optional[np.ndarray] = None
+        self._class_column_source: Optional[List[DataInfo]] = None
+
+    def get_class_column(self, data_infos: List[DataInfo]) -> np.ndarray:
+        """Returns the class of each datainfo as array. The column is only
+        extracted once per list of datainfos and reused afterwards."""
+        if self._class_column is None or self._class_column_source is not data_infos:
+            self._class_column = np.asarray(
+                [
+                    getattr(cur_data_info, self.class_attr)
+                    for cur_data_info in data_infos
+                ]
+            )
+            self._class_column_source = data_infos
+        return self._class_column
+
+    def shuffle(
+        self, data_infos: List[DataInfo], batch_size: Optional[int] = None
+    ) -> np.ndarray:
+        """Returns shuffled indexes with each class occurring equally often"""
+        class_column = self.get_class_column(data_infos)
+        return classes_to_indexes(class_column, self.mode, self.rng)
+
+
+def classes_to_indexes(
+    class_column: np.ndarray, mode: str, rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """
+    Uses the class of each sample to return uniformly distributed indexes
 
-    def shuffle(self, data_infos: List[DataInfo]) -> List[int]:
-        class_dict: Dict[str, List] = defaultdict(list)
-        for idx, cur_data_info in enumerate(data_infos):
-            cur_class = getattr(cur_data_info, self.class_attr)
-            class_dict[cur_class].append(idx)
-
-        out_list = classdict_to_indexes(class_dict, self.mode)
-        return out_list
-
+    Parameters
+    ----------
+    class_column: np.ndarray
+        Contains the class for each sample index
+    mode: str
+        How the target amount of each class should be calculated
+        such that they are evenly distributed (max, min, avg)
+    rng: Optional[np.random.Generator]
+        Random generator used for sampling and shuffling
 
-def classdict_to_indexes(class_dict: Dict[Any, List[int]], mode: str) -> List[int]:
+    Returns
+    -------
+        A shuffled int array of indexes (each index can occur multiple times)
     """
-    Uses the class dict to return a list of indexes
+    check_mode(mode)
+    rng = rng or np.random.default_rng()
+    if len(class_column) == 0:
+        return np.empty(0, dtype=np.int64)
+    _, class_ids, class_counts = np.unique(
+        class_column, return_inverse=True, return_counts=True
+    )
+    class_ids = class_ids.reshape(-1)
+    target_count = int(MODE_DICT[mode](class_counts))
+    repeats, parts = np.divmod(target_count, class_counts)
+
+    # sort the indexes by class and randomly within each class
+    grouped = np.lexsort((rng.random(len(class_ids)), class_ids))
+    grouped_class_ids = class_ids[grouped]
+    class_starts = np.cumsum(class_counts) - class_counts
+    rank_in_class = np.arange(len(grouped)) - class_starts[grouped_class_ids]
+
+    full_repeats = np.repeat(grouped, repeats[grouped_class_ids])
+    sampled_parts = grouped[rank_in_class < parts[grouped_class_ids]]
+    return rng.permutation(np.concatenate([full_repeats, sampled_parts]))
+
+
+def classdict_to_indexes(
+    class_dict: Dict[Any, List[int]],
+    mode: str,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Uses the class dict to return an array of indexes
 
     Parameters
     ----------
@@ -61,19 +121,16 @@ def classdict_to_indexes(class_dict: Dict[Any, List[int]], mode: str) -> List[in
     mode: str
         How the target amount of each class should be calculated
         such that they are evenly distributed (max, min, avg)
+    rng: Optional[np.random.Generator]
+        Random generator used for sampling and shuffling
 
     Returns
     -------
-        A shuffled list of indexes (each index can occur multiple times)
+        A shuffled int array of indexes (each index can occur multiple times)
     """
-    check_mode(mode)
-    class_count_dict = {x: len(y) for x, y in class_dict.items()}
-    cur_mode = MODE_DICT[mode]
-    max_count = int(cur_mode(list(class_count_dict.values())))
-    out_list: List[int] = []
-    for class_list in class_dict.values():
-        count, parts = divmod(max_count, len(class_list))
-        out_list += class_list * count
-        out_list += sample(class_list, parts)
-    shuffle(out_list)
-    return out_list
+    index_arrays = [np.asarray(x, dtype=np.int64) for x in class_dict.values()]
+    if len(index_arrays) == 0:
+        return np.empty(0, dtype=np.int64)
+    indexes = np.concatenate(index_arrays)
+    class_ids = np.repeat(np.arange(len(index_arrays)), [len(x) for x in index_arrays])
+    return indexes[classes_to_indexes(class_ids, mode, rng)]
@@ -0,0 +1,104 @@
+"""Module for LabelStatsGenerator"""
+from itertools import chain
+from typing import List, Optional, Union
+
+import numpy as np
+
+from niceml.data.datainfos.clsdatainfo import ClsDataInfo
+from niceml.data.datainfos.datainfo import DataInfo
+from niceml.data.datainfos.objdetdatainfo import ObjDetDataInfo
+from niceml.data.datastatsgenerator.datastatsgenerator import DataStatsGenerator
+from niceml.utilities.boundingboxes.boxarray import BoxArray
+
+
+class LabelStatsGenerator(DataStatsGenerator):
+    """Stats generator for classification and object detection data infos.
+    Besides the counts of the DefaultStatsGenerator it reports the class frequency,
+    the distribution of labels per data point and the quantiles of the bounding
+    box sizes. SemSegDataInfos only reference their mask files, therefore only
+    the counts are reported for them; their mask coverage would require to
+    load every mask."""
+
+    def __init__(self, quantiles: Optional[List[float]] = None):
+        """
+        Constructor of the LabelStatsGenerator
+        Args:
+            quantiles: Quantiles of the bounding box sizes to report
+        """
+        self.quantiles = quantiles or [0.0, 0.25, 0.5, 0.75, 1.0]
+
+    def generate_stats(
+        self, data_info_list: List[DataInfo], index_list: List[int]
+    ) -> dict:
+        """Creates stats from a data_info_list and an index list"""
+        stats = dict(data_points=len(data_info_list), used_points=len(index_list))
+        # how often each data point is used in one epoch
+        sample_weights = np.bincount(
+            np.asarray(index_list, dtype=np.int64), minlength=len(data_info_list)
+        )
+        # the labels are python objects, so one pass over the infos collects
+        # them into flat columns, everything else works on the arrays
+        labeled_indexes = [
+            data_idx
+            for data_idx, data_info in enumerate(data_info_list)
+            if isinstance(data_info, (ClsDataInfo, ObjDetDataInfo))
+        ]
+        names_per_info = [
+            get_class_names(data_info_list[data_idx]) for data_idx in labeled_indexes
+        ]
+        label_counts = np.fromiter(
+            map(len, names_per_info), dtype=np.int64, count=len(names_per_info)
+        )
+        class_names = np.asarray(list(chain.from_iterable(names_per_info)))
+        boxes = BoxArray.from_bounding_boxes(
+            [
+                label.bounding_box
+                for data_idx in labeled_indexes
+                if isinstance(data_info_list[data_idx], ObjDetDataInfo)
+                for label in data_info_list[data_idx].labels
+            ]
+        ).xywh.astype(np.float64)
+
+        if len(label_counts) == 0:
+            return stats
+        label_weights = np.repeat(sample_weights[labeled_indexes], label_counts)
+        stats.update(
+            class_frequency=count_values(class_names),
+            used_class_frequency=count_values(class_names, weights=label_weights),
+            label_count_distribution=count_values(label_counts),
+        )
+        if len(boxes) > 0:
+            stats.update(
+                box_width_quantiles=get_quantiles(boxes[:, 2], self.quantiles),
+                box_height_quantiles=get_quantiles(boxes[:, 3], self.quantiles),
+                box_area_quantiles=get_quantiles(
+                    boxes[:, 2] * boxes[:, 3], self.quantiles
+                ),
+            )
+        return stats
+
+
+def get_class_names(data_info: Union[ClsDataInfo, ObjDetDataInfo]) -> List[str]:
+    """Returns the class names of all labels of a data info"""
+    if isinstance(data_info, ClsDataInfo):
+        return data_info.get_name_list()
+    return [label.class_name for label in data_info.labels]
+
+
+def count_values(values: np.ndarray, weights: Optional[np.ndarray] = None) -> dict:
+    """Counts how often each unique value occurs, optionally weighted"""
+    unique_values, inverse = np.unique(values, return_inverse=True)
+    counts = np.bincount(inverse.reshape(-1), weights=weights)
+    return {
+        unique_value.item(): int(count)
+        for unique_value, count in zip(unique_values, counts)
+    }
+
+
+def get_quantiles(values: np.ndarray, quantiles: List[float]) -> dict:
+    """Returns the given quantiles of the values as dict"""
+    quantile_values = np.quantile(values, quantiles)
+    return {
+        float(quantile): float(quantile_value)
+        for quantile, quantile_value in zip(quantiles, quantile_values)
+    }
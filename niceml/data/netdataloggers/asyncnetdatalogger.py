@@ -0,0 +1,144 @@
+"""Module for the AsyncNetDataLogger"""
+import logging
+import queue
+import threading
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from niceml.data.datainfos.datainfo import DataInfo
+from niceml.data.netdataloggers.netdatalogger import NetDataLogger
+
+
+class FullQueuePolicy(str, Enum):
+    """Defines what happens with new data if the queue of the writer is full"""
+
+    DROP = "drop"
+    BLOCK = "block"
+
+
+_STOP_SIGNAL = None
+
+
+class AsyncNetDataLogger(NetDataLogger, ABC):
+    """NetDataLogger which renders and writes the logged data in a background
+    thread. `log_data` only copies the samples which are still required and
+    pushes them onto a bounded queue. Subclasses implement `write_data`, which
+    is executed by the writer thread."""
+
+    def __init__(
+        self,
+        max_log: int,
+        queue_size: int = 8,
+        full_queue_policy: FullQueuePolicy = FullQueuePolicy.DROP,
+    ):
+        """
+        Initializes the AsyncNetDataLogger
+        Args:
+            max_log: Maximum number of samples which are logged
+            queue_size: Maximum number of batches waiting to be written
+            full_queue_policy: Whether new data is dropped or the caller
+                blocks until the queue has space again
+        """
+        super().__init__()
+        self.max_log: int = max_log
+        self.log_count: int = 0
+        self.queue_size: int = queue_size
+        self.full_queue_policy = FullQueuePolicy(full_queue_policy)
+        self._queue: Optional[queue.Queue] = None
+        self._writer_thread: Optional[threading.Thread] = None
+
+    def log_data(
+        self,
+        net_inputs: np.ndarray,
+        net_targets: np.ndarray,
+        data_info_list: List[DataInfo],
+    ):
+        """
+        Copies the samples which are still required and schedules them for writing.
+
+        Args:
+            net_inputs: Input data of a model as `np.ndarray`
+            net_targets: Target data of a model as `np.ndarray`
+            data_info_list: Associated data information of input and
+            destination with extended information
+
+        Returns:
+            None
+        """
+        if self.log_count >= self.max_log:
+            return
+        if len(net_inputs) != len(net_targets):
+            raise ValueError(
+                f"Mismatching lengths of net_inputs "
+                f"and net_targets ({len(net_inputs)}, {len(net_targets)}"
+            )
+        sample_count = min(len(data_info_list), self.max_log - self.log_count)
+        item = (
+            np.array(net_inputs[:sample_count], copy=True),
+            np.array(net_targets[:sample_count], copy=True),
+            list(data_info_list[:sample_count]),
+        )
+        self._start_writer()
+        try:
+            self._queue.put(item, block=self.full_queue_policy == FullQueuePolicy.BLOCK)
+        except queue.Full:
+            return
+        self.log_count += sample_count
+
+    @abstractmethod
+    def write_data(
+        self,
+        net_inputs: np.ndarray,
+        net_targets: np.ndarray,
+        data_info_list: List[DataInfo],
+    ):
+        """
+        Renders and writes the logged data. Is executed in the writer thread.
+
+        Args:
+            net_inputs: Copied input data of the samples to log
+            net_targets: Copied target data of the samples to log
+            data_info_list: Associated data information of the samples to log
+
+        Returns:
+            None
+        """
+
+    def flush(self):
+        """Waits until all scheduled data is written and stops the writer thread"""
+        if self._writer_thread is None:
+            return
+        self._queue.put(_STOP_SIGNAL)
+        self._writer_thread.join()
+        self._writer_thread = None
+        self._queue = None
+
+    def _start_writer(self):
+        """Starts the writer thread if it is not running"""
+        if self._writer_thread is not None:
+            return
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._writer_thread = threading.Thread(
+            target=self._write_loop,
+            args=(self._queue,),
+            name=f"{type(self).__name__}Writer",
+            daemon=True,
+        )
+        self._writer_thread.start()
+
+    def _write_loop(self, data_queue: queue.Queue):
+        """Writes the queued data until the stop signal is received"""
+        while True:
+            item: Optional[Tuple[np.ndarray, np.ndarray, List[DataInfo]]]
+            item = data_queue.get()
+            if item is _STOP_SIGNAL:
+                break
+            try:
+                self.write_data(*item)
+            except Exception:  # pylint: disable=broad-except
+                logging.getLogger(__name__).exception(
+                    "Could not write the net data of set %s", self.set_name
+                )
@@ -56,6 +56,9 @@ class NetDataLogger(ABC):
 
         """
 
+    def flush(self):
+        """Writes all pending data. Is called at the end of the training"""
+
     def _save_img(self, image: Image.Image, filename: str):
         """
         Saves an `image`
@@ -1,20 +1,27 @@
 """Module of the ObjDetNetDataLogger"""
 
 from os.path import join
-from typing import List
+from typing import List, Optional
 
 import numpy as np
 from PIL import Image
 
+from niceml.data.datadescriptions.datadescription import DataDescription
 from niceml.data.datadescriptions.outputdatadescriptions import (
     OutputObjDetDataDescription,
 )
 from niceml.data.datainfos.imagedatainfo import ImageDataInfo
 from niceml.data.datainfos.objdetdatainfo import ObjDetDataInfo
-from niceml.data.netdataloggers.netdatalogger import NetDataLogger
+from niceml.data.netdataloggers.asyncnetdatalogger import (
+    AsyncNetDataLogger,
+    FullQueuePolicy,
+)
+from niceml.experiments.experimentcontext import ExperimentContext
 from niceml.experiments.expfilenames import ExperimentFilenames
 from niceml.mlcomponents.objdet.anchorgenerator import AnchorGenerator
+from niceml.utilities.boundingboxes.bboxconversion import convert_to_ullr
 from niceml.utilities.boundingboxes.bboxdrawing import draw_bounding_box_on_image
+from niceml.utilities.boundingboxes.bboxencoding import decode_boxes
 from niceml.utilities.boundingboxes.bboxlabeling import ObjDetInstanceLabel
 from niceml.utilities.boundingboxes.boundingbox import (
     POSITIVE_MASK_VALUE,
@@ -24,26 +31,53 @@ from niceml.utilities.colorutils import Color
 from niceml.utilities.commonutils import check_instance
 
 
-class ObjDetNetDataLogger(NetDataLogger):
+class ObjDetNetDataLogger(AsyncNetDataLogger):
     """NetDataLogger for object detection"""
 
-    def __init__(self, max_log: int = 5):
-        super().__init__()
-        self.max_log: int = max_log
+    def __init__(
+        self,
+        max_log: int = 5,
+        queue_size: int = 8,
+        full_queue_policy: FullQueuePolicy = FullQueuePolicy.DROP,
+    ):
+        super().__init__(
+            max_log=max_log,
+            queue_size=queue_size,
+            full_queue_policy=full_queue_policy,
+        )
         self.anchor_generator: AnchorGenerator = AnchorGenerator()
-        self.log_count: int = 0
+        self.anchor_array: Optional[np.ndarray] = None
+
+    def initialize(
+        self,
+        data_description: DataDescription,
+        exp_context: ExperimentContext,
+        set_name: str,
+    ):
+        """Initializes the ObjDetNetDataLogger and caches the anchors as array"""
+        super().initialize(
+            data_description=data_description,
+            exp_context=exp_context,
+            set_name=set_name,
+        )
+        output_data_description = check_instance(
+            self.data_description, OutputObjDetDataDescription
+        )
+        self.anchor_array = self.anchor_generator.generate_anchor_array(
+            data_description=output_data_description
+        ).xywh
 
     # pylint: disable=too-many-locals
-    def log_data(
+    def write_data(
         self,
         net_inputs: np.ndarray,
         net_targets: np.ndarray,
         data_info_list: List[ObjDetDataInfo],
     ):
         """
-        Saves as many images with corresponding anchor boxes as defined in `self.max_log`.
-        The images are saved into `self.output_path`. For each input image,
-        the associated positively marked anchor boxes are added to the image.
+        Saves the images with corresponding anchor boxes into `self.output_path`.
+        For each input image, the associated positively marked anchor boxes
+        are added to the image.
 
         Args:
             net_inputs: Input images as `np.ndarray`
@@ -55,35 +89,23 @@ class ObjDetNetDataLogger(NetDataLogger):
         Returns:
             None
         """
-        if self.log_count >= self.max_log:
-            return
-
         output_data_description = check_instance(
             self.data_description, OutputObjDetDataDescription
         )
-
-        anchors = self.anchor_generator.generate_anchors(
-            data_description=output_data_description
-        )
-
-        if len(net_inputs) != len(net_targets):
-            raise ValueError(
-                f"Mismatching lengths of net_inputs "
-                f"and net_targets ({len(net_inputs)}, {len(net_targets)}"
-            )
+        box_variances = np.array(output_data_description.get_box_variance())
 
         for net_input, net_target, data_info in zip(
             net_inputs, net_targets, data_info_list
         ):
-            decoded_bboxes = [
-                anchor.decode(
-                    predicted_values=target[:4],
-                    box_variance=output_data_description.get_box_variance(),
-                ).get_absolute_ullr()
-                for anchor, target in zip(anchors, net_target)
-            ]
-            net_target[:, :4] = decoded_bboxes
-            positive_targets = net_target[net_target[:, 4] == POSITIVE_MASK_VALUE]
+            positive_mask = net_target[:, 4] == POSITIVE_MASK_VALUE
+            positive_targets = net_target[positive_mask]
+            positive_targets[:, :4] = convert_to_ullr(
+                decode_boxes(
+                    anchor_boxes_xywh=self.anchor_array[positive_mask],
+                    encoded_array_xywh=positive_targets[:, :4],
+                    box_variances=box_variances,
+                )
+            )
             labels = [
                 self._target_to_label(target=target) for target in positive_targets
             ]
@@ -91,11 +113,6 @@ class ObjDetNetDataLogger(NetDataLogger):
                 image=net_input, instance_labels=labels, data_info=data_info
             )
 
-            self.log_count += 1
-
-            if self.log_count >= self.max_log:
-                break
-
     def _draw_image(
         self,
         image: np.ndarray,
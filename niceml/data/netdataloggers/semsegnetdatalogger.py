@@ -9,7 +9,10 @@ from niceml.data.datadescriptions.outputdatadescriptions import (
 )
 from niceml.data.datainfos.imagedatainfo import ImageDataInfo
 from niceml.data.datainfos.semsegdatainfo import SemSegDataInfo
-from niceml.data.netdataloggers.netdatalogger import NetDataLogger
+from niceml.data.netdataloggers.asyncnetdatalogger import (
+    AsyncNetDataLogger,
+    FullQueuePolicy,
+)
 from niceml.experiments.experimentcontext import ExperimentContext
 from niceml.utilities.colorutils import get_color_array
 from niceml.utilities.imagesize import ImageSize
@@ -17,16 +20,24 @@ from niceml.utilities.semseg.semsegdrawing import draw_error_mask_on_image
 from niceml.utilities.semseg.semseginstancelabeling import SemSegInstanceLabel
 
 
-class SemSegNetDataLogger(NetDataLogger):
+class SemSegNetDataLogger(AsyncNetDataLogger):
     """NetDataLogger for semantic segmentation"""
 
-    def __init__(self, max_log: int = 10, scale: bool = True):
+    def __init__(
+        self,
+        max_log: int = 10,
+        scale: bool = True,
+        queue_size: int = 8,
+        full_queue_policy: FullQueuePolicy = FullQueuePolicy.DROP,
+    ):
         """initialize SemSegNetDataLogger parameters"""
-        super().__init__()
+        super().__init__(
+            max_log=max_log,
+            queue_size=queue_size,
+            full_queue_policy=full_queue_policy,
+        )
         self.scale: bool = scale  # If true, the masks are scaled to the image size.
         # If false the images are scaled to the mask size.
-        self.max_log: int = max_log
-        self.log_count: int = 0
         self.mask_colors: List[Tuple[int]] = []
 
     def initialize(
@@ -50,16 +61,15 @@ class SemSegNetDataLogger(NetDataLogger):
         ]
 
     # pylint: disable=too-many-locals
-    def log_data(
+    def write_data(
         self,
         net_inputs: np.ndarray,
         net_targets: np.ndarray,
         data_info_list: List[SemSegDataInfo],
     ):
         """
-        Saves as many images with corresponding masks as defined in `self.max_log`.
-        The images are saved into `self.output_path`. For each input image,
-        the associated masks are added to the image.
+        Saves the images with corresponding masks into `self.output_path`.
+        For each input image, the associated masks are added to the image.
 
         Args:
             net_inputs: Input images as `np.ndarray`
@@ -70,9 +80,6 @@ class SemSegNetDataLogger(NetDataLogger):
         Returns:
             None
         """
-        if self.log_count >= self.max_log:
-            return
-
         for net_input, net_target, data_info in zip(
             net_inputs, net_targets, data_info_list
         ):
@@ -105,9 +112,6 @@ class SemSegNetDataLogger(NetDataLogger):
                 instance_labels=instance_labels,
                 data_info=data_info,
             )
-            self.log_count += 1
-            if self.log_count >= self.max_log:
-                break
 
     def _draw_image(
         self,
@@ -42,31 +42,37 @@ class KerasGenericDataset(GenericDataset, Sequence):
         """
         start_idx = batch_index * self.batch_size
         end_idx = min(len(self.index_list), (batch_index + 1) * self.batch_size)
-        data_info_list: List[DataInfo] = []
-        for cur_idx in range(start_idx, end_idx):
-            real_index = self.index_list[cur_idx]
-            image_info = self.data_info_list[real_index]
-            data_info_list.append(image_info)
-        return data_info_list
+        return [
+            self.data_info_list[real_index]
+            for real_index in self.index_list[start_idx:end_idx]
+        ]
 
     def __getitem__(self, batch_index: int):
         """Returns the data of the batch at index"""
         cur_data_infos = self.get_datainfo(batch_index)
-        dc_list: list = [self.data_loader.load_data(x) for x in cur_data_infos]
+        with self.measure_stage("load"):
+            dc_list: list = [self.data_loader.load_data(x) for x in cur_data_infos]
         if self.augmentator is not None:
-            dc_list = [self.augmentator(x) for x in dc_list]
-        net_inputs = self.input_transformer.get_net_inputs(dc_list)
-        net_targets = self.target_transformer.get_net_targets(dc_list)
+            with self.measure_stage("augmentation"):
+                dc_list = [self.augmentator(x) for x in dc_list]
+        with self.measure_stage("input_transformation"):
+            net_inputs = self.input_transformer.get_net_inputs(dc_list)
+        with self.measure_stage("target_transformation"):
+            net_targets = self.target_transformer.get_net_targets(dc_list)
         if self.net_data_logger is not None:
-            self.net_data_logger.log_data(
-                net_inputs=net_inputs,
-                net_targets=net_targets,
-                data_info_list=cur_data_infos,
-            )
+            with self.measure_stage("net_data_logging"):
+                self.net_data_logger.log_data(
+                    net_inputs=net_inputs,
+                    net_targets=net_targets,
+                    data_info_list=cur_data_infos,
+                )
+        if self.stage_timer is not None:
+            self.stage_timer.add_samples(len(cur_data_infos))
         return net_inputs, net_targets
 
     def on_epoch_end(self):
-        """Shuffles the data if shuffle is True"""
+        """Writes the stage timings and shuffles the data if shuffle is True"""
+        self.write_stage_timings()
         if self.shuffle:
             self.index_list = self.data_shuffler.shuffle(
                 self.data_info_list, batch_size=self.batch_size
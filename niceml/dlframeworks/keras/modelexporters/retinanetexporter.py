@@ -0,0 +1,239 @@
+"""Module for exporting RetinaNet models with in-graph post-processing"""
+from tempfile import TemporaryDirectory
+from typing import Dict, List, Optional
+
+import numpy as np
+import tensorflow as tf
+from fsspec import AbstractFileSystem
+from fsspec.implementations.local import LocalFileSystem
+
+from niceml.data.datadescriptions.datadescription import DataDescription
+from niceml.data.datadescriptions.inputdatadescriptions import InputImageDataDescription
+from niceml.data.datadescriptions.outputdatadescriptions import (
+    OutputObjDetDataDescription,
+)
+from niceml.mlcomponents.modelexporter.modelexporter import ModelExporter
+from niceml.mlcomponents.objdet.anchorgenerator import AnchorGenerator
+from niceml.mlcomponents.predictionhandlers.objdetpredictionhandler import (
+    NMS_BOXES_KEY,
+    NMS_CLASSES_KEY,
+    NMS_SCORES_KEY,
+    NMS_VALID_DETECTIONS_KEY,
+)
+from niceml.utilities.commonutils import check_instance
+from niceml.utilities.ioutils import upload_directory
+
+
+def decode_box_predictions(
+    anchor_boxes_xywh: tf.Tensor, encoded_boxes: tf.Tensor, box_variances: tf.Tensor
+) -> tf.Tensor:
+    """
+    Decodes the box predictions of a batch like `decode_boxes`
+
+    Args:
+        anchor_boxes_xywh: Anchor boxes with the shape (num_anchors, 4)
+        encoded_boxes: Encoded boxes with the shape (batch_size, num_anchors, 4)
+        box_variances: Box variance to scale by with the shape (4,)
+
+    Returns:
+        Decoded boxes in x,y,width,height format with the shape of `encoded_boxes`
+    """
+    xy_pos = (
+        encoded_boxes[..., :2] * box_variances[:2] * anchor_boxes_xywh[:, 2:]
+        + anchor_boxes_xywh[:, :2]
+    )
+    sizes = (
+        tf.exp(encoded_boxes[..., 2:] * box_variances[2:]) * anchor_boxes_xywh[:, 2:]
+    )
+    return tf.concat([xy_pos, sizes], axis=-1)
+
+
+def suppress_detections(  # noqa: PLR0913
+    boxes_xywh: tf.Tensor,
+    class_scores: tf.Tensor,
+    iou_threshold: float,
+    score_threshold: float,
+    max_detections_per_class: int,
+    max_total_detections: int,
+) -> Dict[str, tf.Tensor]:
+    """
+    Applies `tf.image.combined_non_max_suppression` per class on a batch
+
+    Args:
+        boxes_xywh: Boxes with the shape (batch_size, num_anchors, 4)
+        class_scores: Class scores after sigmoid with the shape
+            (batch_size, num_anchors, num_classes)
+        iou_threshold: Boxes with a higher IoU are suppressed
+        score_threshold: Minimum score of a detection
+        max_detections_per_class: Maximum number of detections per class and image
+        max_total_detections: Maximum number of detections per image
+
+    Returns:
+        Dict with the fixed-size detections: boxes (batch_size, max_total_detections, 4)
+        in xywh format, scores and classes (batch_size, max_total_detections) and
+        the number of valid detections per image (batch_size,)
+    """
+    x_pos, y_pos, width, height = tf.unstack(boxes_xywh, axis=-1)
+    boxes_yxyx = tf.stack([y_pos, x_pos, y_pos + height, x_pos + width], axis=-1)
+    nms_result = tf.image.combined_non_max_suppression(
+        boxes_yxyx[:, :, tf.newaxis, :],
+        class_scores,
+        max_output_size_per_class=max_detections_per_class,
+        max_total_size=max_total_detections,
+        iou_threshold=iou_threshold,
+        score_threshold=score_threshold,
+        clip_boxes=False,
+    )
+    top, left, bottom, right = tf.unstack(nms_result.nmsed_boxes, axis=-1)
+    return {
+        NMS_BOXES_KEY: tf.stack([left, top, right - left, bottom - top], axis=-1),
+        NMS_SCORES_KEY: nms_result.nmsed_scores,
+        NMS_CLASSES_KEY: tf.cast(nms_result.nmsed_classes, tf.int32),
+        NMS_VALID_DETECTIONS_KEY: nms_result.valid_detections,
+    }
+
+
+class RetinaNetInferenceModule(tf.Module):
+    """Wraps a RetinaNet with decoding, sigmoid and NMS, so the module
+    returns the final detections of a batch of images"""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        model: tf.keras.Model,
+        anchor_boxes_xywh: np.ndarray,
+        box_variances: List[float],
+        coordinates_count: int,
+        iou_threshold: float,
+        score_threshold: float,
+        max_detections_per_class: int,
+        max_total_detections: int,
+        apply_sigmoid: bool = True,
+    ):
+        """
+        Constructor of the RetinaNetInferenceModule
+        Args:
+            model: RetinaNet which predicts the encoded boxes and class scores
+            anchor_boxes_xywh: Anchor boxes with the shape (num_anchors, 4)
+            box_variances: Box variance used to encode the boxes
+            coordinates_count: Number of box coordinates in the model output
+            iou_threshold: Boxes of the same class with a higher IoU are suppressed
+            score_threshold: Minimum class score of a detection
+            max_detections_per_class: Maximum number of detections per class and image
+            max_total_detections: Size of the detection output per image
+            apply_sigmoid: Whether the class predictions of the model are logits
+        """
+        super().__init__()
+        self.model = model
+        self.anchor_boxes_xywh = tf.constant(anchor_boxes_xywh, dtype=tf.float32)
+        self.box_variances = tf.constant(box_variances, dtype=tf.float32)
+        self.coordinates_count = coordinates_count
+        self.iou_threshold = iou_threshold
+        self.score_threshold = score_threshold
+        self.max_detections_per_class = max_detections_per_class
+        self.max_total_detections = max_total_detections
+        self.apply_sigmoid = apply_sigmoid
+
+    def __call__(self, images: tf.Tensor) -> Dict[str, tf.Tensor]:
+        """Predicts the detections of a batch of images"""
+        predictions = tf.cast(self.model(images, training=False), tf.float32)
+        boxes_xywh = decode_box_predictions(
+            self.anchor_boxes_xywh,
+            predictions[..., : self.coordinates_count],
+            self.box_variances,
+        )
+        class_scores = predictions[..., self.coordinates_count :]
+        if self.apply_sigmoid:
+            class_scores = tf.sigmoid(class_scores)
+        return suppress_detections(
+            boxes_xywh,
+            class_scores,
+            iou_threshold=self.iou_threshold,
+            score_threshold=self.score_threshold,
+            max_detections_per_class=self.max_detections_per_class,
+            max_total_detections=self.max_total_detections,
+        )
+
+
+class RetinaNetExporter(ModelExporter):  # pylint: disable=too-few-public-methods
+    """Exports a RetinaNet as SavedModel with anchor decoding, sigmoid and
+    `tf.image.combined_non_max_suppression` inside the graph. The serving
+    signature takes a batch of images and returns fixed-size detections,
+    which are consumed by the `ObjDetNmsPredictionHandler`."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        iou_threshold: float = 0.5,
+        score_threshold: float = 0.05,
+        max_detections_per_class: int = 100,
+        max_total_detections: int = 100,
+        apply_sigmoid: bool = True,
+    ):
+        """
+        Constructor of the RetinaNetExporter
+        Args:
+            iou_threshold: Boxes of the same class with a higher IoU are suppressed
+            score_threshold: Minimum class score of a detection
+            max_detections_per_class: Maximum number of detections per class and image
+            max_total_detections: Size of the detection output per image
+            apply_sigmoid: Whether the class predictions of the model are logits
+        """
+        self.iou_threshold = iou_threshold
+        self.score_threshold = score_threshold
+        self.max_detections_per_class = max_detections_per_class
+        self.max_total_detections = max_total_detections
+        self.apply_sigmoid = apply_sigmoid
+
+    def create_inference_module(
+        self, model: tf.keras.Model, data_description: DataDescription
+    ) -> RetinaNetInferenceModule:
+        """Wraps the model with the post-processing"""
+        output_dd: OutputObjDetDataDescription = check_instance(
+            data_description, OutputObjDetDataDescription
+        )
+        return RetinaNetInferenceModule(
+            model,
+            anchor_boxes_xywh=AnchorGenerator()
+            .generate_anchor_array(data_description=output_dd)
+            .xywh,
+            box_variances=output_dd.get_box_variance(),
+            coordinates_count=output_dd.get_coordinates_count(),
+            iou_threshold=self.iou_threshold,
+            score_threshold=self.score_threshold,
+            max_detections_per_class=self.max_detections_per_class,
+            max_total_detections=self.max_total_detections,
+            apply_sigmoid=self.apply_sigmoid,
+        )
+
+    def __call__(
+        self,
+        model: tf.keras.Model,
+        data_description: DataDescription,
+        export_path: str,
+        file_system: Optional[AbstractFileSystem] = None,
+    ):
+        """Saves the model with post-processing as SavedModel at `export_path`"""
+        input_dd: InputImageDataDescription = check_instance(
+            data_description, InputImageDataDescription
+        )
+        inference_module = self.create_inference_module(model, data_description)
+        serving_function = tf.function(
+            inference_module.__call__,
+            input_signature=[
+                tf.TensorSpec(
+                    shape=(None,)
+                    + input_dd.get_input_image_size().to_numpy_shape()
+                    + (input_dd.get_input_channel_count(),),
+                    dtype=tf.float32,
+                    name="images",
+                )
+            ],
+        )
+        inference_module.serve = serving_function
+        file_system = file_system or LocalFileSystem()
+        with TemporaryDirectory() as tmp_dir:
+            tf.saved_model.save(
+                inference_module,
+                tmp_dir,
+                signatures={"serving_default": serving_function},
+            )
+            upload_directory(tmp_dir, export_path, file_system=file_system)
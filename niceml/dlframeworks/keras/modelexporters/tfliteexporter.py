@@ -0,0 +1,104 @@
+"""Module for exporting keras models to TFLite with post-training quantization"""
+from enum import Enum
+from typing import Iterator, List, Optional
+
+import numpy as np
+import tensorflow as tf
+from fsspec import AbstractFileSystem
+from fsspec.implementations.local import LocalFileSystem
+
+from niceml.data.datadescriptions.datadescription import DataDescription
+from niceml.data.datasets.dataset import Dataset
+from niceml.experiments.experimentcontext import ExperimentContext
+from niceml.mlcomponents.modelexporter.modelexporter import ModelExporter
+from niceml.utilities.fsspec.locationutils import join_fs_path
+
+TFLITE_MODEL_FILENAME = "model.tflite"
+
+
+class TFLiteQuantization(str, Enum):
+    """Post-training quantization of the TFLite export"""
+
+    NONE = "none"
+    # weights are stored as float16 and computed as float32 on CPU
+    FLOAT16 = "float16"
+    # weights and activations are int8, calibrated with a dataset
+    INT8 = "int8"
+
+
+class TFLiteExporter(ModelExporter):
+    """Exports a keras model as TFLite flatbuffer (`model.tflite` in the export
+    folder) for CPU inference with the TFLitePredictionFunction. For the int8
+    quantization the activation ranges are calibrated on samples of the
+    `calibration_dataset`. The model input and output stay float32, so the
+    predictions can be handled like the predictions of the keras model."""
+
+    def __init__(
+        self,
+        quantization: TFLiteQuantization = TFLiteQuantization.NONE,
+        calibration_dataset: Optional[Dataset] = None,
+        calibration_sample_count: int = 100,
+        seed: Optional[int] = None,
+    ):
+        """
+        Constructor of the TFLiteExporter
+        Args:
+            quantization: Post-training quantization of the model
+            calibration_dataset: Dataset (e.g. train set) whose net inputs are
+                used to calibrate the int8 quantization
+            calibration_sample_count: Number of samples used for the calibration
+            seed: Seed of the random selection of the calibration batches
+        """
+        self.quantization = TFLiteQuantization(quantization)
+        self.calibration_dataset = calibration_dataset
+        self.calibration_sample_count = calibration_sample_count
+        self.seed = seed
+        if self.quantization == TFLiteQuantization.INT8 and calibration_dataset is None:
+            raise ValueError("The int8 quantization requires a calibration_dataset")
+
+    def initialize(
+        self, data_description: DataDescription, exp_context: ExperimentContext
+    ):
+        """Initializes the calibration dataset"""
+        if self.calibration_dataset is not None:
+            self.calibration_dataset.initialize(data_description, exp_context)
+
+    def get_calibration_samples(self) -> Iterator[List[np.ndarray]]:
+        """Yields the net inputs of single samples of randomly selected batches
+        of the calibration dataset until `calibration_sample_count` is reached"""
+        sample_count = 0
+        rng = np.random.default_rng(self.seed)
+        for batch_idx in rng.permutation(len(self.calibration_dataset)):
+            net_inputs, _ = self.calibration_dataset[int(batch_idx)]
+            for sample in np.asarray(net_inputs, dtype=np.float32):
+                if sample_count >= self.calibration_sample_count:
+                    return
+                yield [sample[np.newaxis]]
+                sample_count += 1
+
+    def convert(self, model: tf.keras.Model) -> bytes:
+        """Converts the model with the configured quantization"""
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        if self.quantization == TFLiteQuantization.FLOAT16:
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.target_spec.supported_types = [tf.float16]
+        elif self.quantization == TFLiteQuantization.INT8:
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.representative_dataset = self.get_calibration_samples
+        return converter.convert()
+
+    def __call__(
+        self,
+        model: tf.keras.Model,
+        data_description: DataDescription,
+        export_path: str,
+        file_system: Optional[AbstractFileSystem] = None,
+    ):
+        """Converts the model and writes it to the folder at `export_path`"""
+        model_content = self.convert(model)
+        file_system = file_system or LocalFileSystem()
+        file_system.makedirs(export_path, exist_ok=True)
+        with file_system.open(
+            join_fs_path(file_system, export_path, TFLITE_MODEL_FILENAME), "wb"
+        ) as model_file:
+            model_file.write(model_content)
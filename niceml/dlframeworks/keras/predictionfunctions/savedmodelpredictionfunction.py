@@ -0,0 +1,28 @@
+"""Module for SavedModelPredictionFunction"""
+from typing import Dict
+
+import numpy as np
+import tensorflow as tf
+
+from niceml.mlcomponents.predictionfunction.predictionfunction import PredictionFunction
+
+
+class SavedModelPredictionFunction(PredictionFunction):
+    """Prediction function for SavedModels loaded with the SavedModelLoader"""
+
+    def __init__(self, signature_key: str = "serving_default"):
+        """
+        Constructor of the SavedModelPredictionFunction
+        Args:
+            signature_key: Name of the serving signature to call
+        """
+        self.signature_key = signature_key
+
+    def predict(self, model, data_x) -> Dict[str, np.ndarray]:
+        """Calls the serving signature and returns its outputs as numpy arrays"""
+        serving_function = model.signatures[self.signature_key]
+        input_name = list(serving_function.structured_input_signature[1].keys())[0]
+        outputs = serving_function(
+            **{input_name: tf.convert_to_tensor(data_x, dtype=tf.float32)}
+        )
+        return {key: value.numpy() for key, value in outputs.items()}
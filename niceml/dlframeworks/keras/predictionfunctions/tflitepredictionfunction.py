@@ -0,0 +1,76 @@
+"""Module for TFLitePredictionFunction"""
+from typing import Dict, Optional, Union
+
+import numpy as np
+import tensorflow as tf
+
+from niceml.mlcomponents.predictionfunction.predictionfunction import PredictionFunction
+
+
+class TFLitePredictionFunction(PredictionFunction):
+    """Prediction function for TFLite models loaded with the TFLiteModelLoader.
+    The interpreter is created once per model and the input tensor is only
+    resized, when the batch shape changes."""
+
+    def __init__(self, num_threads: Optional[int] = None):
+        """
+        Constructor of the TFLitePredictionFunction
+        Args:
+            num_threads: Number of CPU threads of the interpreter;
+                default = decided by TFLite
+        """
+        self.num_threads = num_threads
+        self._model_content: Optional[bytes] = None
+        self._interpreter: Optional[tf.lite.Interpreter] = None
+
+    def get_interpreter(self, model_content: bytes) -> tf.lite.Interpreter:
+        """Returns the interpreter of the model and creates it if required"""
+        if self._interpreter is None or self._model_content is not model_content:
+            self._interpreter = tf.lite.Interpreter(
+                model_content=model_content, num_threads=self.num_threads
+            )
+            self._interpreter.allocate_tensors()
+            self._model_content = model_content
+        return self._interpreter
+
+    def predict(self, model: bytes, data_x) -> Union[np.ndarray, Dict[str, np.ndarray]]:
+        """Predicts a batch with the interpreter. Returns the output array or
+        a dict with the output arrays by name, if the model has multiple outputs."""
+        interpreter = self.get_interpreter(model)
+        input_details = interpreter.get_input_details()[0]
+        data_x = quantize_input(np.asarray(data_x), input_details)
+        if tuple(input_details["shape"]) != data_x.shape:
+            interpreter.resize_tensor_input(input_details["index"], data_x.shape)
+            interpreter.allocate_tensors()
+        interpreter.set_tensor(input_details["index"], data_x)
+        interpreter.invoke()
+        outputs = {
+            output_details["name"]: dequantize_output(
+                interpreter.get_tensor(output_details["index"]), output_details
+            )
+            for output_details in interpreter.get_output_details()
+        }
+        if len(outputs) == 1:
+            return next(iter(outputs.values()))
+        return outputs
+
+
+def quantize_input(data_x: np.ndarray, input_details: dict) -> np.ndarray:
+    """Converts the input to the dtype of the interpreter input and applies
+    the quantization parameters of integer inputs"""
+    scale, zero_point = input_details["quantization"]
+    input_dtype = input_details["dtype"]
+    if np.issubdtype(input_dtype, np.integer) and scale != 0:
+        dtype_info = np.iinfo(input_dtype)
+        data_x = np.clip(
+            np.round(data_x / scale + zero_point), dtype_info.min, dtype_info.max
+        )
+    return data_x.astype(input_dtype, copy=False)
+
+
+def dequantize_output(output: np.ndarray, output_details: dict) -> np.ndarray:
+    """Converts quantized integer outputs to float32"""
+    scale, zero_point = output_details["quantization"]
+    if np.issubdtype(output.dtype, np.integer) and scale != 0:
+        return (output.astype(np.float32) - zero_point) * scale
+    return output
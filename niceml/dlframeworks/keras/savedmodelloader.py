@@ -0,0 +1,26 @@
+"""Module for SavedModelLoader"""
+from tempfile import TemporaryDirectory
+from typing import Any, Optional
+
+import tensorflow as tf
+from fsspec import AbstractFileSystem
+from fsspec.implementations.local import LocalFileSystem
+
+from niceml.mlcomponents.modelloader.modelloader import ModelLoader
+from niceml.utilities.ioutils import download_directory
+
+
+class SavedModelLoader(ModelLoader):  # pylint: disable=too-few-public-methods
+    """Loads an exported TensorFlow SavedModel (e.g. from the RetinaNetExporter)"""
+
+    def __call__(
+        self,
+        model_path: str,
+        file_system: Optional[AbstractFileSystem] = None,
+    ) -> Any:
+        """Loads the SavedModel in the directory at the given path"""
+        file_system = file_system or LocalFileSystem()
+        with TemporaryDirectory() as tmp_dir:
+            download_directory(model_path, tmp_dir, file_system=file_system)
+            model = tf.saved_model.load(tmp_dir)
+        return model
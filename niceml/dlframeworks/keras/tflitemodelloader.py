@@ -0,0 +1,29 @@
+"""Module for TFLiteModelLoader"""
+from typing import Optional
+
+from fsspec import AbstractFileSystem
+from fsspec.implementations.local import LocalFileSystem
+
+from niceml.dlframeworks.keras.modelexporters.tfliteexporter import (
+    TFLITE_MODEL_FILENAME,
+)
+from niceml.mlcomponents.modelloader.modelloader import ModelLoader
+from niceml.utilities.fsspec.locationutils import join_fs_path
+
+
+class TFLiteModelLoader(ModelLoader):  # pylint: disable=too-few-public-methods
+    """Loads a TFLite model exported with the TFLiteExporter. The model is
+    returned as flatbuffer content, which the TFLitePredictionFunction
+    runs with the TFLite interpreter."""
+
+    def __call__(
+        self,
+        model_path: str,
+        file_system: Optional[AbstractFileSystem] = None,
+    ) -> bytes:
+        """Reads the TFLite file or the TFLite file in the export folder at the path"""
+        file_system = file_system or LocalFileSystem()
+        if not model_path.endswith(".tflite"):
+            model_path = join_fs_path(file_system, model_path, TFLITE_MODEL_FILENAME)
+        with file_system.open(model_path, "rb") as model_file:
+            return model_file.read()
@@ -11,6 +11,7 @@ class ExperimentFilenames:  # pylint: disable=too-few-public-methods
 
     CONFIGS_FOLDER: str = "configs"
     MODELS_FOLDER: str = "models"
+    EXPORTED_MODELS_FOLDER: str = "exported_models"
     EXP_INFO: str = "experiment_info.yaml"
     DATA_DESCRIPTION: str = "data_description.yaml"
     EXP_TESTS: str = "exp_tests.csv"
@@ -21,8 +22,10 @@ class ExperimentFilenames:  # pylint: disable=too-few-public-methods
     CUSTOM_LOAD_OBJECTS: str = "model_load_custom_objects.yaml"
     ANALYSIS_FILE: str = "result_{subset_name}.yaml"
     ANALYSIS_FOLDER: str = "analysis"
+    PR_CURVES: str = "pr_curves_{subset_name}.parq"
     EPOCHS_FORMATTING: str = "ep{epoch:03d}"
     DATASETS_STATS_FOLDER: str = "datasetsstats"
+    STAGE_TIMINGS: str = "stage_timings_{subset_name}.parq"
     PREDICTION_FOLDER: str = "predictions"
     EXTERNAL_INFOS: str = "external_infos"
     NET_DATA_FOLDER: str = "net_data"
@@ -39,6 +42,7 @@ class OpNames(str, Enum):
     OP_ANALYSIS = "analysis"
     OP_PREDICTION = "prediction"
     OP_EXPERIMENT = "experiment"
+    OP_EXPORT_MODEL = "export_model"
 
 
 def filter_for_exp_info_files(file_list: List[str]) -> List[str]:
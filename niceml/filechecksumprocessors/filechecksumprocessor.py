@@ -130,6 +130,8 @@ class FileChecksumProcessor(ABC):
             output_file_list=output_file_list,
             checksum_dict=checksum_dict,
         )
+        # keeps the checksums of unchanged files, which are not processed again
+        self.lock_data = deep_update(self.lock_data, checksum_dict)
 
         changed_files_dict = (
             self.find_changed_files(  # TODO right place or better in line 82
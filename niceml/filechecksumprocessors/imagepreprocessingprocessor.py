@@ -0,0 +1,361 @@
+"""Module for implementation of ImagePreprocessingProcessor"""
+import hashlib
+import io
+import json
+from collections import defaultdict
+from os.path import basename, splitext
+from typing import Dict, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+from attrs import asdict
+from PIL import Image
+
+from niceml.data.datadescriptions.inputdatadescriptions import (
+    InputImageDataDescription,
+)
+from niceml.filechecksumprocessors.filechecksumprocessor import FileChecksumProcessor
+from niceml.utilities.boundingboxes.bboxlabeling import ObjDetImageLabel
+from niceml.utilities.boundingboxes.boundingbox import BoundingBox
+from niceml.utilities.fsspec.locationutils import (
+    LocationConfig,
+    join_fs_path,
+    open_location,
+)
+from niceml.utilities.imagesize import ImageSize
+from niceml.utilities.ioutils import list_dir
+from niceml.utilities.splitutils import clear_folder
+
+MASK_FORMAT = ".png"
+# image modes which can be encoded as jpeg
+JPEG_MODES = ["1", "L", "RGB", "CMYK"]
+
+
+class ImagePreprocessingProcessor(FileChecksumProcessor):
+    """Implementation of a FileChecksumProcessor which resizes the images of a
+    folder once to the input size of a model. Images are resized linearly,
+    masks with nearest neighbour interpolation and the bounding boxes of json
+    labels are rescaled accordingly. The images are reencoded to a fast
+    decoding format and masks are stored losslessly as png."""
+
+    # ruff: noqa: PLR0913
+    def __init__(
+        self,
+        input_location: Union[dict, LocationConfig],
+        output_location: Union[dict, LocationConfig],
+        lockfile_location: Union[dict, LocationConfig],
+        data_description: InputImageDataDescription,
+        lock_file_name: str = "lock.yaml",
+        debug: bool = False,
+        process_count: int = 8,
+        batch_size: int = 16,
+        image_format: str = ".jpg",
+        jpeg_quality: int = 95,
+        mask_suffix: str = "_mask",
+        label_suffix: str = ".json",
+        image_suffixes: Optional[List[str]] = None,
+        clear: bool = False,
+    ):
+        """
+        FileChecksumProcessor that resizes and reencodes images, masks and labels.
+        Args:
+            input_location: Input location of the Processor
+            output_location: Output location of the Processor. Should not
+                contain the lockfile, because files which are not created
+                by the processor are removed
+            lockfile_location: Location of the checksum lockfile
+            data_description: Data description which defines the target image size
+            debug: Flag to activate the debug mode
+            process_count: Amount of processes for parallel execution
+            batch_size: Size of a batch
+            image_format: File extension of the format to reencode the images to
+            jpeg_quality: Quality of the images if they are stored as jpeg
+            mask_suffix: Suffix of the mask files, which are resized with
+                nearest neighbour interpolation and stored as png
+            label_suffix: Suffix of the label files with bounding boxes
+            image_suffixes: Suffixes of the image and mask files to process
+            clear: Flag to clear the output location when initialize the Processor
+        """
+        super().__init__(
+            input_location=input_location,
+            output_location=output_location,
+            lockfile_location=lockfile_location,
+            debug=debug,
+            process_count=process_count,
+            batch_size=batch_size,
+            lock_file_name=lock_file_name,
+        )
+        self.target_size: ImageSize = data_description.get_input_image_size()
+        self.image_format = image_format
+        self.jpeg_quality = jpeg_quality
+        self.mask_suffix = mask_suffix
+        self.label_suffix = label_suffix
+        self.image_suffixes = image_suffixes or [".png", ".jpg", ".jpeg"]
+
+        if clear:
+            clear_folder(self.output_location)
+
+    def get_output_filename(self, input_filename: str) -> str:
+        """Returns the filename of the preprocessed file of an input file"""
+        file_stem, file_ext = splitext(basename(input_filename))
+        if file_ext == self.label_suffix:
+            return file_stem + file_ext
+        if self.mask_suffix in file_stem:
+            return file_stem + MASK_FORMAT
+        return file_stem + self.image_format
+
+    def check_output_filenames(self, input_files: List[str]):
+        """Raises a ValueError if multiple input files have the same output
+        filename (e.g. a.png and a.jpg), because they would overwrite each other"""
+        input_files_by_output = defaultdict(list)
+        for input_file in input_files:
+            input_files_by_output[self.get_output_filename(input_file)].append(
+                basename(input_file)
+            )
+        duplicates = {
+            output_file: input_names
+            for output_file, input_names in input_files_by_output.items()
+            if len(input_names) > 1
+        }
+        if duplicates:
+            raise ValueError(
+                f"Multiple input files have the same output filename: {duplicates}"
+            )
+
+    def list_files(self) -> Tuple[List[str], List[str]]:
+        """
+        Returns a tuple of two lists:
+            1. A list of all images, masks and labels in the input location
+            2. A list of the already preprocessed files of these inputs
+            in the output location
+
+        Returns:
+            A tuple of two lists
+        """
+        with open_location(self.input_location) as (input_fs, input_path):
+            input_files = list_dir(
+                path=input_path,
+                file_system=input_fs,
+                filter_ext=self.image_suffixes + [self.label_suffix],
+            )
+            input_files = [
+                join_fs_path(input_fs, input_path, input_file)
+                for input_file in sorted(input_files)
+            ]
+        self.check_output_filenames(input_files)
+        with open_location(self.output_location) as (output_fs, output_path):
+            output_fs.makedirs(output_path, exist_ok=True)
+            existing_files = set(list_dir(path=output_path, file_system=output_fs))
+            output_files = [
+                join_fs_path(output_fs, output_path, output_file)
+                for output_file in sorted(
+                    {self.get_output_filename(x) for x in input_files}
+                )
+                if output_file in existing_files
+            ]
+        return input_files, output_files
+
+    def generate_batches(
+        self,
+        input_file_list: List[str],
+        changed_files_dict: Dict[str, Dict[str, bool]],
+        output_file_list: Optional[List[str]] = None,
+        force: bool = False,
+    ) -> List[Dict[str, List[str]]]:
+        """
+        Generates batches of all input files which have changed or whose
+        preprocessed file has changed or is missing
+
+        Args:
+            input_file_list: List[str]: A list of input file names
+            changed_files_dict: Dict[str: Dict[str:bool]]: Dictionary with the information
+            which files have changed
+            output_file_list: List[str]: A optional list of output file names
+            force: bool: Force the generation of batches even if no files have changed
+
+        Returns:
+            A list of batches, each batch is a dictionary with one key `inputs`
+            and the value is a list of file paths
+        """
+        if not force:
+            output_changed = {
+                basename(file_name): changed
+                for file_name, changed in changed_files_dict["outputs"].items()
+            }
+            input_file_list = [
+                file_name
+                for file_name in input_file_list
+                if changed_files_dict["inputs"].get(file_name, True)
+                or output_changed.get(self.get_output_filename(file_name), True)
+            ]
+        batches = []
+        for batch_pos in range(0, len(input_file_list), self.batch_size):
+            batches.append(
+                {"inputs": input_file_list[batch_pos : batch_pos + self.batch_size]}
+            )
+        return batches
+
+    def process(self, batch: Dict[str, List[str]]) -> Dict[str, Dict[str, str]]:
+        """
+        Resizes and reencodes a batch of images, masks and labels
+
+        Args:
+            batch: Dictionary with the key `inputs` and the list of files to process
+
+        Returns:
+            A dictionary of checksums for each file in `self.output_location`
+            (key = `outputs`) and `self.input_location` (key = `inputs`)
+        """
+        checksums = defaultdict(dict)
+        with open_location(self.input_location) as (
+            input_fs,
+            _,
+        ), open_location(
+            self.output_location
+        ) as (output_fs, output_root):
+            for input_file in batch["inputs"]:
+                with input_fs.open(input_file, "rb") as opened_file:
+                    input_content = opened_file.read()
+                checksums["inputs"][input_file] = hashlib.md5(input_content).hexdigest()
+                output_filename = self.get_output_filename(input_file)
+                if splitext(input_file)[1] == self.label_suffix:
+                    output_content = resize_label(
+                        input_content,
+                        self.target_size,
+                        self.image_format,
+                        self.image_suffixes,
+                    )
+                elif self.mask_suffix in basename(input_file):
+                    output_content = resize_image(
+                        input_content,
+                        self.target_size,
+                        MASK_FORMAT,
+                        interpolation=cv2.INTER_NEAREST,
+                    )
+                else:
+                    output_content = resize_image(
+                        input_content,
+                        self.target_size,
+                        self.image_format,
+                        jpeg_quality=self.jpeg_quality,
+                    )
+                output_path = join_fs_path(output_fs, output_root, output_filename)
+                with output_fs.open(output_path, "wb") as opened_file:
+                    opened_file.write(output_content)
+                checksums["outputs"][output_path] = hashlib.md5(
+                    output_content
+                ).hexdigest()
+        return checksums
+
+
+def resize_image(
+    image_content: bytes,
+    target_size: ImageSize,
+    image_format: str,
+    interpolation: int = cv2.INTER_LINEAR,
+    jpeg_quality: int = 95,
+) -> bytes:
+    """
+    Resizes an encoded image and reencodes it
+
+    Args:
+        image_content: Encoded image
+        target_size: Size of the resized image
+        image_format: File extension of the format to encode the resized image to
+        interpolation: Interpolation of resizing
+        jpeg_quality: Quality of the image if it is stored as jpeg
+
+    Returns:
+        The encoded resized image
+    """
+    is_jpeg = image_format.lower() in [".jpg", ".jpeg"]
+    image = convert_image_mode(
+        Image.open(io.BytesIO(image_content)),
+        is_jpeg=is_jpeg,
+        keep_palette=interpolation == cv2.INTER_NEAREST,
+    )
+    image_array = np.array(image)
+    if image_array.dtype == bool:
+        image_array = image_array.astype(np.uint8) * 255
+    if not target_size.np_array_has_same_size(image_array):
+        image_array = cv2.resize(
+            image_array, target_size.to_pil_size(), interpolation=interpolation
+        )
+    output_image = Image.fromarray(image_array)
+    if image.mode == "P":
+        # nearest neighbour resizing keeps the palette indices valid
+        output_image.putpalette(image.getpalette())
+    output_buffer = io.BytesIO()
+    save_kwargs = dict(quality=jpeg_quality) if is_jpeg else {}
+    output_image.save(
+        output_buffer, format=Image.registered_extensions()[image_format], **save_kwargs
+    )
+    return output_buffer.getvalue()
+
+
+def convert_image_mode(
+    image: Image.Image, is_jpeg: bool, keep_palette: bool
+) -> Image.Image:
+    """
+    Converts the image to a mode, which can be resized and encoded in the
+    target format. Palette images are converted to RGB(A), unless they are
+    resized with nearest neighbour interpolation to a format supporting
+    palettes, because interpolating palette indices mixes unrelated colors.
+    Images with an alpha channel are converted to RGB or L for jpeg.
+
+    Args:
+        image: Decoded image
+        is_jpeg: Whether the image is encoded as jpeg
+        keep_palette: Whether palette indices may be resized
+
+    Returns:
+        The image in the converted mode
+    """
+    if image.mode == "P" and (is_jpeg or not keep_palette):
+        has_alpha = "transparency" in image.info and not is_jpeg
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    if is_jpeg and image.mode not in JPEG_MODES:
+        image = image.convert("L" if image.mode in ["LA", "I", "I;16"] else "RGB")
+    return image
+
+
+def resize_label(
+    label_content: bytes,
+    target_size: ImageSize,
+    image_format: Optional[str] = None,
+    image_suffixes: Optional[List[str]] = None,
+) -> bytes:
+    """
+    Rescales the bounding boxes of an encoded ObjDetImageLabel to the target size
+
+    Args:
+        label_content: Json encoded ObjDetImageLabel
+        target_size: Size of the resized image
+        image_format: File extension of the reencoded image. If given, the
+            extension of the label filename is replaced, when it is one of
+            the `image_suffixes`
+        image_suffixes: Suffixes of the images which are reencoded
+
+    Returns:
+        The json encoded rescaled ObjDetImageLabel
+    """
+    image_label = ObjDetImageLabel(**json.loads(label_content))
+    if image_format is not None and image_label.filename:
+        file_stem, file_ext = splitext(image_label.filename)
+        if file_ext.lower() in (image_suffixes or [".png", ".jpg", ".jpeg"]):
+            image_label.filename = file_stem + image_format
+    image_size = image_label.img_size
+    if isinstance(image_size, dict):
+        image_size = ImageSize(**image_size)
+    x_scale = target_size.width / image_size.width
+    y_scale = target_size.height / image_size.height
+    for label in image_label.labels:
+        bounding_box = label.bounding_box
+        label.bounding_box = BoundingBox(
+            x_pos=bounding_box.x_pos * x_scale,
+            y_pos=bounding_box.y_pos * y_scale,
+            width=bounding_box.width * x_scale,
+            height=bounding_box.height * y_scale,
+        )
+    image_label.img_size = target_size
+    return json.dumps(asdict(image_label)).encode()
@@ -21,11 +21,15 @@ def fit_generator(  # noqa: PLR0913
     if train_params.steps_per_epoch is not None:
         print(f"Steps per epoch: {train_params.steps_per_epoch}")
 
-    learner.run_training(
-        exp_context,
-        model,
-        train_set,
-        validation_set,
-        train_params,
-        data_description,
-    )
+    try:
+        learner.run_training(
+            exp_context,
+            model,
+            train_set,
+            validation_set,
+            train_params,
+            data_description,
+        )
+    finally:
+        train_set.on_training_end()
+        validation_set.on_training_end()
@@ -0,0 +1,30 @@
+"""Module for ABC ModelExporter"""
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from fsspec import AbstractFileSystem
+
+from niceml.data.datadescriptions.datadescription import DataDescription
+from niceml.experiments.experimentcontext import ExperimentContext
+
+
+class ModelExporter(ABC):  # pylint: disable=too-few-public-methods
+    """Callable that exports a trained model for inference"""
+
+    def initialize(
+        self, data_description: DataDescription, exp_context: ExperimentContext
+    ):
+        """
+        This method can be implemented if the export requires initialized
+        components (e.g. a calibration dataset)
+        """
+
+    @abstractmethod
+    def __call__(
+        self,
+        model: Any,
+        data_description: DataDescription,
+        export_path: str,
+        file_system: Optional[AbstractFileSystem] = None,
+    ):
+        """Exports the model to the given path"""
@@ -1,10 +1,11 @@
 """Module for anchor encoding"""
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import List, Optional, Union
 
 import numpy as np
 
+from niceml.mlcomponents.objdet.anchormatching import AnchorMatching, GridAnchorMatcher
 from niceml.utilities.boundingboxes.bboxconversion import compute_target_gt_array
 from niceml.utilities.boundingboxes.bboxencoding import decode_boxes
 from niceml.utilities.boundingboxes.bboxlabeling import ObjDetInstanceLabel
@@ -13,8 +14,9 @@ from niceml.utilities.boundingboxes.boundingbox import (
     NEGATIVE_MASK_VALUE,
     POSITIVE_MASK_VALUE,
     BoundingBox,
+    bounding_box_from_ullr,
 )
-from niceml.utilities.ioumatrix import compute_iou_matrix
+from niceml.utilities.ioumatrix import compute_iou_matrix, compute_iou_matrix_batch
 
 
 class AnchorEncoder(ABC):  # pylint: disable=too-few-public-methods
@@ -23,12 +25,38 @@ class AnchorEncoder(ABC):  # pylint: disable=too-few-public-methods
     @abstractmethod
     def encode_anchors(
         self,
-        anchor_list: List[BoundingBox],
+        anchor_list: Union[List[BoundingBox], np.ndarray],
         gt_labels: List[ObjDetInstanceLabel],
         num_classes: int,
         box_variance: List[float],
     ) -> np.ndarray:
-        """Encodes an anchor list with corresponding labels to a numpy array"""
+        """Encodes an anchor list with corresponding labels to a numpy array.
+        The anchors are given as list of BoundingBoxes or as array in ullr format
+        (e.g. `AnchorGenerator.generate_anchor_array(...).ullr`)"""
+
+    def encode_anchor_batch(
+        self,
+        anchor_list: Union[List[BoundingBox], np.ndarray],
+        gt_labels_batch: List[List[ObjDetInstanceLabel]],
+        num_classes: int,
+        box_variance: List[float],
+    ) -> np.ndarray:
+        """Encodes the labels of multiple images with the same anchors into
+        one float32 array with the shape (batch_size, anchor_count, 5 + num_classes)"""
+        target_array: Optional[np.ndarray] = None
+        for batch_idx, gt_labels in enumerate(gt_labels_batch):
+            encoded_anchors = self.encode_anchors(
+                anchor_list=anchor_list,
+                gt_labels=gt_labels,
+                num_classes=num_classes,
+                box_variance=box_variance,
+            )
+            if target_array is None:
+                target_array = np.empty(
+                    (len(gt_labels_batch),) + encoded_anchors.shape, dtype=np.float32
+                )
+            target_array[batch_idx] = encoded_anchors
+        return target_array
 
     @abstractmethod
     def decode_anchors(self, anchor_list: List[BoundingBox], encodings: np.ndarray):
@@ -44,13 +72,17 @@ class SimpleAnchorEncoder(AnchorEncoder):
 
     def encode_anchors(  # pylint: disable=too-many-locals
         self,
-        anchor_list: List[BoundingBox],
+        anchor_list: Union[List[BoundingBox], np.ndarray],
         gt_labels: List[ObjDetInstanceLabel],
         num_classes: int,
         box_variance: List[float],
     ) -> np.ndarray:
         """Encodes an anchor list to a numpy array"""
         encoded_feature_list: List[List[float]] = []
+        if isinstance(anchor_list, np.ndarray):
+            anchor_list = [
+                bounding_box_from_ullr(*anchor) for anchor in anchor_list.tolist()
+            ]
 
         for anchor in anchor_list:
             if len(gt_labels) == 0:
@@ -127,16 +159,29 @@ class SimpleAnchorEncoder(AnchorEncoder):
 
 @dataclass
 class OptimizedAnchorEncoder(AnchorEncoder):
-    """Class to encode anchors before model optimization"""
+    """Class to encode anchors before model optimization. With `matching` set to
+    `grid` only anchors and gt boxes which share a grid cell are compared,
+    instead of computing the dense IoU matrix of all anchors and gt boxes."""
 
     match_iou: float = 0.5
     ignore_iou: float = 0.4
     anchor_array_stored_ullr: Optional[np.ndarray] = None
     anchor_array_stored_xywh: Optional[np.ndarray] = None
+    matching: AnchorMatching = AnchorMatching.DENSE
+    grid_cell_size: float = 64.0
+    _grid_matcher: Optional[GridAnchorMatcher] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        """Converts the matching strategy and creates the grid matcher"""
+        self.matching = AnchorMatching(self.matching)
+        if self.matching == AnchorMatching.GRID:
+            self._grid_matcher = GridAnchorMatcher(self.grid_cell_size)
 
     def encode_anchors(
         self,
-        anchor_list: List[BoundingBox],
+        anchor_list: Union[List[BoundingBox], np.ndarray],
         gt_labels: List[ObjDetInstanceLabel],
         num_classes: int,
         box_variance: List[float],
@@ -144,7 +189,9 @@ class OptimizedAnchorEncoder(AnchorEncoder):
         """Encodes an anchor list to a numpy array"""
         box: BoundingBox
         label: ObjDetInstanceLabel
-        if (
+        if isinstance(anchor_list, np.ndarray):
+            self.anchor_array_stored_ullr = anchor_list
+        elif (
             self.anchor_array_stored_ullr is None
             or len(anchor_list) != self.anchor_array_stored_ullr.shape[0]
         ):
@@ -159,6 +206,10 @@ class OptimizedAnchorEncoder(AnchorEncoder):
             )
             target_array[:, anchor_shape[1]] = NEGATIVE_MASK_VALUE
             return target_array
+        if self._grid_matcher is not None:
+            return self.encode_anchor_batch(
+                self.anchor_array_stored_ullr, [gt_labels], num_classes, box_variance
+            )[0]
 
         gt_box_array = np.array(
             [label.bounding_box.get_absolute_ullr() for label in gt_labels]
@@ -177,6 +228,64 @@ class OptimizedAnchorEncoder(AnchorEncoder):
         )
         return target_array
 
+    def encode_anchor_batch(
+        self,
+        anchor_list: Union[List[BoundingBox], np.ndarray],
+        gt_labels_batch: List[List[ObjDetInstanceLabel]],
+        num_classes: int,
+        box_variance: List[float],
+    ) -> np.ndarray:
+        """Encodes the labels of multiple images with the same anchors into
+        one float32 array with the shape (batch_size, anchor_count, 5 + num_classes).
+        All images are encoded in one broadcasted pass."""
+        if isinstance(anchor_list, np.ndarray):
+            anchor_array = anchor_list
+        elif (
+            self.anchor_array_stored_ullr is not None
+            and len(anchor_list) == self.anchor_array_stored_ullr.shape[0]
+        ):
+            anchor_array = self.anchor_array_stored_ullr
+        else:
+            anchor_array = np.array([box.get_absolute_ullr() for box in anchor_list])
+            self.anchor_array_stored_ullr = anchor_array
+        gt_count_array = np.array([len(labels) for labels in gt_labels_batch])
+        gt_box_array = np.zeros(
+            (len(gt_labels_batch), max(1, gt_count_array.max(initial=0)), 4),
+            dtype=np.float32,
+        )
+        class_index_array = np.zeros(gt_box_array.shape[:2], dtype=np.int64)
+        for batch_idx, gt_labels in enumerate(gt_labels_batch):
+            for gt_idx, label in enumerate(gt_labels):
+                gt_box_array[batch_idx, gt_idx] = label.bounding_box.get_absolute_ullr()
+                class_index_array[batch_idx, gt_idx] = label.class_index
+        anchor_gt_indexes: Optional[np.ndarray] = None
+        iou_maxes: Optional[np.ndarray] = None
+        if self._grid_matcher is not None:
+            anchor_gt_indexes = np.zeros(
+                (len(gt_labels_batch), anchor_array.shape[0]), dtype=np.int64
+            )
+            iou_maxes = np.zeros(anchor_gt_indexes.shape, dtype=np.float32)
+            for batch_idx, gt_count in enumerate(gt_count_array):
+                match_result = self._grid_matcher.match(
+                    anchor_array, gt_box_array[batch_idx, :gt_count]
+                )
+                (
+                    anchor_gt_indexes[batch_idx],
+                    iou_maxes[batch_idx],
+                ) = match_result.to_dense(anchor_array.shape[0])
+        return compute_target_gt_batch(
+            anchor_array,
+            gt_box_array,
+            gt_count_array,
+            box_variances=np.array(box_variance),
+            class_index_array=class_index_array,
+            num_classes=num_classes,
+            match_iou=self.match_iou,
+            ignore_iou=self.ignore_iou,
+            anchor_gt_indexes=anchor_gt_indexes,
+            iou_maxes=iou_maxes,
+        )
+
     def decode_anchors(self, anchor_list: List[BoundingBox], encodings: np.ndarray):
         """
         Decodes encoded bounding boxes in an optimized way
@@ -210,3 +319,89 @@ class OptimizedAnchorEncoder(AnchorEncoder):
         encodings[:, :4] = decoded_boxes
 
         return encodings
+
+
+# pylint: disable=too-many-arguments,too-many-locals
+def compute_target_gt_batch(  # noqa: PLR0913
+    anchor_boxes: np.ndarray,
+    gt_boxes: np.ndarray,
+    gt_counts: np.ndarray,
+    box_variances: np.ndarray,
+    class_index_array: np.ndarray,
+    num_classes: int,
+    match_iou: float = 0.5,
+    ignore_iou: float = 0.4,
+    anchor_gt_indexes: Optional[np.ndarray] = None,
+    iou_maxes: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Computes the targets of multiple images like `compute_target_gt_array`,
+    but in one broadcasted pass which writes into one preallocated array
+
+    Args:
+        anchor_boxes: n x 4 array with anchors in ullr format
+        gt_boxes: b x m x 4 array with the gt boxes of b images in ullr format,
+            padded to the maximum number of gt boxes m
+        gt_counts: array with length b with the number of gt boxes per image
+        box_variances: array with 4 values for scaling
+        class_index_array: b x m array with gt class indices
+        num_classes: number of classes as int
+        match_iou: float value between zero and one to define when
+            two bounding boxes are matching
+        ignore_iou: bounding boxes with an iou between ignore_iou and match_iou are ignored
+        anchor_gt_indexes: Optional b x n array with the index of the best matching
+            gt box per anchor. Computed with the dense IoU matrix if not given.
+        iou_maxes: Optional b x n array with the IoU of the best matching gt box
+            per anchor. Must be given together with anchor_gt_indexes.
+
+    Returns:
+        A float32 array with the shape (b, n, 4 + 1 + num_classes) with the encoded
+        bounding box coordinates, the mask value and the one-hot encoded class.
+        Images without gt boxes have zero coordinates and only negative anchors.
+    """
+    batch_size, max_gt_count = gt_boxes.shape[:2]
+    anchor_count = anchor_boxes.shape[0]
+    target_array = np.zeros(
+        (batch_size, anchor_count, 4 + 1 + num_classes), dtype=np.float32
+    )
+
+    if anchor_gt_indexes is None or iou_maxes is None:
+        iou_matrix = compute_iou_matrix_batch(anchor_boxes, gt_boxes)
+        padding_mask = (
+            np.arange(max_gt_count)[np.newaxis, :] >= gt_counts[:, np.newaxis]
+        )
+        iou_matrix[padding_mask] = -1
+        anchor_gt_indexes = np.argmax(iou_matrix, axis=1)
+        iou_maxes = np.max(iou_matrix, axis=1)
+        del iou_matrix
+
+    positive_targets = iou_maxes >= match_iou
+    negative_targets = iou_maxes <= ignore_iou
+    target_array[..., 4] = np.where(
+        positive_targets,
+        POSITIVE_MASK_VALUE,
+        np.where(negative_targets, NEGATIVE_MASK_VALUE, IGNORE_MASK_VALUE),
+    )
+    batch_indexes, anchor_indexes = np.nonzero(positive_targets)
+    target_classes = class_index_array[
+        batch_indexes, anchor_gt_indexes[batch_indexes, anchor_indexes]
+    ]
+    target_array[batch_indexes, anchor_indexes, 5 + target_classes] = 1.0
+
+    box_variances = box_variances.astype(np.float32)
+    anchor_xy = anchor_boxes[:, :2].astype(np.float32)
+    inverse_anchor_wh = 1.0 / (anchor_boxes[:, 2:] - anchor_boxes[:, :2]).astype(
+        np.float32
+    )
+    target_boxes = np.take_along_axis(gt_boxes, anchor_gt_indexes[..., np.newaxis], 1)
+    target_xy = target_boxes[..., :2] - anchor_xy
+    target_xy *= inverse_anchor_wh / box_variances[:2]
+    target_array[..., :2] = target_xy
+    wh_ratio = target_boxes[..., 2:] - target_boxes[..., :2]
+    wh_ratio *= inverse_anchor_wh
+    target_array[..., 2:4] = (
+        np.log(wh_ratio, out=np.zeros_like(wh_ratio), where=wh_ratio > 0)
+        / box_variances[2:]
+    )
+    target_array[gt_counts == 0, :, :4] = 0.0
+    return target_array
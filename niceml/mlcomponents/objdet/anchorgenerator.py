@@ -1,63 +1,146 @@
 """Module for the anchorgenerator"""
+from dataclasses import dataclass
 from math import sqrt
-from typing import List, Tuple
+from typing import Dict, List, Tuple
+
+import numpy as np
 
 from niceml.data.datadescriptions.outputdatadescriptions import (
     OutputObjDetDataDescription,
 )
-from niceml.utilities.boundingboxes.bboxconversion import (
-    bounding_box_from_absolute_cxcywh,
-)
 from niceml.utilities.boundingboxes.boundingbox import BoundingBox
 from niceml.utilities.imagesize import ImageSize
 
 
+@dataclass(frozen=True)
+class AnchorArrays:
+    """All anchors of a data description as read-only float32 arrays
+    with the shape (anchor_count, 4)"""
+
+    xywh: np.ndarray
+    ullr: np.ndarray
+
+
+_ANCHOR_CACHE: Dict[tuple, AnchorArrays] = {}
+
+
+def get_anchor_cache_key(data_description: OutputObjDetDataDescription) -> tuple:
+    """Returns the values of a data description which define the anchors"""
+    image_size = data_description.get_input_image_size()
+    return (
+        image_size.width,
+        image_size.height,
+        tuple(data_description.get_featuremap_scales()),
+        tuple(data_description.get_anchor_aspect_ratios()),
+        tuple(data_description.get_anchor_scales()),
+        data_description.get_base_area_side(),
+    )
+
+
+def clear_anchor_cache():
+    """Removes all cached anchor arrays"""
+    _ANCHOR_CACHE.clear()
+
+
 class AnchorGenerator:
     """Class for generating anchors for object detection"""
 
+    def generate_anchor_array(
+        self, data_description: OutputObjDetDataDescription
+    ) -> AnchorArrays:
+        """Generates the anchors for all feature maps as arrays. The arrays are
+        cached by the generator class and the anchor defining values of the
+        data description and must not be modified."""
+        cache_key = (type(self), *get_anchor_cache_key(data_description))
+        if cache_key not in _ANCHOR_CACHE:
+            xywh_array = self.gen_anchor_array(data_description)
+            ullr_array = np.concatenate(
+                [xywh_array[:, :2], xywh_array[:, :2] + xywh_array[:, 2:]], axis=1
+            )
+            anchor_arrays = AnchorArrays(
+                xywh=xywh_array.astype(np.float32),
+                ullr=ullr_array.astype(np.float32),
+            )
+            anchor_arrays.xywh.setflags(write=False)
+            anchor_arrays.ullr.setflags(write=False)
+            _ANCHOR_CACHE[cache_key] = anchor_arrays
+        return _ANCHOR_CACHE[cache_key]
+
     def generate_anchors(
         self, data_description: OutputObjDetDataDescription
     ) -> List[BoundingBox]:
         """Generate anchors for all feature maps and appends them"""
-        out_anchors = []
-        for feature_map_scale in data_description.get_featuremap_scales():
-            out_anchors += self.gen_anchors_for_featuremap(
-                image_size=data_description.get_input_image_size(),
-                scale=feature_map_scale,
-                aspect_ratios=data_description.get_anchor_aspect_ratios(),
-                anchor_scales=data_description.get_anchor_scales(),
-                base_area_side=data_description.get_base_area_side(),
-            )
-        return out_anchors
+        return [
+            BoundingBox(*anchor)
+            for anchor in self.gen_anchor_array(data_description).tolist()
+        ]
 
-    def gen_anchors_for_featuremap(  # pylint: disable=too-many-locals,too-many-arguments
+    def gen_anchor_array(
+        self, data_description: OutputObjDetDataDescription
+    ) -> np.ndarray:
+        """Generates the anchors for all feature maps as float64 array
+        in xywh format without caching"""
+        return np.concatenate(
+            [
+                self.gen_anchor_array_for_featuremap(
+                    image_size=data_description.get_input_image_size(),
+                    scale=feature_map_scale,
+                    aspect_ratios=data_description.get_anchor_aspect_ratios(),
+                    anchor_scales=data_description.get_anchor_scales(),
+                    base_area_side=data_description.get_base_area_side(),
+                )
+                for feature_map_scale in data_description.get_featuremap_scales()
+            ]
+        )
+
+    def gen_anchor_array_for_featuremap(  # noqa: PLR0913
+        # pylint: disable=too-many-arguments
         self,
         image_size: ImageSize,
         scale: int,
         aspect_ratios: List[float],
         anchor_scales: List[float],
         base_area_side: float,
-    ) -> List[BoundingBox]:
-        """Generates anchors for one featuremap"""
-
+    ) -> np.ndarray:
+        """Generates the anchors for one featuremap as float64 array in xywh format.
+        The anchors are ordered by row, column and width/height combination,
+        which matches the reshaping of the model outputs."""
         steps_width = image_size.width // scale
         steps_height = image_size.height // scale
         area: float = (base_area_side * scale) ** 2
 
-        width_height_list = calculate_anchor_width_height_list(
-            aspect_ratios, anchor_scales, area
+        width_height_array = np.array(
+            calculate_anchor_width_height_list(aspect_ratios, anchor_scales, area),
+            dtype=np.float64,
+        )
+        center_y, center_x = np.meshgrid(
+            (np.arange(steps_height) + 0.5) * scale,
+            (np.arange(steps_width) + 0.5) * scale,
+            indexing="ij",
+        )
+        centers = np.stack([center_x, center_y], axis=-1).reshape(-1, 1, 2)
+        upper_left = centers - width_height_array[np.newaxis, :, :] / 2
+        width_height = np.broadcast_to(width_height_array, upper_left.shape)
+        return np.concatenate([upper_left, width_height], axis=-1).reshape(-1, 4)
+
+    def gen_anchors_for_featuremap(  # noqa: PLR0913
+        # pylint: disable=too-many-arguments
+        self,
+        image_size: ImageSize,
+        scale: int,
+        aspect_ratios: List[float],
+        anchor_scales: List[float],
+        base_area_side: float,
+    ) -> List[BoundingBox]:
+        """Generates anchors for one featuremap"""
+        anchor_array = self.gen_anchor_array_for_featuremap(
+            image_size=image_size,
+            scale=scale,
+            aspect_ratios=aspect_ratios,
+            anchor_scales=anchor_scales,
+            base_area_side=base_area_side,
         )
-        bbox_list: List[BoundingBox] = []
-        for y_pos in range(steps_height):
-            for x_pos in range(steps_width):
-                center_x = (x_pos + 0.5) * scale
-                center_y = (y_pos + 0.5) * scale
-                for cur_width, cur_height in width_height_list:
-                    bounding_box: BoundingBox = bounding_box_from_absolute_cxcywh(
-                        center_x, center_y, cur_width, cur_height
-                    )
-                    bbox_list.append(bounding_box)
-        return bbox_list
+        return [BoundingBox(*anchor) for anchor in anchor_array.tolist()]
 
 
 def calculate_anchor_width_height_list(
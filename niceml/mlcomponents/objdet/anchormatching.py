@@ -0,0 +1,204 @@
+"""Module for matching anchors with ground truth boxes on a spatial grid"""
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class AnchorMatching(str, Enum):
+    """Strategies to match anchors with ground truth boxes"""
+
+    DENSE = "dense"
+    GRID = "grid"
+
+
+@dataclass
+class SparseMatchResult:
+    """Best matching ground truth box for each anchor with a positive IoU.
+    Anchors which do not overlap with any ground truth box are not contained."""
+
+    anchor_indexes: np.ndarray
+    gt_indexes: np.ndarray
+    iou_values: np.ndarray
+
+    def to_dense(self, anchor_count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the best gt index and the best IoU for every anchor like
+        `argmax` and `max` of a dense IoU matrix"""
+        anchor_gt_indexes = np.zeros(anchor_count, dtype=np.int64)
+        iou_maxes = np.zeros(anchor_count, dtype=np.float32)
+        anchor_gt_indexes[self.anchor_indexes] = self.gt_indexes
+        iou_maxes[self.anchor_indexes] = self.iou_values
+        return anchor_gt_indexes, iou_maxes
+
+
+def get_upper_left_cells(boxes: np.ndarray, grid_cell_size: float) -> np.ndarray:
+    """Returns the x and y coordinate of the grid cell of the upper left
+    corner of each box in ullr format as int64 array with the shape (N, 2)"""
+    return np.floor(boxes[:, :2] / grid_cell_size).astype(np.int64)
+
+
+def pack_cell_ids(cell_x: np.ndarray, cell_y: np.ndarray) -> np.ndarray:
+    """Packs the coordinates of grid cells into one int64 id per cell"""
+    return (cell_y << 32) + (cell_x & 0xFFFFFFFF)
+
+
+def get_box_cells(
+    boxes: np.ndarray, grid_cell_size: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns all grid cells which are covered by boxes
+
+    Args:
+        boxes: Boxes in ullr format with the shape (N, 4)
+        grid_cell_size: Side length of the square grid cells
+
+    Returns:
+        The box index and the cell id (see `pack_cell_ids`)
+        of each covered cell
+    """
+    cell_coords = np.floor(boxes / grid_cell_size).astype(np.int64)
+    left, top, right, bottom = cell_coords.T
+    widths = right - left + 1
+    cell_counts = widths * (bottom - top + 1)
+    box_indexes = np.repeat(np.arange(len(boxes)), cell_counts)
+    # position of each cell inside its box
+    cell_offsets = np.arange(cell_counts.sum()) - np.repeat(
+        np.cumsum(cell_counts) - cell_counts, cell_counts
+    )
+    cell_x = left[box_indexes] + cell_offsets % widths[box_indexes]
+    cell_y = top[box_indexes] + cell_offsets // widths[box_indexes]
+    return box_indexes, pack_cell_ids(cell_x, cell_y)
+
+
+def compute_pair_ious(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Computes the IoU of pairs of boxes in ullr format with the shape (N, 4)"""
+    intersection_widths = np.minimum(boxes_a[:, 2], boxes_b[:, 2]) - np.maximum(
+        boxes_a[:, 0], boxes_b[:, 0]
+    )
+    intersection_heights = np.minimum(boxes_a[:, 3], boxes_b[:, 3]) - np.maximum(
+        boxes_a[:, 1], boxes_b[:, 1]
+    )
+    intersection_areas = np.maximum(intersection_widths, 0.0) * np.maximum(
+        intersection_heights, 0.0
+    )
+    union_areas = (
+        (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+        + (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+        - intersection_areas
+    )
+    return np.divide(
+        intersection_areas,
+        union_areas,
+        out=np.zeros_like(intersection_areas),
+        where=union_areas > 0,
+    )
+
+
+class GridAnchorMatcher:
+    """Matches anchors only with the ground truth boxes which share a grid cell
+    with them. The anchors are bucketed by grid cell once and the ground truth
+    boxes are looked up by cell for each image. Time and memory scale with the
+    number of overlapping pairs instead of anchors x ground truth boxes."""
+
+    def __init__(self, grid_cell_size: float = 64.0):
+        """
+        Constructor of the GridAnchorMatcher
+        Args:
+            grid_cell_size: Side length of the square grid cells in pixels
+        """
+        self.grid_cell_size = grid_cell_size
+        self._anchor_boxes: Optional[np.ndarray] = None
+        self._anchor_cell_ids: Optional[np.ndarray] = None
+        self._anchor_indexes: Optional[np.ndarray] = None
+        self._anchor_upper_left_cells: Optional[np.ndarray] = None
+
+    def _bucket_anchors(self, anchor_boxes: np.ndarray):
+        """Computes and caches the cells of the anchors sorted by cell id"""
+        if self._anchor_boxes is anchor_boxes:
+            return
+        anchor_indexes, cell_ids = get_box_cells(anchor_boxes, self.grid_cell_size)
+        order = np.argsort(cell_ids, kind="stable")
+        self._anchor_boxes = anchor_boxes
+        self._anchor_cell_ids = cell_ids[order]
+        self._anchor_indexes = anchor_indexes[order]
+        self._anchor_upper_left_cells = get_upper_left_cells(
+            anchor_boxes, self.grid_cell_size
+        )
+
+    def _get_candidate_pairs(
+        self, gt_boxes: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the anchor and gt indexes of all pairs which share a grid cell.
+        A pair sharing multiple cells is only returned for the upper left
+        cell of the cells they share."""
+        gt_indexes, gt_cell_ids = get_box_cells(gt_boxes, self.grid_cell_size)
+        cell_starts = np.searchsorted(self._anchor_cell_ids, gt_cell_ids, "left")
+        cell_ends = np.searchsorted(self._anchor_cell_ids, gt_cell_ids, "right")
+        pair_counts = cell_ends - cell_starts
+        pair_positions = np.arange(pair_counts.sum()) + np.repeat(
+            cell_starts - (np.cumsum(pair_counts) - pair_counts), pair_counts
+        )
+        pair_anchor_indexes = self._anchor_indexes[pair_positions]
+        pair_gt_indexes = np.repeat(gt_indexes, pair_counts)
+
+        shared_upper_left_cells = np.maximum(
+            self._anchor_upper_left_cells[pair_anchor_indexes],
+            get_upper_left_cells(gt_boxes, self.grid_cell_size)[pair_gt_indexes],
+        )
+        is_unique = np.repeat(gt_cell_ids, pair_counts) == pack_cell_ids(
+            shared_upper_left_cells[:, 0], shared_upper_left_cells[:, 1]
+        )
+        return pair_anchor_indexes[is_unique], pair_gt_indexes[is_unique]
+
+    def match(
+        self, anchor_boxes: np.ndarray, gt_boxes: np.ndarray
+    ) -> SparseMatchResult:
+        """
+        Finds the best matching ground truth box for each anchor
+
+        Args:
+            anchor_boxes: Anchors in ullr format with the shape (N, 4). The cells
+                of the anchors are cached as long as the same array is passed.
+            gt_boxes: Ground truth boxes in ullr format with the shape (M, 4)
+
+        Returns:
+            The best match of each anchor with a positive IoU. Ties are resolved
+            by the lowest ground truth index like `np.argmax`.
+        """
+        self._bucket_anchors(anchor_boxes)
+        pair_anchor_indexes, pair_gt_indexes = self._get_candidate_pairs(gt_boxes)
+        pair_ious = compute_pair_ious(
+            anchor_boxes[pair_anchor_indexes], gt_boxes[pair_gt_indexes]
+        )
+        overlapping = pair_ious > 0
+        # sort by anchor and gt index to reduce the pairs of each anchor
+        order = np.argsort(
+            pair_anchor_indexes[overlapping] * len(gt_boxes)
+            + pair_gt_indexes[overlapping]
+        )
+        pair_anchor_indexes = pair_anchor_indexes[overlapping][order]
+        pair_gt_indexes = pair_gt_indexes[overlapping][order]
+        pair_ious = pair_ious[overlapping][order]
+
+        is_anchor_start = np.ones(len(order), dtype=bool)
+        is_anchor_start[1:] = pair_anchor_indexes[1:] != pair_anchor_indexes[:-1]
+        anchor_starts = np.flatnonzero(is_anchor_start)
+        anchor_pair_counts = np.diff(np.append(anchor_starts, len(order)))
+        iou_maxes = (
+            np.maximum.reduceat(pair_ious, anchor_starts)
+            if len(order) > 0
+            else pair_ious
+        )
+        is_best = pair_ious == np.repeat(iou_maxes, anchor_pair_counts)
+        # the first best pair of an anchor has the lowest gt index
+        best_pairs = np.flatnonzero(is_best)
+        is_first_best = np.ones(len(best_pairs), dtype=bool)
+        best_anchor_indexes = pair_anchor_indexes[best_pairs]
+        is_first_best[1:] = best_anchor_indexes[1:] != best_anchor_indexes[:-1]
+        best_pairs = best_pairs[is_first_best]
+        return SparseMatchResult(
+            anchor_indexes=pair_anchor_indexes[best_pairs],
+            gt_indexes=pair_gt_indexes[best_pairs],
+            iou_values=pair_ious[best_pairs],
+        )
@@ -1,8 +1,8 @@
 """Module with a prediction handler for object detection and also supportive functions """
 
 import logging
-from os.path import join
-from typing import List
+from contextlib import ExitStack
+from typing import Dict, List, Optional, Sequence
 
 import numpy as np
 import pandas as pd
@@ -21,13 +21,29 @@ from niceml.mlcomponents.objdet.anchorgenerator import AnchorGenerator
 from niceml.mlcomponents.predictionhandlers.predictionhandler import PredictionHandler
 from niceml.utilities.boundingboxes.bboxencoding import decode_boxes
 from niceml.utilities.boundingboxes.boundingbox import BoundingBox
+from niceml.utilities.boundingboxes.filtering.candidateselection import (
+    score_to_logit,
+    select_candidates,
+)
 from niceml.utilities.boundingboxes.filtering.predictionfilter import PredictionFilter
 from niceml.utilities.commonutils import check_instance
+from niceml.utilities.fsspec.locationutils import join_fs_path, open_location
+from niceml.utilities.parquetwriter import ParquetRowGroupWriter
+
+NMS_BOXES_KEY = "boxes"
+NMS_SCORES_KEY = "scores"
+NMS_CLASSES_KEY = "classes"
+NMS_VALID_DETECTIONS_KEY = "valid_detections"
 
 
 # pylint:disable=too-many-arguments,too-many-instance-attributes)
 class ObjDetPredictionHandler(PredictionHandler):
-    """Prediction handler for object detection predictions (BoundingBox, class prediction)"""
+    """Prediction handler for object detection predictions (BoundingBox, class prediction).
+    With `candidate_score_threshold` or `candidate_top_k` the candidates of a batch
+    are selected on the raw model output first, so only the candidates are
+    decoded and filtered. The filtered detections are collected in numpy
+    column buffers and written to the prediction parquet file in row groups
+    of `row_group_size` rows."""
 
     def __init__(  # noqa: PLR0913
         self,
@@ -36,123 +52,319 @@ class ObjDetPredictionHandler(PredictionHandler):
         pred_identifier: str = "image_location",
         detection_idx_col: str = DETECTION_INDEX_COLUMN_NAME,
         apply_sigmoid: bool = True,
+        row_group_size: int = 100_000,
+        candidate_score_threshold: Optional[float] = None,
+        candidate_top_k: Optional[int] = None,
     ):
-        """Initializes the ObjDetPredictionHandler"""
+        """
+        Initializes the ObjDetPredictionHandler
+        Args:
+            prediction_filter: Filter which is applied to the predictions of each image
+            prediction_prefix: Prefix of the class prediction columns
+            pred_identifier: Name of the column with the image identifier
+            detection_idx_col: Name of the column with the detection index
+            apply_sigmoid: Whether the class predictions are logits
+            row_group_size: Number of rows which are buffered before they are
+                written as one row group
+            candidate_score_threshold: Minimum class score of an anchor to be
+                passed to the prediction filter. Compared with the logits if
+                `apply_sigmoid` is set. All anchors are passed if None.
+            candidate_top_k: Maximum number of anchors per image with the
+                highest scores, which are passed to the prediction filter
+        """
         super().__init__()
         self.prediction_filter = prediction_filter
         self.prediction_prefix = prediction_prefix
         self.apply_sigmoid = apply_sigmoid
         self.pred_identifier = pred_identifier
         self.detection_idx_col = detection_idx_col
-        self.data = None
+        self.row_group_size = row_group_size
+        self.candidate_score_threshold = candidate_score_threshold
+        self.candidate_top_k = candidate_top_k
         self.data_columns = [pred_identifier, detection_idx_col]
         self.data_columns += list(asdict(BoundingBox(0, 0, 0, 0)).keys())
 
         self.anchor_generator = AnchorGenerator()
-        self.anchors = None
-        self.anchor_array = None
+        self.anchor_array: Optional[np.ndarray] = None
+        self._exit_stack: Optional[ExitStack] = None
+        self._writer: Optional[ParquetRowGroupWriter] = None
+        self._identifier_buffer: Optional[np.ndarray] = None
+        self._detection_idx_buffer: Optional[np.ndarray] = None
+        self._value_buffer: Optional[np.ndarray] = None
+        self._buffer_row_count: int = 0
 
     def initialize(self):
         """Initializes the prediction handler"""
-        self.anchors: List[BoundingBox] = self.anchor_generator.generate_anchors(
+        self.anchor_array = self.anchor_generator.generate_anchor_array(
             data_description=self.data_description
-        )
-        self.anchor_array = np.array([box.get_absolute_xywh() for box in self.anchors])
+        ).xywh
         self.prediction_filter.initialize(data_description=self.data_description)
 
-    def __enter__(self):
-        """Init `self.data` after the context is entered"""
-        self.data = []
+    def get_value_columns(self) -> List[str]:
+        """Returns the names of the box coordinate and class prediction columns"""
+        value_columns = self.data_columns[2:]
         if isinstance(self.data_description, OutputObjDetDataDescription):
-            for class_count in range(self.data_description.get_output_class_count()):
-                self.data_columns.append(f"{self.prediction_prefix}_{class_count:04d}")
+            value_columns += [
+                f"{self.prediction_prefix}_{class_idx:04d}"
+                for class_idx in range(self.data_description.get_output_class_count())
+            ]
+        return value_columns
+
+    def __enter__(self):
+        """Opens the prediction parquet file and allocates the column buffers
+        after the context is entered"""
+        self._exit_stack = ExitStack()
+        file_system, root_path = self._exit_stack.enter_context(
+            open_location(self.exp_context.fs_config)
+        )
+        self._writer = self._exit_stack.enter_context(
+            ParquetRowGroupWriter(
+                join_fs_path(
+                    file_system,
+                    root_path,
+                    ExperimentFilenames.PREDICTION_FOLDER,
+                    self.filename + ".parq",
+                ),
+                file_system=file_system,
+            )
+        )
+        self._identifier_buffer = np.empty(self.row_group_size, dtype=object)
+        self._detection_idx_buffer = np.empty(self.row_group_size, dtype=np.int64)
+        self._value_buffer = np.empty(
+            (self.row_group_size, len(self.get_value_columns())), dtype=np.float32
+        )
+        self._buffer_row_count = 0
         return self
 
     def _add_data(
         self,
         identifier: str,
-        prediction: np.ndarray,
-        detection_index: int,
+        predictions: np.ndarray,
+        detection_indexes: np.ndarray,
     ):
-        """Adds a prediction entry to `self.data` including to final predictions"""
-        prediction_list: List[float] = [float(pred) for pred in prediction]
-        col_list: list = [identifier, detection_index] + prediction_list
-        self.data.append(dict(zip(self.data_columns, col_list)))
-
-    def _decode_box_predictions(self, box_predictions) -> np.ndarray:
-        """Decode the predictions into real bounding box coordinates"""
-
-        decoded_boxes = decode_boxes(
-            anchor_boxes_xywh=self.anchor_array,
-            encoded_array_xywh=box_predictions[:, :4],
-            box_variances=np.array(self.data_description.get_box_variance()),
+        """Appends the predictions of one image to the column buffers
+        and grows the buffers if they are too small"""
+        row_start = self._buffer_row_count
+        row_end = row_start + len(predictions)
+        if row_end > len(self._value_buffer):
+            buffer_size = max(row_end, 2 * len(self._value_buffer))
+            self._identifier_buffer = np.resize(self._identifier_buffer, buffer_size)
+            self._detection_idx_buffer = np.resize(
+                self._detection_idx_buffer, buffer_size
+            )
+            self._value_buffer = np.resize(
+                self._value_buffer, (buffer_size, self._value_buffer.shape[1])
+            )
+        self._identifier_buffer[row_start:row_end] = identifier
+        self._detection_idx_buffer[row_start:row_end] = detection_indexes
+        self._value_buffer[row_start:row_end] = predictions
+        self._buffer_row_count = row_end
+
+    def _flush(self):
+        """Writes the buffered rows as one row group to the parquet file"""
+        row_count = self._buffer_row_count
+        data_frame = pd.DataFrame(
+            self._value_buffer[:row_count], columns=self.get_value_columns()
+        )
+        data_frame.insert(0, self.pred_identifier, self._identifier_buffer[:row_count])
+        data_frame.insert(
+            1, self.detection_idx_col, self._detection_idx_buffer[:row_count]
         )
+        self._writer.write_row_group(data_frame)
+        self._buffer_row_count = 0
 
-        box_predictions[:, :4] = decoded_boxes
+    def _decode_box_predictions(
+        self, box_predictions: np.ndarray, anchor_array: np.ndarray
+    ) -> np.ndarray:
+        """Decode the predictions into real bounding box coordinates in place.
+        The anchors must have the same shape or be broadcastable to it."""
+        box_predictions[..., :4] = decode_boxes(
+            anchor_boxes_xywh=anchor_array,
+            encoded_array_xywh=box_predictions[..., :4],
+            box_variances=np.array(
+                self.data_description.get_box_variance(), dtype=box_predictions.dtype
+            ),
+        )
         return box_predictions
 
-    def add_prediction(
-        self, data_info_list: List[ObjDetDataInfo], prediction_batch: np.ndarray
-    ):
-        """Gets the results of an object detection model, de"""
+    def _select_candidates(
+        self, prediction_batch: np.ndarray, coordinates_count: int
+    ) -> List[np.ndarray]:
+        """Selects the candidates of the whole batch on the raw model output
+        and returns the decoded candidates of each image"""
+        score_threshold = self.candidate_score_threshold
+        if self.apply_sigmoid and score_threshold is not None:
+            score_threshold = score_to_logit(score_threshold)
+        batch_idxes, anchor_idxes = select_candidates(
+            prediction_batch,
+            coordinates_count,
+            score_threshold=score_threshold,
+            top_k=self.candidate_top_k,
+        )
+        candidates = self._decode_box_predictions(
+            np.array(prediction_batch[batch_idxes, anchor_idxes], dtype=np.float32),
+            self.anchor_array[anchor_idxes],
+        )
+        if self.apply_sigmoid:
+            candidates = apply_sigmoid_on_cls_predictions(candidates, coordinates_count)
+        candidate_counts = np.bincount(batch_idxes, minlength=len(prediction_batch))
+        return np.split(candidates, np.cumsum(candidate_counts)[:-1])
+
+    def _decode_prediction_batch(
+        self, prediction_batch: np.ndarray
+    ) -> Sequence[np.ndarray]:
+        """Decodes the whole batch at once and returns the decoded
+        (candidate) predictions of each image"""
         output_dd: OutputObjDetDataDescription = check_instance(
             self.data_description, OutputObjDetDataDescription
         )
-        for curr_batch, curr_data_info in zip(prediction_batch, data_info_list):
-            decoded_box_predictions = self._decode_box_predictions(
-                box_predictions=curr_batch
+        if self.candidate_score_threshold is None and self.candidate_top_k is None:
+            prediction_batch = self._decode_box_predictions(
+                np.array(prediction_batch, dtype=np.float32), self.anchor_array
             )
-
             if self.apply_sigmoid:
-                decoded_box_predictions = apply_sigmoid_on_cls_predictions(
-                    decoded_box_predictions,
-                    output_dd.get_coordinates_count(),
+                prediction_batch = apply_sigmoid_on_cls_predictions(
+                    prediction_batch, output_dd.get_coordinates_count()
                 )
+            return prediction_batch
+        return self._select_candidates(
+            np.asarray(prediction_batch), output_dd.get_coordinates_count()
+        )
 
-            filtered_box_predictions = self.prediction_filter.filter(
-                decoded_box_predictions
+    def add_prediction(
+        self, data_info_list: List[ObjDetDataInfo], prediction_batch: np.ndarray
+    ):
+        """Decodes, filters and buffers the predictions of an object detection model.
+        The whole batch is decoded at once."""
+        prediction_batch = self._decode_prediction_batch(prediction_batch)
+        for curr_batch, curr_data_info in zip(prediction_batch, data_info_list):
+            self._add_image_predictions(
+                curr_data_info.get_identifier(),
+                self.prediction_filter.filter(curr_batch),
             )
+        if self._buffer_row_count >= self.row_group_size:
+            self._flush()
 
-            if len(filtered_box_predictions) > 0:
-                for curr_index, prediction in enumerate(filtered_box_predictions):
-                    self._add_data(
-                        identifier=curr_data_info.get_identifier(),
-                        prediction=prediction,
-                        detection_index=curr_index,
-                    )
-            else:
-                prediction = np.zeros(
-                    (
-                        output_dd.get_coordinates_count()
-                        + output_dd.get_output_class_count(),
-                    )
-                )
-                self._add_data(
-                    curr_data_info.get_identifier(),
-                    prediction=prediction,
-                    detection_index=NO_PREDICTIONS_DETECTION_VALUE,
-                )
+    def _add_image_predictions(self, identifier: str, box_predictions: np.ndarray):
+        """Buffers the final predictions of one image or one placeholder row
+        with NO_PREDICTIONS_DETECTION_VALUE, if there are no predictions"""
+        if len(box_predictions) > 0:
+            self._add_data(
+                identifier=identifier,
+                predictions=box_predictions[:, : self._value_buffer.shape[1]],
+                detection_indexes=np.arange(len(box_predictions)),
+            )
+        else:
+            self._add_data(
+                identifier,
+                predictions=np.zeros((1, self._value_buffer.shape[1])),
+                detection_indexes=np.array([NO_PREDICTIONS_DETECTION_VALUE]),
+            )
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
-        """Save the data in `self.data` as a parquet file"""
-        if self.data is None:
+        """Writes the remaining rows and closes the parquet file"""
+        if self._writer is None:
             logging.getLogger(__name__).warning(
                 "PredictionHandler: %s has no data to write!",
                 self.filename,
             )
-        else:
-            data_frame: pd.DataFrame = pd.DataFrame(self.data)
-            self.exp_context.write_parquet(
-                data_frame,
-                join(ExperimentFilenames.PREDICTION_FOLDER, self.filename + ".parq"),
+            return
+        if self._buffer_row_count > 0 or self._writer.row_count == 0:
+            self._flush()
+        self._exit_stack.close()
+        self._writer = None
+        self._identifier_buffer = None
+        self._detection_idx_buffer = None
+        self._value_buffer = None
+        self.exp_context.update_last_modified()
+
+
+class ObjDetNmsPredictionHandler(ObjDetPredictionHandler):
+    """Prediction handler for models which already decode the boxes and apply
+    the NMS inside the graph (see `RetinaNetExporter`). It consumes the
+    fixed-size detection output directly and writes the same parquet file
+    as the ObjDetPredictionHandler. The class prediction columns contain the
+    score of the detected class and zero for the other classes."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        prediction_filter: Optional[PredictionFilter] = None,
+        prediction_prefix: str = "pred",
+        pred_identifier: str = "image_location",
+        detection_idx_col: str = DETECTION_INDEX_COLUMN_NAME,
+        row_group_size: int = 100_000,
+    ):
+        """
+        Initializes the ObjDetNmsPredictionHandler
+        Args:
+            prediction_filter: Optional filter which is additionally applied
+                to the detections of each image
+            prediction_prefix: Prefix of the class prediction columns
+            pred_identifier: Name of the column with the image identifier
+            detection_idx_col: Name of the column with the detection index
+            row_group_size: Number of rows which are buffered before they are
+                written as one row group
+        """
+        super().__init__(
+            prediction_filter=prediction_filter,
+            prediction_prefix=prediction_prefix,
+            pred_identifier=pred_identifier,
+            detection_idx_col=detection_idx_col,
+            apply_sigmoid=False,
+            row_group_size=row_group_size,
+        )
+
+    def initialize(self):
+        """Initializes the prediction filter, anchors are not required"""
+        if self.prediction_filter is not None:
+            self.prediction_filter.initialize(data_description=self.data_description)
+
+    def add_prediction(
+        self,
+        data_info_list: List[ObjDetDataInfo],
+        prediction_batch: Dict[str, np.ndarray],
+    ):
+        """Buffers the valid detections of each image of the batch"""
+        output_dd: OutputObjDetDataDescription = check_instance(
+            self.data_description, OutputObjDetDataDescription
+        )
+        coordinates_count = output_dd.get_coordinates_count()
+        boxes = np.asarray(prediction_batch[NMS_BOXES_KEY])
+        scores = np.asarray(prediction_batch[NMS_SCORES_KEY])
+        classes = np.asarray(prediction_batch[NMS_CLASSES_KEY])
+        valid_detections = np.asarray(prediction_batch[NMS_VALID_DETECTIONS_KEY])
+
+        for image_idx, curr_data_info in enumerate(data_info_list):
+            detection_count = int(valid_detections[image_idx])
+            box_predictions = np.zeros(
+                (
+                    detection_count,
+                    coordinates_count + output_dd.get_output_class_count(),
+                ),
+                dtype=np.float32,
+            )
+            box_predictions[:, :coordinates_count] = boxes[image_idx, :detection_count]
+            box_predictions[
+                np.arange(detection_count),
+                coordinates_count + classes[image_idx, :detection_count],
+            ] = scores[image_idx, :detection_count]
+            if self.prediction_filter is not None:
+                box_predictions = self.prediction_filter.filter(box_predictions)
+            self._add_image_predictions(
+                curr_data_info.get_identifier(), box_predictions
             )
+        if self._buffer_row_count >= self.row_group_size:
+            self._flush()
 
 
 def apply_sigmoid_on_cls_predictions(
     box_predictions: np.ndarray, coordinates_count: int
 ) -> np.ndarray:
-    """Applies sigmoid only on the classification part"""
-    box_predictions[:, coordinates_count:] = 1 / (
-        1 + np.exp(-box_predictions[:, coordinates_count:])
-    )
+    """Applies sigmoid in place only on the classification part of the predictions
+    of one (anchors, values) or multiple images (batch_size, anchors, values)"""
+    class_predictions = box_predictions[..., coordinates_count:]
+    np.negative(class_predictions, out=class_predictions)
+    np.exp(class_predictions, out=class_predictions)
+    class_predictions += 1
+    np.reciprocal(class_predictions, out=class_predictions)
     return box_predictions
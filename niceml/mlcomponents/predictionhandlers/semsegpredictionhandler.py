@@ -1,11 +1,16 @@
 """module for semseg prediction handlers"""
 import logging
+import threading
+from concurrent import futures
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
 from os.path import join
-from typing import List, Tuple
+from typing import List, Optional, Tuple, Union
 
 import cv2
 import numpy as np
 import pandas as pd
+from fsspec import AbstractFileSystem
 from PIL import Image
 
 from niceml.data.datadescriptions.datadescription import DataDescription
@@ -19,6 +24,9 @@ from niceml.data.dataiterators.boundingboxdataiterator import (
 from niceml.experiments.experimentcontext import ExperimentContext
 from niceml.experiments.expfilenames import ExperimentFilenames
 from niceml.mlcomponents.predictionhandlers.predictionhandler import PredictionHandler
+from niceml.mlcomponents.resultanalyzers.instancefinders.componentinstance import (
+    ComponentInstance,
+)
 from niceml.mlcomponents.resultanalyzers.instancefinders.instancefinder import (
     InstanceFinder,
 )
@@ -30,25 +38,62 @@ from niceml.mlcomponents.resultanalyzers.tensors.semsegdataiterator import (
 )
 from niceml.utilities.boundingboxes.boundingbox import get_bounding_box_attributes
 from niceml.utilities.commonutils import check_instance
+from niceml.utilities.fsspec.locationutils import open_location
+from niceml.utilities.ioutils import write_image
 
 
 class SemSegMaskPredictionHandler(PredictionHandler):
-    """Prediction handler to convert a tensor to channel images for SemSeg"""
+    """Prediction handler to convert a tensor to channel images for SemSeg.
+    The images are encoded and written by a pool of background threads while
+    the next batch is predicted. At most `queue_size` images wait to be
+    written, further predictions block until there is space again."""
 
-    def __init__(self, img_extension: str = ".png", prediction_suffix: str = "_pred"):
+    def __init__(  # noqa: PLR0913
+        self,
+        img_extension: str = ".png",
+        prediction_suffix: str = "_pred",
+        writer_count: int = 4,
+        queue_size: int = 16,
+        png_compression_level: Optional[int] = None,
+    ):
         """
         This prediction handler converts a tensor to the maximum prediction image
 
         Args:
             img_extension: Type of the images to write
             prediction_suffix: Suffix for prediction columns
+            writer_count: Number of background threads which encode and write
+                the images; 0 writes the images synchronously
+            queue_size: Maximum number of images waiting to be written
+            png_compression_level: zlib compression level (0-9) of png images;
+                default = PIL default (6)
         """
         super().__init__()
         self.img_extension = img_extension
         self.prediction_suffix = prediction_suffix
+        self.writer_count = writer_count
+        self.queue_size = queue_size
+        self.png_compression_level = png_compression_level
+        self._exit_stack: Optional[ExitStack] = None
+        self._file_system: Optional[AbstractFileSystem] = None
+        self._root_path: Optional[str] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queue_slots: Optional[threading.BoundedSemaphore] = None
+        self._pending_writes: List[Future] = []
 
     def __enter__(self):
-        """Enter SemSegMaskPredictionHandler"""
+        """Opens the experiment location and starts the writer threads"""
+        self._exit_stack = ExitStack()
+        self._file_system, self._root_path = self._exit_stack.enter_context(
+            open_location(self.exp_context.fs_config)
+        )
+        self._pending_writes = []
+        if self.writer_count > 0:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.writer_count,
+                thread_name_prefix=type(self).__name__,
+            )
+            self._queue_slots = threading.BoundedSemaphore(self.queue_size)
         return self
 
     def add_prediction(self, data_info_list: List[DataInfo], prediction_batch):
@@ -63,6 +108,7 @@ class SemSegMaskPredictionHandler(PredictionHandler):
             len(prediction_batch.shape) < expected_shape_dimensions
         ):  # If the batch size is 1, an additional dimension is necessary and added below
             prediction_batch = np.expand_dims(prediction_batch, 0)
+        self._raise_write_errors(wait=False)
         for prediction, data_info in zip(prediction_batch, data_info_list):
             if output_data_description.get_use_void_class():
                 # remove background class from prediction array
@@ -72,19 +118,62 @@ class SemSegMaskPredictionHandler(PredictionHandler):
             target_array = np.stack(
                 (values, value_idxes, np.zeros_like(values)), axis=2
             ).astype(dtype=np.uint8)
-            target_image = Image.fromarray(target_array)
-            self.exp_context.write_image(
-                target_image,
-                join(
-                    ExperimentFilenames.PREDICTION_FOLDER,
-                    self.filename,
-                    f"{data_info.get_identifier()}{self.prediction_suffix}{self.img_extension}",
-                ),
+            image_path = join(
+                self._root_path,
+                ExperimentFilenames.PREDICTION_FOLDER,
+                self.filename,
+                f"{data_info.get_identifier()}{self.prediction_suffix}{self.img_extension}",
             )
+            if self._executor is None:
+                self._write_image(target_array, image_path)
+            else:
+                self._queue_slots.acquire()
+                future = self._executor.submit(
+                    self._write_image, target_array, image_path
+                )
+                future.add_done_callback(lambda _: self._queue_slots.release())
+                self._pending_writes.append(future)
+
+    def _write_image(self, target_array: np.ndarray, image_path: str):
+        """Encodes the prediction image and writes it to the experiment location"""
+        write_kwargs = {}
+        if (
+            self.png_compression_level is not None
+            and self.img_extension.lower() == ".png"
+        ):
+            write_kwargs["compress_level"] = self.png_compression_level
+        write_image(
+            Image.fromarray(target_array),
+            image_path,
+            file_system=self._file_system,
+            **write_kwargs,
+        )
+
+    def _raise_write_errors(self, wait: bool):
+        """Removes the finished writes and raises the first error of a failed
+        write. If `wait` is set, all pending writes are finished before."""
+        if wait:
+            futures.wait(self._pending_writes)
+        finished_writes = [future for future in self._pending_writes if future.done()]
+        self._pending_writes = [
+            future for future in self._pending_writes if not future.done()
+        ]
+        for future in finished_writes:
+            if future.exception() is not None:
+                raise future.exception()
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
-        """Exit SemSegMaskPredictionHandler"""
-        pass
+        """Waits until all images are written and raises the first write error"""
+        try:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            if exc_type is None:
+                self._raise_write_errors(wait=True)
+        finally:
+            self._executor = None
+            self._pending_writes = []
+            self._exit_stack.close()
+            self.exp_context.update_last_modified()
 
 
 class SemSegBBoxPredictionHandler(PredictionHandler):
@@ -187,17 +276,25 @@ class SemSegBBoxPredictionHandler(PredictionHandler):
                 max_prediction_values=values,
             )
 
-            mask_instances: List[MaskInstance] = self.instance_finder.analyse_datapoint(
+            instances: Union[
+                List[MaskInstance], List[ComponentInstance]
+            ] = self.instance_finder.analyse_datapoint(
                 data_key="",
                 data_predicted=prediction_container,
                 data_loaded=None,
                 additional_data={},
             )
 
-            bbox_pred_data = create_bbox_prediction_from_mask_instances(
-                prediction=prediction,
-                mask_instances=mask_instances,
-            )
+            if all(isinstance(instance, ComponentInstance) for instance in instances):
+                bbox_pred_data = create_bbox_prediction_from_component_instances(
+                    prediction=prediction,
+                    component_instances=instances,
+                )
+            else:
+                bbox_pred_data = create_bbox_prediction_from_mask_instances(
+                    prediction=prediction,
+                    mask_instances=instances,
+                )
             for detection_idx, predictions in bbox_pred_data:
                 self._add_data(
                     identifier=data_info.get_identifier(),
@@ -268,3 +365,48 @@ def create_bbox_prediction_from_mask_instances(
             )
             detection_idx_count += 1
     return bbox_prediction_data
+
+
+def create_bbox_prediction_from_component_instances(
+    prediction: np.ndarray,
+    component_instances: List[ComponentInstance],
+) -> List[Tuple[int, List[float]]]:
+    """
+    Creates a prepared list of bounding box prediction information based on
+    the connected components of a semantic segmentation
+    (see `ConnectedComponentsInstanceFinder`)
+    Args:
+        prediction: raw prediction data with the shape
+                    (image_height, image_width, channel_count)
+        component_instances: found instances of a mask
+
+    Returns:
+        List of Tuples (detection_index, list of prediction data
+        (bbox coordinates and prediction scores of each output channel))
+    """
+    if len(component_instances) == 0:
+        return [(-1, [0.0 for _ in range(4 + prediction.shape[-1])])]
+
+    bbox_prediction_data: List[Tuple[int, List[float]]] = []
+    for detection_idx, instance in enumerate(component_instances):
+        predictions_of_instance = prediction[
+            instance.y_pos : instance.y_pos + instance.height,
+            instance.x_pos : instance.x_pos + instance.width,
+            :,
+        ]
+        bbox_prediction_data.append(
+            (
+                detection_idx,
+                [
+                    float(coord)
+                    for coord in [
+                        instance.x_pos,
+                        instance.y_pos,
+                        instance.width,
+                        instance.height,
+                    ]
+                ]
+                + list(np.max(predictions_of_instance, axis=(0, 1))),
+            )
+        )
+    return bbox_prediction_data
@@ -0,0 +1,248 @@
+"""Module with prediction handlers which merge the predictions of
+image tiles (see `TileDataInfoListing`) back to whole images"""
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from niceml.data.datadescriptions.datadescription import DataDescription
+from niceml.data.datainfos.tiledatainfo import TileDataInfo
+from niceml.data.dataiterators.boundingboxdataiterator import (
+    DETECTION_INDEX_COLUMN_NAME,
+)
+from niceml.experiments.experimentcontext import ExperimentContext
+from niceml.mlcomponents.predictionhandlers.objdetpredictionhandler import (
+    ObjDetPredictionHandler,
+)
+from niceml.mlcomponents.predictionhandlers.predictionhandler import PredictionHandler
+from niceml.utilities.boundingboxes.filtering.predictionfilter import PredictionFilter
+from niceml.utilities.imagetiling import get_blending_weights
+
+
+# pylint:disable=too-many-arguments
+class TileObjDetPredictionHandler(ObjDetPredictionHandler):
+    """Prediction handler for object detection predictions of image tiles.
+    The predictions of each tile are decoded and filtered like in the
+    ObjDetPredictionHandler and shifted to image coordinates. When all tiles
+    of an image are predicted, the `merge_filter` (e.g. NmsFilter) removes the
+    duplicate detections in the overlapping areas and the detections are
+    written with the identifier of the whole image."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        prediction_filter: PredictionFilter,
+        merge_filter: PredictionFilter,
+        prediction_prefix: str = "pred",
+        pred_identifier: str = "image_location",
+        detection_idx_col: str = DETECTION_INDEX_COLUMN_NAME,
+        apply_sigmoid: bool = True,
+        row_group_size: int = 100_000,
+        candidate_score_threshold: Optional[float] = None,
+        candidate_top_k: Optional[int] = None,
+    ):
+        """
+        Initializes the TileObjDetPredictionHandler
+        Args:
+            prediction_filter: Filter which is applied to the predictions of each tile
+            merge_filter: Filter which is applied to the merged predictions
+                of all tiles of an image
+            prediction_prefix: Prefix of the class prediction columns
+            pred_identifier: Name of the column with the image identifier
+            detection_idx_col: Name of the column with the detection index
+            apply_sigmoid: Whether the class predictions are logits
+            row_group_size: Number of rows which are buffered before they are
+                written as one row group
+            candidate_score_threshold: Minimum class score of an anchor to be
+                passed to the prediction filter. Compared with the logits if
+                `apply_sigmoid` is set. All anchors are passed if None.
+            candidate_top_k: Maximum number of anchors per tile with the
+                highest scores, which are passed to the prediction filter
+        """
+        super().__init__(
+            prediction_filter=prediction_filter,
+            prediction_prefix=prediction_prefix,
+            pred_identifier=pred_identifier,
+            detection_idx_col=detection_idx_col,
+            apply_sigmoid=apply_sigmoid,
+            row_group_size=row_group_size,
+            candidate_score_threshold=candidate_score_threshold,
+            candidate_top_k=candidate_top_k,
+        )
+        self.merge_filter = merge_filter
+        self._tile_predictions: Dict[str, List[np.ndarray]] = {}
+
+    def initialize(self):
+        """Initializes the prediction handler and the merge filter"""
+        super().initialize()
+        self.merge_filter.initialize(data_description=self.data_description)
+
+    def __enter__(self):
+        """Opens the prediction parquet file and resets the pending tiles"""
+        self._tile_predictions = {}
+        return super().__enter__()
+
+    def add_prediction(
+        self, data_info_list: List[TileDataInfo], prediction_batch: np.ndarray
+    ):
+        """Decodes and filters the predictions of the tiles and merges the
+        predictions of each image, when all of its tiles are predicted"""
+        prediction_batch = self._decode_prediction_batch(prediction_batch)
+        for decoded_predictions, tile_info in zip(prediction_batch, data_info_list):
+            tile_predictions = self.prediction_filter.filter(decoded_predictions)
+            tile_predictions[:, 0] += tile_info.x_pos
+            tile_predictions[:, 1] += tile_info.y_pos
+            image_tiles = self._tile_predictions.setdefault(
+                tile_info.get_image_identifier(), []
+            )
+            image_tiles.append(tile_predictions)
+            if len(image_tiles) == tile_info.tile_count:
+                self._merge_tiles(tile_info.get_image_identifier())
+        if self._buffer_row_count >= self.row_group_size:
+            self._flush()
+
+    def _merge_tiles(self, image_identifier: str):
+        """Applies the merge filter to the predictions of all tiles of an image
+        and buffers the result"""
+        predictions = np.concatenate(self._tile_predictions.pop(image_identifier))
+        if len(predictions) > 0:
+            predictions = self.merge_filter.filter(predictions)
+        self._add_image_predictions(image_identifier, predictions)
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """Merges the images with missing tiles and writes the remaining rows"""
+        for image_identifier in list(self._tile_predictions):
+            logging.getLogger(__name__).warning(
+                "Not all tiles of %s were predicted", image_identifier
+            )
+            self._merge_tiles(image_identifier)
+        super().__exit__(exc_type, exc_value, exc_traceback)
+
+
+@dataclass
+class BlendedImage:
+    """Sum of the weighted tile predictions of an image"""
+
+    tile_info: TileDataInfo
+    prediction_sum: np.ndarray
+    weight_sum: np.ndarray
+    tile_count: int = 0
+
+    @classmethod
+    def create(cls, tile_info: TileDataInfo, channel_shape: Tuple[int, ...]):
+        """Creates an empty BlendedImage for the image of the tile"""
+        image_shape = tile_info.image_size.to_numpy_shape()
+        return cls(
+            tile_info=tile_info,
+            prediction_sum=np.zeros(image_shape + channel_shape, dtype=np.float32),
+            weight_sum=np.zeros(image_shape, dtype=np.float32),
+        )
+
+    def add_tile(self, tile_info: TileDataInfo, tile_prediction: np.ndarray):
+        """Adds the weighted prediction (height, width, channels) of a tile.
+        Padded areas of tiles exceeding the image are ignored."""
+        tile_height = min(
+            tile_info.tile_size.height, tile_info.image_size.height - tile_info.y_pos
+        )
+        tile_width = min(
+            tile_info.tile_size.width, tile_info.image_size.width - tile_info.x_pos
+        )
+        tile_weights = get_blending_weights(tile_info.tile_size, tile_info.overlap)[
+            :tile_height, :tile_width
+        ]
+        image_area = (
+            slice(tile_info.y_pos, tile_info.y_pos + tile_height),
+            slice(tile_info.x_pos, tile_info.x_pos + tile_width),
+        )
+        self.prediction_sum[image_area] += (
+            tile_prediction[:tile_height, :tile_width] * tile_weights[..., np.newaxis]
+        )
+        self.weight_sum[image_area] += tile_weights
+        self.tile_count += 1
+
+    def is_complete(self) -> bool:
+        """Checks if all tiles of the image are added"""
+        return self.tile_count == self.tile_info.tile_count
+
+    def get_prediction(self) -> np.ndarray:
+        """Returns the blended prediction of the image"""
+        return (
+            self.prediction_sum
+            / np.maximum(self.weight_sum, np.finfo(np.float32).eps)[..., np.newaxis]
+        )
+
+
+class TileBlendingPredictionHandler(PredictionHandler):
+    """Prediction handler for dense predictions of image tiles (e.g. semantic
+    segmentation). The tile predictions are blended into a prediction of the
+    whole image with weights, which decrease linearly towards the tile borders
+    in the overlapping areas. The blended prediction is passed with the data
+    info of the whole image to the wrapped prediction handler."""
+
+    def __init__(self, prediction_handler: PredictionHandler):
+        """
+        Initializes the TileBlendingPredictionHandler
+        Args:
+            prediction_handler: Handler of the blended predictions of whole
+                images (e.g. SemSegMaskPredictionHandler)
+        """
+        super().__init__()
+        self.prediction_handler = prediction_handler
+        self._blended_images: Dict[str, BlendedImage] = {}
+
+    def set_params(
+        self,
+        exp_context: ExperimentContext,
+        filename: str,
+        data_description: DataDescription,
+    ):
+        """Sets the parameters of this and the wrapped prediction handler"""
+        super().set_params(exp_context, filename, data_description)
+        self.prediction_handler.set_params(exp_context, filename, data_description)
+        self.prediction_handler.initialize()
+
+    def __enter__(self):
+        """Enters the wrapped prediction handler"""
+        self._blended_images = {}
+        self.prediction_handler.__enter__()
+        return self
+
+    def add_prediction(
+        self, data_info_list: List[TileDataInfo], prediction_batch: np.ndarray
+    ):
+        """Adds the weighted tile predictions to the predictions of their images
+        and passes each image to the wrapped handler, when all of its tiles
+        are predicted"""
+        expected_shape_dimensions = 4
+        prediction_batch = np.asarray(prediction_batch)
+        if (
+            prediction_batch.ndim < expected_shape_dimensions
+        ):  # If the batch size is 1, an additional dimension is necessary and added below
+            prediction_batch = np.expand_dims(prediction_batch, 0)
+        for tile_prediction, tile_info in zip(prediction_batch, data_info_list):
+            image_identifier = tile_info.get_image_identifier()
+            if image_identifier not in self._blended_images:
+                self._blended_images[image_identifier] = BlendedImage.create(
+                    tile_info, tile_prediction.shape[2:]
+                )
+            blended_image = self._blended_images[image_identifier]
+            blended_image.add_tile(tile_info, tile_prediction)
+            if blended_image.is_complete():
+                self._pass_image(image_identifier)
+
+    def _pass_image(self, image_identifier: str):
+        """Passes the blended prediction of an image to the wrapped handler"""
+        blended_image = self._blended_images.pop(image_identifier)
+        self.prediction_handler.add_prediction(
+            [blended_image.tile_info.data_info],
+            blended_image.get_prediction()[np.newaxis],
+        )
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """Passes the images with missing tiles and exits the wrapped handler"""
+        for image_identifier in list(self._blended_images):
+            logging.getLogger(__name__).warning(
+                "Not all tiles of %s were predicted", image_identifier
+            )
+            self._pass_image(image_identifier)
+        self.prediction_handler.__exit__(exc_type, exc_value, exc_traceback)
@@ -0,0 +1,72 @@
+"""Module of the ComponentInstance that represents an error instance found as
+connected component in a prediction mask"""
+
+from dataclasses import dataclass
+from typing import Tuple, Union
+
+import numpy as np
+
+from niceml.data.datadescriptions.outputdatadescriptions import (
+    OutputImageDataDescription,
+)
+from niceml.utilities.imagesize import ImageSize
+from niceml.utilities.semseg.semseginstancelabeling import SemSegInstanceLabel
+
+
+@dataclass
+class ComponentInstance:  # pylint: disable = too-many-instance-attributes
+    """Dataclass with infos about an error (instance) found on a predicted image.
+    The mask only covers the bounding box of the instance (crop-local), the
+    position of the crop in the image is given by `x_pos` and `y_pos`."""
+
+    class_idx: int
+    x_pos: int
+    y_pos: int
+    width: int
+    height: int
+    area: int
+    max_score: float
+    mean_score: float
+    mask: np.ndarray
+
+    def get_image_mask(
+        self, target_shape: Union[ImageSize, Tuple[int, int]]
+    ) -> np.ndarray:
+        """
+        Creates an image-sized mask of the instance (255 = instance)
+        Args:
+            target_shape: Shape of the mask
+
+        Returns:
+            Mask with the instance on it and the form `target_shape`.
+        """
+        target_shape = (
+            target_shape.to_numpy_shape()
+            if isinstance(target_shape, ImageSize)
+            else target_shape
+        )
+        image_mask = np.zeros(shape=target_shape)
+        image_area = image_mask[
+            self.y_pos : self.y_pos + self.height, self.x_pos : self.x_pos + self.width
+        ]
+        image_area[self.mask[: image_area.shape[0], : image_area.shape[1]]] = 255
+        return image_mask
+
+    def to_semseg_instance_label(
+        self, data_description: OutputImageDataDescription
+    ) -> SemSegInstanceLabel:
+        """
+        Transform this `ComponentInstance` into a `SemSegInstanceLabel`
+        Args:
+            data_description: Data description to get the class name of `self.class_idx`
+
+        Returns:
+            Created `SemSegInstanceLabel`
+        """
+        return SemSegInstanceLabel(
+            class_name=data_description.get_output_channel_names()[self.class_idx],
+            class_index=self.class_idx,
+            mask=self.get_image_mask(
+                target_shape=data_description.get_output_image_size()
+            ),
+        )
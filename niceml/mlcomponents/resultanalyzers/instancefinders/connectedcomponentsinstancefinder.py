@@ -0,0 +1,109 @@
+"""Module for the connected components instance finder"""
+
+from typing import List, Optional
+
+import cv2
+import numpy as np
+from scipy import ndimage
+
+from niceml.data.datainfos.datainfo import DataInfo
+from niceml.mlcomponents.resultanalyzers.instancefinders.componentinstance import (
+    ComponentInstance,
+)
+from niceml.mlcomponents.resultanalyzers.instancefinders.instancefinder import (
+    InstanceFinder,
+)
+from niceml.mlcomponents.resultanalyzers.tensors.semsegdataiterator import (
+    SemSegPredictionContainer,
+)
+
+
+class ConnectedComponentsInstanceFinder(InstanceFinder):
+    """Instance finder for SemSeg predictions with more than one channel (classes).
+    Alternative to the MultiChannelInstanceFinder, which labels each class with
+    `cv2.connectedComponentsWithStats` instead of drawing each contour on an
+    image-sized mask. The bounding boxes and areas (pixel counts) are taken
+    from the component stats, the scores are reduced per label with
+    `scipy.ndimage` and the instance masks are cropped to the bounding box."""
+
+    # pylint: disable = too-many-arguments
+    def __init__(  # noqa: PLR0913
+        self,
+        key: str = "connectedcomponentsinstancefinder",
+        min_area: int = 10,
+        max_area: int = 2000000,
+        threshold: float = 0.5,
+        connectivity: int = 8,
+    ):
+        """
+        Constructor of the ConnectedComponentsInstanceFinder
+        Args:
+            key: Key of the metric
+            min_area: Minimum number of pixels of an instance
+            max_area: Maximum number of pixels of an instance
+            threshold: Pixels with a score above the threshold belong to an instance
+            connectivity: Pixel connectivity of the instances (4 or 8)
+        """
+        super().__init__(
+            key=key,
+            min_area=min_area,
+            max_area=max_area,
+            threshold=threshold,
+        )
+        self.connectivity = connectivity
+
+    # pylint: disable = too-many-arguments, too-many-locals
+    def analyse_datapoint(  # noqa: PLR0913
+        self,
+        data_key: str,
+        data_predicted: SemSegPredictionContainer,
+        data_loaded: Optional[DataInfo] = None,
+        additional_data: Optional[dict] = None,
+        dyn_threshold: Optional[float] = None,
+        **kwargs,
+    ) -> List[ComponentInstance]:
+        """Finds the connected components of each predicted class.
+        The dynamic threshold can be used to override the threshold"""
+        dyn_threshold = dyn_threshold or self.threshold
+        scores = data_predicted.max_prediction_values
+        class_idxes = data_predicted.max_prediction_idxes
+        above_threshold = scores > dyn_threshold
+        component_instances: List[ComponentInstance] = []
+
+        for class_idx in np.unique(class_idxes[above_threshold]):
+            class_mask = (above_threshold & (class_idxes == class_idx)).astype(np.uint8)
+            _, labels, stats, _ = cv2.connectedComponentsWithStats(
+                class_mask, connectivity=self.connectivity, ltype=cv2.CV_32S
+            )
+            areas = stats[1:, cv2.CC_STAT_AREA]
+            instance_labels = (
+                np.flatnonzero((areas >= self.min_area) & (areas <= self.max_area)) + 1
+            )
+            if len(instance_labels) == 0:
+                continue
+            max_scores = ndimage.maximum(scores, labels, instance_labels)
+            mean_scores = ndimage.mean(scores, labels, instance_labels)
+            for label, max_score, mean_score in zip(
+                instance_labels, max_scores, mean_scores
+            ):
+                x_pos, y_pos, width, height, area = (int(x) for x in stats[label])
+                component_instances.append(
+                    ComponentInstance(
+                        class_idx=int(class_idx),
+                        x_pos=x_pos,
+                        y_pos=y_pos,
+                        width=width,
+                        height=height,
+                        area=area,
+                        max_score=float(max_score),
+                        mean_score=float(mean_score),
+                        mask=labels[y_pos : y_pos + height, x_pos : x_pos + width]
+                        == label,
+                    )
+                )
+
+        return component_instances
+
+    def get_final_metric(self) -> Optional[dict]:
+        """returns empty dict"""
+        return {}
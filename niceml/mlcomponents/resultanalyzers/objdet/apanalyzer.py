@@ -0,0 +1,230 @@
+"""Module for the ObjDetAPAnalyzer"""
+import logging
+from os.path import basename, join
+from typing import Dict, List, Optional, Sequence
+
+import mlflow
+import numpy as np
+import pandas as pd
+
+from niceml.data.datadescriptions.outputdatadescriptions import (
+    OutputObjDetDataDescription,
+)
+from niceml.data.datainfos.objdetdatainfo import ObjDetDataInfo
+from niceml.data.datainfos.tiledatainfo import TileDataInfo
+from niceml.data.dataiterators.boundingboxdataiterator import (
+    NO_PREDICTIONS_DETECTION_VALUE,
+    BoundingBoxIterator,
+)
+from niceml.data.datasets.dataset import Dataset
+from niceml.experiments.experimentcontext import ExperimentContext
+from niceml.experiments.expfilenames import ExperimentFilenames
+from niceml.mlcomponents.resultanalyzers.analyzer import ResultAnalyzer
+from niceml.mlcomponents.resultanalyzers.objdet.averageprecision import (
+    COCO_IOU_THRESHOLDS,
+    AveragePrecisionResult,
+    DetectionArrays,
+    compute_average_precision,
+    match_detections_in_chunks,
+)
+from niceml.mlcomponents.resultanalyzers.tensors.tensorgraphanalyzer import (
+    metrics_dict_to_mlflow_metrics_dict,
+)
+from niceml.utilities.boundingboxes.bboxconversion import convert_to_ullr
+from niceml.utilities.commonutils import check_instance
+from niceml.utilities.fsspec.locationutils import open_location
+from niceml.utilities.logutils import get_logstr_from_dict
+
+
+class ObjDetAPAnalyzer(ResultAnalyzer):
+    """Result analyzer which computes the mean average precision (mAP), the AP
+    per class and IoU threshold, the average recall (AR) and the
+    precision/recall curves of object detection predictions. Predictions and
+    ground truth boxes are read as columnar arrays, matched in chunks of images
+    and the curves are computed for all detections at once."""
+
+    def __init__(
+        self,
+        iou_thresholds: Optional[Sequence[float]] = None,
+        image_chunk_size: int = 1000,
+        parq_file_prefix: str = "",
+    ):
+        """
+        Constructor of the ObjDetAPAnalyzer
+        Args:
+            iou_thresholds: IoU thresholds for the matching;
+                default = COCO thresholds 0.5:0.05:0.95
+            image_chunk_size: Number of images which are matched at once
+            parq_file_prefix: Prefix of the prediction parquet file
+        """
+        super().__init__()
+        self.iou_thresholds: List[float] = list(iou_thresholds or COCO_IOU_THRESHOLDS)
+        self.image_chunk_size = image_chunk_size
+        self.parq_file_prefix = parq_file_prefix
+
+    def read_predictions(
+        self, exp_context: ExperimentContext, dataset_name: str
+    ) -> BoundingBoxIterator:
+        """Opens the prediction parquet file of a dataset with the BoundingBoxIterator"""
+        bbox_iterator = BoundingBoxIterator()
+        with open_location(exp_context.fs_config) as (exp_fs, exp_root):
+            bbox_iterator.open(
+                join(
+                    exp_root,
+                    ExperimentFilenames.PREDICTION_FOLDER,
+                    f"{self.parq_file_prefix}{dataset_name}",
+                ),
+                file_system=exp_fs,
+            )
+        return bbox_iterator
+
+    def __call__(
+        self, dataset: Dataset, exp_context: ExperimentContext, dataset_name: str
+    ):
+        """Computes the AP metrics of the predictions of one dataset and
+        writes them with the precision/recall curves to the experiment"""
+        output_dd: OutputObjDetDataDescription = check_instance(
+            self.data_description, OutputObjDetDataDescription
+        )
+        class_names = output_dd.get_output_class_names()
+        data_infos = get_objdet_data_infos(dataset)
+        image_keys = pd.Index([data_info.get_identifier() for data_info in data_infos])
+        ground_truths = get_gt_arrays(data_infos, class_names)
+        detections = get_detection_arrays(
+            self.read_predictions(exp_context, dataset_name), image_keys
+        ).sort_by_image()
+
+        true_positives = match_detections_in_chunks(
+            detections,
+            ground_truths,
+            iou_thresholds=self.iou_thresholds,
+            class_count=len(class_names),
+            image_chunk_size=self.image_chunk_size,
+        )
+        ap_result = compute_average_precision(
+            detections.scores,
+            detections.class_indexes,
+            true_positives,
+            gt_counts=np.bincount(
+                ground_truths.class_indexes, minlength=len(class_names)
+            ),
+            iou_thresholds=self.iou_thresholds,
+        )
+        out_dict = get_ap_metrics_dict(ap_result, class_names)
+
+        output_file = join(
+            ExperimentFilenames.ANALYSIS_FOLDER,
+            ExperimentFilenames.ANALYSIS_FILE.format(subset_name=dataset_name),
+        )
+        log_str = f"{basename(output_file)}\n" f"========================\n"
+        log_str += get_logstr_from_dict(out_dict)
+        logging.getLogger(__name__).info(log_str)
+
+        mlflow.log_metrics(metrics_dict_to_mlflow_metrics_dict(out_dict))
+        exp_context.write_yaml(out_dict, output_file)
+        exp_context.write_parquet(
+            get_pr_curves_df(ap_result, class_names),
+            join(
+                ExperimentFilenames.ANALYSIS_FOLDER,
+                ExperimentFilenames.PR_CURVES.format(subset_name=dataset_name),
+            ),
+        )
+
+
+def get_objdet_data_infos(dataset: Dataset) -> List[ObjDetDataInfo]:
+    """Returns the data infos of all batches of the dataset once per identifier
+    without loading the images. Tiles are replaced by the data info of their image."""
+    data_info_dict: Dict[str, ObjDetDataInfo] = {}
+    for batch_idx in range(len(dataset)):
+        for data_info in dataset.get_datainfo(batch_idx):
+            if isinstance(data_info, TileDataInfo):
+                data_info = data_info.data_info  # noqa: PLW2901
+            data_info_dict.setdefault(data_info.get_identifier(), data_info)
+    return list(data_info_dict.values())
+
+
+def get_gt_arrays(
+    data_infos: List[ObjDetDataInfo], class_names: List[str]
+) -> DetectionArrays:
+    """Collects the labels of all data infos as DetectionArrays. The image
+    index is the position of the data info and labels with unknown class
+    names are ignored."""
+    class_name_indexes = {
+        class_name: class_idx for class_idx, class_name in enumerate(class_names)
+    }
+    labels = [
+        (image_idx, class_name_indexes[label.class_name], label.bounding_box)
+        for image_idx, data_info in enumerate(data_infos)
+        for label in data_info.labels
+        if label.class_name in class_name_indexes
+    ]
+    return DetectionArrays(
+        image_indexes=np.array([label[0] for label in labels], dtype=np.int64),
+        class_indexes=np.array([label[1] for label in labels], dtype=np.int64),
+        boxes_ullr=np.array(
+            [label[2].get_absolute_ullr() for label in labels], dtype=np.float64
+        ).reshape(-1, 4),
+    )
+
+
+def get_detection_arrays(
+    bbox_iterator: BoundingBoxIterator, image_keys: pd.Index
+) -> DetectionArrays:
+    """Converts the arrays of an opened BoundingBoxIterator to DetectionArrays.
+    Each detection gets the class with the highest prediction. Detections of
+    images which are not in `image_keys` are ignored."""
+    key_counts = [
+        key_end - key_start for key_start, key_end in bbox_iterator.key_offsets.values()
+    ]
+    image_indexes = np.repeat(image_keys.get_indexer(bbox_iterator.keys), key_counts)
+    is_valid = (bbox_iterator.detection_indexes != NO_PREDICTIONS_DETECTION_VALUE) & (
+        image_indexes >= 0
+    )
+    class_predictions = bbox_iterator.class_predictions[is_valid]
+    return DetectionArrays(
+        image_indexes=image_indexes[is_valid],
+        class_indexes=np.argmax(class_predictions, axis=1),
+        boxes_ullr=convert_to_ullr(bbox_iterator.boxes_xywh[is_valid]),
+        scores=np.max(class_predictions, axis=1),
+    )
+
+
+def get_ap_metrics_dict(
+    ap_result: AveragePrecisionResult, class_names: List[str]
+) -> dict:
+    """Returns mAP, AR and the AP per class and per IoU threshold as dict.
+    Classes without ground truth boxes are left out."""
+    out_dict = dict(
+        mean_average_precision=ap_result.get_mean_average_precision(),
+        average_recall=ap_result.get_average_recall(),
+    )
+    out_dict["average_precision_per_iou"] = {
+        f"{iou_threshold:.2f}": ap_result.get_mean_average_precision(iou_threshold)
+        for iou_threshold in ap_result.iou_thresholds
+    }
+    class_average_precisions = np.mean(ap_result.average_precisions, axis=0)
+    out_dict["average_precision_per_class"] = {
+        class_name: float(class_ap)
+        for class_name, class_ap in zip(class_names, class_average_precisions)
+        if not np.isnan(class_ap)
+    }
+    return out_dict
+
+
+def get_pr_curves_df(
+    ap_result: AveragePrecisionResult, class_names: List[str]
+) -> pd.DataFrame:
+    """Returns the interpolated precision/recall curves of all classes with
+    ground truth boxes and all IoU thresholds as long format dataframe"""
+    threshold_count, class_count, level_count = ap_result.precisions.shape
+    pr_curves_df = pd.DataFrame(
+        dict(
+            iou_threshold=np.repeat(
+                ap_result.iou_thresholds, class_count * level_count
+            ),
+            class_name=np.tile(np.repeat(class_names, level_count), threshold_count),
+            recall=np.tile(ap_result.recall_levels, threshold_count * class_count),
+            precision=ap_result.precisions.ravel(),
+        )
+    )
+    return pr_curves_df.dropna(subset=["precision"]).reset_index(drop=True)
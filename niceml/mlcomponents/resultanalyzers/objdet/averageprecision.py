@@ -0,0 +1,295 @@
+"""Module for the vectorised matching of detections and the computation of
+precision/recall curves, average precision and average recall"""
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from niceml.mlcomponents.objdet.anchormatching import compute_pair_ious
+
+COCO_IOU_THRESHOLDS: Tuple[float, ...] = tuple(
+    np.round(np.linspace(0.5, 0.95, 10), 2).tolist()
+)
+RECALL_LEVEL_COUNT: int = 101
+
+
+@dataclass
+class DetectionArrays:
+    """Columnar arrays of detections or ground truth boxes of multiple images.
+    The ground truth boxes have no scores."""
+
+    image_indexes: np.ndarray
+    class_indexes: np.ndarray
+    boxes_ullr: np.ndarray
+    scores: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        """Returns the number of boxes"""
+        return len(self.image_indexes)
+
+    def take(self, indexes: np.ndarray) -> "DetectionArrays":
+        """Returns the boxes at the indexes or a slice"""
+        return DetectionArrays(
+            image_indexes=self.image_indexes[indexes],
+            class_indexes=self.class_indexes[indexes],
+            boxes_ullr=self.boxes_ullr[indexes],
+            scores=None if self.scores is None else self.scores[indexes],
+        )
+
+    def sort_by_image(self) -> "DetectionArrays":
+        """Returns the boxes sorted by image index (stable)"""
+        return self.take(np.argsort(self.image_indexes, kind="stable"))
+
+
+@dataclass
+class AveragePrecisionResult:
+    """Average precision and recall per IoU threshold and class.
+    Classes without ground truth boxes are NaN."""
+
+    iou_thresholds: np.ndarray
+    recall_levels: np.ndarray
+    # interpolated precision with the shape (thresholds, classes, recall_levels)
+    precisions: np.ndarray
+    # shape (thresholds, classes)
+    average_precisions: np.ndarray
+    # highest recall with the shape (thresholds, classes)
+    recalls: np.ndarray
+
+    def get_mean_average_precision(
+        self, iou_threshold: Optional[float] = None
+    ) -> float:
+        """Returns the mean AP over all classes with ground truth boxes and
+        all IoU thresholds or only the given IoU threshold"""
+        average_precisions = self.average_precisions
+        if iou_threshold is not None:
+            average_precisions = average_precisions[
+                np.isclose(self.iou_thresholds, iou_threshold)
+            ]
+        return _nanmean(average_precisions)
+
+    def get_average_recall(self) -> float:
+        """Returns the highest recall averaged over classes and IoU thresholds"""
+        return _nanmean(self.recalls)
+
+
+def _nanmean(values: np.ndarray) -> float:
+    """Mean of the values which are not NaN or NaN if all values are NaN"""
+    valid_values = values[~np.isnan(values)]
+    return float(np.mean(valid_values)) if len(valid_values) > 0 else float("nan")
+
+
+def get_candidate_pairs(
+    detections: DetectionArrays, ground_truths: DetectionArrays, class_count: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the detection and ground truth indexes of all pairs
+    with the same image and class"""
+    det_group_keys = detections.image_indexes * class_count + detections.class_indexes
+    gt_group_keys = (
+        ground_truths.image_indexes * class_count + ground_truths.class_indexes
+    )
+    gt_order = np.argsort(gt_group_keys, kind="stable")
+    sorted_gt_group_keys = gt_group_keys[gt_order]
+    group_starts = np.searchsorted(sorted_gt_group_keys, det_group_keys, "left")
+    pair_counts = (
+        np.searchsorted(sorted_gt_group_keys, det_group_keys, "right") - group_starts
+    )
+    pair_positions = np.arange(pair_counts.sum()) + np.repeat(
+        group_starts - (np.cumsum(pair_counts) - pair_counts), pair_counts
+    )
+    return np.repeat(np.arange(len(detections)), pair_counts), gt_order[pair_positions]
+
+
+def match_detections(
+    detections: DetectionArrays,
+    ground_truths: DetectionArrays,
+    iou_thresholds: Sequence[float] = COCO_IOU_THRESHOLDS,
+    class_count: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Matches detections one-to-one to ground truth boxes of the same image and
+    class like the COCO evaluation: detections are processed by descending
+    score and each takes the unmatched ground truth box with the highest IoU
+    (inclusive threshold). Instead of looping over detections, rounds of
+    array operations accept every detection which takes its best available
+    ground truth box and is the best scored remaining candidate of this box.
+
+    Args:
+        detections: Detections with scores
+        ground_truths: Ground truth boxes
+        iou_thresholds: IoU thresholds which are matched independently
+        class_count: Number of classes; derived from the class indexes if None
+
+    Returns:
+        Boolean array with the shape (len(iou_thresholds), len(detections)),
+        which is True for the true positive detections
+    """
+    det_count = len(detections)
+    gt_count = len(ground_truths)
+    threshold_count = len(iou_thresholds)
+    true_positives = np.zeros(threshold_count * det_count, dtype=bool)
+    if det_count == 0 or gt_count == 0:
+        return true_positives.reshape(threshold_count, det_count)
+    if class_count is None:
+        class_count = (
+            int(max(detections.class_indexes.max(), ground_truths.class_indexes.max()))
+            + 1
+        )
+    pair_det_idxes, pair_gt_idxes = get_candidate_pairs(
+        detections, ground_truths, class_count
+    )
+    pair_ious = compute_pair_ious(
+        detections.boxes_ullr[pair_det_idxes], ground_truths.boxes_ullr[pair_gt_idxes]
+    )
+    # one independent set of pairs per threshold with offset indexes
+    pair_thresholds = [
+        np.flatnonzero(pair_ious >= iou_threshold) for iou_threshold in iou_thresholds
+    ]
+    pair_dets = np.concatenate(
+        [
+            pair_det_idxes[valid] + thr_idx * det_count
+            for thr_idx, valid in enumerate(pair_thresholds)
+        ]
+    )
+    pair_gts = np.concatenate(
+        [
+            pair_gt_idxes[valid] + thr_idx * gt_count
+            for thr_idx, valid in enumerate(pair_thresholds)
+        ]
+    )
+    pair_ious = np.concatenate([pair_ious[valid] for valid in pair_thresholds])
+    det_ranks = np.empty(det_count, dtype=np.int64)
+    det_ranks[np.argsort(-detections.scores, kind="stable")] = np.arange(det_count)
+
+    # pairs of each detection are ordered by descending IoU
+    order = np.lexsort((pair_gts, -pair_ious, pair_dets))
+    pair_dets = pair_dets[order]
+    pair_gts = pair_gts[order]
+    pair_ranks = det_ranks[pair_dets % det_count]
+    gt_taken = np.zeros(threshold_count * gt_count, dtype=bool)
+    while len(pair_dets) > 0:
+        is_best_gt = np.ones(len(pair_dets), dtype=bool)
+        is_best_gt[1:] = pair_dets[1:] != pair_dets[:-1]
+        gt_best_ranks = np.full(threshold_count * gt_count, det_count)
+        np.minimum.at(gt_best_ranks, pair_gts, pair_ranks)
+        accepted = is_best_gt & (pair_ranks == gt_best_ranks[pair_gts])
+        true_positives[pair_dets[accepted]] = True
+        gt_taken[pair_gts[accepted]] = True
+        remaining = ~(true_positives[pair_dets] | gt_taken[pair_gts])
+        pair_dets = pair_dets[remaining]
+        pair_gts = pair_gts[remaining]
+        pair_ranks = pair_ranks[remaining]
+    return true_positives.reshape(threshold_count, det_count)
+
+
+def match_detections_in_chunks(
+    detections: DetectionArrays,
+    ground_truths: DetectionArrays,
+    iou_thresholds: Sequence[float] = COCO_IOU_THRESHOLDS,
+    class_count: Optional[int] = None,
+    image_chunk_size: int = 1000,
+) -> np.ndarray:
+    """
+    Matches the detections with `match_detections` in chunks of images,
+    so the memory of the candidate pairs is bounded by the chunk size
+
+    Args:
+        detections: Detections with scores sorted by image index
+        ground_truths: Ground truth boxes sorted by image index
+        iou_thresholds: IoU thresholds which are matched independently
+        class_count: Number of classes; derived from the class indexes if None
+        image_chunk_size: Number of images which are matched at once
+
+    Returns:
+        Boolean array with the shape (len(iou_thresholds), len(detections)),
+        which is True for the true positive detections
+    """
+    image_count = (
+        int(
+            max(
+                detections.image_indexes.max(initial=-1),
+                ground_truths.image_indexes.max(initial=-1),
+            )
+        )
+        + 1
+    )
+    chunk_starts = np.arange(0, image_count + image_chunk_size, image_chunk_size)
+    det_bounds = np.searchsorted(detections.image_indexes, chunk_starts)
+    gt_bounds = np.searchsorted(ground_truths.image_indexes, chunk_starts)
+    chunk_results: List[np.ndarray] = [np.zeros((len(iou_thresholds), 0), dtype=bool)]
+    for det_start, det_end, gt_start, gt_end in zip(
+        det_bounds[:-1], det_bounds[1:], gt_bounds[:-1], gt_bounds[1:]
+    ):
+        chunk_results.append(
+            match_detections(
+                detections.take(slice(det_start, det_end)),
+                ground_truths.take(slice(gt_start, gt_end)),
+                iou_thresholds=iou_thresholds,
+                class_count=class_count,
+            )
+        )
+    return np.concatenate(chunk_results, axis=1)
+
+
+def compute_average_precision(  # pylint: disable=too-many-locals
+    scores: np.ndarray,
+    class_indexes: np.ndarray,
+    true_positives: np.ndarray,
+    gt_counts: np.ndarray,
+    iou_thresholds: Sequence[float] = COCO_IOU_THRESHOLDS,
+) -> AveragePrecisionResult:
+    """
+    Computes precision/recall curves, AP and AR of all classes and IoU
+    thresholds. All detections are sorted by class and descending score once
+    and the curves are cumulative sums over the slice of each class. The AP is
+    the mean of the interpolated precision at 101 recall levels like COCO.
+
+    Args:
+        scores: Score of each detection
+        class_indexes: Class index of each detection
+        true_positives: Boolean array (thresholds, detections) from `match_detections`
+        gt_counts: Number of ground truth boxes per class
+        iou_thresholds: IoU thresholds of the rows of `true_positives`
+
+    Returns:
+        AveragePrecisionResult with NaN for classes without ground truth boxes
+    """
+    class_count = len(gt_counts)
+    threshold_count = len(iou_thresholds)
+    recall_levels = np.linspace(0.0, 1.0, RECALL_LEVEL_COUNT)
+    precisions = np.full((threshold_count, class_count, RECALL_LEVEL_COUNT), np.nan)
+    recalls = np.full((threshold_count, class_count), np.nan)
+
+    order = np.lexsort((-scores, class_indexes))
+    sorted_true_positives = true_positives[:, order]
+    class_bounds = np.searchsorted(class_indexes[order], np.arange(class_count + 1))
+    for class_idx in np.flatnonzero(gt_counts > 0):
+        class_true_positives = sorted_true_positives[
+            :, class_bounds[class_idx] : class_bounds[class_idx + 1]
+        ]
+        precisions[:, class_idx] = 0.0
+        recalls[:, class_idx] = 0.0
+        if class_true_positives.shape[1] == 0:
+            continue
+        tp_sums = np.cumsum(class_true_positives, axis=1)
+        class_recalls = tp_sums / gt_counts[class_idx]
+        class_precisions = tp_sums / np.arange(1, class_true_positives.shape[1] + 1)
+        # precision envelope: highest precision at the same or a higher recall
+        class_precisions = np.maximum.accumulate(class_precisions[:, ::-1], axis=1)[
+            :, ::-1
+        ]
+        recalls[:, class_idx] = class_recalls[:, -1]
+        for thr_idx in range(threshold_count):
+            level_idxes = np.searchsorted(
+                class_recalls[thr_idx], recall_levels, side="left"
+            )
+            is_reached = level_idxes < class_precisions.shape[1]
+            precisions[thr_idx, class_idx, is_reached] = class_precisions[
+                thr_idx, level_idxes[is_reached]
+            ]
+    return AveragePrecisionResult(
+        iou_thresholds=np.asarray(iou_thresholds),
+        recall_levels=recall_levels,
+        precisions=precisions,
+        average_precisions=np.mean(precisions, axis=-1),
+        recalls=recalls,
+    )
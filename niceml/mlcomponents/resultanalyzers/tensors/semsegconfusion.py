@@ -0,0 +1,225 @@
+"""Module for the vectorised confusion matrices of semantic segmentation
+predictions at multiple score thresholds"""
+from dataclasses import dataclass
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+from niceml.mlcomponents.resultanalyzers.tensors.semsegdataiterator import (
+    SemSegPredictionContainer,
+)
+
+
+def get_gt_class_indexes(gt_mask: np.ndarray, class_count: int) -> np.ndarray:
+    """
+    Returns the class index of each pixel of a ground truth mask. Pixels
+    without a class get the index `class_count`.
+
+    Args:
+        gt_mask: Class index mask (height, width), where indexes outside of
+            [0, class_count) mean no class (e.g. 255), or a binary mask
+            with one channel per class (height, width, class_count)
+        class_count: Number of classes
+
+    Returns:
+        int64 array with the shape (height, width)
+    """
+    if gt_mask.ndim == 3:  # noqa: PLR2004
+        is_class = gt_mask > 0
+        gt_idxes = np.argmax(is_class, axis=2).astype(np.int64)
+        gt_idxes[~np.any(is_class, axis=2)] = class_count
+        return gt_idxes
+    gt_idxes = gt_mask.astype(np.int64)
+    gt_idxes[(gt_idxes < 0) | (gt_idxes >= class_count)] = class_count
+    return gt_idxes
+
+
+def get_prediction_maps(
+    prediction: Union[np.ndarray, SemSegPredictionContainer], class_count: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the predicted class index and its score of each pixel. Channels
+    after the first `class_count` channels (e.g. a void class) mean no class.
+
+    Args:
+        prediction: Scores with the shape (height, width, channels) or a
+            SemSegPredictionContainer with the argmax already applied
+        class_count: Number of classes
+
+    Returns:
+        Tuple of the class indexes (int64) and the scores with the shape (height, width)
+    """
+    if isinstance(prediction, SemSegPredictionContainer):
+        pred_idxes = prediction.max_prediction_idxes.astype(np.int64)
+        pred_scores = prediction.max_prediction_values
+    else:
+        pred_idxes = np.argmax(prediction, axis=2)
+        pred_scores = np.take_along_axis(
+            prediction, pred_idxes[:, :, np.newaxis], axis=2
+        )[:, :, 0]
+    pred_idxes = np.minimum(pred_idxes, class_count)
+    return pred_idxes, pred_scores
+
+
+def compute_confusion_histogram(
+    gt_idxes: np.ndarray,
+    pred_idxes: np.ndarray,
+    pred_scores: np.ndarray,
+    class_count: int,
+    thresholds: np.ndarray,
+) -> np.ndarray:
+    """
+    Counts the pixels per ground truth class, predicted class and score bin
+    with one `np.bincount`. The score bin of a pixel is the number of
+    thresholds which its score reaches, so a pixel keeps its predicted class
+    at the thresholds below its bin.
+
+    Args:
+        gt_idxes: Ground truth class index of each pixel (see `get_gt_class_indexes`)
+        pred_idxes: Predicted class index of each pixel
+        pred_scores: Score of the predicted class of each pixel
+        class_count: Number of classes; index `class_count` means no class
+        thresholds: Ascending score thresholds
+
+    Returns:
+        int64 array with the shape (class_count + 1, class_count + 1, len(thresholds) + 1)
+    """
+    label_count = class_count + 1
+    bin_count = len(thresholds) + 1
+    score_bins = np.searchsorted(thresholds, pred_scores.ravel(), side="right")
+    flat_idxes = (
+        gt_idxes.ravel() * label_count + pred_idxes.ravel()
+    ) * bin_count + score_bins
+    return np.bincount(
+        flat_idxes, minlength=label_count * label_count * bin_count
+    ).reshape(label_count, label_count, bin_count)
+
+
+def histogram_to_confusion_matrices(histogram: np.ndarray) -> np.ndarray:
+    """
+    Converts a confusion histogram (see `compute_confusion_histogram`) to one
+    confusion matrix per threshold. At threshold i the pixels of the score
+    bins above i keep their predicted class and all other pixels are
+    predicted as no class.
+
+    Args:
+        histogram: Pixel counts with the shape (labels, labels, thresholds + 1)
+
+    Returns:
+        Confusion matrices with the shape (thresholds, labels, labels),
+        where the rows are the ground truth and the columns the prediction
+    """
+    kept_counts = np.cumsum(histogram[..., ::-1], axis=-1)[..., ::-1][..., 1:]
+    confusion_matrices = np.moveaxis(kept_counts, -1, 0).copy()
+    confusion_matrices[:, :, -1] = 0
+    confusion_matrices[:, :, -1] = histogram.sum(axis=(1, 2)) - confusion_matrices.sum(
+        axis=2
+    )
+    return confusion_matrices
+
+
+def _divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Divides elementwise with NaN where the denominator is zero"""
+    result = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result
+
+
+@dataclass
+class SemSegConfusionResult:
+    """Confusion matrices of all thresholds with the shape
+    (thresholds, classes + 1, classes + 1). The rows are the ground truth,
+    the columns the prediction and the last row and column mean no class.
+    The metrics have the shape (thresholds, classes) and are NaN if undefined."""
+
+    thresholds: np.ndarray
+    confusion_matrices: np.ndarray
+
+    def get_true_positives(self) -> np.ndarray:
+        """Returns the correctly predicted pixels per threshold and class"""
+        return np.diagonal(self.confusion_matrices, axis1=1, axis2=2)[:, :-1]
+
+    def get_false_positives(self) -> np.ndarray:
+        """Returns the pixels wrongly predicted as the class"""
+        return self.confusion_matrices.sum(axis=1)[:, :-1] - self.get_true_positives()
+
+    def get_false_negatives(self) -> np.ndarray:
+        """Returns the pixels of the class predicted as another or no class"""
+        return self.confusion_matrices.sum(axis=2)[:, :-1] - self.get_true_positives()
+
+    def get_iou(self) -> np.ndarray:
+        """Returns the IoU per threshold and class"""
+        true_positives = self.get_true_positives()
+        return _divide(
+            true_positives,
+            true_positives + self.get_false_positives() + self.get_false_negatives(),
+        )
+
+    def get_dice(self) -> np.ndarray:
+        """Returns the Dice coefficient (F1 score) per threshold and class"""
+        true_positives = self.get_true_positives()
+        return _divide(
+            2 * true_positives,
+            2 * true_positives
+            + self.get_false_positives()
+            + self.get_false_negatives(),
+        )
+
+    def get_precision(self) -> np.ndarray:
+        """Returns the precision per threshold and class"""
+        true_positives = self.get_true_positives()
+        return _divide(true_positives, true_positives + self.get_false_positives())
+
+    def get_recall(self) -> np.ndarray:
+        """Returns the recall per threshold and class"""
+        true_positives = self.get_true_positives()
+        return _divide(true_positives, true_positives + self.get_false_negatives())
+
+
+class SemSegConfusionAccumulator:
+    """Accumulates the confusion histograms of multiple samples, from which
+    the confusion matrices and metrics of all thresholds are derived at once"""
+
+    def __init__(self, class_count: int, thresholds: Sequence[float]):
+        """
+        Constructor of the SemSegConfusionAccumulator
+        Args:
+            class_count: Number of classes
+            thresholds: Score thresholds; a pixel is predicted as its argmax
+                class, if its score is at least the threshold
+        """
+        self.class_count = class_count
+        self.thresholds = np.unique(np.asarray(thresholds, dtype=np.float64))
+        self.histogram = np.zeros(
+            (class_count + 1, class_count + 1, len(self.thresholds) + 1),
+            dtype=np.int64,
+        )
+
+    def add(
+        self,
+        gt_mask: np.ndarray,
+        prediction: Union[np.ndarray, SemSegPredictionContainer],
+    ):
+        """Adds the pixels of one sample (see `get_gt_class_indexes` and
+        `get_prediction_maps` for the supported formats)"""
+        pred_idxes, pred_scores = get_prediction_maps(prediction, self.class_count)
+        gt_idxes = get_gt_class_indexes(gt_mask, self.class_count)
+        if gt_idxes.shape != pred_idxes.shape:
+            raise ValueError(
+                f"The ground truth mask shape {gt_idxes.shape} differs from "
+                f"the prediction shape {pred_idxes.shape}"
+            )
+        self.histogram += compute_confusion_histogram(
+            gt_idxes,
+            pred_idxes,
+            pred_scores,
+            self.class_count,
+            self.thresholds,
+        )
+
+    def get_result(self) -> SemSegConfusionResult:
+        """Returns the confusion matrices of all added samples"""
+        return SemSegConfusionResult(
+            thresholds=self.thresholds,
+            confusion_matrices=histogram_to_confusion_matrices(self.histogram),
+        )
@@ -1,40 +1,49 @@
 """Module for TensorIou TensorMetric"""
-from os import makedirs
-from os.path import isdir, join
+from typing import List, Optional
 
 import numpy as np
-import pyximport
 
 from niceml.data.datadescriptions.semsegdatadescritption import SemSegDataDescription
 from niceml.data.datainfos.semsegdatainfo import SemSegData
+from niceml.mlcomponents.resultanalyzers.tensors.semsegconfusion import (
+    SemSegConfusionAccumulator,
+)
 from niceml.mlcomponents.resultanalyzers.tensors.tensormetric import TensorMetric
 
-pyximport.install(setup_args={"include_dirs": np.get_include()})
-# pylint: disable=import-error,wrong-import-position,no-name-in-module
-from niceml.mlcomponents.resultanalyzers.tensors.cytensoriou import cy_calc_iou
-
 
 class TensorIoU(TensorMetric):
-    """TensorMetric for calculating the IoU"""
+    """TensorMetric for calculating the IoU, Dice, precision and recall of
+    semantic segmentation predictions. Each pixel is predicted as its argmax
+    class, if the score reaches the threshold, otherwise as no class. The
+    confusion matrices of all thresholds are accumulated in one pass over
+    the data (see `SemSegConfusionAccumulator`)."""
 
     def __init__(
         self,
         key: str,
         threshold: float = 0.5,
+        thresholds: Optional[List[float]] = None,
     ):
+        """
+        Constructor of TensorIoU
+        Args:
+            key: Key of the metric
+            threshold: Score threshold of the per class metrics
+            thresholds: Additional score thresholds, for which the mean metrics
+                over the classes are reported
+        """
         super().__init__(key)
         self.threshold = threshold
-        self.data_description = None
-        self.intersection_sum = None
-        self.union_sum = None
+        self.thresholds: List[float] = sorted(set([threshold] + (thresholds or [])))
+        self.accumulator: Optional[SemSegConfusionAccumulator] = None
 
     def start_analysis(self):
-        self.data_description: SemSegDataDescription = (
-            self.exp_context.instantiate_datadescription_from_yaml()
+        """Creates the confusion accumulator for the classes of the data description"""
+        data_description: SemSegDataDescription = self.data_description
+        self.accumulator = SemSegConfusionAccumulator(
+            class_count=len(data_description.get_output_channel_names()),
+            thresholds=self.thresholds,
         )
-        store_folder = join(self.output_folder, self.dataset_name)
-        if not isdir(store_folder):
-            makedirs(store_folder)
 
     def analyse_datapoint(
         self,
@@ -44,20 +53,46 @@ class TensorIoU(TensorMetric):
         additional_data: dict,
         **kwargs,
     ):
-        data_predicted: np.ndarray
-        gt_array: np.ndarray = data_loaded.mask_image.astype(float)
-        if self.intersection_sum is None or self.union_sum is None:
-            self.intersection_sum: np.ndarray = np.zeros(gt_array.shape[2])
-            self.union_sum: np.ndarray = np.zeros(gt_array.shape[2])
-        intersect, union = cy_calc_iou(data_predicted, gt_array, self.threshold)
-        self.intersection_sum += intersect
-        self.union_sum += union
+        """Adds the pixels of the prediction (scores or SemSegPredictionContainer)
+        and the ground truth mask to the confusion matrices"""
+        self.accumulator.add(data_loaded.mask_image, data_predicted)
 
     def get_final_metric(self) -> dict:
-        class_iou = self.intersection_sum / self.union_sum
-        mean_iou = float(np.mean(class_iou))
-        iou_dict = dict(mean_iou=mean_iou)
-        for idx, name in enumerate(self.data_description.get_class_names()):
+        """Returns the mean and per class IoU, Dice, precision and recall at
+        `threshold` and the mean metrics of all thresholds"""
+        result = self.accumulator.get_result()
+        class_names = self.data_description.get_output_channel_names()
+        threshold_idx = int(np.searchsorted(result.thresholds, self.threshold))
+        class_metrics = dict(
+            iou=result.get_iou(),
+            dice=result.get_dice(),
+            precision=result.get_precision(),
+            recall=result.get_recall(),
+        )
+        class_iou = class_metrics["iou"][threshold_idx]
+        iou_dict = dict(mean_iou=_nanmean(class_iou))
+        for idx, name in enumerate(class_names):
             iou_dict[f"iou_{name}"] = float(class_iou[idx])
+        for metric_name in ["dice", "precision", "recall"]:
+            metric_values = class_metrics[metric_name][threshold_idx]
+            iou_dict[f"mean_{metric_name}"] = _nanmean(metric_values)
+            iou_dict[metric_name] = {
+                name: float(metric_values[idx]) for idx, name in enumerate(class_names)
+            }
+        if len(result.thresholds) > 1:
+            for metric_name, metric_values in class_metrics.items():
+                iou_dict[f"mean_{metric_name}_per_threshold"] = {
+                    f"{threshold:.2f}": _nanmean(threshold_values)
+                    for threshold, threshold_values in zip(
+                        result.thresholds, metric_values
+                    )
+                }
 
         return iou_dict
+
+
+def _nanmean(values: np.ndarray) -> float:
+    """Returns the mean of the defined values or NaN if none is defined"""
+    if np.all(np.isnan(values)):
+        return float("nan")
+    return float(np.nanmean(values))
@@ -29,21 +29,17 @@ class ObjDetTargetTransformer(NetTargetTransformer):
     def get_net_targets(self, data_list: List[ObjDetData]) -> np.ndarray:
         if self.anchors is None:
             if isinstance(self.data_description, OutputObjDetDataDescription):
-                self.anchors = self.anchor_generator.generate_anchors(
+                self.anchors = self.anchor_generator.generate_anchor_array(
                     self.data_description
-                )
+                ).ullr
             else:
                 raise TypeError(
                     "data_description must be an instance of OutputObjDetDataDescription"
                 )
 
-        target_list = [
-            self.anchor_encoder.encode_anchors(
-                anchor_list=self.anchors,
-                gt_labels=curr_obj_data.labels,
-                num_classes=self.data_description.get_output_class_count(),
-                box_variance=self.data_description.get_box_variance(),
-            )
-            for curr_obj_data in data_list
-        ]
-        return np.array(target_list)
+        return self.anchor_encoder.encode_anchor_batch(
+            anchor_list=self.anchors,
+            gt_labels_batch=[curr_obj_data.labels for curr_obj_data in data_list],
+            num_classes=self.data_description.get_output_class_count(),
+            box_variance=self.data_description.get_box_variance(),
+        )
@@ -0,0 +1,278 @@
+"""Module to benchmark the throughput of the datasets of a train job config"""
+import multiprocessing
+import queue
+import resource
+import sys
+import time
+from tempfile import TemporaryDirectory
+from typing import Optional, Tuple
+
+import pandas as pd
+from hydra.utils import ConvertMode, instantiate
+
+from niceml.data.datadescriptions.datadescription import DataDescription
+from niceml.data.datasets.dataset import Dataset
+from niceml.data.datasets.genericdataset import GenericDataset
+from niceml.experiments.experimentcontext import ExperimentContext
+from niceml.scripts.hydraconfreader import load_hydra_conf
+from niceml.utilities.fsspec.locationutils import LocationConfig
+from niceml.utilities.omegaconfutils import register_niceml_resolvers
+from niceml.utilities.stagetimer import StageTimer
+
+KILOBYTES_PER_MEGABYTE = 1024
+
+
+def load_train_dataset(
+    config_path: str, set_name: str = "train"
+) -> Tuple[Dataset, DataDescription]:
+    """
+    Instantiates a dataset and the data description of the train op of a
+    job_train config
+
+    Args:
+        config_path: Path to the job_train config
+        set_name: Name of the dataset in the train op config (train or validation)
+
+    Returns:
+        The not initialized dataset and the data description
+    """
+    register_niceml_resolvers()
+    train_config = load_hydra_conf(config_path)["ops"]["train"]["config"]
+    dataset: Dataset = instantiate(
+        train_config[f"data_{set_name}"], _convert_=ConvertMode.ALL
+    )
+    data_description: DataDescription = instantiate(
+        train_config["data_description"], _convert_=ConvertMode.ALL
+    )
+    return dataset, data_description
+
+
+def max_rss_to_mb(max_rss: int) -> float:
+    """Converts `ru_maxrss` to MB, which is given in bytes on macOS and
+    in kilobytes on Linux"""
+    if sys.platform == "darwin":
+        return max_rss / KILOBYTES_PER_MEGABYTE**2
+    return max_rss / KILOBYTES_PER_MEGABYTE
+
+
+def get_peak_rss_mb() -> float:
+    """Returns the peak resident set size of this process in MB. The peak is
+    the high-water mark of the whole process lifetime."""
+    return max_rss_to_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def get_children_peak_rss_mb() -> float:
+    """Returns the peak resident set size of the largest terminated child
+    process (e.g. a multiprocessing worker) in MB"""
+    return max_rss_to_mb(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+
+def iterate_batches(
+    dataset: Dataset,
+    batch_count: int,
+    workers: int = 0,
+    max_queue_size: int = 10,
+    use_multiprocessing: bool = False,
+):
+    """
+    Yields `batch_count` batches of a dataset and starts a new epoch after the
+    last batch of an epoch. With workers the batches are prefetched in parallel
+    with the keras OrderedEnqueuer, which is also used by `model.fit`.
+
+    Args:
+        dataset: Initialized dataset to iterate
+        batch_count: Number of batches to yield
+        workers: Number of workers loading batches in parallel.
+            0 loads the batches sequentially.
+        max_queue_size: Maximum number of prefetched batches
+        use_multiprocessing: Whether the workers are processes instead of threads
+    """
+    if workers == 0:
+        for batch_idx in range(batch_count):
+            yield dataset[batch_idx % len(dataset)]
+            if (batch_idx + 1) % len(dataset) == 0:
+                dataset.on_epoch_end()
+        return
+
+    from keras.utils import (  # pylint: disable=import-outside-toplevel
+        OrderedEnqueuer,
+    )
+
+    enqueuer = OrderedEnqueuer(dataset, use_multiprocessing=use_multiprocessing)
+    enqueuer.start(workers=workers, max_queue_size=max_queue_size)
+    try:
+        batch_generator = enqueuer.get()
+        for _ in range(batch_count):
+            yield next(batch_generator)
+    finally:
+        enqueuer.stop()
+
+
+def benchmark_dataset(  # noqa: PLR0913
+    dataset: Dataset,
+    batch_count: int,
+    workers: int = 0,
+    max_queue_size: int = 10,
+    use_multiprocessing: bool = False,
+) -> Tuple[dict, pd.DataFrame]:
+    """
+    Measures how fast a dataset provides batches without a model
+
+    Args:
+        dataset: Initialized dataset to benchmark
+        batch_count: Number of batches to load
+        workers: Number of workers loading batches in parallel.
+            0 loads the batches sequentially.
+        max_queue_size: Maximum number of prefetched batches
+        use_multiprocessing: Whether the workers are processes instead of threads
+
+    Returns:
+        A dict with the batches per second and the peak RSS and the stage
+        latencies per epoch. The peak RSS is the peak of the whole process,
+        so it only belongs to this run, if the run has its own process
+        (see `run_dataset_benchmark`). The stage latencies are only available
+        for GenericDatasets, which are not loaded in worker processes.
+    """
+    stage_timer: Optional[StageTimer] = None
+    if isinstance(dataset, GenericDataset):
+        stage_timer = StageTimer()
+        dataset.stage_timer = stage_timer
+
+    start_time = time.perf_counter()
+    for _ in iterate_batches(
+        dataset,
+        batch_count,
+        workers=workers,
+        max_queue_size=max_queue_size,
+        use_multiprocessing=use_multiprocessing,
+    ):
+        pass
+    duration = time.perf_counter() - start_time
+
+    stage_df = pd.DataFrame()
+    if stage_timer is not None:
+        stage_timer.aggregate_epoch()
+        stage_df = stage_timer.get_records_df()
+        dataset.stage_timer = None
+    result = dict(
+        workers=workers,
+        max_queue_size=max_queue_size,
+        use_multiprocessing=use_multiprocessing,
+        batches=batch_count,
+        duration_sec=duration,
+        batches_per_sec=batch_count / duration,
+        peak_rss_mb=get_peak_rss_mb(),
+        children_peak_rss_mb=get_children_peak_rss_mb(),
+    )
+    return result, stage_df
+
+
+def benchmark_config(
+    config_path: str, batch_count: int, set_name: str, run_config: dict
+) -> Tuple[dict, pd.DataFrame]:
+    """
+    Instantiates and initializes the dataset of a job_train config and
+    benchmarks it with one run configuration
+
+    Args:
+        config_path: Path to the job_train config
+        batch_count: Number of batches to load
+        set_name: Name of the dataset in the train op config (train or validation)
+        run_config: Keyword arguments of `benchmark_dataset`
+
+    Returns:
+        The result dict and the stage latencies of `benchmark_dataset`
+    """
+    dataset, data_description = load_train_dataset(config_path, set_name)
+    with TemporaryDirectory() as tmp_dir:
+        exp_context = ExperimentContext(
+            fs_config=LocationConfig(uri=tmp_dir),
+            run_id="benchmark",
+            short_id="bench",
+        )
+        dataset.initialize(data_description, exp_context)
+        result, stage_df = benchmark_dataset(dataset, batch_count, **run_config)
+        dataset.on_training_end()
+    return result, stage_df
+
+
+def _benchmark_config_process(result_queue: multiprocessing.Queue, *args):
+    """Runs `benchmark_config` in a subprocess and sends back the result or
+    the raised error"""
+    try:
+        result_queue.put(benchmark_config(*args))
+    except Exception as error:  # pylint: disable=broad-except
+        result_queue.put(error)
+
+
+def benchmark_config_in_subprocess(
+    config_path: str, batch_count: int, set_name: str, run_config: dict
+) -> Tuple[dict, pd.DataFrame]:
+    """Runs `benchmark_config` in a new process, so the peak RSS of the
+    result only belongs to this run configuration"""
+    spawn_context = multiprocessing.get_context("spawn")
+    result_queue = spawn_context.Queue()
+    process = spawn_context.Process(
+        target=_benchmark_config_process,
+        args=(result_queue, config_path, batch_count, set_name, run_config),
+    )
+    process.start()
+    try:
+        while True:
+            try:
+                process_result = result_queue.get(timeout=1.0)
+                break
+            except queue.Empty as error:
+                if not process.is_alive():
+                    raise RuntimeError(
+                        f"The benchmark process exited with code {process.exitcode}"
+                    ) from error
+    finally:
+        process.join()
+    if isinstance(process_result, Exception):
+        raise process_result
+    return process_result
+
+
+def run_dataset_benchmark(  # noqa: PLR0913
+    config_path: str,
+    batch_count: int,
+    set_name: str = "train",
+    workers: int = 4,
+    max_queue_size: int = 10,
+    use_multiprocessing: bool = False,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Benchmarks a dataset of a job_train config once with sequential loading
+    and once with parallel prefetching. Each run is executed in its own
+    process, so the peak RSS of the runs can be compared.
+
+    Args:
+        config_path: Path to the job_train config
+        batch_count: Number of batches to load in each run
+        set_name: Name of the dataset in the train op config (train or validation)
+        workers: Number of workers of the parallel run. 0 skips the parallel run.
+        max_queue_size: Maximum number of prefetched batches of the parallel run
+        use_multiprocessing: Whether the workers are processes instead of threads
+
+    Returns:
+        One row with the throughput per run and the stage latencies of all runs
+    """
+    run_configs = [dict(workers=0)]
+    if workers > 0:
+        run_configs.append(
+            dict(
+                workers=workers,
+                max_queue_size=max_queue_size,
+                use_multiprocessing=use_multiprocessing,
+            )
+        )
+    results = []
+    stage_dfs = []
+    for run_config in run_configs:
+        result, stage_df = benchmark_config_in_subprocess(
+            config_path, batch_count, set_name, run_config
+        )
+        results.append(result)
+        stage_dfs.append(stage_df.assign(workers=result["workers"]))
+    return pd.DataFrame(results), pd.concat(stage_dfs, ignore_index=True)
@@ -52,31 +52,25 @@ def decode_boxes(
 
     Args:
         anchor_boxes_xywh: Anchor boxes in x,y,width,height format
-        encoded_array_xywh: Encoded boxes in x,y,width,height format
+        encoded_array_xywh: Encoded boxes in x,y,width,height format. Can have
+            leading batch axes, e.g. (batch_size, num_anchors, 4).
         box_variances: Box variance to scale by
 
     Returns:
         The decoded boxes x,y,width,height format
+        with the shape of `encoded_array_xywh`
     """
     x_pos = (
-        encoded_array_xywh[:, 0] * box_variances[0] * anchor_boxes_xywh[:, 2]
+        encoded_array_xywh[..., 0] * box_variances[0] * anchor_boxes_xywh[:, 2]
     ) + anchor_boxes_xywh[:, 0]
     y_pos = (
-        encoded_array_xywh[:, 1] * box_variances[1] * anchor_boxes_xywh[:, 3]
+        encoded_array_xywh[..., 1] * box_variances[1] * anchor_boxes_xywh[:, 3]
     ) + anchor_boxes_xywh[:, 1]
     width = (
-        np.exp(encoded_array_xywh[:, 2] * box_variances[2]) * anchor_boxes_xywh[:, 2]
+        np.exp(encoded_array_xywh[..., 2] * box_variances[2]) * anchor_boxes_xywh[:, 2]
     )
     height = (
-        np.exp(encoded_array_xywh[:, 3] * box_variances[3]) * anchor_boxes_xywh[:, 3]
+        np.exp(encoded_array_xywh[..., 3] * box_variances[3]) * anchor_boxes_xywh[:, 3]
     )
 
-    return np.concatenate(
-        (
-            x_pos[:, np.newaxis],
-            y_pos[:, np.newaxis],
-            width[:, np.newaxis],
-            height[:, np.newaxis],
-        ),
-        axis=1,
-    )
+    return np.stack((x_pos, y_pos, width, height), axis=-1)
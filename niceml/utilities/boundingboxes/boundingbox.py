@@ -12,9 +12,11 @@ NEGATIVE_MASK_VALUE = 2.0
 POSITIVE_MASK_VALUE = 3.0
 
 
-@define
+@define(weakref_slot=False)
 class BoundingBox:
-    """Class to represent a bounding box and its methods"""
+    """Class to represent a bounding box and its methods. The class is slotted
+    without a weakref slot to keep the memory of each box small. For many
+    boxes use `BoxArray` instead."""
 
     x_pos: float  # QUEST: center coordinates?
     y_pos: float
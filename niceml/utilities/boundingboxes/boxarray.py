@@ -0,0 +1,128 @@
+"""Module for BoxArray, an array of bounding boxes with vectorised methods"""
+from itertools import chain
+from typing import List, Sequence, Union
+
+import numpy as np
+from attrs import define, field
+
+from niceml.utilities.boundingboxes.bboxconversion import (
+    convert_to_ullr,
+    convert_to_xywh,
+)
+from niceml.utilities.boundingboxes.bboxencoding import decode_boxes, encode_boxes
+from niceml.utilities.boundingboxes.boundingbox import BoundingBox
+from niceml.utilities.imagesize import ImageSize
+from niceml.utilities.ioumatrix import compute_iou_matrix
+
+
+def _to_xywh_array(boxes_xywh: np.ndarray) -> np.ndarray:
+    """Converts the boxes to a float32 array with the shape (N, 4).
+    Float32 arrays are not copied."""
+    return np.asarray(boxes_xywh, dtype=np.float32).reshape(-1, 4)
+
+
+@define(eq=False)
+class BoxArray:
+    """Bounding boxes stored in one float32 array with the shape (N, 4) in
+    xywh format. The methods correspond to the methods of `BoundingBox`,
+    but are applied to all boxes at once."""
+
+    xywh: np.ndarray = field(converter=_to_xywh_array)
+
+    @classmethod
+    def from_ullr(cls, boxes_ullr: np.ndarray) -> "BoxArray":
+        """Creates a BoxArray from boxes in ullr format with the shape (N, 4)"""
+        return cls(convert_to_xywh(np.asarray(boxes_ullr, dtype=np.float32)))
+
+    @classmethod
+    def from_bounding_boxes(cls, bounding_boxes: Sequence[BoundingBox]) -> "BoxArray":
+        """Creates a BoxArray from BoundingBoxes by writing their coordinates
+        directly into one array without intermediate lists"""
+        return cls(
+            np.fromiter(
+                chain.from_iterable(
+                    (bbox.x_pos, bbox.y_pos, bbox.width, bbox.height)
+                    for bbox in bounding_boxes
+                ),
+                dtype=np.float32,
+                count=4 * len(bounding_boxes),
+            )
+        )
+
+    def to_bounding_boxes(self) -> List[BoundingBox]:
+        """Returns one BoundingBox per box"""
+        return [BoundingBox(*box_xywh) for box_xywh in self.xywh.tolist()]
+
+    def __len__(self) -> int:
+        """Returns the number of boxes"""
+        return len(self.xywh)
+
+    def __getitem__(
+        self, index: Union[int, slice, np.ndarray]
+    ) -> Union[BoundingBox, "BoxArray"]:
+        """Returns a BoundingBox for an int index, otherwise a BoxArray"""
+        if isinstance(index, (int, np.integer)):
+            return BoundingBox(*self.xywh[index].tolist())
+        return BoxArray(self.xywh[index])
+
+    def __eq__(self, other: "BoxArray") -> bool:
+        """Checks if two BoxArrays contain the (nearly) same boxes"""
+        if isinstance(other, BoxArray):
+            return self.xywh.shape == other.xywh.shape and np.allclose(
+                self.xywh, other.xywh
+            )
+        return False
+
+    def get_absolute_ullr(self) -> np.ndarray:
+        """Returns the upper-left and lower-right coordinates with the shape (N, 4)"""
+        return convert_to_ullr(self.xywh)
+
+    def get_absolute_area(self) -> np.ndarray:
+        """Returns the area (= width * height) of each box"""
+        return self.xywh[:, 2] * self.xywh[:, 3]
+
+    def get_relative_area(self, image_size: ImageSize) -> np.ndarray:
+        """Returns the area of each box relative to the image area"""
+        return self.get_absolute_area() / (image_size.width * image_size.height)
+
+    def calc_iou(self, other: "BoxArray") -> np.ndarray:
+        """Calculates the IoU matrix with the shape (len(self), len(other))"""
+        if not isinstance(other, BoxArray):
+            raise TypeError(f"other is not type BoxArray but {type(other)}")
+        return compute_iou_matrix(self.get_absolute_ullr(), other.get_absolute_ullr())
+
+    def encode(self, gt_boxes: "BoxArray", box_variance: List[float]) -> np.ndarray:
+        """Encodes the anchors (self) with the ground truth box of the same
+        index to net targets with the shape (N, 4)"""
+        return encode_boxes(
+            self.xywh, gt_boxes.xywh, np.array(box_variance, dtype=np.float32)
+        )
+
+    def decode(
+        self, predicted_values: np.ndarray, box_variance: List[float]
+    ) -> "BoxArray":
+        """Decodes the predicted net values of the anchors (self) to boxes"""
+        return BoxArray(
+            decode_boxes(
+                self.xywh,
+                np.asarray(predicted_values, dtype=np.float32),
+                np.array(box_variance, dtype=np.float32),
+            )
+        )
+
+    def scale(self, scale: float) -> "BoxArray":
+        """Scales all coordinates by a given scale factor. Unlike
+        `BoundingBox.scale` the coordinates are not rounded."""
+        return BoxArray(self.xywh * np.float32(scale))
+
+    def shift(self, x_shift: float = 0.0, y_shift: float = 0.0) -> "BoxArray":
+        """Shifts all boxes by `x_shift` and `y_shift` pixels"""
+        return BoxArray(self.xywh + np.array([x_shift, y_shift, 0, 0], np.float32))
+
+    def clip(self, image_size: ImageSize) -> "BoxArray":
+        """Clips the boxes to the image. Boxes outside of the image
+        get a width or height of zero."""
+        boxes_ullr = self.get_absolute_ullr()
+        np.clip(boxes_ullr[:, 0::2], 0, image_size.width, out=boxes_ullr[:, 0::2])
+        np.clip(boxes_ullr[:, 1::2], 0, image_size.height, out=boxes_ullr[:, 1::2])
+        return BoxArray.from_ullr(boxes_ullr)
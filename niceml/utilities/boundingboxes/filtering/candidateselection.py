@@ -0,0 +1,50 @@
+"""Module for selecting prediction candidates before decoding and filtering"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def score_to_logit(score: float) -> float:
+    """Converts a sigmoid score to the logit which results in this score.
+    The scores 0 and 1 result in -inf and inf."""
+    with np.errstate(divide="ignore"):
+        return float(np.log(score) - np.log1p(-score))
+
+
+def select_candidates(
+    prediction_batch: np.ndarray,
+    coordinates_count: int,
+    score_threshold: Optional[float] = None,
+    top_k: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Selects the candidates of a batch of predictions by the maximum class score
+    of each anchor. Because sigmoid is monotonic, this also works on logits
+    with a threshold converted by `score_to_logit`.
+
+    Args:
+        prediction_batch: Predictions with the shape
+            (batch_size, anchor_count, coordinates_count + class_count)
+        coordinates_count: Number of coordinates before the class scores
+        score_threshold: Minimum maximum class score (inclusive) of a candidate.
+            All anchors are candidates if None.
+        top_k: Maximum number of candidates per image with the highest scores.
+            Not limited if None.
+
+    Returns:
+        The batch indexes and the anchor indexes of the candidates,
+        ordered by batch index
+    """
+    max_scores = np.max(prediction_batch[..., coordinates_count:], axis=-1)
+    candidate_mask = (
+        np.ones(max_scores.shape, dtype=bool)
+        if score_threshold is None
+        else max_scores >= score_threshold
+    )
+    if top_k is not None and top_k < max_scores.shape[1]:
+        masked_scores = np.where(candidate_mask, max_scores, -np.inf)
+        top_k_idxes = np.argpartition(-masked_scores, top_k - 1, axis=1)[:, :top_k]
+        top_k_mask = np.zeros(max_scores.shape, dtype=bool)
+        np.put_along_axis(top_k_mask, top_k_idxes, True, axis=1)
+        candidate_mask &= top_k_mask
+    return np.nonzero(candidate_mask)
@@ -1,5 +1,5 @@
 """Module for NmsFilter"""
-from typing import List
+from typing import List, Optional
 
 import numpy as np
 from attrs import define
@@ -11,14 +11,20 @@ from niceml.utilities.boundingboxes.bboxconversion import (
 from niceml.utilities.boundingboxes.filtering.predictionfilter import PredictionFilter
 from niceml.utilities.ioumatrix import compute_iou_matrix
 
+NMS_BLOCK_SIZE = 1024
+
 
 @define
 class NmsFilter(PredictionFilter):  # pylint: disable=too-few-public-methods
-    """Applies non-maximum suppression (nms) filtering to predictions"""
+    """Applies non-maximum suppression (nms) filtering to predictions.
+    All classes are suppressed in one vectorised pass."""
 
     iou_threshold: float = 0.5
     score_threshold: float = 0.5
     coordinates_count: int = 4
+    top_k: Optional[int] = None
+    class_agnostic: bool = False
+    soft_nms_sigma: Optional[float] = None
 
     def filter(self, prediction_array_xywh: np.ndarray) -> np.ndarray:
         return non_maximum_suppression(
@@ -27,15 +33,147 @@ class NmsFilter(PredictionFilter):  # pylint: disable=too-few-public-methods
             coordinates_count=self.coordinates_count,
             score_threshold=self.score_threshold,
             class_count=self.output_class_count,
+            top_k=self.top_k,
+            class_agnostic=self.class_agnostic,
+            soft_nms_sigma=self.soft_nms_sigma,
+        )
+
+    def filter_batch(self, prediction_batch_xywh: np.ndarray) -> List[np.ndarray]:
+        """Filters the predictions of multiple images with the shape
+        (batch_size, anchor_count, 4 + num_classes) and returns
+        the kept predictions of each image"""
+        return batched_non_maximum_suppression(
+            prediction_batch_xywh=prediction_batch_xywh,
+            iou_threshold=self.iou_threshold,
+            coordinates_count=self.coordinates_count,
+            score_threshold=self.score_threshold,
+            class_count=self.output_class_count,
+            top_k=self.top_k,
+            class_agnostic=self.class_agnostic,
+            soft_nms_sigma=self.soft_nms_sigma,
+        )
+
+
+def select_top_k_candidates(
+    scores: np.ndarray, score_threshold: float, top_k: Optional[int] = None
+) -> np.ndarray:
+    """
+    Selects the indexes of the predictions with a score above the threshold
+
+    Args:
+        scores: Array with the score of each prediction
+        score_threshold: Prediction score threshold for predictions to keep
+        top_k: Maximum number of selected predictions. All are selected if None.
+
+    Returns:
+        Indexes of the selected predictions sorted by descending score
+    """
+    candidate_idxes = np.flatnonzero(scores > score_threshold)
+    if top_k is not None and len(candidate_idxes) > top_k:
+        candidate_idxes = candidate_idxes[
+            np.argpartition(-scores[candidate_idxes], top_k - 1)[:top_k]
+        ]
+    return candidate_idxes[np.argsort(-scores[candidate_idxes], kind="stable")]
+
+
+def offset_boxes_by_class(
+    boxes_ullr: np.ndarray, class_indexes: np.ndarray
+) -> np.ndarray:
+    """Shifts the boxes of each class into a separate region, so boxes of
+    different classes never overlap and can be suppressed in one pass"""
+    class_offset = (
+        np.max(boxes_ullr) - np.min(boxes_ullr) + 1.0 if len(boxes_ullr) > 0 else 0.0
+    )
+    return boxes_ullr + (class_indexes * class_offset)[:, np.newaxis]
+
+
+def compute_nms_keep_mask(
+    boxes_ullr: np.ndarray, iou_threshold: float, block_size: int = NMS_BLOCK_SIZE
+) -> np.ndarray:
+    """
+    Computes which boxes are kept by greedy non-maximum suppression with matrix
+    operations only (Cluster-NMS). The boxes are processed in blocks. Each block
+    is first suppressed by the kept boxes of the previous blocks and then the
+    suppression inside the block is iterated until no kept box changes, which
+    gives exactly the result of greedy nms.
+
+    Args:
+        boxes_ullr: Boxes in ullr format sorted by descending score
+        iou_threshold: Boxes with a higher IoU to a kept box with a higher
+            score are suppressed
+        block_size: Number of boxes per block, which bounds the size
+            of the computed IoU matrices
+
+    Returns:
+        Boolean mask with the kept boxes
+    """
+    keep_mask = np.zeros(len(boxes_ullr), dtype=bool)
+    for block_start in range(0, len(boxes_ullr), block_size):
+        block_boxes = boxes_ullr[block_start : block_start + block_size]
+        kept_boxes = boxes_ullr[:block_start][keep_mask[:block_start]]
+        block_keep_mask = ~np.any(
+            compute_iou_matrix(kept_boxes, block_boxes) > iou_threshold, axis=0
+        )
+        overlap_matrix = np.triu(
+            compute_iou_matrix(block_boxes, block_boxes) > iou_threshold, k=1
         )
+        cur_keep_mask = block_keep_mask
+        while True:
+            new_keep_mask = block_keep_mask & ~np.any(
+                overlap_matrix[cur_keep_mask], axis=0
+            )
+            if np.array_equal(new_keep_mask, cur_keep_mask):
+                break
+            cur_keep_mask = new_keep_mask
+        keep_mask[block_start : block_start + block_size] = cur_keep_mask
+    return keep_mask
 
 
-def non_maximum_suppression(  # pylint: disable=too-many-locals
+def compute_soft_nms_decay(
+    boxes_ullr: np.ndarray, sigma: float, block_size: int = NMS_BLOCK_SIZE
+) -> np.ndarray:
+    """
+    Computes the gaussian score decay of soft non-maximum suppression with
+    matrix operations only (Matrix-NMS). The decay of a box depends on its IoU
+    with all boxes of a higher score and is computed in blocks of boxes.
+
+    Args:
+        boxes_ullr: Boxes in ullr format sorted by descending score
+        sigma: Sigma of the gaussian decay. Smaller values suppress stronger.
+        block_size: Number of boxes per block, which bounds the size
+            of the computed IoU matrices
+
+    Returns:
+        Factor for the score of each box
+    """
+    score_decay = np.ones(len(boxes_ullr))
+    # IoU of each box with the box of a higher score it overlaps most
+    compensate_ious = np.zeros(len(boxes_ullr))
+    for block_start in range(0, len(boxes_ullr), block_size):
+        block_end = min(block_start + block_size, len(boxes_ullr))
+        iou_matrix = np.triu(
+            compute_iou_matrix(
+                boxes_ullr[:block_end], boxes_ullr[block_start:block_end]
+            ),
+            k=1 - block_start,
+        )
+        compensate_ious[block_start:block_end] = np.max(iou_matrix, axis=0)
+        decay_matrix = np.exp(
+            -(iou_matrix**2 - compensate_ious[:block_end, np.newaxis] ** 2) / sigma
+        )
+        score_decay[block_start:block_end] = np.min(decay_matrix, axis=0)
+    return score_decay
+
+
+def non_maximum_suppression(  # noqa: PLR0913
     prediction_array_xywh: np.ndarray,
     iou_threshold: float,
     coordinates_count: int,
     class_count: int,
     score_threshold: float = 0.5,
+    top_k: Optional[int] = None,
+    class_agnostic: bool = False,
+    soft_nms_sigma: Optional[float] = None,
 ) -> np.ndarray:
     """
     Filters the box predictions to get the most relevant boxes according to given parameters
@@ -45,53 +183,93 @@ def non_maximum_suppression(  # pylint: disable=too-many-locals
         coordinates_count: Number of coordinates in prediction array
         class_count: Number of classes in prediction array
         score_threshold: Prediction score threshold for predictions to keep
+        top_k: Maximum number of predictions after the score threshold which
+            are passed to the suppression. All are passed if None.
+        class_agnostic: Whether boxes of different classes suppress each other
+        soft_nms_sigma: If given, the class scores are decayed with gaussian
+            soft-nms instead of removing overlapping boxes. Boxes whose decayed
+            score is not above the score threshold are removed.
 
     Returns:
-        Array of prediction boxes to keep
+        Array of prediction boxes to keep sorted by descending score
     """
-    prediction_array_ullr = convert_to_ullr(prediction_array_xywh)
+    score_array = prediction_array_xywh[
+        :, coordinates_count : coordinates_count + class_count
+    ]
+    max_score = np.max(score_array, axis=1, initial=0.0)
+    candidate_idxes = select_top_k_candidates(max_score, score_threshold, top_k)
+    candidate_array_ullr = convert_to_ullr(prediction_array_xywh[candidate_idxes])
 
-    max_class_array = np.argmax(
-        prediction_array_ullr[:, coordinates_count : coordinates_count + class_count],
-        axis=1,
-    )
-    max_score = np.max(
-        prediction_array_ullr[:, coordinates_count : coordinates_count + class_count],
-        axis=1,
-    )
+    boxes_ullr = candidate_array_ullr[:, :coordinates_count]
+    if not class_agnostic:
+        boxes_ullr = offset_boxes_by_class(
+            boxes_ullr, np.argmax(score_array[candidate_idxes], axis=1)
+        )
 
-    prediction_array_ullr = prediction_array_ullr[max_score > score_threshold, :]
-    max_class_array = max_class_array[max_score > score_threshold]
-    max_score = max_score[max_score > score_threshold]
+    if soft_nms_sigma is None:
+        out_bbox_array_ullr = candidate_array_ullr[
+            compute_nms_keep_mask(boxes_ullr, iou_threshold)
+        ]
+    else:
+        score_decay = compute_soft_nms_decay(boxes_ullr, soft_nms_sigma)
+        candidate_array_ullr[
+            :, coordinates_count : coordinates_count + class_count
+        ] *= score_decay[:, np.newaxis]
+        decayed_scores = max_score[candidate_idxes] * score_decay
+        out_bbox_array_ullr = candidate_array_ullr[
+            select_top_k_candidates(decayed_scores, score_threshold)
+        ]
+    return convert_to_xywh(out_bbox_array_ullr)
 
-    sorted_scores_idxes = max_score.argsort()[::-1]
-    prediction_array_ullr = prediction_array_ullr[sorted_scores_idxes]
-    max_class_array = max_class_array[sorted_scores_idxes]
 
-    out_bboxes: List[np.ndarray] = []
-    for cur_class in range(class_count):
-        cur_class_idxes = max_class_array == cur_class
-        class_prediction_array_ullr = prediction_array_ullr[cur_class_idxes]
+def batched_non_maximum_suppression(  # noqa: PLR0913
+    prediction_batch_xywh: np.ndarray,
+    iou_threshold: float,
+    coordinates_count: int,
+    class_count: int,
+    score_threshold: float = 0.5,
+    top_k: Optional[int] = None,
+    class_agnostic: bool = False,
+    soft_nms_sigma: Optional[float] = None,
+) -> List[np.ndarray]:
+    """
+    Applies `non_maximum_suppression` to the predictions of multiple images.
+    The score threshold and the top-k selection are computed for the whole batch
+    at once, before the candidates of each image are suppressed.
 
-        if len(class_prediction_array_ullr) == 0:
-            continue
-        iou_mat = compute_iou_matrix(
-            class_prediction_array_ullr, class_prediction_array_ullr
-        )
-        used_box_idxes = set()
-        for cur_row_idx in range(iou_mat.shape[0]):
-            if cur_row_idx in used_box_idxes:
-                continue
-
-            cur_cluster_idxes = np.argwhere(iou_mat[cur_row_idx, :] > iou_threshold)[
-                :, 0
-            ].tolist()
-            used_box_idxes.update(cur_cluster_idxes)
-            out_bboxes.append(
-                class_prediction_array_ullr[cur_row_idx, :][np.newaxis, :]
-            )
+    Args:
+        prediction_batch_xywh: Array with the predictions of all images with the
+            shape (batch_size, anchor_count, coordinates_count + class_count + ...)
+        iou_threshold: IOU threshold for boxes to keep
+        coordinates_count: Number of coordinates in prediction array
+        class_count: Number of classes in prediction array
+        score_threshold: Prediction score threshold for predictions to keep
+        top_k: Maximum number of predictions per image which are passed to the
+            suppression. All are passed if None.
+        class_agnostic: Whether boxes of different classes suppress each other
+        soft_nms_sigma: If given, gaussian soft-nms is applied
 
-    if len(out_bboxes) == 0:
-        return np.empty(shape=(0, prediction_array_ullr.shape[1]))
-    out_bbox_array_ullr = np.concatenate(out_bboxes, axis=0)
-    return convert_to_xywh(out_bbox_array_ullr)
+    Returns:
+        A list with the array of kept predictions of each image
+    """
+    max_scores = np.max(
+        prediction_batch_xywh[..., coordinates_count : coordinates_count + class_count],
+        axis=-1,
+    )
+    if top_k is not None and max_scores.shape[1] > top_k:
+        top_k_idxes = np.argpartition(-max_scores, top_k - 1, axis=1)[:, :top_k]
+        prediction_batch_xywh = np.take_along_axis(
+            prediction_batch_xywh, top_k_idxes[..., np.newaxis], axis=1
+        )
+    return [
+        non_maximum_suppression(
+            prediction_array_xywh=prediction_array_xywh,
+            iou_threshold=iou_threshold,
+            coordinates_count=coordinates_count,
+            class_count=class_count,
+            score_threshold=score_threshold,
+            class_agnostic=class_agnostic,
+            soft_nms_sigma=soft_nms_sigma,
+        )
+        for prediction_array_xywh in prediction_batch_xywh
+    ]
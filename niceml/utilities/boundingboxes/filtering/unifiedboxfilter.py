@@ -1,15 +1,16 @@
 """Module for UnifiedBoxFilter"""  # QUEST: still used?
-from typing import List
+from typing import List, Tuple
 
 import numpy as np
 from attrs import define
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
 
 from niceml.utilities.boundingboxes.bboxconversion import (
     convert_to_ullr,
     convert_to_xywh,
 )
 from niceml.utilities.boundingboxes.filtering.predictionfilter import PredictionFilter
-from niceml.utilities.ioumatrix import compute_iou_matrix
 
 
 # pylint:disable = duplicate-code
@@ -22,9 +23,7 @@ class UnifiedBoxFilter(PredictionFilter):
     iou_threshold: float = 0.5
     box_coordinates: int = 4
 
-    def filter(  # pylint: disable=too-many-locals
-        self, prediction_array_xywh: np.ndarray
-    ) -> np.ndarray:
+    def filter(self, prediction_array_xywh: np.ndarray) -> np.ndarray:
         """
         Filters bounding boxes of prediction array according to given filter conditions
         Args:
@@ -34,72 +33,190 @@ class UnifiedBoxFilter(PredictionFilter):
             filtered prediction array
         """
         prediction_array_ullr = convert_to_ullr(prediction_array_xywh)
+        score_array = prediction_array_ullr[
+            :, self.box_coordinates : self.box_coordinates + self.output_class_count
+        ]
+        max_class_array = np.argmax(score_array, axis=1)
+        max_score = np.max(score_array, axis=1)
+
+        score_mask = max_score > self.score_threshold
+        # sorted by class and then by descending score
+        sorted_idxes = np.flatnonzero(score_mask)[
+            np.lexsort((-max_score[score_mask], max_class_array[score_mask]))
+        ]
+        prediction_array_ullr = prediction_array_ullr[sorted_idxes]
+        max_class_array = max_class_array[sorted_idxes]
 
-        max_class_array = np.argmax(
-            prediction_array_ullr[
-                :, self.box_coordinates : self.box_coordinates + self.output_class_count
-            ],
-            axis=1,
+        cluster_labels = np.empty(len(prediction_array_ullr), dtype=np.int64)
+        cluster_count = 0
+        class_starts = np.searchsorted(
+            max_class_array, np.arange(self.output_class_count + 1)
         )
-        max_score = np.max(
-            prediction_array_ullr[
-                :, self.box_coordinates : self.box_coordinates + self.output_class_count
-            ],
-            axis=1,
+        for class_start, class_end in zip(class_starts[:-1], class_starts[1:]):
+            if class_start == class_end:
+                continue
+            class_cluster_count, class_cluster_labels = connected_components(
+                compute_iou_adjacency(
+                    prediction_array_ullr[class_start:class_end, :4],
+                    self.iou_threshold,
+                ),
+                directed=False,
+            )
+            cluster_labels[class_start:class_end] = class_cluster_labels + cluster_count
+            cluster_count += class_cluster_count
+
+        out_bbox_array_ullr = unify_clusters(
+            prediction_array_ullr,
+            cluster_labels,
+            score_slice=slice(
+                self.box_coordinates, self.box_coordinates + self.output_class_count
+            ),
         )
+        return convert_to_xywh(out_bbox_array_ullr)
 
-        prediction_array_ullr = prediction_array_ullr[
-            max_score > self.score_threshold, :
-        ]
-        max_class_array = max_class_array[max_score > self.score_threshold]
-        max_score = max_score[max_score > self.score_threshold]
 
-        sorted_scores_idxes = max_score.argsort()[::-1]
-        prediction_array_ullr = prediction_array_ullr[sorted_scores_idxes]
-        max_class_array = max_class_array[sorted_scores_idxes]
+def compute_iou_adjacency(
+    boxes_ullr: np.ndarray, iou_threshold: float, max_pair_count: int = 2**20
+) -> csr_matrix:
+    """
+    Computes the sparse adjacency matrix of boxes which overlap with
+    an IoU above the threshold. Each edge is only contained once. Instead of
+    all N x N pairs only candidate pairs of a sweep along the x- or y-axis
+    (whichever yields fewer candidates) are compared (see
+    `get_sweep_candidates`). The candidates are compared in chunks of at most
+    `max_pair_count` pairs, so the memory stays bounded.
 
-        out_bboxes: List[np.ndarray] = []
-        for cur_class in range(self.output_class_count):
-            cur_class_idxes = max_class_array == cur_class
-            class_prediction_array_ullr = prediction_array_ullr[cur_class_idxes]
+    Args:
+        boxes_ullr: Boxes in ullr format with the shape (N, 4)
+        iou_threshold: Minimum IoU of two adjacent boxes (exclusive, >= 0)
+        max_pair_count: Maximum number of pairs compared at once
 
-            if len(class_prediction_array_ullr) == 0:
-                continue
-            iou_mat = compute_iou_matrix(
-                class_prediction_array_ullr, class_prediction_array_ullr
-            )
-            used_box_idxes = set()
-            for cur_row_idx in range(iou_mat.shape[0]):
-                if cur_row_idx in used_box_idxes:
-                    continue
-
-                cur_cluster_idxes = np.argwhere(
-                    iou_mat[cur_row_idx, :] > self.iou_threshold
-                )[:, 0].tolist()
-                used_box_idxes.update(cur_cluster_idxes)
-
-                cur_cluster_prediction_array = class_prediction_array_ullr[
-                    cur_cluster_idxes, :
-                ]
-
-                ul_corners = np.min(cur_cluster_prediction_array[:, :2], axis=0)
-                lr_corners = np.max(cur_cluster_prediction_array[:, 2:4], axis=0)
-                predictions = np.max(
-                    cur_cluster_prediction_array[
-                        :,
-                        self.box_coordinates : self.box_coordinates
-                        + self.output_class_count,
-                    ],
-                    axis=0,
-                )
-                additional_info = class_prediction_array_ullr[
-                    cur_row_idx, self.box_coordinates + self.output_class_count :
-                ]
-                cur_cluster_bbox = np.concatenate(
-                    [ul_corners, lr_corners, predictions, additional_info]
-                )
-                out_bboxes.append(cur_cluster_bbox[np.newaxis, :])
-        if len(out_bboxes) == 0:
-            return np.empty(shape=(0, prediction_array_ullr.shape[1]))
-        out_bbox_array_ullr = np.concatenate(out_bboxes, axis=0)
-        return convert_to_xywh(out_bbox_array_ullr)
+    Returns:
+        A N x N boolean csr_matrix
+    """
+    box_count = len(boxes_ullr)
+    sorted_idxes, pair_counts = min(
+        (get_sweep_candidates(boxes_ullr, iou_threshold, axis) for axis in [0, 1]),
+        key=lambda candidates: int(candidates[1].sum()),
+    )
+    sorted_boxes = boxes_ullr[sorted_idxes]
+    pair_ends = np.cumsum(pair_counts)
+    row_idxes: List[np.ndarray] = []
+    col_idxes: List[np.ndarray] = []
+    chunk_start = 0
+    while chunk_start < box_count:
+        pairs_before = pair_ends[chunk_start - 1] if chunk_start > 0 else 0
+        chunk_end = max(
+            int(np.searchsorted(pair_ends, pairs_before + max_pair_count, "right")),
+            chunk_start + 1,
+        )
+        chunk_counts = pair_counts[chunk_start:chunk_end]
+        chunk_rows = np.repeat(np.arange(chunk_start, chunk_end), chunk_counts)
+        row_offsets = np.repeat(np.cumsum(chunk_counts) - chunk_counts, chunk_counts)
+        chunk_cols = chunk_rows + 1 + np.arange(len(chunk_rows)) - row_offsets
+        is_adjacent = is_iou_above_threshold(
+            sorted_boxes, chunk_rows, chunk_cols, iou_threshold
+        )
+        row_idxes.append(sorted_idxes[chunk_rows[is_adjacent]])
+        col_idxes.append(sorted_idxes[chunk_cols[is_adjacent]])
+        chunk_start = chunk_end
+    row_idx_array = np.concatenate(row_idxes) if row_idxes else np.empty(0, int)
+    col_idx_array = np.concatenate(col_idxes) if col_idxes else np.empty(0, int)
+    return csr_matrix(
+        (np.ones(len(row_idx_array), dtype=bool), (row_idx_array, col_idx_array)),
+        shape=(box_count, box_count),
+    )
+
+
+def get_sweep_candidates(
+    boxes_ullr: np.ndarray, iou_threshold: float, axis: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sorts the boxes by their start along an axis and counts for each sorted
+    box the following boxes, which can have an IoU above the threshold with
+    it. The IoU of two boxes is at most their IoU along the axis, so a
+    following box B of box A needs an overlap o with
+    o / (w_A + w_B - o) > t, which requires start_B < end_A - w_A * t / (1 + t).
+
+    Args:
+        boxes_ullr: Boxes in ullr format with the shape (N, 4)
+        iou_threshold: Minimum IoU of two adjacent boxes (exclusive, >= 0)
+        axis: 0 for the x-axis and 1 for the y-axis
+
+    Returns:
+        Tuple of the sorting indexes and the candidate count of each sorted box
+    """
+    sorted_idxes = np.argsort(boxes_ullr[:, axis], kind="stable")
+    sorted_starts = boxes_ullr[sorted_idxes, axis]
+    sorted_ends = boxes_ullr[sorted_idxes, axis + 2]
+    overlap_ends = np.searchsorted(
+        sorted_starts,
+        sorted_ends
+        - (sorted_ends - sorted_starts) * iou_threshold / (1 + iou_threshold),
+        side="left",
+    )
+    pair_counts = np.maximum(overlap_ends - np.arange(len(boxes_ullr)) - 1, 0)
+    return sorted_idxes, pair_counts
+
+
+def is_iou_above_threshold(
+    boxes_ullr: np.ndarray,
+    box_idxes: np.ndarray,
+    other_box_idxes: np.ndarray,
+    iou_threshold: float,
+) -> np.ndarray:
+    """Returns for each index pair, whether the IoU of the two boxes (ullr
+    format) is above the threshold. The IoU is compared as
+    intersection > threshold * union to avoid the division."""
+    lefts, tops, rights, bottoms = boxes_ullr[:, :4].T
+    areas = (rights - lefts) * (bottoms - tops)
+    intersection_widths = np.minimum(rights[box_idxes], rights[other_box_idxes])
+    intersection_widths -= np.maximum(lefts[box_idxes], lefts[other_box_idxes])
+    np.maximum(intersection_widths, 0.0, out=intersection_widths)
+    intersection_areas = np.minimum(bottoms[box_idxes], bottoms[other_box_idxes])
+    intersection_areas -= np.maximum(tops[box_idxes], tops[other_box_idxes])
+    np.maximum(intersection_areas, 0.0, out=intersection_areas)
+    intersection_areas *= intersection_widths
+    union_areas = areas[box_idxes]
+    union_areas += areas[other_box_idxes]
+    union_areas -= intersection_areas
+    return (intersection_areas > iou_threshold * union_areas) & (union_areas > 0)
+
+
+def unify_clusters(
+    prediction_array_ullr: np.ndarray, cluster_labels: np.ndarray, score_slice: slice
+) -> np.ndarray:
+    """
+    Combines the predictions of each cluster to one prediction with the
+    surrounding box, the maximum scores and the additional values of the
+    first prediction of the cluster
+
+    Args:
+        prediction_array_ullr: Predictions in ullr format
+        cluster_labels: Cluster label of each prediction
+        score_slice: Columns of the class scores
+
+    Returns:
+        One prediction per cluster, ordered by the first prediction of the cluster
+    """
+    if len(prediction_array_ullr) == 0:
+        return prediction_array_ullr
+    # grouped by cluster and ordered by position inside the cluster
+    order = np.lexsort((np.arange(len(cluster_labels)), cluster_labels))
+    sorted_predictions = prediction_array_ullr[order]
+    sorted_labels = cluster_labels[order]
+    cluster_starts = np.flatnonzero(
+        np.concatenate([[True], sorted_labels[1:] != sorted_labels[:-1]])
+    )
+
+    out_array = sorted_predictions[cluster_starts].copy()
+    out_array[:, :2] = np.minimum.reduceat(
+        sorted_predictions[:, :2], cluster_starts, axis=0
+    )
+    out_array[:, 2:4] = np.maximum.reduceat(
+        sorted_predictions[:, 2:4], cluster_starts, axis=0
+    )
+    out_array[:, score_slice] = np.maximum.reduceat(
+        sorted_predictions[:, score_slice], cluster_starts, axis=0
+    )
+    return out_array[np.argsort(order[cluster_starts])]
@@ -86,3 +86,24 @@ def convert_to_3channel_img(input_img: np.ndarray) -> np.ndarray:  # QUEST: stil
     raise ImgShapeError(
         f"Image cannot be broadcast to a " f"3 channel image: {input_img.shape}"
     )
+
+
+def load_image_size(
+    image_path: Union[str, LocationConfig],
+    file_system: Optional[AbstractFileSystem] = None,
+) -> ImageSize:
+    """
+    Reads the size of an image from its header without decoding the pixels
+
+    Args:
+        image_path: Path of image file
+        file_system: Allow the function to be used with different file systems; default = local
+
+    Returns:
+        ImageSize of the image
+    """
+    file_system: AbstractFileSystem = file_system or LocalFileSystem()
+    if isinstance(image_path, LocationConfig):
+        image_path = image_path.uri
+    with file_system.open(image_path) as fs_file, Image.open(fs_file) as image:
+        return ImageSize.from_pil_image(image)
@@ -0,0 +1,79 @@
+"""Module for splitting images into overlapping tiles and merging them"""
+import numpy as np
+
+from niceml.utilities.imagesize import ImageSize
+
+
+def get_tile_offsets(length: int, tile_length: int, overlap: int) -> np.ndarray:
+    """
+    Computes the start offsets of overlapping tiles along one axis. The tiles
+    have a stride of `tile_length - overlap` and the last tile ends at the
+    border, so only images smaller than a tile need padding.
+
+    Args:
+        length: Length of the image along the axis
+        tile_length: Length of a tile along the axis
+        overlap: Minimum number of pixels which neighbouring tiles share
+
+    Returns:
+        Array with the start offset of each tile
+    """
+    if not 0 <= overlap < tile_length:
+        raise ValueError(
+            f"The overlap ({overlap}) must be positive and smaller "
+            f"than the tile length ({tile_length})"
+        )
+    if length <= tile_length:
+        return np.zeros(1, dtype=np.int64)
+    stride = tile_length - overlap
+    tile_count = int(np.ceil((length - tile_length) / stride)) + 1
+    return np.minimum(np.arange(tile_count) * stride, length - tile_length)
+
+
+def get_tile_positions(
+    image_size: ImageSize, tile_size: ImageSize, overlap: int
+) -> np.ndarray:
+    """Returns the upper left corners (x, y) of all tiles of an image
+    row by row with the shape (tile_count, 2)"""
+    x_offsets = get_tile_offsets(image_size.width, tile_size.width, overlap)
+    y_offsets = get_tile_offsets(image_size.height, tile_size.height, overlap)
+    y_grid, x_grid = np.meshgrid(y_offsets, x_offsets, indexing="ij")
+    return np.stack([x_grid.ravel(), y_grid.ravel()], axis=1)
+
+
+def crop_tile(
+    image: np.ndarray, x_pos: int, y_pos: int, tile_size: ImageSize
+) -> np.ndarray:
+    """Crops a tile of an image (height, width, ...). Tiles which exceed
+    the image are padded with zeros at the bottom and right side."""
+    tile = image[y_pos : y_pos + tile_size.height, x_pos : x_pos + tile_size.width]
+    if tile.shape[:2] == tile_size.to_numpy_shape():
+        return tile
+    padding = [
+        (0, tile_size.height - tile.shape[0]),
+        (0, tile_size.width - tile.shape[1]),
+    ] + [(0, 0)] * (tile.ndim - 2)
+    return np.pad(tile, padding)
+
+
+def get_blending_weights(tile_size: ImageSize, overlap: int) -> np.ndarray:
+    """
+    Returns pixel weights of a tile with the shape (height, width), which
+    rise linearly over the first and last `overlap` pixels of each axis.
+    Weighted sums of overlapping tiles divided by the summed weights blend
+    the tiles without visible seams.
+
+    Args:
+        tile_size: Size of a tile
+        overlap: Number of pixels over which the weights rise
+
+    Returns:
+        float32 weights in the range (0, 1]
+    """
+    axis_weights = []
+    for length in tile_size.to_numpy_shape():
+        distances = np.minimum(np.arange(1, length + 1), np.arange(length, 0, -1))
+        axis_weights.append(
+            np.minimum(distances / (overlap + 1), 1.0).astype(np.float32)
+        )
+    return np.outer(*axis_weights)
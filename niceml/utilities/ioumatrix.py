@@ -146,3 +146,54 @@ def compute_iou_matrix(anchor_boxes: np.ndarray, gt_boxes: np.ndarray) -> np.nda
         where=union_areas != 0.0,
     )
     return iou_matrix
+
+
+def compute_iou_matrix_batch(
+    anchor_boxes: np.ndarray, gt_boxes: np.ndarray
+) -> np.ndarray:
+    """Computes the pairwise IOU matrices of one set of anchors and the
+    ground truth boxes of multiple images in one broadcasted pass.
+    The anchors are the last axis, so the inner loops run over the
+    contiguous anchor coordinates.
+
+    Args:
+        anchor_boxes: A tensor with shape `(N, 4)` representing anchor bounding boxes
+            where each box is of the format `[left, top, right, bottom]`.
+        gt_boxes: A tensor with shape `(B, M, 4)` representing the ground truth
+            bounding boxes of B images in the format `[left, top, right, bottom]`.
+
+    Returns:
+        IOU matrices as float32 with shape `(B, M, N)`, where the value at
+        'b'th image, 'j'th row and 'i'th column holds the IOU between the 'j'th
+        ground truth box of the 'b'th image and the 'i'th anchor.
+    """
+    anchor_coords = np.ascontiguousarray(anchor_boxes.T, dtype=np.float32)
+    anchor_lefts, anchor_tops, anchor_rights, anchor_bottoms = anchor_coords
+    gt_coords = gt_boxes.astype(np.float32, copy=False)[..., np.newaxis]
+    gt_lefts, gt_tops, gt_rights, gt_bottoms = (
+        gt_coords[:, :, 0],
+        gt_coords[:, :, 1],
+        gt_coords[:, :, 2],
+        gt_coords[:, :, 3],
+    )
+
+    anchor_areas = (anchor_rights - anchor_lefts) * (anchor_bottoms - anchor_tops)
+    gt_areas = (gt_rights - gt_lefts) * (gt_bottoms - gt_tops)
+
+    intersection_areas = np.minimum(anchor_rights, gt_rights)
+    intersection_areas -= np.maximum(anchor_lefts, gt_lefts)
+    np.maximum(intersection_areas, 0.0, out=intersection_areas)
+    intersection_heights = np.minimum(anchor_bottoms, gt_bottoms)
+    intersection_heights -= np.maximum(anchor_tops, gt_tops)
+    np.maximum(intersection_heights, 0.0, out=intersection_heights)
+    intersection_areas *= intersection_heights
+
+    union_areas = intersection_heights
+    np.add(anchor_areas, gt_areas, out=union_areas)
+    union_areas -= intersection_areas
+    return np.divide(
+        intersection_areas,
+        union_areas,
+        out=np.zeros_like(intersection_areas),
+        where=union_areas > 0,
+    )
@@ -255,7 +255,7 @@ def write_image(
         dirname(filepath),
         exist_ok=True,
     )
-    with file_system.open(filepath, "wb") as file:
+    with cur_fs.open(filepath, "wb") as file:
         file_format = filepath.rsplit(".")[-1]
         image.save(file, format=file_format, **kwargs)
 
@@ -276,7 +276,7 @@ def read_image(
     cur_fs: AbstractFileSystem = file_system or LocalFileSystem()
     if not cur_fs.exists(filepath):
         raise FileNotFoundError(f"ImageFile not found: {filepath}")
-    with file_system.open(filepath, "rb") as file:
+    with cur_fs.open(filepath, "rb") as file:
         return Image.open(file, **kwargs).copy()
 
 
@@ -308,3 +308,51 @@ def find_and_read_file(
         if cur_fs.exists(cur_path):
             return cur_path, read_func(cur_path, file_system=cur_fs, **kwargs)
     raise FileNotFoundError(f"File not found: {filepath}")
+
+
+def upload_directory(
+    local_path: str,
+    target_path: str,
+    file_system: Optional[AbstractFileSystem] = None,
+):
+    """
+    Copies all files of a local directory recursively to a directory
+
+    Args:
+        local_path: Path of the local directory
+        target_path: Path of the target directory
+        file_system: Allow the function to be used with different file systems; default = local
+    """
+    cur_fs: AbstractFileSystem = file_system or LocalFileSystem()
+    local_fs = LocalFileSystem()
+    for cur_file in list_dir(local_path, recursive=True, file_system=local_fs):
+        local_file = join(local_path, cur_file)
+        if local_fs.isdir(local_file):
+            continue
+        target_file = join_fs_path(cur_fs, target_path, cur_file)
+        cur_fs.mkdirs(dirname(target_file), exist_ok=True)
+        cur_fs.put_file(local_file, target_file)
+
+
+def download_directory(
+    source_path: str,
+    local_path: str,
+    file_system: Optional[AbstractFileSystem] = None,
+):
+    """
+    Copies all files of a directory recursively to a local directory
+
+    Args:
+        source_path: Path of the source directory
+        local_path: Path of the local directory
+        file_system: Allow the function to be used with different file systems; default = local
+    """
+    cur_fs: AbstractFileSystem = file_system or LocalFileSystem()
+    local_fs = LocalFileSystem()
+    for cur_file in list_dir(source_path, recursive=True, file_system=cur_fs):
+        source_file = join_fs_path(cur_fs, source_path, cur_file)
+        if cur_fs.isdir(source_file):
+            continue
+        local_file = join(local_path, cur_file)
+        local_fs.mkdirs(dirname(local_file), exist_ok=True)
+        cur_fs.get_file(source_file, local_file)
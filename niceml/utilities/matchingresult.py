@@ -1,11 +1,18 @@
 """Module for abstract MatchingResult class"""
 
 from abc import ABC
+from enum import Enum
 from typing import List, Optional, Set
 
+import numpy as np
 from attr import define
+from scipy.optimize import linear_sum_assignment
 
+from niceml.utilities.boundingboxes.bboxconversion import bbox_list_to_ullr_array
+from niceml.utilities.boundingboxes.bboxlabeling import ObjDetInstanceLabel
 from niceml.utilities.instancelabeling import InstanceLabel
+from niceml.utilities.ioumatrix import compute_iou_matrix
+from niceml.utilities.semseg.semseginstancelabeling import SemSegInstanceLabel
 
 
 @define
@@ -119,10 +126,153 @@ class MatchingResult(ABC):
             ) from error
 
 
+class AssignmentStrategy(str, Enum):
+    """Strategies to assign predictions to ground truth labels"""
+
+    # every prediction matches all ground truth labels it overlaps with
+    ALL = "all"
+    # one-to-one assignment, pairs with the highest IoU are assigned first
+    GREEDY = "greedy"
+    # one-to-one assignment which maximizes the sum of IoUs (hungarian method)
+    HUNGARIAN = "hungarian"
+
+
+def compute_label_iou_matrix(
+    gt_labels: List[InstanceLabel], pred_labels: List[InstanceLabel]
+) -> np.ndarray:
+    """
+    Computes the IoU matrix of ground truth and prediction labels. Bounding box
+    labels are computed with `compute_iou_matrix` and masks of the same shape
+    with one matrix product. Other labels fall back to `calc_iou`.
+
+    Args:
+        gt_labels: ground truth labels (bounding box or mask)
+        pred_labels: prediction labels (bounding box or mask)
+
+    Returns:
+        IoU matrix with the shape (len(gt_labels), len(pred_labels))
+    """
+    if len(gt_labels) == 0 or len(pred_labels) == 0:
+        return np.zeros((len(gt_labels), len(pred_labels)))
+    labels = gt_labels + pred_labels
+    if all(isinstance(label, ObjDetInstanceLabel) for label in labels):
+        return compute_iou_matrix(
+            bbox_list_to_ullr_array([label.bounding_box for label in gt_labels]),
+            bbox_list_to_ullr_array([label.bounding_box for label in pred_labels]),
+        )
+    if all(isinstance(label, SemSegInstanceLabel) for label in labels) and (
+        len({label.mask.shape for label in labels}) == 1
+    ):
+        gt_masks = np.stack([label.mask.ravel() for label in gt_labels]) > 0
+        pred_masks = np.stack([label.mask.ravel() for label in pred_labels]) > 0
+        intersections = gt_masks.astype(np.float32) @ pred_masks.T.astype(np.float32)
+        unions = (
+            gt_masks.sum(axis=1)[:, np.newaxis]
+            + pred_masks.sum(axis=1)[np.newaxis, :]
+            - intersections
+        )
+        return np.divide(
+            intersections,
+            unions,
+            out=np.zeros_like(intersections),
+            where=unions > 0,
+        )
+    return np.array(
+        [
+            [gt_label.calc_iou(pred_label) for pred_label in pred_labels]
+            for gt_label in gt_labels
+        ]
+    )
+
+
+def assign_one_to_one(
+    match_matrix: np.ndarray,
+    iou_matrix: np.ndarray,
+    assignment: AssignmentStrategy,
+) -> np.ndarray:
+    """
+    Reduces a matrix of possible matches to one-to-one matches
+
+    Args:
+        match_matrix: Boolean matrix of possible matches (gt x pred)
+        iou_matrix: IoU matrix (gt x pred)
+        assignment: GREEDY or HUNGARIAN assignment
+
+    Returns:
+        Boolean matrix with at most one match per row and column
+    """
+    match_ious = np.where(match_matrix, iou_matrix, -1.0)
+    assigned_matrix = np.zeros(match_matrix.shape, dtype=bool)
+    if assignment == AssignmentStrategy.HUNGARIAN:
+        gt_idxes, pred_idxes = linear_sum_assignment(match_ious, maximize=True)
+        assigned_matrix[gt_idxes, pred_idxes] = match_matrix[gt_idxes, pred_idxes]
+        return assigned_matrix
+    # Pairs which are the best match of their gt and their pred are assigned
+    # until no match is left. This equals assigning the highest IoU first.
+    while np.any(match_ious >= 0):
+        best_pred_idxes = np.argmax(match_ious, axis=1)
+        best_gt_idxes = np.argmax(match_ious, axis=0)
+        gt_idxes = np.flatnonzero(
+            (best_gt_idxes[best_pred_idxes] == np.arange(len(match_ious)))
+            & (np.max(match_ious, axis=1) >= 0)
+        )
+        pred_idxes = best_pred_idxes[gt_idxes]
+        assigned_matrix[gt_idxes, pred_idxes] = True
+        match_ious[gt_idxes, :] = -1.0
+        match_ious[:, pred_idxes] = -1.0
+    return assigned_matrix
+
+
+def match_instance_labels(
+    pred_labels: List[InstanceLabel],
+    gt_labels: List[InstanceLabel],
+    matching_iou: float = 0.5,
+    match_classes: bool = False,
+    assignment: AssignmentStrategy = AssignmentStrategy.ALL,
+) -> MatchingResult:
+    """
+    Matches predictions to ground truth labels with array operations on the
+    IoU matrix. A ground truth label is a true positive if a prediction matches
+    it, otherwise a false negative. Not matching predictions are false positives.
+
+    Args:
+        pred_labels: prediction labels (bounding box or mask)
+        gt_labels:  ground truth labels (bounding box or mask)
+        matching_iou: Minimum iou for region matching (exclusive)
+        match_classes: Whether the class names must be equal to match
+        assignment: Whether a prediction can match multiple ground truth
+            labels (ALL) or predictions and ground truth labels are assigned
+            one-to-one (GREEDY or HUNGARIAN)
+
+    Returns:
+        MatchingResult with true_pos, false_pos and false_neg
+    """
+    iou_matrix = compute_label_iou_matrix(gt_labels, pred_labels)
+    match_matrix = iou_matrix > matching_iou
+    if match_classes:
+        match_matrix &= np.equal.outer(
+            np.array([label.class_name for label in gt_labels], dtype=object),
+            np.array([label.class_name for label in pred_labels], dtype=object),
+        ).astype(bool)
+    if AssignmentStrategy(assignment) != AssignmentStrategy.ALL:
+        match_matrix = assign_one_to_one(
+            match_matrix, iou_matrix, AssignmentStrategy(assignment)
+        )
+
+    matched_gt_mask = np.any(match_matrix, axis=1)
+    matched_pred_mask = np.any(match_matrix, axis=0)
+    return MatchingResult(
+        true_pos=[gt_labels[idx] for idx in np.flatnonzero(matched_gt_mask)],
+        false_pos=[pred_labels[idx] for idx in np.flatnonzero(~matched_pred_mask)],
+        false_neg=[gt_labels[idx] for idx in np.flatnonzero(~matched_gt_mask)],
+    )
+
+
 def match_detection_prediction_and_gt(
     pred_labels: List[InstanceLabel],
     gt_labels: List[InstanceLabel],
     matching_iou: float = 0.5,
+    assignment: AssignmentStrategy = AssignmentStrategy.ALL,
 ) -> MatchingResult:
     """
     Matches regions of predictions to ground truth label regions and checks
@@ -136,41 +286,17 @@ def match_detection_prediction_and_gt(
         pred_labels: prediction labels (bounding box or mask)
         gt_labels:  ground truth labels (bounding box or mask)
         matching_iou: Minimum iou for region matching
+        assignment: Strategy to assign predictions to ground truth labels
 
     Returns:
         MatchingResult with true_pos, false_pos and false_neg
     """
-
-    matched_pred_labels: Set[int] = set()
-    classification_true_pos_list: List[InstanceLabel] = []
-    classification_false_pos_list: List[InstanceLabel] = []
-    classification_false_neg_list: List[InstanceLabel] = []
-
-    for cur_gt_label in gt_labels:
-        cur_gt_true_pos = False
-        for pred_idx, cur_pred_label in enumerate(pred_labels):
-            cur_iou = cur_gt_label.calc_iou(cur_pred_label)
-
-            if cur_iou > matching_iou:
-                matched_pred_labels.add(pred_idx)
-                cur_gt_true_pos = True
-
-        if cur_gt_true_pos:
-            classification_true_pos_list.append(cur_gt_label)
-        else:
-            classification_false_neg_list.append(cur_gt_label)
-
-    missed_pred_label_idxes = [
-        index for index in range(len(pred_labels)) if index not in matched_pred_labels
-    ]
-    for index in missed_pred_label_idxes:
-        cur_pred_label = pred_labels[index]
-        classification_false_pos_list.append(cur_pred_label)
-
-    return MatchingResult(
-        true_pos=classification_true_pos_list,
-        false_pos=classification_false_pos_list,
-        false_neg=classification_false_neg_list,
+    return match_instance_labels(
+        pred_labels,
+        gt_labels,
+        matching_iou=matching_iou,
+        match_classes=False,
+        assignment=assignment,
     )
 
 
@@ -178,6 +304,7 @@ def match_classification_prediction_and_gt(
     pred_labels: List[InstanceLabel],
     gt_labels: List[InstanceLabel],
     matching_iou: float = 0.5,
+    assignment: AssignmentStrategy = AssignmentStrategy.ALL,
 ) -> MatchingResult:
     """
     Matches region and class of predictions to ground truth labels and checks
@@ -191,42 +318,15 @@ def match_classification_prediction_and_gt(
         pred_labels: prediction labels (bounding box or mask)
         gt_labels:  ground truth labels (bounding box or mask)
         matching_iou: Minimum iou for region matching
+        assignment: Strategy to assign predictions to ground truth labels
 
     Returns:
         MatchingResult with true_pos, false_pos and false_neg
     """
-
-    matched_pred_labels: Set[int] = set()
-    classification_true_pos_list: List[InstanceLabel] = []
-    classification_false_pos_list: List[InstanceLabel] = []
-    classification_false_neg_list: List[InstanceLabel] = []
-
-    for cur_gt_label in gt_labels:
-        cur_gt_true_pos = False
-        for pred_idx, cur_pred_label in enumerate(pred_labels):
-            cur_iou = cur_gt_label.calc_iou(cur_pred_label)
-
-            if (
-                cur_iou > matching_iou
-                and cur_pred_label.class_name == cur_gt_label.class_name
-            ):
-                matched_pred_labels.add(pred_idx)
-                cur_gt_true_pos = True
-
-        if cur_gt_true_pos:
-            classification_true_pos_list.append(cur_gt_label)
-        else:
-            classification_false_neg_list.append(cur_gt_label)
-
-    missed_pred_label_idxes = [
-        index for index in range(len(pred_labels)) if index not in matched_pred_labels
-    ]
-    for index in missed_pred_label_idxes:
-        cur_pred_label = pred_labels[index]
-        classification_false_pos_list.append(cur_pred_label)
-
-    return MatchingResult(
-        true_pos=classification_true_pos_list,
-        false_pos=classification_false_pos_list,
-        false_neg=classification_false_neg_list,
+    return match_instance_labels(
+        pred_labels,
+        gt_labels,
+        matching_iou=matching_iou,
+        match_classes=True,
+        assignment=assignment,
     )
@@ -0,0 +1,78 @@
+"""Module for writing parquet files row group by row group"""
+import struct
+from os.path import dirname
+from typing import Optional
+
+import pandas as pd
+from fastparquet.writer import (
+    MARKER,
+    make_metadata,
+    make_row_group,
+    write_thrift,
+)
+from fsspec import AbstractFileSystem
+from fsspec.implementations.local import LocalFileSystem
+
+
+class ParquetRowGroupWriter:
+    """Context manager which keeps a parquet file open and writes each
+    dataframe as one row group. The footer is written when the context
+    is left, therefore only one row group has to be kept in memory.
+    All dataframes must have the same columns and dtypes."""
+
+    def __init__(
+        self,
+        filepath: str,
+        file_system: Optional[AbstractFileSystem] = None,
+        compression: Optional[str] = "gzip",
+    ):
+        """
+        Constructor of the ParquetRowGroupWriter
+        Args:
+            filepath: Path of the parquet file to write
+            file_system: Allow the writer to be used with different file systems;
+                default = local
+            compression: Compression method
+        """
+        self.filepath = filepath
+        self.file_system: AbstractFileSystem = file_system or LocalFileSystem()
+        self.compression = compression
+        self.row_count: int = 0
+        self._file = None
+        self._file_metadata = None
+        self._row_groups: list = []
+
+    def __enter__(self):
+        """Opens the file and writes the parquet header"""
+        self.file_system.mkdirs(dirname(self.filepath), exist_ok=True)
+        self._file = self.file_system.open(self.filepath, "wb")
+        self._file.write(MARKER)
+        return self
+
+    def write_row_group(self, dataframe: pd.DataFrame):
+        """Writes a dataframe as a row group. The index is not written."""
+        if self._file_metadata is None:
+            self._file_metadata = make_metadata(
+                dataframe, object_encoding="infer", index_cols=[]
+            )
+        row_group = make_row_group(
+            self._file,
+            dataframe,
+            self._file_metadata.schema,
+            compression=self.compression,
+        )
+        if row_group is not None:
+            self._row_groups.append(row_group)
+            self.row_count += len(dataframe)
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """Writes the footer with the metadata of all row groups and closes the file"""
+        try:
+            if self._file_metadata is not None:
+                self._file_metadata.row_groups = self._row_groups
+                self._file_metadata.num_rows = self.row_count
+                footer_size = write_thrift(self._file, self._file_metadata)
+                self._file.write(struct.pack(b"<I", footer_size))
+                self._file.write(MARKER)
+        finally:
+            self._file.close()
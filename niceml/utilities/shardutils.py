@@ -0,0 +1,216 @@
+"""Module for reading and writing sharded datasets.
+
+A shard is an uncompressed tar file, which contains all files of consecutive
+samples. Each sample is stored under its own key and consists of its referenced
+files (e.g. image and mask) and a json file with its serialized data info.
+The shard index lists all shards with the data infos of their samples, so a
+dataset can be listed by reading a single file."""
+import hashlib
+import io
+import json
+import tarfile
+import typing
+from dataclasses import dataclass, fields, is_dataclass, replace
+from os.path import basename
+from typing import Dict, List, Tuple, Union
+
+from cattrs import Converter
+from fsspec import AbstractFileSystem
+from hydra.utils import get_class
+
+from niceml.data.datainfos.datainfo import DataInfo
+from niceml.utilities.fsspec.locationutils import (
+    LocationConfig,
+    get_location_uri,
+    join_fs_path,
+    open_location,
+)
+from niceml.utilities.ioutils import read_json
+
+SHARD_INDEX_FILENAME = "shard_index.json"
+SHARD_MEMORY_ROOT = "memory://niceml-shards"
+SAMPLE_INFO_SUFFIX = "datainfo.json"
+LOCATION_FIELD_SUFFIX = "_location"
+
+
+class ShardFormatError(Exception):
+    """Error if a shard or a sharded data info does not have the expected format"""
+
+
+def _create_converter() -> Converter:
+    """Creates a converter which keeps primitive, union and tuple values as they are
+    and (un)structures dataclasses, attrs classes and lists"""
+    converter = Converter()
+    for primitive_type in (int, float, str, bool):
+        converter.register_structure_hook(primitive_type, lambda value, _: value)
+    converter.register_structure_hook_func(
+        lambda cur_type: typing.get_origin(cur_type) in (typing.Union, tuple),
+        lambda value, _: value,
+    )
+    converter.register_unstructure_hook_func(
+        lambda cur_type: typing.get_origin(cur_type) is tuple,
+        lambda value: None if value is None else list(value),
+    )
+    return converter
+
+
+_CONVERTER = _create_converter()
+
+
+def data_info_to_dict(data_info: DataInfo) -> dict:
+    """Serializes a data info to a json compatible dict including its type"""
+    data_info_type = type(data_info)
+    return dict(
+        type=f"{data_info_type.__module__}.{data_info_type.__qualname__}",
+        info=_CONVERTER.unstructure(data_info),
+    )
+
+
+def data_info_from_dict(data_info_dict: dict) -> DataInfo:
+    """Deserializes a data info, which was serialized with `data_info_to_dict`"""
+    data_info_type = get_class(data_info_dict["type"])
+    return _CONVERTER.structure(data_info_dict["info"], data_info_type)
+
+
+def get_location_field_names(data_info: DataInfo) -> List[str]:
+    """Returns the names of all fields of a data info referencing a file"""
+    if not is_dataclass(data_info):
+        raise ShardFormatError(
+            f"Only dataclass based data infos can be sharded: {type(data_info)}"
+        )
+    return [
+        cur_field.name
+        for cur_field in fields(data_info)
+        if cur_field.name.endswith(LOCATION_FIELD_SUFFIX)
+    ]
+
+
+def get_member_name(key: str, field_name: str, file_path: str) -> str:
+    """Returns the name of a file of a sample inside the shard"""
+    return f"{key}/{field_name}/{basename(file_path)}"
+
+
+def get_shard_name(shard_idx: int) -> str:
+    """Returns the filename of a shard"""
+    return f"shard-{shard_idx:06d}.tar"
+
+
+def get_shard_memory_root(location: Union[dict, LocationConfig]) -> str:
+    """Returns the root uri of the in memory filesystem where the shards of
+    a location are extracted to"""
+    location_hash = hashlib.md5(get_location_uri(location).encode()).hexdigest()
+    return f"{SHARD_MEMORY_ROOT}/{location_hash}"
+
+
+def split_shard_memory_uri(uri: str) -> Tuple[str, str]:
+    """Returns the memory root and the shard name of a file extracted from a shard"""
+    if not uri.startswith(SHARD_MEMORY_ROOT):
+        raise ShardFormatError(f"Uri is not located in a shard: {uri}")
+    location_hash, shard_name = uri[len(SHARD_MEMORY_ROOT) + 1 :].split("/")[:2]
+    return f"{SHARD_MEMORY_ROOT}/{location_hash}", shard_name
+
+
+@dataclass
+class ShardSample:
+    """One sample of a shard"""
+
+    key: str
+    identifier: str
+    data_info: DataInfo  # with locations relative to the shard
+    files: Dict[str, bytes]
+
+    def to_dict(self) -> dict:
+        """Returns the json compatible description of the sample"""
+        return dict(
+            key=self.key,
+            identifier=self.identifier,
+            **data_info_to_dict(self.data_info),
+        )
+
+
+def write_shard(
+    samples: List[ShardSample], shard_path: str, file_system: AbstractFileSystem
+):
+    """
+    Writes samples into one shard
+
+    Args:
+        samples: Samples to store in the shard
+        shard_path: Path of the shard to write
+        file_system: Filesystem to write the shard to
+    """
+    with file_system.open(shard_path, "wb") as shard_file, tarfile.open(
+        fileobj=shard_file, mode="w"
+    ) as shard_tar:
+        for sample in samples:
+            info_content = json.dumps(sample.to_dict()).encode()
+            member_dict = {
+                **sample.files,
+                f"{sample.key}/{SAMPLE_INFO_SUFFIX}": info_content,
+            }
+            for member_name, content in member_dict.items():
+                tar_info = tarfile.TarInfo(name=member_name)
+                tar_info.size = len(content)
+                shard_tar.addfile(tar_info, io.BytesIO(content))
+
+
+def read_shard(shard_path: str, file_system: AbstractFileSystem) -> Dict[str, bytes]:
+    """Reads all files of a shard with one sequential read"""
+    with file_system.open(shard_path, "rb") as shard_file:
+        shard_content = shard_file.read()
+    member_dict: Dict[str, bytes] = {}
+    with tarfile.open(fileobj=io.BytesIO(shard_content), mode="r") as shard_tar:
+        for tar_info in shard_tar:
+            if tar_info.isfile():
+                member_dict[tar_info.name] = shard_tar.extractfile(tar_info).read()
+    return member_dict
+
+
+def read_sample_files(data_info: DataInfo, key: str) -> ShardSample:
+    """
+    Reads all files referenced by a data info
+
+    Args:
+        data_info: Data info of the sample
+        key: Key of the sample inside the shard
+
+    Returns:
+        The sample with the file contents and shard relative locations
+    """
+    files: Dict[str, bytes] = {}
+    new_locations: Dict[str, dict] = {}
+    for field_name in get_location_field_names(data_info):
+        with open_location(getattr(data_info, field_name)) as (file_fs, file_path):
+            with file_fs.open(file_path, "rb") as cur_file:
+                member_name = get_member_name(key, field_name, file_path)
+                files[member_name] = cur_file.read()
+        new_locations[field_name] = dict(uri=member_name)
+    return ShardSample(
+        key=key,
+        identifier=data_info.get_identifier(),
+        data_info=replace(data_info, **new_locations),
+        files=files,
+    )
+
+
+def relocate_data_info(
+    data_info: DataInfo, memory_root: str, shard_name: str
+) -> DataInfo:
+    """Points the shard relative locations of a data info to the in memory
+    filesystem the shard is extracted to"""
+    new_locations = {
+        field_name: dict(
+            uri=f"{memory_root}/{shard_name}/{getattr(data_info, field_name)['uri']}"
+        )
+        for field_name in get_location_field_names(data_info)
+    }
+    return replace(data_info, **new_locations)
+
+
+def read_shard_index(location: Union[dict, LocationConfig]) -> dict:
+    """Reads the shard index of a sharded dataset"""
+    with open_location(location) as (shard_fs, shard_root):
+        return read_json(
+            join_fs_path(shard_fs, shard_root, SHARD_INDEX_FILENAME),
+            file_system=shard_fs,
+        )
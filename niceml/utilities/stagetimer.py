@@ -0,0 +1,115 @@
+"""Module for the StageTimer, which measures the latency of pipeline stages"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BIN_EDGES_MS = [1.0, 5.0, 10.0, 50.0, 100.0, 500.0, 1000.0]
+
+
+class StageTimer:
+    """Records the latencies of named stages (e.g. loading or augmentation) and
+    aggregates them per epoch into latency histograms and samples per second.
+    Recording a measurement only appends to a list, the statistics are computed
+    once per epoch."""
+
+    def __init__(self, bin_edges_ms: Optional[List[float]] = None):
+        """
+        Constructor of the StageTimer
+        Args:
+            bin_edges_ms: Upper edges of the latency histogram bins in
+                milliseconds. Latencies above the last edge are counted
+                in an additional bin.
+        """
+        self.bin_edges_ms: List[float] = sorted(bin_edges_ms or DEFAULT_BIN_EDGES_MS)
+        self.epoch: int = 0
+        self._lock = threading.Lock()
+        self._durations: Dict[str, List[float]] = defaultdict(list)
+        self._sample_count: int = 0
+        self._start_time: Optional[float] = None
+        self._records: List[dict] = []
+
+    @contextmanager
+    def measure(self, stage: str):
+        """Measures the duration of the code inside the context as one
+        latency of the stage"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            end_time = time.perf_counter()
+            with self._lock:
+                if self._start_time is None:
+                    self._start_time = start_time
+                self._durations[stage].append(end_time - start_time)
+
+    def add_samples(self, sample_count: int):
+        """Adds the number of samples which passed the pipeline"""
+        with self._lock:
+            self._sample_count += sample_count
+
+    def aggregate_epoch(self) -> List[dict]:
+        """
+        Aggregates the measurements of the current epoch and starts a new epoch.
+
+        Returns:
+            One record per stage with the latency statistics in milliseconds,
+            the histogram counts and the samples per second of the epoch.
+            Empty if nothing was measured.
+        """
+        with self._lock:
+            durations = self._durations
+            sample_count = self._sample_count
+            start_time = self._start_time
+            self._durations = defaultdict(list)
+            self._sample_count = 0
+            self._start_time = None
+        if len(durations) == 0:
+            return []
+        wall_time = time.perf_counter() - start_time
+        samples_per_sec = sample_count / wall_time if wall_time > 0 else 0.0
+        records: List[dict] = []
+        for stage, stage_durations in durations.items():
+            durations_ms = np.asarray(stage_durations) * 1000.0
+            percentiles = np.percentile(durations_ms, [50, 90, 99])
+            hist_counts = np.bincount(
+                np.searchsorted(self.bin_edges_ms, durations_ms, side="left"),
+                minlength=len(self.bin_edges_ms) + 1,
+            )
+            record = dict(
+                epoch=self.epoch,
+                stage=stage,
+                count=len(durations_ms),
+                total_sec=float(durations_ms.sum() / 1000.0),
+                mean_ms=float(durations_ms.mean()),
+                p50_ms=float(percentiles[0]),
+                p90_ms=float(percentiles[1]),
+                p99_ms=float(percentiles[2]),
+                max_ms=float(durations_ms.max()),
+                samples=sample_count,
+                samples_per_sec=float(samples_per_sec),
+            )
+            record.update(
+                {
+                    name: int(count)
+                    for name, count in zip(self.get_histogram_names(), hist_counts)
+                }
+            )
+            records.append(record)
+        self._records += records
+        self.epoch += 1
+        return records
+
+    def get_histogram_names(self) -> List[str]:
+        """Returns the names of the histogram bins"""
+        return [f"hist_le_{edge:g}ms" for edge in self.bin_edges_ms] + [
+            f"hist_gt_{self.bin_edges_ms[-1]:g}ms"
+        ]
+
+    def get_records_df(self) -> pd.DataFrame:
+        """Returns the records of all aggregated epochs as dataframe"""
+        return pd.DataFrame(self._records)
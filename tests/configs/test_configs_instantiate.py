@@ -13,11 +13,21 @@ from niceml.scripts.hydraconfreader import load_hydra_conf
         "configs/jobs/job_train/job_train_cls/job_train_cls_multitarget.yaml",
         "configs/jobs/job_train/job_train_cls/job_train_cls_softmax.yaml",
         "configs/jobs/job_train/job_train_objdet/job_train_objdet_number.yaml",
+        "configs/jobs/job_train/job_train_objdet/job_train_objdet_number_shards.yaml",
         "configs/jobs/job_train/job_train_reg/job_train_reg_number.yaml",
         "configs/jobs/job_train/job_train_semseg/job_train_semseg_number.yaml",
         # Eval Configs
         "configs/jobs/job_eval/job_eval_objdet/job_eval_objdet_number.yaml",
+        "configs/jobs/job_eval/job_eval_objdet/job_eval_objdet_number_tiled.yaml",
+        "configs/jobs/job_eval/job_eval_objdet/job_eval_objdet_number_tflite.yaml",
+        "configs/jobs/job_eval/job_eval_objdet/job_eval_objdet_number_nms.yaml",
         "configs/jobs/job_eval/job_eval_reg/job_eval_reg_number.yaml",
+        # Export Configs
+        "configs/jobs/job_export_model/job_export_model_objdet.yaml",
+        "configs/jobs/job_export_model/job_export_model_tflite_objdet.yaml",
+        # Data Configs
+        "configs/jobs/job_write_shards/job_write_shards_objdet.yaml",
+        "configs/jobs/job_preprocess_images/job_preprocess_images_objdet.yaml",
     ]
 )
 def yaml_path(request):
@@ -3,6 +3,7 @@ from tempfile import TemporaryDirectory
 from typing import List
 
 import fastparquet
+import numpy as np
 import pandas as pd
 import pytest
 from attr import asdict
@@ -79,3 +80,39 @@ def test_boundingboxiterator(
                 assert cur_bbox == target_bbox
         else:
             assert len(targets) == 0
+
+
+def test_boundingboxiterator_interleaved_keys(tmp_path: str):
+    data_frame = pd.DataFrame(
+        {
+            "image_location": ["b.png", "a.png", "b.png", "c.png", "a.png"],
+            "detection_index": [0, 0, 1, -1, 1],
+            "x_pos": [1.0, 2.0, 3.0, 0.0, 4.0],
+            "y_pos": [5.0, 6.0, 7.0, 0.0, 8.0],
+            "width": [10.0, 11.0, 12.0, 0.0, 13.0],
+            "height": [20.0, 21.0, 22.0, 0.0, 23.0],
+            "pred_0000": [0.9, 0.8, 0.7, 0.0, 0.6],
+            "pred_0001": [0.1, 0.2, 0.3, 0.0, 0.4],
+        }
+    )
+    parq_file_path = join(tmp_path, "interleaved")
+    fastparquet.write(parq_file_path + ".parq", data_frame)
+
+    bbox_iterator = BoundingBoxIterator()
+    bbox_iterator.open(parq_file_path)
+
+    assert list(bbox_iterator) == ["b.png", "a.png", "c.png"]
+    a_arrays = bbox_iterator.get_arrays("a.png")
+    assert len(a_arrays) == 2
+    assert np.array_equal(
+        a_arrays.to_array(),
+        [[2.0, 6.0, 11.0, 21.0, 0.8, 0.2], [4.0, 8.0, 13.0, 23.0, 0.6, 0.4]],
+    )
+    b_containers = bbox_iterator["b.png"]
+    assert [container.bounding_box for container in b_containers] == [
+        BoundingBox(1.0, 5.0, 10.0, 20.0),
+        BoundingBox(3.0, 7.0, 12.0, 22.0),
+    ]
+    assert np.array_equal(b_containers[1].class_predictions, [0.7, 0.3])
+    assert len(bbox_iterator.get_arrays("c.png")) == 0
+    assert bbox_iterator["c.png"] == []
@@ -0,0 +1,209 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os.path import join
+from typing import List
+
+import numpy as np
+import pytest
+
+from niceml.dagster.ops.writeshards import write_shard_files
+from niceml.data.datadescriptions.objdetdatadescription import ObjDetDataDescription
+from niceml.data.datainfolistings.objdetdatainfolisting import ObjDetDataInfoListing
+from niceml.data.datainfolistings.sharddatainfolisting import ShardDataInfoListing
+from niceml.data.datainfos.datainfo import DataInfo
+from niceml.data.dataloaders.dataloader import DataLoader
+from niceml.data.dataloaders.objdetdataloader import ObjDetDataLoader
+from niceml.data.dataloaders.sharddataloader import ShardDataLoader
+from niceml.data.datasets.genericdataset import check_shard_shuffler
+from niceml.data.datashuffler.defaultshuffler import DefaultDataShuffler
+from niceml.data.datashuffler.shardshuffler import ShardShuffler
+from niceml.utilities.imagesize import ImageSize
+from niceml.utilities.shardutils import get_location_field_names, split_shard_memory_uri
+
+
+def test_shard_roundtrip(created_test_image_path, tmp_dir):
+    classes, output_location = created_test_image_path
+    data_description = ObjDetDataDescription(
+        featuremap_scales=[8, 16, 32, 64, 128],
+        classes=classes,
+        input_image_size=ImageSize(256, 256),
+        anchor_aspect_ratios=[1, 0.5, 2.0],
+        anchor_scales=[1, 1.25, 1.6],
+        anchor_base_area_side=4,
+        box_variance=[0.1, 0.1, 0.2, 0.2],
+    )
+    data_info_list = ObjDetDataInfoListing(location=output_location, sub_dir="").list(
+        data_description
+    )
+    shard_location = {"uri": join(tmp_dir, "shards")}
+    shard_index = write_shard_files(data_info_list, shard_location, 3)
+    assert len(shard_index["shards"]) == 4
+
+    shard_info_list = ShardDataInfoListing(location=shard_location).list(
+        data_description
+    )
+    assert len(shard_info_list) == len(data_info_list)
+
+    data_loader = ObjDetDataLoader()
+    data_loader.initialize(data_description)
+    shard_loader = ShardDataLoader(
+        data_loader=ObjDetDataLoader(), location=shard_location, cache_size=1
+    )
+    shard_loader.initialize(data_description)
+    for data_info, shard_info in zip(data_info_list, shard_info_list):
+        original_data = data_loader.load_data(data_info)
+        shard_data = shard_loader.load_data(shard_info)
+        assert np.array_equal(original_data.image, shard_data.image)
+        assert original_data.labels == shard_data.labels
+        assert data_info.get_filename() == shard_info.get_filename()
+
+    shard_shuffler = ShardShuffler(buffer_size=2, seed=1)
+    shuffled_indexes = shard_shuffler.shuffle(shard_info_list)
+    assert sorted(shuffled_indexes.tolist()) == list(range(len(shard_info_list)))
+    shard_names = [
+        split_shard_memory_uri(
+            getattr(shard_info_list[idx], get_location_field_names(data_info)[0])["uri"]
+        )[1]
+        for idx in shuffled_indexes
+    ]
+    shard_changes = sum(
+        cur_name != next_name
+        for cur_name, next_name in zip(shard_names, shard_names[1:])
+    )
+    assert shard_changes <= 2 * (len(shard_index["shards"]) - 1)
+
+
+class SlowDataLoader(DataLoader):
+    """Waits before loading, so other threads switch the shards meanwhile"""
+
+    def __init__(self, data_loader: DataLoader):
+        super().__init__()
+        self.data_loader = data_loader
+
+    def initialize(self, data_description):
+        super().initialize(data_description)
+        self.data_loader.initialize(data_description)
+
+    def load_data(self, data_info: DataInfo):
+        time.sleep(0.01)
+        return self.data_loader.load_data(data_info)
+
+
+def test_shard_loader_pins_shards_of_concurrent_loads(created_test_image_path, tmp_dir):
+    classes, output_location = created_test_image_path
+    data_description = ObjDetDataDescription(
+        featuremap_scales=[8, 16, 32, 64, 128],
+        classes=classes,
+        input_image_size=ImageSize(256, 256),
+        anchor_aspect_ratios=[1, 0.5, 2.0],
+        anchor_scales=[1, 1.25, 1.6],
+        anchor_base_area_side=4,
+        box_variance=[0.1, 0.1, 0.2, 0.2],
+    )
+    data_info_list = ObjDetDataInfoListing(location=output_location, sub_dir="").list(
+        data_description
+    )
+    shard_location = {"uri": join(tmp_dir, "shards")}
+    write_shard_files(data_info_list, shard_location, 3)
+    shard_info_list = ShardDataInfoListing(location=shard_location).list(
+        data_description
+    )
+    data_loader = ObjDetDataLoader()
+    data_loader.initialize(data_description)
+    shard_loader = ShardDataLoader(
+        data_loader=SlowDataLoader(ObjDetDataLoader()),
+        location=shard_location,
+        cache_size=1,
+    )
+    shard_loader.initialize(data_description)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        shard_data_list = list(executor.map(shard_loader.load_data, shard_info_list))
+
+    for data_info, shard_data in zip(data_info_list, shard_data_list):
+        assert np.array_equal(data_loader.load_data(data_info).image, shard_data.image)
+    assert len(shard_loader._cached_shards) == 1
+    assert len(shard_loader._shard_users) == 0
+
+
+class BlockingShardDataLoader(ShardDataLoader):
+    """Blocks the extraction of one shard until the event is set"""
+
+    def __init__(self, blocked_shard: str, **kwargs):
+        super().__init__(**kwargs)
+        self.blocked_shard = blocked_shard
+        self.release_event = threading.Event()
+        self.extracted_shards: List[str] = []
+
+    def _extract_shard(self, shard_name: str):
+        self.extracted_shards.append(shard_name)
+        if shard_name == self.blocked_shard:
+            assert self.release_event.wait(timeout=10)
+        super()._extract_shard(shard_name)
+
+
+def get_shard_name(data_info: DataInfo) -> str:
+    return split_shard_memory_uri(
+        getattr(data_info, get_location_field_names(data_info)[0])["uri"]
+    )[1]
+
+
+def test_shard_loader_extracts_shards_in_parallel(created_test_image_path, tmp_dir):
+    classes, output_location = created_test_image_path
+    data_description = ObjDetDataDescription(
+        featuremap_scales=[8, 16, 32, 64, 128],
+        classes=classes,
+        input_image_size=ImageSize(256, 256),
+        anchor_aspect_ratios=[1, 0.5, 2.0],
+        anchor_scales=[1, 1.25, 1.6],
+        anchor_base_area_side=4,
+        box_variance=[0.1, 0.1, 0.2, 0.2],
+    )
+    data_info_list = ObjDetDataInfoListing(location=output_location, sub_dir="").list(
+        data_description
+    )
+    shard_location = {"uri": join(tmp_dir, "shards")}
+    write_shard_files(data_info_list, shard_location, 3)
+    shard_info_list = ShardDataInfoListing(location=shard_location).list(
+        data_description
+    )
+    blocked_shard = get_shard_name(shard_info_list[0])
+    other_infos = [
+        info for info in shard_info_list if get_shard_name(info) != blocked_shard
+    ]
+    shard_loader = BlockingShardDataLoader(
+        blocked_shard=blocked_shard,
+        data_loader=ObjDetDataLoader(),
+        location=shard_location,
+        cache_size=2,
+    )
+    shard_loader.initialize(data_description)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        blocked_futures = [
+            executor.submit(shard_loader.load_data, shard_info_list[idx])
+            for idx in [0, 1]
+        ]
+        # other shards are extracted and loaded while the first one is blocked
+        shard_loader.load_data(other_infos[0])
+        shard_loader.load_data(other_infos[1])
+        assert not any(future.done() for future in blocked_futures)
+        shard_loader.release_event.set()
+        for future in blocked_futures:
+            assert future.result(timeout=10).image is not None
+
+    assert shard_loader.extracted_shards.count(blocked_shard) == 1
+    assert len(shard_loader._shard_users) == 0
+
+
+def test_check_shard_shuffler(tmp_dir):
+    shard_loader = ShardDataLoader(
+        data_loader=ObjDetDataLoader(), location={"uri": tmp_dir}
+    )
+
+    check_shard_shuffler(shard_loader, ShardShuffler(), shuffle=True)
+    check_shard_shuffler(shard_loader, DefaultDataShuffler(), shuffle=False)
+    check_shard_shuffler(ObjDetDataLoader(), DefaultDataShuffler(), shuffle=True)
+    with pytest.raises(ValueError, match="ShardShuffler"):
+        check_shard_shuffler(shard_loader, DefaultDataShuffler(), shuffle=True)
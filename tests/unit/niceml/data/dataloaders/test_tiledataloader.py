@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from niceml.data.datadescriptions.objdetdatadescription import ObjDetDataDescription
+from niceml.data.datainfolistings.objdetdatainfolisting import ObjDetDataInfoListing
+from niceml.data.datainfolistings.tiledatainfolisting import TileDataInfoListing
+from niceml.data.datainfos.objdetdatainfo import ObjDetData, ObjDetDataInfo
+from niceml.data.datainfos.tiledatainfo import TileDataInfo
+from niceml.data.dataloaders.dataloader import DataLoader
+from niceml.data.dataloaders.objdetdataloader import ObjDetDataLoader
+from niceml.data.dataloaders.tiledataloader import TileDataLoader
+from niceml.utilities.imagesize import ImageSize
+
+
+@pytest.fixture()
+def tile_data_description() -> ObjDetDataDescription:
+    return ObjDetDataDescription(
+        featuremap_scales=[8, 16, 32, 64, 128],
+        classes=["0", "1"],
+        input_image_size=ImageSize(128, 128),
+        anchor_aspect_ratios=[1, 0.5, 2.0],
+        anchor_scales=[1, 1.25, 1.6],
+        anchor_base_area_side=4,
+        box_variance=[0.1, 0.1, 0.2, 0.2],
+    )
+
+
+def test_tile_roundtrip(created_test_image_path, tile_data_description):
+    _, output_location = created_test_image_path
+    image_listing = ObjDetDataInfoListing(location=output_location, sub_dir="")
+    tile_infos = TileDataInfoListing(image_listing, overlap=32).list(
+        tile_data_description
+    )
+    image_infos = image_listing.list(tile_data_description)
+    # 256x256 images with 128x128 tiles at the offsets 0, 96 and 128
+    assert len(tile_infos) == 9 * len(image_infos)
+    assert len({tile_info.get_identifier() for tile_info in tile_infos}) == len(
+        tile_infos
+    )
+
+    full_loader = ObjDetDataLoader(resize_to_input_size=False)
+    full_loader.initialize(tile_data_description)
+    tile_loader = TileDataLoader(ObjDetDataLoader(resize_to_input_size=False))
+    tile_loader.initialize(tile_data_description)
+    for tile_info in tile_infos[:9]:
+        image_data = full_loader.load_data(tile_info.data_info)
+        tile_data = tile_loader.load_data(tile_info)
+        assert tile_info.get_image_identifier() == image_infos[0].get_identifier()
+        assert tile_data.image.shape[:2] == (128, 128)
+        assert np.array_equal(
+            tile_data.image,
+            image_data.image[
+                tile_info.y_pos : tile_info.y_pos + 128,
+                tile_info.x_pos : tile_info.x_pos + 128,
+            ],
+        )
+        for label in tile_data.labels:
+            ullr = np.array(label.bounding_box.get_absolute_ullr())
+            assert np.all(ullr >= 0) and np.all(ullr <= 128)
+    assert len(tile_loader._cached_data) == 1
+
+
+def test_tile_loader_rejects_resized_images(
+    created_test_image_path, tile_data_description
+):
+    _, output_location = created_test_image_path
+    tile_infos = TileDataInfoListing(
+        ObjDetDataInfoListing(location=output_location, sub_dir="")
+    ).list(tile_data_description)
+    tile_loader = TileDataLoader(ObjDetDataLoader())
+    tile_loader.initialize(tile_data_description)
+    with pytest.raises(ValueError):
+        tile_loader.load_data(tile_infos[0])
+
+
+class BlockingDataLoader(DataLoader):
+    """Loads empty images; the first image waits until the second one is loading"""
+
+    def __init__(self):
+        super().__init__()
+        self.second_image_loading = threading.Event()
+        self.load_counts = Counter()
+
+    def load_data(self, data_info: ObjDetDataInfo) -> ObjDetData:
+        self.load_counts[data_info.get_identifier()] += 1
+        if data_info.get_identifier().startswith("image_0"):
+            assert self.second_image_loading.wait(timeout=5)
+        else:
+            self.second_image_loading.set()
+        time.sleep(0.05)
+        return ObjDetData(image=np.zeros((64, 64, 3), dtype=np.uint8), labels=[])
+
+
+def test_tile_loader_loads_images_in_parallel(tile_data_description):
+    tile_infos = [
+        TileDataInfo(
+            data_info=ObjDetDataInfo(
+                image_location={"uri": f"image_{image_idx}.png"},
+                labels=[],
+                class_count_in_dataset=2,
+            ),
+            tile_index=tile_idx,
+            tile_count=4,
+            x_pos=tile_idx % 2 * 32,
+            y_pos=tile_idx // 2 * 32,
+            tile_size=ImageSize(32, 32),
+            image_size=ImageSize(64, 64),
+            overlap=0,
+        )
+        for image_idx in range(2)
+        for tile_idx in range(4)
+    ]
+    data_loader = BlockingDataLoader()
+    tile_loader = TileDataLoader(data_loader, cache_size=2)
+    tile_loader.initialize(tile_data_description)
+
+    # the first image blocks until the second one is loaded in parallel
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        tiles = list(executor.map(tile_loader.load_data, tile_infos))
+
+    assert all(tile.image.shape == (32, 32, 3) for tile in tiles)
+    assert data_loader.load_counts == {"image_0.png": 1, "image_1.png": 1}
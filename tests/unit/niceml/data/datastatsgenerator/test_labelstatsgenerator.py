@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from niceml.data.datainfos.clsdatainfo import ClsDataInfo
+from niceml.data.datainfos.objdetdatainfo import ObjDetDataInfo
+from niceml.data.datastatsgenerator.labelstatsgenerator import LabelStatsGenerator
+from niceml.utilities.boundingboxes.bboxlabeling import ObjDetInstanceLabel
+from niceml.utilities.boundingboxes.boundingbox import BoundingBox
+
+
+def test_cls_label_stats():
+    data_info_list = [
+        ClsDataInfo(
+            identifier=f"{idx:03d}",
+            image_location=f"{idx:03d}",
+            class_idx=idx % 2,
+            class_name=str(idx % 2),
+        )
+        for idx in range(5)
+    ]
+    stats = LabelStatsGenerator().generate_stats(data_info_list, [0, 0, 1, 2])
+
+    assert stats["data_points"] == 5
+    assert stats["used_points"] == 4
+    assert stats["class_frequency"] == {"0": 3, "1": 2}
+    assert stats["used_class_frequency"] == {"0": 3, "1": 1}
+    assert stats["label_count_distribution"] == {1: 5}
+
+
+def test_objdet_label_stats():
+    data_info_list = [
+        ObjDetDataInfo(
+            image_location={"uri": f"{idx}.png"},
+            labels=[
+                ObjDetInstanceLabel(
+                    class_name="a" if label_idx % 2 == 0 else "b",
+                    class_index=label_idx % 2,
+                    bounding_box=BoundingBox(0, 0, 10 * (label_idx + 1), 10),
+                )
+                for label_idx in range(idx)
+            ],
+            class_count_in_dataset=2,
+        )
+        for idx in range(4)
+    ]
+    stats = LabelStatsGenerator(quantiles=[0.0, 1.0]).generate_stats(
+        data_info_list, np.arange(4)
+    )
+
+    assert stats["class_frequency"] == {"a": 4, "b": 2}
+    assert stats["label_count_distribution"] == {0: 1, 1: 1, 2: 1, 3: 1}
+    assert stats["box_width_quantiles"] == {0.0: 10.0, 1.0: 30.0}
+    assert stats["box_area_quantiles"] == {0.0: 100.0, 1.0: 300.0}
+
+
+def test_label_stats_quantiles():
+    data_info_list = [
+        ObjDetDataInfo(
+            image_location={"uri": "0.png"},
+            labels=[
+                ObjDetInstanceLabel(
+                    class_name="a",
+                    class_index=0,
+                    bounding_box=BoundingBox(0, 0, width, 10),
+                )
+                for width in range(1, 11)
+            ],
+            class_count_in_dataset=1,
+        )
+    ]
+    median_stats = LabelStatsGenerator([0.5]).generate_stats(data_info_list, [0])
+    outer_stats = LabelStatsGenerator([0.1, 0.9]).generate_stats(data_info_list, [0])
+
+    assert median_stats["box_width_quantiles"] == {0.5: 5.5}
+    assert outer_stats["box_width_quantiles"] == pytest.approx({0.1: 1.9, 0.9: 9.1})
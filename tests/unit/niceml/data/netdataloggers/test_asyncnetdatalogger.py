@@ -0,0 +1,66 @@
+import threading
+from typing import List
+
+import numpy as np
+
+from niceml.data.datainfos.clsdatainfo import ClsDataInfo
+from niceml.data.netdataloggers.asyncnetdatalogger import (
+    AsyncNetDataLogger,
+    FullQueuePolicy,
+)
+
+
+class RecordingNetDataLogger(AsyncNetDataLogger):
+    def __init__(self, release_event: threading.Event = None, **kwargs):
+        super().__init__(**kwargs)
+        self.release_event = release_event
+        self.written_inputs: List[np.ndarray] = []
+        self.written_infos: List[ClsDataInfo] = []
+
+    def write_data(self, net_inputs, net_targets, data_info_list):
+        if self.release_event is not None:
+            self.release_event.wait()
+        self.written_inputs += list(net_inputs)
+        self.written_infos += data_info_list
+
+
+def get_batch(batch_size: int, offset: int = 0):
+    net_inputs = np.arange(offset, offset + batch_size).reshape(-1, 1)
+    net_targets = np.zeros((batch_size, 1))
+    data_infos = [
+        ClsDataInfo(
+            identifier=str(idx), image_location=str(idx), class_idx=0, class_name="0"
+        )
+        for idx in range(offset, offset + batch_size)
+    ]
+    return net_inputs, net_targets, data_infos
+
+
+def test_async_logger_max_log():
+    logger = RecordingNetDataLogger(max_log=5, full_queue_policy="block")
+    for batch_idx in range(4):
+        net_inputs, net_targets, data_infos = get_batch(2, offset=batch_idx * 2)
+        logger.log_data(net_inputs, net_targets, data_infos)
+        net_inputs[:] = -1
+    logger.flush()
+
+    assert logger.log_count == 5
+    assert [x.identifier for x in logger.written_infos] == ["0", "1", "2", "3", "4"]
+    assert all(x[0] >= 0 for x in logger.written_inputs)
+
+
+def test_async_logger_drops_on_full_queue():
+    release_event = threading.Event()
+    logger = RecordingNetDataLogger(
+        release_event=release_event,
+        max_log=100,
+        queue_size=1,
+        full_queue_policy=FullQueuePolicy.DROP,
+    )
+    for batch_idx in range(10):
+        logger.log_data(*get_batch(1, offset=batch_idx))
+    release_event.set()
+    logger.flush()
+
+    assert 0 < len(logger.written_infos) < 10
+    assert logger.log_count == len(logger.written_infos)
@@ -0,0 +1,72 @@
+from typing import List
+
+import numpy as np
+
+from niceml.data.datadescriptions.objdetdatadescription import ObjDetDataDescription
+from niceml.data.datainfos.objdetdatainfo import ObjDetDataInfo
+from niceml.data.netdataloggers.objdetnetdatalogger import ObjDetNetDataLogger
+from niceml.experiments.experimentcontext import ExperimentContext
+from niceml.mlcomponents.objdet.anchorencoding import OptimizedAnchorEncoder
+from niceml.mlcomponents.objdet.anchorgenerator import AnchorGenerator
+from niceml.utilities.boundingboxes.bboxlabeling import ObjDetInstanceLabel
+from niceml.utilities.boundingboxes.boundingbox import BoundingBox
+from niceml.utilities.imagesize import ImageSize
+
+
+class LabelRecordingLogger(ObjDetNetDataLogger):
+    def __init__(self):
+        super().__init__(max_log=2)
+        self.drawn_labels: List[List[ObjDetInstanceLabel]] = []
+
+    def _draw_image(self, image, instance_labels, data_info):
+        self.drawn_labels.append(instance_labels)
+
+
+def test_objdet_net_data_logger_decodes_positive_anchors(tmp_dir):
+    data_description = ObjDetDataDescription(
+        featuremap_scales=[8, 16],
+        classes=["a", "b"],
+        input_image_size=ImageSize(64, 64),
+        anchor_aspect_ratios=[1, 0.5, 2.0],
+        anchor_scales=[1, 1.25],
+        anchor_base_area_side=4,
+        box_variance=[0.1, 0.1, 0.2, 0.2],
+    )
+    gt_box = BoundingBox(10, 12, 30, 28)
+    gt_labels = [
+        ObjDetInstanceLabel(class_name="b", class_index=1, bounding_box=gt_box)
+    ]
+    anchors = AnchorGenerator().generate_anchors(data_description)
+    net_target = OptimizedAnchorEncoder().encode_anchors(
+        anchor_list=anchors,
+        gt_labels=gt_labels,
+        num_classes=2,
+        box_variance=data_description.get_box_variance(),
+    )
+    exp_context = ExperimentContext(
+        fs_config={"uri": tmp_dir}, run_id="test", short_id="test"
+    )
+    logger = LabelRecordingLogger()
+    logger.initialize(data_description, exp_context, "train")
+    logger.log_data(
+        net_inputs=np.zeros((1, 64, 64, 3), dtype=np.uint8),
+        net_targets=net_target[np.newaxis],
+        data_info_list=[
+            ObjDetDataInfo(
+                image_location={"uri": "test.png"},
+                labels=gt_labels,
+                class_count_in_dataset=2,
+            )
+        ],
+    )
+    logger.flush()
+
+    assert len(logger.drawn_labels) == 1
+    assert len(logger.drawn_labels[0]) > 0
+    for label in logger.drawn_labels[0]:
+        assert label.class_name == "b"
+        assert np.allclose(
+            label.bounding_box.get_absolute_ullr(),
+            gt_box.get_absolute_ullr(),
+            atol=1e-3,
+        )
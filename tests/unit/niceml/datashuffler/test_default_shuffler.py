@@ -1,5 +1,6 @@
 from typing import List
 
+import numpy as np
 import pytest
 
 from niceml.data.datainfos.clsdatainfo import ClsDataInfo
@@ -32,3 +33,18 @@ def test_twice_randomness(
     result_idxs2 = datashuffler.shuffle(data_info_list)
     comparisons = [x != y for x, y in zip(result_idxs, result_idxs2)]
     assert any(comparisons)
+
+
+@pytest.mark.parametrize("shuffler_type", ["default", "uniform"])
+def test_seeded_reproducibility(shuffler_type: str, data_info_list: List[ClsDataInfo]):
+    """Checks if two shufflers with the same seed return the same indexes"""
+    if shuffler_type == "uniform":
+        shufflers = [
+            UniformDistributionShuffler("class_idx", seed=42) for _ in range(2)
+        ]
+    else:
+        shufflers = [DefaultDataShuffler(seed=42) for _ in range(2)]
+    first_idxs = [shufflers[0].shuffle(data_info_list) for _ in range(3)]
+    second_idxs = [shufflers[1].shuffle(data_info_list) for _ in range(3)]
+    for first, second in zip(first_idxs, second_idxs):
+        assert np.array_equal(first, second)
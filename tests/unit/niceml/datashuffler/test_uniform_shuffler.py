@@ -1,12 +1,14 @@
 from collections import defaultdict
 from typing import Dict, List
 
+import numpy as np
 import pytest
 
 from niceml.data.datainfos.clsdatainfo import ClsDataInfo
 from niceml.data.datashuffler.datashuffler import DataShuffler
 from niceml.data.datashuffler.uniformdistributionshuffler import (
     UniformDistributionShuffler,
+    classdict_to_indexes,
 )
 
 
@@ -37,3 +39,17 @@ def test_uniform_dist(
         assert len(shuffle_idxes) >= len(data_info_list)
     if mode in ["min", "avg"]:
         assert len(shuffle_idxes) <= len(data_info_list)
+
+
+def test_classdict_to_indexes(mode: str):
+    """Test if the indexes of the class dict are uniformly sampled"""
+    class_dict = {"a": [0, 1, 2, 3, 4], "b": [5, 6], "c": [7, 8, 9]}
+    indexes = classdict_to_indexes(class_dict, mode, np.random.default_rng(1))
+    counts = [np.isin(indexes, x).sum() for x in class_dict.values()]
+    assert len(set(counts)) == 1
+    assert set(indexes.tolist()) <= set(range(10))
+    for class_indexes in class_dict.values():
+        values, value_counts = np.unique(
+            indexes[np.isin(indexes, class_indexes)], return_counts=True
+        )
+        assert value_counts.max() - value_counts.min() <= 1
@@ -0,0 +1,104 @@
+from os.path import join
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pytest
+import tensorflow as tf
+from tensorflow import keras
+
+from niceml.data.datadescriptions.objdetdatadescription import ObjDetDataDescription
+from niceml.dlframeworks.keras.modelexporters.retinanetexporter import (
+    RetinaNetExporter,
+    decode_box_predictions,
+)
+from niceml.dlframeworks.keras.predictionfunctions.savedmodelpredictionfunction import (
+    SavedModelPredictionFunction,
+)
+from niceml.dlframeworks.keras.savedmodelloader import SavedModelLoader
+from niceml.mlcomponents.objdet.anchorgenerator import AnchorGenerator
+from niceml.mlcomponents.predictionhandlers.objdetpredictionhandler import (
+    NMS_BOXES_KEY,
+    NMS_CLASSES_KEY,
+    NMS_SCORES_KEY,
+    NMS_VALID_DETECTIONS_KEY,
+)
+from niceml.utilities.boundingboxes.bboxencoding import decode_boxes
+from niceml.utilities.imagesize import ImageSize
+
+
+@pytest.fixture()
+def data_description() -> ObjDetDataDescription:
+    return ObjDetDataDescription(
+        featuremap_scales=[16, 32],
+        classes=["a", "b"],
+        input_image_size=ImageSize(64, 64),
+        anchor_aspect_ratios=[1.0],
+        anchor_scales=[1.0, 1.5],
+        anchor_base_area_side=4,
+        box_variance=[0.1, 0.1, 0.2, 0.2],
+    )
+
+
+@pytest.fixture()
+def objdet_model(data_description: ObjDetDataDescription) -> keras.Model:
+    anchor_count = data_description.get_anchorcount_per_image()
+    value_count = data_description.get_coordinates_count() + len(
+        data_description.classes
+    )
+    tf.random.set_seed(1)
+    in_layer = keras.layers.Input(shape=(64, 64, 3))
+    actual_layer = keras.layers.GlobalAveragePooling2D()(in_layer)
+    actual_layer = keras.layers.Dense(anchor_count * value_count)(actual_layer)
+    out_layer = keras.layers.Reshape((anchor_count, value_count))(actual_layer)
+    return keras.Model(inputs=[in_layer], outputs=[out_layer])
+
+
+def test_decode_box_predictions():
+    rng = np.random.default_rng(0)
+    anchors = np.abs(rng.normal(10, 3, (20, 4))).astype(np.float32)
+    encoded = rng.normal(0, 1, (3, 20, 4)).astype(np.float32)
+    box_variances = np.array([0.1, 0.1, 0.2, 0.2], dtype=np.float32)
+    decoded = decode_box_predictions(
+        tf.constant(anchors), tf.constant(encoded), tf.constant(box_variances)
+    )
+    assert np.allclose(
+        decoded.numpy(), decode_boxes(anchors, encoded, box_variances), atol=1e-4
+    )
+
+
+def test_retinanet_exporter(
+    objdet_model: keras.Model, data_description: ObjDetDataDescription
+):
+    images = np.random.default_rng(1).uniform(0, 1, (2, 64, 64, 3)).astype(np.float32)
+    exporter = RetinaNetExporter(score_threshold=0.0, max_total_detections=10)
+    with TemporaryDirectory() as tmp_dir:
+        export_path = join(tmp_dir, "exported")
+        exporter(objdet_model, data_description, export_path)
+        saved_model = SavedModelLoader()(export_path)
+
+    outputs = SavedModelPredictionFunction().predict(saved_model, images)
+    assert outputs[NMS_BOXES_KEY].shape == (2, 10, 4)
+    assert outputs[NMS_SCORES_KEY].shape == (2, 10)
+    assert outputs[NMS_CLASSES_KEY].shape == (2, 10)
+    assert list(outputs[NMS_VALID_DETECTIONS_KEY]) == [10, 10]
+
+    # the best detection is the decoded anchor with the highest class score
+    predictions = objdet_model.predict_step(tf.constant(images)).numpy()
+    anchors = AnchorGenerator().generate_anchor_array(data_description).xywh
+    for image_idx in range(2):
+        best_idx = np.unravel_index(
+            np.argmax(predictions[image_idx, :, 4:]), predictions.shape[1:2] + (2,)
+        )
+        expected_box = decode_boxes(
+            anchors,
+            predictions[image_idx, :, :4],
+            np.array(data_description.box_variance),
+        )[best_idx[0]]
+        assert np.allclose(
+            outputs[NMS_BOXES_KEY][image_idx, 0], expected_box, atol=1e-3
+        )
+        assert outputs[NMS_CLASSES_KEY][image_idx, 0] == best_idx[1]
+        assert outputs[NMS_SCORES_KEY][image_idx, 0] == pytest.approx(
+            1 / (1 + np.exp(-predictions[image_idx, best_idx[0], 4 + best_idx[1]])),
+            abs=1e-5,
+        )
@@ -0,0 +1,96 @@
+from os.path import join
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pytest
+import tensorflow as tf
+from tensorflow import keras
+
+from niceml.dlframeworks.keras.modelexporters.tfliteexporter import (
+    TFLITE_MODEL_FILENAME,
+    TFLiteExporter,
+    TFLiteQuantization,
+)
+from niceml.dlframeworks.keras.predictionfunctions.tflitepredictionfunction import (
+    TFLitePredictionFunction,
+)
+from niceml.dlframeworks.keras.tflitemodelloader import TFLiteModelLoader
+
+
+class CalibrationDataset:
+    def __init__(self, batches: np.ndarray):
+        self.batches = batches
+        self.initialized = False
+
+    def initialize(self, data_description, exp_context):
+        self.initialized = True
+
+    def __len__(self):
+        return len(self.batches)
+
+    def __getitem__(self, batch_idx: int):
+        return self.batches[batch_idx], None
+
+
+@pytest.fixture()
+def conv_model() -> keras.Model:
+    tf.random.set_seed(2)
+    in_layer = keras.layers.Input(shape=(16, 16, 3))
+    actual_layer = keras.layers.Conv2D(8, 3, activation="relu")(in_layer)
+    actual_layer = keras.layers.GlobalAveragePooling2D()(actual_layer)
+    out_layer = keras.layers.Dense(4)(actual_layer)
+    return keras.Model(inputs=[in_layer], outputs=[out_layer])
+
+
+@pytest.fixture()
+def images() -> np.ndarray:
+    return np.random.default_rng(4).random((10, 16, 16, 3), dtype=np.float32)
+
+
+@pytest.mark.parametrize(
+    ("quantization", "tolerance"),
+    [
+        (TFLiteQuantization.NONE, 1e-5),
+        (TFLiteQuantization.FLOAT16, 1e-2),
+        (TFLiteQuantization.INT8, 5e-2),
+    ],
+)
+def test_tflite_export_roundtrip(
+    conv_model: keras.Model, images: np.ndarray, quantization, tolerance
+):
+    calibration_dataset = CalibrationDataset(images.reshape(5, 2, 16, 16, 3))
+    exporter = TFLiteExporter(
+        quantization=quantization,
+        calibration_dataset=calibration_dataset,
+        calibration_sample_count=6,
+        seed=1,
+    )
+    exporter.initialize(None, None)
+    assert calibration_dataset.initialized
+    assert len(list(exporter.get_calibration_samples())) == 6
+
+    with TemporaryDirectory() as tmp_dir:
+        export_path = join(tmp_dir, "tflite_model")
+        exporter(conv_model, None, export_path)
+        model_content = TFLiteModelLoader()(export_path)
+        assert model_content == TFLiteModelLoader()(
+            join(export_path, TFLITE_MODEL_FILENAME)
+        )
+
+    prediction_function = TFLitePredictionFunction(num_threads=1)
+    expected = conv_model.predict_step(images).numpy()
+    # the input is resized for the batch sizes 4 and 2
+    predictions = np.concatenate(
+        [
+            prediction_function.predict(model_content, images[batch_start:batch_end])
+            for batch_start, batch_end in [(0, 4), (4, 8), (8, 10)]
+        ]
+    )
+    assert predictions.shape == expected.shape
+    assert predictions.dtype == np.float32
+    assert np.allclose(predictions, expected, atol=tolerance)
+
+
+def test_tflite_int8_requires_calibration_dataset():
+    with pytest.raises(ValueError):
+        TFLiteExporter(quantization="int8")
@@ -0,0 +1,185 @@
+import io
+import json
+import os
+from os.path import join
+
+import cv2
+import numpy as np
+import pytest
+from attrs import asdict
+from PIL import Image
+
+from niceml.data.datadescriptions.objdetdatadescription import ObjDetDataDescription
+from niceml.filechecksumprocessors.imagepreprocessingprocessor import (
+    ImagePreprocessingProcessor,
+    resize_image,
+)
+from niceml.utilities.boundingboxes.bboxlabeling import (
+    ObjDetImageLabel,
+    ObjDetInstanceLabel,
+)
+from niceml.utilities.boundingboxes.boundingbox import BoundingBox
+from niceml.utilities.fsspec.locationutils import LocationConfig
+from niceml.utilities.imagesize import ImageSize
+from niceml.utilities.ioutils import list_dir, read_json, read_yaml
+
+
+def create_processor(
+    tmp_dir: str, image_format: str = ".png"
+) -> ImagePreprocessingProcessor:
+    data_description = ObjDetDataDescription(
+        featuremap_scales=[8, 16, 32, 64, 128],
+        classes=["0"],
+        input_image_size=ImageSize(64, 32),
+        anchor_aspect_ratios=[1.0],
+        anchor_scales=[1.0],
+        anchor_base_area_side=4,
+        box_variance=[0.1, 0.1, 0.2, 0.2],
+    )
+    return ImagePreprocessingProcessor(
+        input_location=LocationConfig(uri=join(tmp_dir, "inputs")),
+        output_location=LocationConfig(uri=join(tmp_dir, "outputs")),
+        lockfile_location=LocationConfig(uri=join(tmp_dir, "locks")),
+        data_description=data_description,
+        image_format=image_format,
+        debug=True,
+        batch_size=2,
+    )
+
+
+def write_inputs(input_dir: str):
+    image = np.random.default_rng(0).integers(0, 255, (64, 128, 3), dtype=np.uint8)
+    Image.fromarray(image).save(join(input_dir, "sample.png"))
+    mask = np.zeros((64, 128), dtype=np.uint8)
+    mask[:, 64:] = 3
+    Image.fromarray(mask).save(join(input_dir, "sample_mask.png"))
+    label = ObjDetImageLabel(
+        filename="sample.json",
+        img_size=ImageSize(128, 64),
+        labels=[
+            ObjDetInstanceLabel(
+                class_name="0", bounding_box=BoundingBox(20, 10, 40, 30)
+            )
+        ],
+    )
+    with open(join(input_dir, "sample.json"), "w", encoding="utf-8") as label_file:
+        json.dump(asdict(label), label_file)
+
+
+def test_image_preprocessing_processor(tmp_dir):
+    processor = create_processor(tmp_dir)
+    input_dir = join(tmp_dir, "inputs")
+    output_dir = join(tmp_dir, "outputs")
+    os.makedirs(input_dir)
+    write_inputs(input_dir)
+    processor.run_process()
+
+    assert sorted(list_dir(output_dir)) == [
+        "sample.json",
+        "sample.png",
+        "sample_mask.png",
+    ]
+    image = np.array(Image.open(join(output_dir, "sample.png")))
+    assert image.shape == (32, 64, 3)
+    mask = np.array(Image.open(join(output_dir, "sample_mask.png")))
+    assert set(np.unique(mask)) == {0, 3}
+    assert np.all(mask[:, 32:] == 3)
+    label = ObjDetImageLabel(**read_json(join(output_dir, "sample.json")))
+    assert label.img_size == asdict(ImageSize(64, 32))
+    assert label.labels[0].bounding_box == BoundingBox(10, 5, 20, 15)
+
+    lock_data = read_yaml(join(tmp_dir, "locks", "lock.yaml"))
+    assert len(lock_data["inputs"]) == 3
+    assert len(lock_data["outputs"]) == 3
+
+    # only the changed label is processed again
+    new_processor = create_processor(tmp_dir)
+    label_dict = read_json(join(input_dir, "sample.json"))
+    label_dict["labels"] = []
+    with open(join(input_dir, "sample.json"), "w", encoding="utf-8") as label_file:
+        json.dump(label_dict, label_file)
+    input_files, output_files = new_processor.list_files()
+    checksum_dict = new_processor.load_checksums()
+    changed_files_dict = new_processor.find_changed_files(
+        input_files, output_files, checksum_dict
+    )
+    batches = new_processor.generate_batches(input_files, changed_files_dict)
+    assert batches == [{"inputs": [join(input_dir, "sample.json")]}]
+    new_processor.run_process()
+    lock_data = read_yaml(join(tmp_dir, "locks", "lock.yaml"))
+    assert len(lock_data["inputs"]) == 3
+    assert len(lock_data["outputs"]) == 3
+    assert ObjDetImageLabel(**read_json(join(output_dir, "sample.json"))).labels == []
+
+
+def test_image_preprocessing_processor_jpeg_with_alpha(tmp_dir):
+    processor = create_processor(tmp_dir, image_format=".jpg")
+    input_dir = join(tmp_dir, "inputs")
+    os.makedirs(input_dir)
+    image = np.full((64, 128, 4), 200, dtype=np.uint8)
+    Image.fromarray(image, mode="RGBA").save(join(input_dir, "sample.png"))
+    Image.fromarray(image[:, :, [0, 3]], mode="LA").save(join(input_dir, "gray.png"))
+    label = ObjDetImageLabel(
+        filename="sample.png", img_size=ImageSize(128, 64), labels=[]
+    )
+    with open(join(input_dir, "sample.json"), "w", encoding="utf-8") as label_file:
+        json.dump(asdict(label), label_file)
+    processor.run_process()
+
+    output_dir = join(tmp_dir, "outputs")
+    assert sorted(list_dir(output_dir)) == ["gray.jpg", "sample.jpg", "sample.json"]
+    output_label = ObjDetImageLabel(**read_json(join(output_dir, "sample.json")))
+    assert output_label.filename == "sample.jpg"
+    rgb_image = Image.open(join(output_dir, "sample.jpg"))
+    assert rgb_image.mode == "RGB"
+    assert rgb_image.size == (64, 32)
+    assert Image.open(join(output_dir, "gray.jpg")).mode == "L"
+
+
+def test_image_preprocessing_processor_same_output_filename(tmp_dir):
+    processor = create_processor(tmp_dir, image_format=".jpg")
+    input_dir = join(tmp_dir, "inputs")
+    os.makedirs(input_dir)
+    image = np.zeros((64, 128, 3), dtype=np.uint8)
+    Image.fromarray(image).save(join(input_dir, "sample.png"))
+    Image.fromarray(image).save(join(input_dir, "sample.jpg"))
+
+    with pytest.raises(ValueError, match="sample.jpg"):
+        processor.list_files()
+
+
+def _encode_palette_image() -> bytes:
+    index_image = np.zeros((4, 8), dtype=np.uint8)
+    index_image[:, 4:] = 2
+    palette_image = Image.fromarray(index_image, mode="P")
+    palette_image.putpalette([0, 0, 0, 255, 255, 255, 255, 0, 0] + [0] * 759)
+    output_buffer = io.BytesIO()
+    palette_image.save(output_buffer, format="PNG")
+    return output_buffer.getvalue()
+
+
+def test_resize_palette_image():
+    image_content = _encode_palette_image()
+
+    linear_image = Image.open(
+        io.BytesIO(resize_image(image_content, ImageSize(16, 8), ".png"))
+    )
+    nearest_image = Image.open(
+        io.BytesIO(
+            resize_image(
+                image_content,
+                ImageSize(16, 8),
+                ".png",
+                interpolation=cv2.INTER_NEAREST,
+            )
+        )
+    )
+
+    # interpolated between black and red instead of the indices 0 and 2,
+    # which would create the white index 1 in between
+    linear_array = np.array(linear_image)
+    assert linear_image.mode == "RGB"
+    assert np.all(linear_array[:, :, 1:] == 0)
+    assert nearest_image.mode == "P"
+    assert set(np.unique(np.array(nearest_image))) == {0, 2}
+    assert np.array(nearest_image.convert("RGB"))[0, -1].tolist() == [255, 0, 0]
@@ -86,3 +86,71 @@ def test_anchor_featuremap_generation(
         encoding_array[encoding_array[:, 4] == NEGATIVE_MASK_VALUE, 5:]
     )
     assert negative_sum == 0
+
+
+@pytest.mark.parametrize(
+    "encoder_factory",
+    [
+        SimpleAnchorEncoder,
+        OptimizedAnchorEncoder,
+        lambda: OptimizedAnchorEncoder(matching="grid", grid_cell_size=16),
+    ],
+)
+def test_encode_anchor_batch(encoder_factory, box_variance: List[float]):
+    anchor_list: List[BoundingBox] = AnchorGenerator().gen_anchors_for_featuremap(
+        image_size=ImageSize(128, 128),
+        scale=8,
+        anchor_scales=[1.0, 1.25],
+        aspect_ratios=[0.5, 1.0, 2.0],
+        base_area_side=4,
+    )
+    num_classes = 3
+    gt_labels_batch: List[List[ObjDetInstanceLabel]] = [
+        [
+            ObjDetInstanceLabel(
+                class_name="",
+                bounding_box=BoundingBox(10, 12, 30, 25),
+                class_index=2,
+            ),
+            ObjDetInstanceLabel(
+                class_name="",
+                bounding_box=anchor_list[200],
+                class_index=1,
+            ),
+        ],
+        [],
+        [
+            ObjDetInstanceLabel(
+                class_name="",
+                bounding_box=BoundingBox(60.5, 70, 40, 20.5),
+                class_index=0,
+            )
+        ],
+    ]
+    encoder: AnchorEncoder = encoder_factory()
+    anchor_array = np.array([box.get_absolute_ullr() for box in anchor_list])
+    batch_encoding = encoder.encode_anchor_batch(
+        anchor_list=anchor_array,
+        gt_labels_batch=gt_labels_batch,
+        num_classes=num_classes,
+        box_variance=box_variance,
+    )
+
+    assert batch_encoding.shape == (3, len(anchor_list), 4 + 1 + num_classes)
+    assert batch_encoding.dtype == np.float32
+    for encoding, gt_labels in zip(batch_encoding, gt_labels_batch):
+        expected_encoding = encoder.encode_anchors(
+            anchor_list=anchor_list,
+            gt_labels=gt_labels,
+            num_classes=num_classes,
+            box_variance=box_variance,
+        )
+        assert np.array_equal(encoding[:, 4:], expected_encoding[:, 4:])
+        assert np.allclose(encoding[:, :4], expected_encoding[:, :4], atol=1e-4)
+        dense_encoding = OptimizedAnchorEncoder().encode_anchors(
+            anchor_list=anchor_list,
+            gt_labels=gt_labels,
+            num_classes=num_classes,
+            box_variance=box_variance,
+        )
+        assert np.array_equal(encoding[:, 4:], dense_encoding[:, 4:])
@@ -1,9 +1,13 @@
 from math import isclose
 from typing import List
 
+import numpy as np
+
+from niceml.data.datadescriptions.objdetdatadescription import ObjDetDataDescription
 from niceml.mlcomponents.objdet.anchorgenerator import (
     AnchorGenerator,
     calculate_anchor_width_height_list,
+    clear_anchor_cache,
 )
 from niceml.utilities.boundingboxes.boundingbox import BoundingBox
 from niceml.utilities.imagesize import ImageSize
@@ -55,3 +59,56 @@ def test_anchor_featuremap_generation():
     # would do it
     assert first_bbox.y_pos == second_bbox.y_pos
     assert first_bbox.x_pos < second_bbox.x_pos
+
+
+def test_generate_anchor_array():
+    data_description = ObjDetDataDescription(
+        featuremap_scales=[8, 16, 32, 64, 128],
+        classes=["0"],
+        input_image_size=ImageSize(256, 128),
+        anchor_aspect_ratios=[0.5, 1.0, 2.0],
+        anchor_scales=[1.0, 1.25, 1.6],
+        anchor_base_area_side=4,
+        box_variance=[0.1, 0.1, 0.2, 0.2],
+    )
+    clear_anchor_cache()
+    anchor_gen = AnchorGenerator()
+    anchor_arrays = anchor_gen.generate_anchor_array(data_description)
+    anchor_list = anchor_gen.generate_anchors(data_description)
+
+    assert anchor_arrays.xywh.shape == (len(anchor_list), 4)
+    assert anchor_arrays.xywh.dtype == np.float32
+    assert len(anchor_list) == data_description.get_anchorcount_per_image()
+    assert np.allclose(
+        anchor_arrays.xywh, [box.get_absolute_xywh() for box in anchor_list]
+    )
+    assert np.allclose(
+        anchor_arrays.ullr, [box.get_absolute_ullr() for box in anchor_list]
+    )
+    assert not anchor_arrays.ullr.flags.writeable
+    assert AnchorGenerator().generate_anchor_array(data_description) is anchor_arrays
+
+
+class ShiftedAnchorGenerator(AnchorGenerator):
+    def gen_anchor_array_for_featuremap(self, *args, **kwargs) -> np.ndarray:
+        anchor_array = super().gen_anchor_array_for_featuremap(*args, **kwargs)
+        anchor_array[:, :2] += 1.0
+        return anchor_array
+
+
+def test_anchor_array_cache_per_generator_class():
+    data_description = ObjDetDataDescription(
+        featuremap_scales=[8, 16],
+        classes=["0"],
+        input_image_size=ImageSize(64, 64),
+        anchor_aspect_ratios=[1.0],
+        anchor_scales=[1.0],
+        anchor_base_area_side=4,
+        box_variance=[0.1, 0.1, 0.2, 0.2],
+    )
+    clear_anchor_cache()
+    anchor_arrays = AnchorGenerator().generate_anchor_array(data_description)
+    shifted_arrays = ShiftedAnchorGenerator().generate_anchor_array(data_description)
+
+    assert np.allclose(shifted_arrays.xywh[:, :2], anchor_arrays.xywh[:, :2] + 1.0)
+    assert np.allclose(shifted_arrays.xywh[:, 2:], anchor_arrays.xywh[:, 2:])
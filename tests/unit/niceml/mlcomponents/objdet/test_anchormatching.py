@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from niceml.mlcomponents.objdet.anchorgenerator import AnchorGenerator
+from niceml.mlcomponents.objdet.anchormatching import GridAnchorMatcher
+from niceml.utilities.imagesize import ImageSize
+from niceml.utilities.ioumatrix import compute_iou_matrix
+
+
+@pytest.fixture
+def anchor_array() -> np.ndarray:
+    anchor_xywh = AnchorGenerator().gen_anchor_array_for_featuremap(
+        image_size=ImageSize(256, 192),
+        scale=8,
+        anchor_scales=[1.0, 1.25, 4.0],
+        aspect_ratios=[0.5, 1.0, 2.0],
+        base_area_side=4,
+    )
+    return np.concatenate(
+        [anchor_xywh[:, :2], anchor_xywh[:, :2] + anchor_xywh[:, 2:]], axis=1
+    )
+
+
+@pytest.mark.parametrize("grid_cell_size", [16.0, 64.0, 500.0])
+@pytest.mark.parametrize("gt_count", [0, 1, 25])
+def test_grid_matcher_equals_dense(
+    anchor_array: np.ndarray, grid_cell_size: float, gt_count: int
+):
+    rng = np.random.default_rng(42)
+    upper_left = rng.uniform(-20, 240, (gt_count, 2))
+    gt_boxes = np.concatenate(
+        [upper_left, upper_left + rng.uniform(2, 120, (gt_count, 2))], axis=1
+    )
+    matcher = GridAnchorMatcher(grid_cell_size)
+    match_result = matcher.match(anchor_array, gt_boxes)
+    anchor_gt_indexes, iou_maxes = match_result.to_dense(anchor_array.shape[0])
+
+    assert np.all(match_result.iou_values > 0)
+    if gt_count == 0:
+        assert len(match_result.anchor_indexes) == 0
+        return
+    iou_matrix = compute_iou_matrix(anchor_array, gt_boxes)
+    assert np.allclose(iou_maxes, iou_matrix.max(axis=1), atol=1e-6)
+    overlapping = iou_matrix.max(axis=1) > 0
+    assert np.array_equal(
+        anchor_gt_indexes[overlapping], iou_matrix.argmax(axis=1)[overlapping]
+    )
+    assert len(match_result.anchor_indexes) == overlapping.sum()
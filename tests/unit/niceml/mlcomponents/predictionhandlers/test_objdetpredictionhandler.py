@@ -1,6 +1,7 @@
 from os.path import join
 from typing import List
 
+import fastparquet
 import numpy as np
 import pytest
 
@@ -12,6 +13,11 @@ from niceml.data.datainfos.objdetdatainfo import ObjDetDataInfo
 from niceml.experiments.experimentcontext import ExperimentContext
 from niceml.experiments.expfilenames import ExperimentFilenames
 from niceml.mlcomponents.predictionhandlers.objdetpredictionhandler import (
+    NMS_BOXES_KEY,
+    NMS_CLASSES_KEY,
+    NMS_SCORES_KEY,
+    NMS_VALID_DETECTIONS_KEY,
+    ObjDetNmsPredictionHandler,
     ObjDetPredictionHandler,
 )
 from niceml.utilities.boundingboxes.filtering.nmsfilter import NmsFilter
@@ -137,3 +143,137 @@ def test_objdet_prediction_handler(
     )
 
     assert list(pred_dataframe.columns) == target_cols
+
+
+def test_objdet_prediction_handler_row_groups(
+    objdet_prediction_handler: ObjDetPredictionHandler,
+):
+    objdet_prediction_handler.row_group_size = 2
+    location = objdet_prediction_handler.exp_context.fs_config
+    anchor_array = objdet_prediction_handler.anchor_array
+    predictions = np.zeros((2, len(anchor_array), 7), dtype=np.float32)
+    # two separated boxes in the first image and none in the second image
+    predictions[0, [10, 50000], 4] = 0.9
+    data_info_list: List[ObjDetDataInfo] = [
+        ObjDetDataInfo(
+            image_location=join_location_w_path(location, f"image_{idx}.png"),
+            labels=[],
+            class_count_in_dataset=3,
+        )
+        for idx in range(2)
+    ]
+
+    with objdet_prediction_handler as prediction_handler:
+        for _ in range(3):
+            prediction_handler.add_prediction(
+                data_info_list=data_info_list, prediction_batch=predictions.copy()
+            )
+
+    filepath = join(
+        location["uri"],
+        ExperimentFilenames.PREDICTION_FOLDER,
+        objdet_prediction_handler.filename + ".parq",
+    )
+    assert len(fastparquet.ParquetFile(filepath).row_groups) == 3
+    pred_dataframe = objdet_prediction_handler.exp_context.read_parquet(
+        join(
+            ExperimentFilenames.PREDICTION_FOLDER,
+            objdet_prediction_handler.filename + ".parq",
+        ),
+    )
+    assert len(pred_dataframe) == 9
+    assert list(pred_dataframe["detection_index"]) == [0, 1, -1] * 3
+    first_image_df = pred_dataframe.iloc[:2]
+    assert np.allclose(
+        first_image_df[["x_pos", "y_pos", "width", "height"]].to_numpy(),
+        anchor_array[[10, 50000]],
+    )
+    assert np.allclose(first_image_df["pred_0000"], 0.9)
+
+
+@pytest.mark.parametrize(
+    "candidate_score_threshold,candidate_top_k", [(0.5, None), (None, 200), (0.3, 200)]
+)
+def test_objdet_prediction_handler_candidates(
+    objdet_prediction_handler: ObjDetPredictionHandler,
+    candidate_score_threshold,
+    candidate_top_k,
+):
+    location = objdet_prediction_handler.exp_context.fs_config
+    anchor_count = len(objdet_prediction_handler.anchor_array)
+    rng = np.random.default_rng(3)
+    predictions = np.concatenate(
+        [
+            rng.normal(0, 0.1, (2, anchor_count, 4)),
+            rng.normal(-7.5, 2, (2, anchor_count, 3)),
+        ],
+        axis=-1,
+    ).astype(np.float32)
+    data_info_list: List[ObjDetDataInfo] = [
+        ObjDetDataInfo(
+            image_location=join_location_w_path(location, f"image_{idx}.png"),
+            labels=[],
+            class_count_in_dataset=3,
+        )
+        for idx in range(2)
+    ]
+    pred_path = join(
+        ExperimentFilenames.PREDICTION_FOLDER,
+        objdet_prediction_handler.filename + ".parq",
+    )
+    objdet_prediction_handler.apply_sigmoid = True
+    with objdet_prediction_handler as prediction_handler:
+        prediction_handler.add_prediction(data_info_list, predictions.copy())
+    expected_df = objdet_prediction_handler.exp_context.read_parquet(pred_path)
+
+    objdet_prediction_handler.candidate_score_threshold = candidate_score_threshold
+    objdet_prediction_handler.candidate_top_k = candidate_top_k
+    with objdet_prediction_handler as prediction_handler:
+        prediction_handler.add_prediction(data_info_list, predictions.copy())
+    pred_df = objdet_prediction_handler.exp_context.read_parquet(pred_path)
+
+    assert len(expected_df) > 2
+    assert np.allclose(
+        pred_df.iloc[:, 2:].to_numpy(), expected_df.iloc[:, 2:].to_numpy(), atol=1e-5
+    )
+    assert pred_df.iloc[:, :2].equals(expected_df.iloc[:, :2])
+
+
+def test_objdet_nms_prediction_handler(
+    objdet_prediction_handler: ObjDetPredictionHandler,
+):
+    location = objdet_prediction_handler.exp_context.fs_config
+    prediction_handler = ObjDetNmsPredictionHandler()
+    prediction_handler.set_params(
+        data_description=objdet_prediction_handler.data_description,
+        filename="test_nms",
+        exp_context=objdet_prediction_handler.exp_context,
+    )
+    prediction_handler.initialize()
+    boxes = np.zeros((2, 3, 4), dtype=np.float32)
+    boxes[0, :2] = [[1, 2, 10, 20], [30, 40, 5, 6]]
+    nms_output = {
+        NMS_BOXES_KEY: boxes,
+        NMS_SCORES_KEY: np.array([[0.9, 0.6, 0.0], [0.0, 0.0, 0.0]]),
+        NMS_CLASSES_KEY: np.array([[2, 0, 0], [0, 0, 0]]),
+        NMS_VALID_DETECTIONS_KEY: np.array([2, 0]),
+    }
+    data_info_list: List[ObjDetDataInfo] = [
+        ObjDetDataInfo(
+            image_location=join_location_w_path(location, f"image_{idx}.png"),
+            labels=[],
+            class_count_in_dataset=3,
+        )
+        for idx in range(2)
+    ]
+    with prediction_handler as handler:
+        handler.add_prediction(data_info_list, nms_output)
+
+    pred_dataframe = prediction_handler.exp_context.read_parquet(
+        join(ExperimentFilenames.PREDICTION_FOLDER, "test_nms.parq")
+    )
+    assert list(pred_dataframe["detection_index"]) == [0, 1, -1]
+    assert np.allclose(
+        pred_dataframe.iloc[:2, 2:].to_numpy(),
+        [[1, 2, 10, 20, 0.0, 0.0, 0.9], [30, 40, 5, 6, 0.6, 0.0, 0.0]],
+    )
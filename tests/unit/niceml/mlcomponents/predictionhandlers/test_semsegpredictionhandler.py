@@ -1,3 +1,4 @@
+from os.path import join
 from typing import List, Tuple
 
 import numpy as np
@@ -8,7 +9,11 @@ from niceml.data.datadescriptions.semsegdatadescritption import (
     SemSegClassInfo,
     SemSegDataDescription,
 )
+from niceml.data.datainfos.semsegdatainfo import SemSegDataInfo
+from niceml.experiments.experimentcontext import ExperimentContext
+from niceml.experiments.expfilenames import ExperimentFilenames
 from niceml.mlcomponents.predictionhandlers.semsegpredictionhandler import (
+    SemSegMaskPredictionHandler,
     create_bbox_prediction_from_mask_instances,
 )
 from niceml.mlcomponents.resultanalyzers.instancefinders.maskinstance import (
@@ -21,6 +26,7 @@ from niceml.mlcomponents.resultanalyzers.tensors.semsegdataiterator import (
     SemSegPredictionContainer,
 )
 from niceml.utilities.imagesize import ImageSize
+from niceml.utilities.ioutils import read_image
 from tests.unit.niceml.utilities.semseg.testutils import get_random_semseg_mask
 
 
@@ -119,3 +125,82 @@ def test_create_bbox_prediction_from_mask_instances_small_box_size(
     assert bbox_prediction[2] == box_size
     assert bbox_prediction[3] == box_size
     assert len(bbox_prediction) == 4 + len(class_list)
+
+
+def _create_mask_prediction_handler(
+    tmp_dir: str, class_list: List[str], **kwargs
+) -> SemSegMaskPredictionHandler:
+    data_description = SemSegDataDescription(
+        classes=[SemSegClassInfo(color=[], name=name) for name in class_list],
+        input_image_size=ImageSize(16, 8),
+        output_image_size=ImageSize(16, 8),
+    )
+    prediction_handler = SemSegMaskPredictionHandler(**kwargs)
+    prediction_handler.set_params(
+        ExperimentContext(fs_config={"uri": tmp_dir}, run_id="test", short_id="test"),
+        "test_masks",
+        data_description,
+    )
+    return prediction_handler
+
+
+def _create_data_infos(count: int) -> List[SemSegDataInfo]:
+    return [
+        SemSegDataInfo(
+            file_id=f"image_{idx}",
+            image_location={"uri": f"image_{idx}.png"},
+            mask_location={"uri": f"mask_{idx}.png"},
+        )
+        for idx in range(count)
+    ]
+
+
+@pytest.mark.parametrize("writer_count", [0, 2])
+def test_semseg_mask_prediction_handler(
+    tmp_dir: str, random_generator, class_list, writer_count: int
+):
+    prediction_handler = _create_mask_prediction_handler(
+        tmp_dir,
+        class_list,
+        writer_count=writer_count,
+        queue_size=1,
+        png_compression_level=1,
+    )
+    predictions = random_generator.uniform(size=(2, 3, 8, 16, len(class_list)))
+    data_infos = _create_data_infos(6)
+
+    with prediction_handler:
+        prediction_handler.add_prediction(data_infos[:3], predictions[0])
+        prediction_handler.add_prediction(data_infos[3:], predictions[1])
+
+    for data_info, prediction in zip(data_infos, predictions.reshape(6, 8, 16, -1)):
+        image = np.asarray(
+            read_image(
+                join(
+                    tmp_dir,
+                    ExperimentFilenames.PREDICTION_FOLDER,
+                    "test_masks",
+                    f"{data_info.get_identifier()}_pred.png",
+                )
+            )
+        )
+        assert np.array_equal(image[:, :, 1], np.argmax(prediction, axis=2))
+        assert np.array_equal(
+            image[:, :, 0], (np.max(prediction, axis=2) * 255).astype(np.uint8)
+        )
+
+
+def test_semseg_mask_prediction_handler_raises_write_errors(
+    tmp_dir: str, class_list, monkeypatch
+):
+    prediction_handler = _create_mask_prediction_handler(tmp_dir, class_list)
+
+    def write_image_with_error(*_):
+        raise OSError("write failed")
+
+    monkeypatch.setattr(prediction_handler, "_write_image", write_image_with_error)
+    with pytest.raises(OSError, match="write failed"):
+        with prediction_handler:
+            prediction_handler.add_prediction(
+                _create_data_infos(1), np.zeros((1, 8, 16, len(class_list)))
+            )
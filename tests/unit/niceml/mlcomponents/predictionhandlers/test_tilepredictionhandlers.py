@@ -0,0 +1,154 @@
+from os.path import join
+from typing import List
+
+import numpy as np
+import pytest
+
+from niceml.data.datadescriptions.objdetdatadescription import ObjDetDataDescription
+from niceml.data.datainfos.datainfo import DataInfo
+from niceml.data.datainfos.objdetdatainfo import ObjDetDataInfo
+from niceml.data.datainfos.tiledatainfo import TileDataInfo
+from niceml.experiments.experimentcontext import ExperimentContext
+from niceml.experiments.expfilenames import ExperimentFilenames
+from niceml.mlcomponents.objdet.anchorgenerator import AnchorGenerator
+from niceml.mlcomponents.predictionhandlers.predictionhandler import PredictionHandler
+from niceml.mlcomponents.predictionhandlers.tilepredictionhandlers import (
+    TileBlendingPredictionHandler,
+    TileObjDetPredictionHandler,
+)
+from niceml.utilities.boundingboxes.filtering.nmsfilter import NmsFilter
+from niceml.utilities.boundingboxes.filtering.thresholdfilter import ThresholdFilter
+from niceml.utilities.imagesize import ImageSize
+from niceml.utilities.imagetiling import crop_tile, get_tile_positions
+
+
+@pytest.fixture()
+def exp_context(tmp_dir: str) -> ExperimentContext:
+    return ExperimentContext(fs_config={"uri": tmp_dir}, run_id="test", short_id="test")
+
+
+def create_tile_infos(
+    data_info: DataInfo, image_size: ImageSize, tile_size: ImageSize, overlap: int
+) -> List[TileDataInfo]:
+    tile_positions = get_tile_positions(image_size, tile_size, overlap)
+    return [
+        TileDataInfo(
+            data_info=data_info,
+            tile_index=tile_idx,
+            tile_count=len(tile_positions),
+            x_pos=int(x_pos),
+            y_pos=int(y_pos),
+            tile_size=tile_size,
+            image_size=image_size,
+            overlap=overlap,
+        )
+        for tile_idx, (x_pos, y_pos) in enumerate(tile_positions)
+    ]
+
+
+def test_tile_objdet_prediction_handler(exp_context: ExperimentContext):
+    tile_size = ImageSize(64, 64)
+    data_description = ObjDetDataDescription(
+        featuremap_scales=[8, 16, 32, 64, 128],
+        classes=["1", "2", "3"],
+        input_image_size=tile_size,
+        anchor_aspect_ratios=[1, 0.5, 2.0],
+        anchor_scales=[1, 1.25, 1.6],
+        anchor_base_area_side=4,
+        box_variance=[1.0, 1.0, 2.0, 2.0],
+    )
+    prediction_handler = TileObjDetPredictionHandler(
+        prediction_filter=ThresholdFilter(score_threshold=0.5),
+        merge_filter=NmsFilter(iou_threshold=0.5, score_threshold=0.5),
+        apply_sigmoid=False,
+    )
+    prediction_handler.set_params(exp_context, "test_tiles", data_description)
+    prediction_handler.initialize()
+
+    # the tiles of the first image start at x = 0 and x = 48
+    tile_infos = create_tile_infos(
+        ObjDetDataInfo({"uri": "image_0.png"}, [], 3),
+        ImageSize(112, 64),
+        tile_size,
+        overlap=16,
+    )
+    tile_infos += create_tile_infos(
+        ObjDetDataInfo({"uri": "image_1.png"}, [], 3),
+        ImageSize(64, 64),
+        tile_size,
+        overlap=16,
+    )
+    assert [tile_info.x_pos for tile_info in tile_infos] == [0, 48, 0]
+
+    # one object in the overlap is found by both tiles of the first image
+    anchors = AnchorGenerator().generate_anchor_array(data_description).xywh
+    shifted_anchors = anchors - np.array([48, 0, 0, 0])
+    first_idx, second_idx = np.argwhere(
+        np.all(np.isclose(anchors[:, None], shifted_anchors[None]), axis=2)
+    )[0][::-1]
+    predictions = np.zeros((3, len(anchors), 7), dtype=np.float32)
+    predictions[0, first_idx, 5] = 0.9
+    predictions[1, second_idx, 5] = 0.8
+
+    with prediction_handler as handler:
+        handler.add_prediction(tile_infos[:2], predictions[:2])
+        handler.add_prediction(tile_infos[2:], predictions[2:])
+
+    pred_dataframe = exp_context.read_parquet(
+        join(ExperimentFilenames.PREDICTION_FOLDER, "test_tiles.parq")
+    )
+    assert list(pred_dataframe["image_location"]) == ["image_0.png", "image_1.png"]
+    assert list(pred_dataframe["detection_index"]) == [0, -1]
+    assert np.allclose(
+        pred_dataframe.iloc[0, 2:].to_numpy(dtype=float),
+        list(anchors[first_idx]) + [0.0, 0.9, 0.0],
+    )
+
+
+class RecordingPredictionHandler(PredictionHandler):
+    def __init__(self):
+        super().__init__()
+        self.predictions = {}
+
+    def __enter__(self):
+        return self
+
+    def add_prediction(self, data_info_list: List[DataInfo], prediction_batch):
+        for data_info, prediction in zip(data_info_list, prediction_batch):
+            self.predictions[data_info.get_identifier()] = prediction
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        pass
+
+
+def test_tile_blending_prediction_handler(exp_context: ExperimentContext):
+    image_size = ImageSize(100, 70)
+    tile_size = ImageSize(40, 40)
+    data_info = ObjDetDataInfo({"uri": "image.png"}, [], 2)
+    tile_infos = create_tile_infos(data_info, image_size, tile_size, overlap=8)
+    image_prediction = (
+        np.random.default_rng(5)
+        .random(image_size.to_numpy_shape() + (2,))
+        .astype(np.float32)
+    )
+    tile_predictions = np.stack(
+        [
+            crop_tile(image_prediction, tile_info.x_pos, tile_info.y_pos, tile_size)
+            for tile_info in tile_infos
+        ]
+    )
+    recording_handler = RecordingPredictionHandler()
+    prediction_handler = TileBlendingPredictionHandler(recording_handler)
+    prediction_handler.set_params(exp_context, "test", None)
+
+    with prediction_handler as handler:
+        for batch_start in range(0, len(tile_infos), 4):
+            handler.add_prediction(
+                tile_infos[batch_start : batch_start + 4],
+                tile_predictions[batch_start : batch_start + 4],
+            )
+            assert len(recording_handler.predictions) == int(
+                batch_start + 4 >= len(tile_infos)
+            )
+
+    assert np.allclose(recording_handler.predictions["image.png"], image_prediction)
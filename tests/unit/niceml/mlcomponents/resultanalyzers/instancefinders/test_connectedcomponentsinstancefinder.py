@@ -0,0 +1,145 @@
+import cv2
+import numpy as np
+import pytest
+
+from niceml.data.datadescriptions.semsegdatadescritption import (
+    SemSegClassInfo,
+    SemSegDataDescription,
+)
+from niceml.mlcomponents.predictionhandlers.semsegpredictionhandler import (
+    create_bbox_prediction_from_component_instances,
+    create_bbox_prediction_from_mask_instances,
+)
+from niceml.mlcomponents.resultanalyzers.instancefinders.connectedcomponentsinstancefinder import (
+    ConnectedComponentsInstanceFinder,
+)
+from niceml.mlcomponents.resultanalyzers.instancefinders.multichannelinstancefinder import (
+    MultiChannelInstanceFinder,
+)
+from niceml.mlcomponents.resultanalyzers.tensors.semsegdataiterator import (
+    SemSegPredictionContainer,
+)
+from niceml.utilities.imagesize import ImageSize
+from tests.unit.niceml.utilities.semseg.testutils import get_random_semseg_mask
+
+
+@pytest.fixture()
+def prediction_container() -> SemSegPredictionContainer:
+    idx_mask, pred_mask = get_random_semseg_mask(
+        image_shape=(256, 256),
+        random_generator=np.random.default_rng(seed=42),
+        class_list=["1", "2", "3"],
+        square_width=20,
+        square_height=20,
+    )
+    return SemSegPredictionContainer(
+        max_prediction_idxes=idx_mask.astype(int), max_prediction_values=pred_mask
+    )
+
+
+def test_instances_match_multichannel_instance_finder(prediction_container):
+    component_instances = ConnectedComponentsInstanceFinder(
+        min_area=1
+    ).analyse_datapoint("", data_predicted=prediction_container)
+    mask_instances = MultiChannelInstanceFinder(min_area=1).analyse_datapoint(
+        "", data_predicted=prediction_container
+    )
+
+    expected_boxes = sorted(
+        (mask_instance.instance_class_idx,) + cv2.boundingRect(contour.contour)
+        for mask_instance in mask_instances
+        for contour in mask_instance.instance_contours
+    )
+    boxes = sorted(
+        (
+            instance.class_idx,
+            instance.x_pos,
+            instance.y_pos,
+            instance.width,
+            instance.height,
+        )
+        for instance in component_instances
+    )
+    assert boxes == expected_boxes
+
+
+def test_instance_masks_and_scores():
+    idx_mask = np.zeros((10, 12), dtype=int)
+    scores = np.zeros((10, 12))
+    idx_mask[1:4, 2:4] = 1
+    scores[1:4, 2:4] = 0.8
+    scores[1, 2] = 0.9
+    idx_mask[5:9, 6:11] = 2
+    scores[5:9, 6:11] = 0.7
+    scores[6:8, 7:9] = 0.1
+    idx_mask[0, 11] = 2
+    scores[0, 11] = 0.9
+    finder = ConnectedComponentsInstanceFinder(min_area=2)
+
+    instances = finder.analyse_datapoint(
+        "", data_predicted=SemSegPredictionContainer(idx_mask, scores)
+    )
+
+    assert len(instances) == 2
+    first, second = instances
+    assert (first.class_idx, first.x_pos, first.y_pos, first.width, first.height) == (
+        1,
+        2,
+        1,
+        2,
+        3,
+    )
+    assert first.area == 6
+    assert first.max_score == pytest.approx(0.9)
+    assert first.mean_score == pytest.approx((0.9 + 5 * 0.8) / 6)
+    assert second.class_idx == 2
+    assert second.mask.shape == (4, 5)
+    assert second.area == 16
+    assert not second.mask[1:3, 1:3].any()
+    image_mask = second.get_image_mask((10, 12))
+    assert np.count_nonzero(image_mask) == 16
+    assert np.array_equal(image_mask[5:9, 6:11] > 0, second.mask)
+
+
+def test_to_semseg_instance_label():
+    data_description = SemSegDataDescription(
+        classes=[SemSegClassInfo([], "a"), SemSegClassInfo([], "b")],
+        input_image_size=ImageSize(8, 6),
+        output_image_size=ImageSize(8, 6),
+    )
+    idx_mask = np.ones((6, 8), dtype=int)
+    scores = np.zeros((6, 8))
+    scores[2:4, 3:6] = 1.0
+    instance = ConnectedComponentsInstanceFinder(min_area=1).analyse_datapoint(
+        "", data_predicted=SemSegPredictionContainer(idx_mask, scores)
+    )[0]
+
+    label = instance.to_semseg_instance_label(data_description)
+
+    assert label.class_name == "b"
+    assert label.mask.shape == (6, 8)
+    assert np.count_nonzero(label.mask) == 6
+
+
+def test_create_bbox_prediction_from_component_instances(prediction_container):
+    prediction = np.random.default_rng(seed=1).uniform(size=(256, 256, 3))
+    component_instances = ConnectedComponentsInstanceFinder(
+        min_area=1
+    ).analyse_datapoint("", data_predicted=prediction_container)
+    mask_instances = MultiChannelInstanceFinder(min_area=1).analyse_datapoint(
+        "", data_predicted=prediction_container
+    )
+
+    bbox_predictions = create_bbox_prediction_from_component_instances(
+        prediction, component_instances
+    )
+    expected_predictions = create_bbox_prediction_from_mask_instances(
+        prediction, mask_instances
+    )
+
+    assert sorted(pred for _, pred in bbox_predictions) == sorted(
+        pred for _, pred in expected_predictions
+    )
+    assert create_bbox_prediction_from_component_instances(prediction, []) == [
+        (-1, [0.0] * 7)
+    ]
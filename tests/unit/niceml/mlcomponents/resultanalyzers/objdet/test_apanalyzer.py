@@ -0,0 +1,63 @@
+from os.path import join
+from tempfile import TemporaryDirectory
+
+import fastparquet
+import numpy as np
+import pandas as pd
+
+from niceml.data.dataiterators.boundingboxdataiterator import BoundingBoxIterator
+from niceml.mlcomponents.resultanalyzers.objdet.apanalyzer import (
+    get_ap_metrics_dict,
+    get_detection_arrays,
+    get_pr_curves_df,
+)
+from niceml.mlcomponents.resultanalyzers.objdet.averageprecision import (
+    compute_average_precision,
+)
+
+
+def test_get_detection_arrays():
+    data_frame = pd.DataFrame(
+        {
+            "image_location": ["b.png", "a.png", "c.png", "b.png", "d.png"],
+            "detection_index": [0, 0, -1, 1, 0],
+            "x_pos": [1.0, 2.0, 0.0, 3.0, 4.0],
+            "y_pos": [5.0, 6.0, 0.0, 7.0, 8.0],
+            "width": [10.0, 11.0, 0.0, 12.0, 13.0],
+            "height": [20.0, 21.0, 0.0, 22.0, 23.0],
+            "pred_0000": [0.9, 0.2, 0.0, 0.7, 0.6],
+            "pred_0001": [0.1, 0.8, 0.0, 0.3, 0.4],
+        }
+    )
+    with TemporaryDirectory() as tmp_dir:
+        fastparquet.write(join(tmp_dir, "test.parq"), data_frame)
+        bbox_iterator = BoundingBoxIterator()
+        bbox_iterator.open(join(tmp_dir, "test"))
+
+    detections = get_detection_arrays(
+        bbox_iterator, pd.Index(["a.png", "b.png", "c.png"])
+    ).sort_by_image()
+
+    assert np.array_equal(detections.image_indexes, [0, 1, 1])
+    assert np.array_equal(detections.class_indexes, [1, 0, 0])
+    assert np.allclose(detections.scores, [0.8, 0.9, 0.7])
+    assert np.allclose(detections.boxes_ullr[0], [2.0, 6.0, 13.0, 27.0])
+
+
+def test_get_ap_metrics_dict_and_pr_curves():
+    ap_result = compute_average_precision(
+        scores=np.array([0.9, 0.8]),
+        class_indexes=np.array([0, 0]),
+        true_positives=np.array([[True, False], [False, False]]),
+        gt_counts=np.array([1, 0]),
+        iou_thresholds=[0.5, 0.75],
+    )
+    metrics_dict = get_ap_metrics_dict(ap_result, ["c0", "c1"])
+    assert metrics_dict["mean_average_precision"] == 0.5
+    assert metrics_dict["average_recall"] == 0.5
+    assert metrics_dict["average_precision_per_iou"] == {"0.50": 1.0, "0.75": 0.0}
+    assert metrics_dict["average_precision_per_class"] == {"c0": 0.5}
+
+    pr_curves_df = get_pr_curves_df(ap_result, ["c0", "c1"])
+    assert len(pr_curves_df) == 2 * 101
+    assert set(pr_curves_df["class_name"]) == {"c0"}
@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+
+from niceml.mlcomponents.resultanalyzers.objdet.averageprecision import (
+    DetectionArrays,
+    compute_average_precision,
+    match_detections,
+    match_detections_in_chunks,
+)
+from niceml.utilities.ioumatrix import compute_iou_matrix
+
+
+def _random_boxes(rng: np.random.Generator, count: int) -> np.ndarray:
+    upper_left = rng.uniform(0, 80, size=(count, 2))
+    sizes = rng.uniform(5, 30, size=(count, 2))
+    return np.concatenate([upper_left, upper_left + sizes], axis=1)
+
+
+def _match_sequentially(
+    detections: DetectionArrays, ground_truths: DetectionArrays, iou_threshold: float
+) -> np.ndarray:
+    """Reference implementation of the COCO matching with loops"""
+    true_positives = np.zeros(len(detections), dtype=bool)
+    gt_taken = np.zeros(len(ground_truths), dtype=bool)
+    iou_matrix = compute_iou_matrix(detections.boxes_ullr, ground_truths.boxes_ullr)
+    for det_idx in np.argsort(-detections.scores, kind="stable"):
+        best_gt_idx, best_iou = -1, iou_threshold
+        for gt_idx in range(len(ground_truths)):
+            same_group = (
+                detections.image_indexes[det_idx] == ground_truths.image_indexes[gt_idx]
+                and detections.class_indexes[det_idx]
+                == ground_truths.class_indexes[gt_idx]
+            )
+            if gt_taken[gt_idx] or not same_group:
+                continue
+            if iou_matrix[det_idx, gt_idx] > best_iou or (
+                best_gt_idx < 0 and iou_matrix[det_idx, gt_idx] >= best_iou
+            ):
+                best_gt_idx, best_iou = gt_idx, iou_matrix[det_idx, gt_idx]
+        if best_gt_idx >= 0:
+            true_positives[det_idx] = True
+            gt_taken[best_gt_idx] = True
+    return true_positives
+
+
+@pytest.fixture()
+def random_detections():
+    rng = np.random.default_rng(42)
+    ground_truths = DetectionArrays(
+        image_indexes=np.sort(rng.integers(0, 5, 60)),
+        class_indexes=rng.integers(0, 2, 60),
+        boxes_ullr=_random_boxes(rng, 60),
+    )
+    detections = DetectionArrays(
+        image_indexes=np.sort(rng.integers(0, 5, 150)),
+        class_indexes=rng.integers(0, 2, 150),
+        boxes_ullr=_random_boxes(rng, 150),
+        scores=rng.uniform(size=150),
+    )
+    return detections, ground_truths
+
+
+def test_match_detections_equals_sequential_matching(random_detections):
+    detections, ground_truths = random_detections
+    iou_thresholds = [0.1, 0.3, 0.5]
+    true_positives = match_detections(detections, ground_truths, iou_thresholds)
+    for thr_idx, iou_threshold in enumerate(iou_thresholds):
+        expected = _match_sequentially(detections, ground_truths, iou_threshold)
+        assert np.array_equal(true_positives[thr_idx], expected)
+    assert true_positives[0].sum() > true_positives[2].sum() > 0
+
+
+def test_match_detections_in_chunks(random_detections):
+    detections, ground_truths = random_detections
+    true_positives = match_detections(detections, ground_truths, [0.2, 0.4])
+    for image_chunk_size in [1, 2, 10]:
+        assert np.array_equal(
+            match_detections_in_chunks(
+                detections,
+                ground_truths,
+                [0.2, 0.4],
+                image_chunk_size=image_chunk_size,
+            ),
+            true_positives,
+        )
+
+
+def test_compute_average_precision():
+    # class 0: tp, fp, tp with 3 gt boxes; class 1: no detections; class 2: no gt
+    scores = np.array([0.9, 0.2, 0.8, 0.7, 0.5])
+    class_indexes = np.array([0, 0, 0, 2, 0])
+    true_positives = np.array([[True, False, False, False, True]])
+    ap_result = compute_average_precision(
+        scores,
+        class_indexes,
+        true_positives,
+        gt_counts=np.array([3, 2, 0]),
+        iou_thresholds=[0.5],
+    )
+    # recall 1/3 with precision 1.0 and 2/3 with precision 2/3
+    expected_precisions = np.where(
+        ap_result.recall_levels <= 1 / 3 + 1e-9,
+        1.0,
+        np.where(ap_result.recall_levels <= 2 / 3 + 1e-9, 2 / 3, 0.0),
+    )
+    assert np.allclose(ap_result.precisions[0, 0], expected_precisions)
+    assert np.allclose(ap_result.recalls[0], [2 / 3, 0.0, np.nan], equal_nan=True)
+    assert ap_result.average_precisions[0, 1] == 0.0
+    assert np.isnan(ap_result.average_precisions[0, 2])
+    assert ap_result.get_mean_average_precision() == pytest.approx(
+        np.mean(expected_precisions) / 2
+    )
+    assert ap_result.get_average_recall() == pytest.approx(1 / 3)
+
+
+def test_compute_average_precision_perfect_detections(random_detections):
+    _, ground_truths = random_detections
+    detections = DetectionArrays(
+        image_indexes=ground_truths.image_indexes,
+        class_indexes=ground_truths.class_indexes,
+        boxes_ullr=ground_truths.boxes_ullr,
+        scores=np.linspace(1.0, 0.5, len(ground_truths)),
+    )
+    true_positives = match_detections(detections, ground_truths, [0.5, 0.95])
+    ap_result = compute_average_precision(
+        detections.scores,
+        detections.class_indexes,
+        true_positives,
+        gt_counts=np.bincount(ground_truths.class_indexes),
+        iou_thresholds=[0.5, 0.95],
+    )
+    assert ap_result.get_mean_average_precision() == pytest.approx(1.0)
+    assert ap_result.get_average_recall() == pytest.approx(1.0)
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from niceml.data.datadescriptions.semsegdatadescritption import (
+    SemSegClassInfo,
+    SemSegDataDescription,
+)
+from niceml.data.datainfos.semsegdatainfo import SemSegData
+from niceml.mlcomponents.resultanalyzers.tensors.semsegconfusion import (
+    SemSegConfusionAccumulator,
+    get_gt_class_indexes,
+)
+from niceml.mlcomponents.resultanalyzers.tensors.semsegdataiterator import (
+    SemSegPredictionContainer,
+)
+from niceml.mlcomponents.resultanalyzers.tensors.tensoriou import TensorIoU
+from niceml.utilities.imagesize import ImageSize
+
+
+def _confusion_matrix_with_loops(
+    gt_idxes: np.ndarray, prediction: np.ndarray, threshold: float
+) -> np.ndarray:
+    """Reference implementation with one binary mask per class"""
+    class_count = prediction.shape[2]
+    confusion_matrix = np.zeros((class_count + 1, class_count + 1), dtype=np.int64)
+    for y_pos in range(gt_idxes.shape[0]):
+        for x_pos in range(gt_idxes.shape[1]):
+            pred_idx = int(np.argmax(prediction[y_pos, x_pos]))
+            if prediction[y_pos, x_pos, pred_idx] < threshold:
+                pred_idx = class_count
+            confusion_matrix[gt_idxes[y_pos, x_pos], pred_idx] += 1
+    return confusion_matrix
+
+
+def test_confusion_matrices_match_reference():
+    rng = np.random.default_rng(42)
+    class_count = 3
+    thresholds = [0.3, 0.5, 0.7]
+    accumulator = SemSegConfusionAccumulator(class_count, thresholds)
+    gt_masks, predictions = [], []
+    for _ in range(3):
+        gt_mask = rng.integers(0, class_count + 1, size=(12, 9))
+        gt_mask[gt_mask == class_count] = 255
+        prediction = rng.uniform(size=(12, 9, class_count))
+        accumulator.add(gt_mask, prediction)
+        gt_masks.append(get_gt_class_indexes(gt_mask, class_count))
+        predictions.append(prediction)
+
+    result = accumulator.get_result()
+
+    assert result.confusion_matrices.shape == (3, 4, 4)
+    for threshold_idx, threshold in enumerate(thresholds):
+        expected = sum(
+            _confusion_matrix_with_loops(gt_idxes, prediction, threshold)
+            for gt_idxes, prediction in zip(gt_masks, predictions)
+        )
+        np.testing.assert_array_equal(
+            result.confusion_matrices[threshold_idx], expected
+        )
+
+
+def test_metrics():
+    gt_mask = np.array([[0, 0, 1, 1], [255, 255, 255, 255]])
+    pred_idxes = np.array([[0, 1, 1, 1], [0, 1, 1, 1]])
+    pred_scores = np.array([[0.9, 0.9, 0.9, 0.4], [0.9, 0.4, 0.4, 0.4]])
+    accumulator = SemSegConfusionAccumulator(class_count=2, thresholds=[0.0, 0.5])
+    accumulator.add(gt_mask, SemSegPredictionContainer(pred_idxes, pred_scores, "id"))
+
+    result = accumulator.get_result()
+
+    # threshold 0.0: class 0 tp=1 fp=1 fn=1, class 1 tp=2 fp=4 fn=0
+    # threshold 0.5: class 0 tp=1 fp=1 fn=1, class 1 tp=1 fp=1 fn=1
+    np.testing.assert_allclose(result.get_iou(), [[1 / 3, 2 / 6], [1 / 3, 1 / 3]])
+    np.testing.assert_allclose(result.get_dice(), [[0.5, 0.5], [0.5, 0.5]])
+    np.testing.assert_allclose(result.get_precision(), [[0.5, 2 / 6], [0.5, 0.5]])
+    np.testing.assert_allclose(result.get_recall(), [[0.5, 1.0], [0.5, 0.5]])
+
+
+def test_one_hot_gt_and_undefined_metrics():
+    gt_mask = np.zeros((2, 2, 2), dtype=np.uint8)
+    gt_mask[0, 0, 0] = 1
+    prediction = np.zeros((2, 2, 2))
+    prediction[0, 0, 0] = 1.0
+    accumulator = SemSegConfusionAccumulator(class_count=2, thresholds=[0.5])
+    accumulator.add(gt_mask, prediction)
+
+    result = accumulator.get_result()
+
+    np.testing.assert_array_equal(
+        result.confusion_matrices[0], [[1, 0, 0], [0, 0, 0], [0, 0, 3]]
+    )
+    assert result.get_iou()[0, 0] == 1.0
+    assert np.isnan(result.get_iou()[0, 1])
+
+
+def test_shape_mismatch():
+    accumulator = SemSegConfusionAccumulator(class_count=2, thresholds=[0.5])
+    with pytest.raises(ValueError):
+        accumulator.add(np.zeros((4, 4)), np.zeros((2, 2, 2)))
+
+
+def test_tensor_iou():
+    data_description = SemSegDataDescription(
+        classes=[SemSegClassInfo([255, 0, 0], "a"), SemSegClassInfo([0, 255, 0], "b")],
+        input_image_size=ImageSize(2, 2),
+        output_image_size=ImageSize(2, 2),
+    )
+    metric = TensorIoU("iou", threshold=0.5, thresholds=[0.1, 0.9])
+    metric.initialize(data_description, exp_context=None, dataset_name="test")
+    metric.start_analysis()
+    prediction = np.array([[[0.8, 0.2], [0.3, 0.7]], [[0.6, 0.4], [0.1, 0.2]]])
+    mask = np.array([[0, 1], [1, 255]])
+    metric.analyse_datapoint(
+        "id", prediction, SemSegData(file_id="id", image=None, mask_image=mask), {}
+    )
+
+    metrics = metric.get_final_metric()
+
+    assert metrics["iou_a"] == pytest.approx(0.5)
+    assert metrics["iou_b"] == pytest.approx(0.5)
+    assert metrics["mean_iou"] == pytest.approx(0.5)
+    assert metrics["precision"] == pytest.approx(dict(a=0.5, b=1.0))
+    assert metrics["recall"] == pytest.approx(dict(a=1.0, b=0.5))
+    assert list(metrics["mean_iou_per_threshold"]) == ["0.10", "0.50", "0.90"]
+    assert metrics["mean_iou_per_threshold"]["0.90"] == pytest.approx(0.0)
@@ -0,0 +1,99 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from niceml.data.datadescriptions.datadescription import DataDescription
+from niceml.data.datainfolistings.datainfolisting import DataInfoListing
+from niceml.data.datainfos.clsdatainfo import ClsDataInfo
+from niceml.data.dataloaders.dataloader import DataLoader
+from niceml.data.datasets.genericdataset import GenericDataset
+from niceml.dlframeworks.keras.datasets.kerasgenericdataset import KerasGenericDataset
+from niceml.mlcomponents.targettransformer.targettransformer import (
+    NetInputTransformer,
+    NetTargetTransformer,
+)
+from niceml.scripts.datasetbenchmark import benchmark_dataset, max_rss_to_mb
+
+
+class InMemoryDataInfoListing(DataInfoListing):
+    def list(self, data_description: DataDescription) -> List[ClsDataInfo]:
+        return [
+            ClsDataInfo(
+                identifier=str(idx),
+                image_location=str(idx),
+                class_idx=idx % 2,
+                class_name=str(idx % 2),
+            )
+            for idx in range(6)
+        ]
+
+
+class ArrayDataLoader(DataLoader):
+    def load_data(self, data_info: ClsDataInfo) -> np.ndarray:
+        return np.full((4, 4), float(data_info.class_idx))
+
+
+class StackInputTransformer(NetInputTransformer):
+    def get_net_inputs(self, data_list: List[np.ndarray]) -> np.ndarray:
+        return np.stack(data_list)
+
+
+class MeanTargetTransformer(NetTargetTransformer):
+    def get_net_targets(self, data_list: List[np.ndarray]) -> np.ndarray:
+        return np.array([data.mean() for data in data_list])
+
+
+@pytest.fixture()
+def dataset() -> GenericDataset:
+    dataset = KerasGenericDataset(
+        batch_size=2,
+        set_name="train",
+        datainfo_listing=InMemoryDataInfoListing(),
+        data_loader=ArrayDataLoader(),
+        target_transformer=MeanTargetTransformer(),
+        input_transformer=StackInputTransformer(),
+        shuffle=False,
+    )
+    dataset.initialize(data_description=None, exp_context=None)
+    return dataset
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_benchmark_dataset(dataset: GenericDataset, workers: int):
+    result, stage_df = benchmark_dataset(
+        dataset, batch_count=8, workers=workers, max_queue_size=2
+    )
+
+    assert set(result) == {
+        "workers",
+        "max_queue_size",
+        "use_multiprocessing",
+        "batches",
+        "duration_sec",
+        "batches_per_sec",
+        "peak_rss_mb",
+        "children_peak_rss_mb",
+    }
+    assert result["workers"] == workers
+    assert result["batches"] == 8
+    assert result["batches_per_sec"] > 0
+    assert result["peak_rss_mb"] > 0
+    assert set(stage_df["stage"]) == {
+        "load",
+        "input_transformation",
+        "target_transformation",
+    }
+    load_count = stage_df.loc[stage_df["stage"] == "load", "count"].sum()
+    # the enqueuer may prefetch batches beyond the requested count
+    assert load_count >= 8
+    assert stage_df["samples_per_sec"].gt(0).all()
+    assert dataset.stage_timer is None
+
+
+@pytest.mark.parametrize(
+    "platform,max_rss", [("linux", 2048), ("darwin", 2 * 1024 * 1024)]
+)
+def test_max_rss_to_mb(monkeypatch, platform: str, max_rss: int):
+    monkeypatch.setattr("sys.platform", platform)
+    assert max_rss_to_mb(max_rss) == 2.0
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from niceml.utilities.boundingboxes.filtering.candidateselection import (
+    score_to_logit,
+    select_candidates,
+)
+
+
+@pytest.mark.parametrize("score", [0.01, 0.3, 0.5, 0.99])
+def test_score_to_logit(score: float):
+    assert np.isclose(1 / (1 + np.exp(-score_to_logit(score))), score)
+
+
+@pytest.mark.parametrize(
+    "score_threshold,top_k,expected_batch_idxes,expected_anchor_idxes",
+    [
+        (None, None, [0, 0, 0, 0, 1, 1, 1, 1], [0, 1, 2, 3, 0, 1, 2, 3]),
+        (0.0, None, [0, 0, 1], [1, 3, 2]),
+        (None, 1, [0, 1], [3, 2]),
+        (0.0, 3, [0, 0, 1], [1, 3, 2]),
+        (5.0, 3, [], []),
+    ],
+)
+def test_select_candidates(
+    score_threshold, top_k, expected_batch_idxes, expected_anchor_idxes
+):
+    # logits of two classes after four coordinates
+    class_logits = np.array(
+        [
+            [[-3.0, -2.0], [1.0, -1.0], [-1.0, -0.5], [-4.0, 2.0]],
+            [[-3.0, -2.0], [-1.0, -1.0], [0.5, -0.5], [-4.0, -2.0]],
+        ]
+    )
+    prediction_batch = np.concatenate([np.zeros((2, 4, 4)), class_logits], axis=-1)
+
+    batch_idxes, anchor_idxes = select_candidates(
+        prediction_batch, 4, score_threshold=score_threshold, top_k=top_k
+    )
+
+    assert list(batch_idxes) == expected_batch_idxes
+    assert list(anchor_idxes) == expected_anchor_idxes
@@ -1,7 +1,14 @@
 import numpy as np
 import pytest
 
-from niceml.utilities.boundingboxes.filtering.nmsfilter import non_maximum_suppression
+from niceml.utilities.boundingboxes.bboxconversion import convert_to_ullr
+from niceml.utilities.boundingboxes.filtering.nmsfilter import (
+    NmsFilter,
+    compute_nms_keep_mask,
+    compute_soft_nms_decay,
+    non_maximum_suppression,
+)
+from niceml.utilities.ioumatrix import compute_iou_matrix
 
 
 @pytest.mark.parametrize(
@@ -70,3 +77,106 @@ def test_non_maximum_suppression(box_predictions, iou_threshold):
     best_bboxes = box_predictions[[0, 3, 6, 7, 8]]
     for bbox in filtered_bbox:
         assert bbox in best_bboxes
+
+
+def greedy_nms_reference(
+    prediction_array_xywh: np.ndarray,
+    iou_threshold: float,
+    class_count: int,
+    score_threshold: float,
+) -> np.ndarray:
+    prediction_array_ullr = convert_to_ullr(prediction_array_xywh)
+    scores = prediction_array_ullr[:, 4 : 4 + class_count]
+    classes = np.argmax(scores, axis=1)
+    order = np.argsort(-np.max(scores, axis=1), kind="stable")
+    order = order[np.max(scores, axis=1)[order] > score_threshold]
+    kept_idxes = []
+    for cur_idx in order:
+        same_class_kept = [
+            idx for idx in kept_idxes if classes[idx] == classes[cur_idx]
+        ]
+        if len(same_class_kept) > 0:
+            ious = compute_iou_matrix(
+                prediction_array_ullr[[cur_idx], :4],
+                prediction_array_ullr[same_class_kept, :4],
+            )
+            if np.any(ious > iou_threshold):
+                continue
+        kept_idxes.append(cur_idx)
+    return prediction_array_xywh[kept_idxes]
+
+
+@pytest.fixture
+def random_predictions() -> np.ndarray:
+    rng = np.random.default_rng(7)
+    box_count = 400
+    boxes = np.concatenate(
+        [rng.uniform(0, 200, (box_count, 2)), rng.uniform(5, 60, (box_count, 2))],
+        axis=1,
+    )
+    return np.concatenate([boxes, rng.random((box_count, 3))], axis=1)
+
+
+@pytest.mark.parametrize("iou_threshold", [0.1, 0.3, 0.5, 0.8])
+def test_non_maximum_suppression_equals_greedy(
+    random_predictions: np.ndarray, iou_threshold: float
+):
+    filtered_array = non_maximum_suppression(
+        prediction_array_xywh=random_predictions,
+        iou_threshold=iou_threshold,
+        coordinates_count=4,
+        class_count=3,
+        score_threshold=0.3,
+    )
+    expected_array = greedy_nms_reference(
+        random_predictions, iou_threshold, class_count=3, score_threshold=0.3
+    )
+    assert np.allclose(filtered_array, expected_array)
+
+
+def test_non_maximum_suppression_options(random_predictions: np.ndarray):
+    nms_kwargs = dict(
+        iou_threshold=0.3, coordinates_count=4, class_count=3, score_threshold=0.3
+    )
+    filtered_array = non_maximum_suppression(random_predictions, **nms_kwargs)
+    top_k_array = non_maximum_suppression(random_predictions, top_k=20, **nms_kwargs)
+    agnostic_array = non_maximum_suppression(
+        random_predictions, class_agnostic=True, **nms_kwargs
+    )
+    soft_array = non_maximum_suppression(
+        random_predictions, soft_nms_sigma=0.5, **nms_kwargs
+    )
+
+    assert len(top_k_array) <= 20
+    assert np.allclose(top_k_array, filtered_array[: len(top_k_array)])
+    assert len(agnostic_array) < len(filtered_array)
+    assert len(soft_array) >= len(filtered_array)
+    soft_scores = np.max(soft_array[:, 4:], axis=1)
+    assert np.all(soft_scores > 0.3)
+    assert np.all(np.diff(soft_scores) <= 0)
+
+
+def test_batched_non_maximum_suppression(random_predictions: np.ndarray):
+    prediction_batch = np.stack([random_predictions, random_predictions[::-1]])
+    nms_filter = NmsFilter(iou_threshold=0.4, score_threshold=0.3, top_k=50)
+    nms_filter.output_class_count = 3
+
+    filtered_arrays = nms_filter.filter_batch(prediction_batch)
+
+    assert len(filtered_arrays) == 2
+    for filtered_array, prediction_array in zip(filtered_arrays, prediction_batch):
+        assert np.allclose(filtered_array, nms_filter.filter(prediction_array))
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 64])
+def test_nms_blocks_equal_single_block(random_predictions: np.ndarray, block_size):
+    boxes_ullr = convert_to_ullr(random_predictions)[:, :4]
+
+    assert np.array_equal(
+        compute_nms_keep_mask(boxes_ullr, 0.3, block_size=block_size),
+        compute_nms_keep_mask(boxes_ullr, 0.3, block_size=len(boxes_ullr)),
+    )
+    assert np.allclose(
+        compute_soft_nms_decay(boxes_ullr, 0.5, block_size=block_size),
+        compute_soft_nms_decay(boxes_ullr, 0.5, block_size=len(boxes_ullr)),
+    )
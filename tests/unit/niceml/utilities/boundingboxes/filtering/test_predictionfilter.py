@@ -26,6 +26,9 @@ from niceml.utilities.boundingboxes.filtering.unifiedboxfilter import UnifiedBox
             [
                 {"name": "score_threshold", "default": 0.5, "step": None},
                 {"name": "iou_threshold", "default": 0.5, "step": None},
+                {"name": "top_k", "default": 0, "step": 1},
+                {"name": "class_agnostic", "default": 0.0, "step": None},
+                {"name": "soft_nms_sigma", "default": 0.0, "step": None},
             ],
         ),
         (
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from niceml.utilities.boundingboxes.filtering.unifiedboxfilter import (
+    UnifiedBoxFilter,
+    compute_iou_adjacency,
+)
+from niceml.utilities.ioumatrix import compute_iou_matrix
+
+
+def test_unified_box_filter_merges_connected_boxes():
+    # columns: x, y, width, height, score class 0, score class 1, index
+    prediction_array = np.array(
+        [
+            [0, 0, 10, 10, 0.6, 0.1, 0],
+            [2, 0, 10, 10, 0.9, 0.1, 1],
+            [4, 0, 10, 10, 0.7, 0.2, 2],
+            [3, 1, 10, 10, 0.1, 0.8, 3],
+            [50, 50, 10, 10, 0.95, 0.1, 4],
+            [80, 80, 10, 10, 0.2, 0.3, 5],
+        ],
+        dtype=float,
+    )
+    unified_box_filter = UnifiedBoxFilter(score_threshold=0.5, iou_threshold=0.5)
+    unified_box_filter.output_class_count = 2
+
+    filtered_array = unified_box_filter.filter(prediction_array)
+
+    # box 0 and 2 only overlap via box 1, box 3 has another class
+    expected_array = np.array(
+        [
+            [50, 50, 10, 10, 0.95, 0.1, 4],
+            [0, 0, 14, 10, 0.9, 0.2, 1],
+            [3, 1, 10, 10, 0.1, 0.8, 3],
+        ]
+    )
+    assert np.allclose(filtered_array, expected_array)
+
+
+def test_unified_box_filter_empty():
+    unified_box_filter = UnifiedBoxFilter()
+    unified_box_filter.output_class_count = 2
+
+    filtered_array = unified_box_filter.filter(np.zeros((3, 6)))
+
+    assert filtered_array.shape == (0, 6)
+
+
+@pytest.mark.parametrize("max_pair_count", [1, 7, 2**20])
+@pytest.mark.parametrize("size_range", [([1, 5], [3, 30]), ([5, 1], [30, 3])])
+def test_compute_iou_adjacency_matches_iou_matrix(max_pair_count: int, size_range):
+    rng = np.random.default_rng(0)
+    upper_left = rng.uniform(0, 100, size=(200, 2))
+    sizes = rng.uniform(*size_range, size=(200, 2))
+    boxes_ullr = np.concatenate([upper_left, upper_left + sizes], axis=1)
+
+    adjacency_array = compute_iou_adjacency(boxes_ullr, 0.1, max_pair_count).toarray()
+
+    expected_array = compute_iou_matrix(boxes_ullr, boxes_ullr) > 0.1
+    np.fill_diagonal(expected_array, False)
+    assert not np.any(adjacency_array & adjacency_array.T)
+    assert np.array_equal(adjacency_array | adjacency_array.T, expected_array)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from niceml.utilities.boundingboxes.boundingbox import BoundingBox
+from niceml.utilities.boundingboxes.boxarray import BoxArray
+from niceml.utilities.imagesize import ImageSize
+
+
+@pytest.fixture()
+def bounding_boxes():
+    return [
+        BoundingBox(0, 0, 10, 10),
+        BoundingBox(5, 5, 10, 20),
+        BoundingBox(-5, 30, 20, 10),
+    ]
+
+
+def test_boxarray_conversion(bounding_boxes):
+    box_array = BoxArray.from_bounding_boxes(bounding_boxes)
+    assert box_array.xywh.dtype == np.float32
+    assert box_array.xywh.shape == (3, 4)
+    assert box_array.to_bounding_boxes() == bounding_boxes
+    assert box_array[1] == bounding_boxes[1]
+    assert box_array[1:] == BoxArray.from_bounding_boxes(bounding_boxes[1:])
+    assert len(BoxArray.from_bounding_boxes([])) == 0
+    assert np.allclose(
+        box_array.get_absolute_ullr(),
+        [bbox.get_absolute_ullr() for bbox in bounding_boxes],
+    )
+    assert BoxArray.from_ullr(box_array.get_absolute_ullr()) == box_array
+
+
+def test_boxarray_xywh_is_not_copied():
+    boxes_xywh = np.zeros((5, 4), dtype=np.float32)
+    assert np.shares_memory(BoxArray(boxes_xywh).xywh, boxes_xywh)
+
+
+def test_boxarray_iou_and_area(bounding_boxes):
+    box_array = BoxArray.from_bounding_boxes(bounding_boxes)
+    iou_matrix = box_array.calc_iou(box_array[:2])
+    assert iou_matrix.shape == (3, 2)
+    for row, bbox in enumerate(bounding_boxes):
+        for col, other_bbox in enumerate(bounding_boxes[:2]):
+            assert iou_matrix[row, col] == pytest.approx(bbox.calc_iou(other_bbox))
+    assert np.allclose(
+        box_array.get_absolute_area(),
+        [bbox.get_absolute_area() for bbox in bounding_boxes],
+    )
+    assert np.allclose(
+        box_array.get_relative_area(ImageSize(10, 20)),
+        [bbox.get_relative_area(ImageSize(10, 20)) for bbox in bounding_boxes],
+    )
+
+
+def test_boxarray_encode_decode(bounding_boxes):
+    box_variance = [0.1, 0.1, 0.2, 0.2]
+    anchors = BoxArray.from_bounding_boxes(bounding_boxes)
+    gt_boxes = anchors.shift(2, 3).scale(1.5)
+    encoded = anchors.encode(gt_boxes, box_variance)
+    for anchor, gt_bbox, encoded_values in zip(
+        bounding_boxes, gt_boxes.to_bounding_boxes(), encoded
+    ):
+        assert np.allclose(encoded_values, anchor.encode(gt_bbox, box_variance))
+    assert anchors.decode(encoded, box_variance) == gt_boxes
+
+
+def test_boxarray_scale_shift_clip(bounding_boxes):
+    box_array = BoxArray.from_bounding_boxes(bounding_boxes)
+    assert box_array.scale(2.0)[1] == BoundingBox(10, 10, 20, 40)
+    assert box_array.shift(x_shift=1, y_shift=-1)[0] == BoundingBox(1, -1, 10, 10)
+    clipped = box_array.clip(ImageSize(12, 35))
+    assert clipped.to_bounding_boxes() == [
+        BoundingBox(0, 0, 10, 10),
+        BoundingBox(5, 5, 7, 20),
+        BoundingBox(0, 30, 12, 5),
+    ]
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from niceml.utilities.imagesize import ImageSize
+from niceml.utilities.imagetiling import (
+    crop_tile,
+    get_blending_weights,
+    get_tile_offsets,
+    get_tile_positions,
+)
+
+
+@pytest.mark.parametrize(
+    ("length", "tile_length", "overlap", "expected_offsets"),
+    [
+        (256, 128, 32, [0, 96, 128]),
+        (224, 128, 32, [0, 96]),
+        (128, 128, 32, [0]),
+        (100, 128, 32, [0]),
+        (300, 100, 0, [0, 100, 200]),
+    ],
+)
+def test_get_tile_offsets(length, tile_length, overlap, expected_offsets):
+    offsets = get_tile_offsets(length, tile_length, overlap)
+    assert offsets.tolist() == expected_offsets
+    if length >= tile_length:
+        assert offsets[-1] + tile_length == length
+        assert np.all(offsets[:-1] + tile_length - offsets[1:] >= overlap)
+
+
+def test_get_tile_offsets_invalid_overlap():
+    with pytest.raises(ValueError):
+        get_tile_offsets(256, 128, 128)
+
+
+def test_get_tile_positions():
+    positions = get_tile_positions(ImageSize(224, 112), ImageSize(128, 64), 16)
+    assert positions.tolist() == [[0, 0], [96, 0], [0, 48], [96, 48]]
+
+
+def test_crop_tile_pads_small_images():
+    image = np.ones((50, 60, 3), dtype=np.uint8)
+    tile = crop_tile(image, 0, 0, ImageSize(64, 64))
+    assert tile.shape == (64, 64, 3)
+    assert tile[:50, :60].all()
+    assert not tile[50:].any() and not tile[:, 60:].any()
+
+
+def test_blending_reproduces_image():
+    image_size = ImageSize(200, 150)
+    tile_size = ImageSize(64, 48)
+    overlap = 16
+    image = np.random.default_rng(3).random(image_size.to_numpy_shape())
+    prediction_sum = np.zeros_like(image)
+    weight_sum = np.zeros_like(image)
+    weights = get_blending_weights(tile_size, overlap)
+    for x_pos, y_pos in get_tile_positions(image_size, tile_size, overlap):
+        area = np.s_[y_pos : y_pos + tile_size.height, x_pos : x_pos + tile_size.width]
+        prediction_sum[area] += crop_tile(image, x_pos, y_pos, tile_size) * weights
+        weight_sum[area] += weights
+    assert weights.min() > 0 and weights.max() == 1
+    assert np.allclose(prediction_sum / weight_sum, image)
@@ -1,15 +1,19 @@
 from typing import List
 
+import numpy as np
 import pytest
 
 from niceml.utilities.boundingboxes.bboxlabeling import ObjDetInstanceLabel
 from niceml.utilities.boundingboxes.boundingbox import BoundingBox
 from niceml.utilities.instancelabeling import InstanceLabel
 from niceml.utilities.matchingresult import (
+    AssignmentStrategy,
     MatchingResult,
+    compute_label_iou_matrix,
     match_classification_prediction_and_gt,
     match_detection_prediction_and_gt,
 )
+from niceml.utilities.semseg.semseginstancelabeling import SemSegInstanceLabel
 
 
 @pytest.fixture
@@ -257,3 +261,99 @@ def test_matching_case4(
     assert len(match_result_detection.true_pos) == 1
     assert len(match_result_detection.false_pos) == 3
     assert len(match_result_detection.false_neg) == 0
+
+
+def _box_label(class_name: str, bounding_box: BoundingBox) -> ObjDetInstanceLabel:
+    return ObjDetInstanceLabel(
+        class_name=class_name, class_index=0, active=True, bounding_box=bounding_box
+    )
+
+
+def test_compute_label_iou_matrix_equals_calc_iou(
+    four_disjunkt_instance_labels: List[InstanceLabel],
+    one_surrounding_instance_labels: List[InstanceLabel],
+    one_upper_left_instance_label: List[InstanceLabel],
+):
+    gt_labels = four_disjunkt_instance_labels
+    pred_labels = one_surrounding_instance_labels + one_upper_left_instance_label
+    iou_matrix = compute_label_iou_matrix(gt_labels, pred_labels)
+    expected = [[gt.calc_iou(pred) for pred in pred_labels] for gt in gt_labels]
+    assert np.allclose(iou_matrix, expected)
+    assert compute_label_iou_matrix(gt_labels, []).shape == (4, 0)
+
+
+def test_compute_label_iou_matrix_masks():
+    masks = np.zeros((3, 8, 8), dtype=np.uint8)
+    masks[0, :4, :4] = 1
+    masks[1, :4, :] = 1
+    masks[2, 4:, 4:] = 1
+    labels = [
+        SemSegInstanceLabel(class_name="c1", class_index=0, mask=mask) for mask in masks
+    ]
+    iou_matrix = compute_label_iou_matrix(labels, labels)
+    expected = [[gt.calc_iou(pred) for pred in labels] for gt in labels]
+    assert np.allclose(iou_matrix, expected)
+
+
+@pytest.mark.parametrize(
+    ("assignment", "true_pos_count", "false_pos_count"),
+    [
+        (AssignmentStrategy.ALL, 2, 0),
+        (AssignmentStrategy.GREEDY, 1, 0),
+        (AssignmentStrategy.HUNGARIAN, 1, 0),
+    ],
+)
+def test_matching_assignment(
+    assignment: AssignmentStrategy, true_pos_count: int, false_pos_count: int
+):
+    gt_labels = [
+        _box_label("c1", BoundingBox(0, 0, 10, 10)),
+        _box_label("c1", BoundingBox(2, 0, 10, 10)),
+    ]
+    pred_labels = [_box_label("c1", BoundingBox(1, 0, 10, 10))]
+    result = match_detection_prediction_and_gt(
+        pred_labels, gt_labels, matching_iou=0.5, assignment=assignment
+    )
+    assert len(result.true_pos) == true_pos_count
+    assert len(result.false_pos) == false_pos_count
+    assert len(result.true_pos) + len(result.false_neg) == len(gt_labels)
+
+
+def test_matching_hungarian_maximizes_matches():
+    # greedy assigns the first prediction to the first gt, which leaves
+    # the second gt without a match
+    gt_labels = [
+        _box_label("c1", BoundingBox(0, 0, 10, 10)),
+        _box_label("c1", BoundingBox(3, 0, 10, 10)),
+    ]
+    pred_labels = [
+        _box_label("c1", BoundingBox(1, 0, 10, 10)),
+        _box_label("c1", BoundingBox(-2, 0, 10, 10)),
+    ]
+    greedy_result = match_detection_prediction_and_gt(
+        pred_labels, gt_labels, 0.4, AssignmentStrategy.GREEDY
+    )
+    hungarian_result = match_detection_prediction_and_gt(
+        pred_labels, gt_labels, 0.4, AssignmentStrategy.HUNGARIAN
+    )
+    assert greedy_result.true_pos == [gt_labels[0]]
+    assert greedy_result.false_pos == [pred_labels[1]]
+    assert hungarian_result.true_pos == gt_labels
+    assert hungarian_result.false_pos == []
+
+
+def test_classification_matching_assignment_respects_classes():
+    gt_labels = [
+        _box_label("c1", BoundingBox(0, 0, 10, 10)),
+        _box_label("c2", BoundingBox(0, 0, 10, 10)),
+    ]
+    pred_labels = [
+        _box_label("c2", BoundingBox(0, 0, 10, 10)),
+        _box_label("c3", BoundingBox(0, 0, 10, 10)),
+    ]
+    result = match_classification_prediction_and_gt(
+        pred_labels, gt_labels, assignment=AssignmentStrategy.GREEDY
+    )
+    assert result.true_pos == [gt_labels[1]]
+    assert result.false_neg == [gt_labels[0]]
+    assert result.false_pos == [pred_labels[1]]
@@ -0,0 +1,35 @@
+import time
+
+from niceml.utilities.stagetimer import StageTimer
+
+
+def test_stage_timer_aggregates_per_epoch():
+    stage_timer = StageTimer(bin_edges_ms=[1.0, 1000.0])
+    assert stage_timer.aggregate_epoch() == []
+
+    for _ in range(3):
+        with stage_timer.measure("load"):
+            time.sleep(0.002)
+        with stage_timer.measure("augmentation"):
+            pass
+        stage_timer.add_samples(4)
+    records = {record["stage"]: record for record in stage_timer.aggregate_epoch()}
+
+    assert set(records.keys()) == {"load", "augmentation"}
+    load_record = records["load"]
+    assert load_record["epoch"] == 0
+    assert load_record["count"] == 3
+    assert load_record["samples"] == 12
+    assert load_record["samples_per_sec"] > 0
+    assert load_record["p50_ms"] >= 2.0
+    assert load_record["hist_le_1ms"] == 0
+    assert load_record["hist_le_1000ms"] == 3
+    assert load_record["hist_gt_1000ms"] == 0
+    assert records["augmentation"]["hist_le_1ms"] == 3
+
+    with stage_timer.measure("load"):
+        pass
+    stage_timer.aggregate_epoch()
+    records_df = stage_timer.get_records_df()
+    assert len(records_df) == 3
+    assert records_df["epoch"].tolist() == [0, 0, 1]